@@ -0,0 +1,11 @@
+"""
+Benchmarker.
+"""
+
+from .harness import Benchmark
+from .synthetic import SyntheticData
+
+__all__ = [
+    'synthetic', 'SyntheticData',
+    'harness', 'Benchmark',
+]
@@ -0,0 +1,373 @@
+"""
+Benchmarks of the key stages of the pipeline, which run on synthetic data (see
+:py:class:`benchmarker.SyntheticData`) so that they can be run on any machine.
+
+The results of each run are appended to a (.csv) history of the results, so that the timings can be
+compared across commits (e.g. to find performance regressions).
+
+Command line usage::
+
+    python -m benchmarker.harness --scale 0.01 --repeat 3
+
+    # Also save a trace of the stages (see :py:func:`utils.start_tracing`)
+    python -m benchmarker.harness --scale 0.01 --trace traces/benchmark.json
+"""
+
+import argparse
+import contextlib
+import gc
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from pyhelpers.dir import cd
+
+from benchmarker.synthetic import SyntheticData, make_install_dir
+from utils import count_rows, get_data_source, start_tracing, stop_tracing, summarise_trace
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    """
+    Change the current working directory temporarily.
+
+    :param path: path to a directory
+    :type path: str
+    """
+
+    current_dir = os.getcwd()
+    os.chdir(path)
+
+    try:
+        yield path
+    finally:
+        os.chdir(current_dir)
+
+
+def get_commit_id():
+    """
+    Get the (short) ID of the current commit of the repository.
+
+    :return: ID of the current commit, or ``''`` if it is unknown
+    :rtype: str
+    """
+
+    try:
+        commit_id = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(__file__),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit_id = ''
+
+    return commit_id
+
+
+class Benchmark:
+    """
+    A benchmark of the key stages of the pipeline.
+
+    :param scale: scale of the synthetic data (see :py:class:`benchmarker.SyntheticData`),
+        defaults to ``0.01``
+    :type scale: float
+    :param random_seed: seed of the random number generators of the synthetic data,
+        defaults to ``0``
+    :type random_seed: int
+    :param workspace: a new or empty directory where the synthetic data is installed (and where
+        the stages write their intermediate data), defaults to ``None`` (i.e. a temporary directory)
+    :type workspace: str or None
+    :param keep: whether to keep the ``workspace`` after the benchmark, defaults to ``False``
+    :type keep: bool
+
+    :ivar pandas.DataFrame Results: timings of the stages
+
+    **Test**::
+
+        >>> from benchmarker import Benchmark
+
+        >>> benchmark = Benchmark(scale=0.001)
+
+        >>> results = benchmark.run(stages=['view_schedule8_data'])
+        >>> results[['Stage', 'Succeeded']]
+                         Stage  Succeeded
+        0    install_synthetic       True
+        1  view_schedule8_data       True
+    """
+
+    def __init__(self, scale=0.01, random_seed=0, workspace=None, keep=False):
+        self.Scale = scale
+        self.RandomSeed = random_seed
+
+        self.Workspace = workspace
+        self.Keep = keep
+
+        self.PathToResults = cd("benchmarks", "benchmark-results.csv")
+
+        self.SyntheticData = SyntheticData(scale=scale, random_seed=random_seed)
+
+        # Stage name: (setup, run), where run(setup()) is timed
+        self.Stages = {
+            'view_schedule8_data': (
+                lambda: get_data_source('METExLite'),
+                lambda metex: metex.view_schedule8_data(update=True)),
+            'get_incident_location_weather': (
+                self.make_wind_model,
+                lambda w_model: w_model.get_incident_location_weather(update=True)),
+            'get_incident_location_vegetation': (
+                self.make_wind_model,
+                lambda w_model: w_model.get_incident_location_vegetation(update=True)),
+            'get_processed_incident_records': (
+                self.make_heat_model,
+                lambda h_model: h_model.get_processed_incident_records(update=True)),
+            'evaluate_prototype_model': (
+                self.make_wind_model,
+                lambda w_model: w_model.evaluate_prototype_model(verbose=False)),
+        }
+
+        self.Results = pd.DataFrame()
+
+    @staticmethod
+    def make_wind_model():
+        """
+        Create a data model of wind-related incidents.
+
+        :return: a data model
+        :rtype: modeller.WindAttributedIncidents
+        """
+
+        from modeller import WindAttributedIncidents
+
+        return WindAttributedIncidents(trial_id='benchmark')
+
+    @staticmethod
+    def make_heat_model():
+        """
+        Create a data model of heat-related incidents.
+
+        :return: a data model
+        :rtype: modeller.HeatAttributedIncidentsPlus
+        """
+
+        from modeller import HeatAttributedIncidentsPlus
+
+        return HeatAttributedIncidentsPlus(trial_id='benchmark')
+
+    def time_stage(self, stage_name, setup, run, run_id, verbose=False):
+        """
+        Time a stage.
+
+        A stage fails if it raises an error or returns ``None`` (which is how the pipeline reports
+        most failures).
+
+        :param stage_name: name of the stage
+        :type stage_name: str
+        :param setup: function that prepares the input of ``run``
+        :type setup: typing.Callable
+        :param run: function that runs the stage
+        :type run: typing.Callable
+        :param run_id: number of the run
+        :type run_id: int
+        :param verbose: whether to print relevant information in console, defaults to ``False``
+        :type verbose: bool
+        :return: timing of the stage
+        :rtype: dict
+        """
+
+        if verbose:
+            print("Running \"{}\" (run {})".format(stage_name, run_id), end=" ... ")
+
+        result, seconds, error = None, None, ''
+
+        try:
+            obj = setup()
+            gc.collect()
+
+            start = time.perf_counter()
+            result = run(obj)
+            seconds = time.perf_counter() - start
+
+            if result is None:
+                error = 'No result.'
+
+        except Exception as e:
+            error = "{}: {}".format(type(e).__name__, e)
+
+        timing = {'Stage': stage_name, 'Run': run_id, 'Seconds': seconds,
+                  'Rows': count_rows(result), 'Succeeded': not error, 'Error': error}
+
+        if verbose:
+            print("Done ({:.2f}s).".format(seconds) if not error else "Failed. {}".format(error))
+
+        return timing
+
+    def run(self, stages=None, repeat=1, verbose=False):
+        """
+        Run the benchmark.
+
+        :param stages: names of the stages to be run, defaults to ``None`` (i.e. all stages)
+        :type stages: list or None
+        :param repeat: number of runs of each stage, defaults to ``1``
+        :type repeat: int
+        :param verbose: whether to print relevant information in console, defaults to ``False``
+        :type verbose: bool
+        :return: timings of the stages
+        :rtype: pandas.DataFrame
+        """
+
+        stages = list(self.Stages.keys()) if stages is None else stages
+        unknown_stages = [x for x in stages if x not in self.Stages]
+        if unknown_stages:
+            raise KeyError("Unknown stage(s): {}".format(unknown_stages))
+
+        # (A given workspace must be new or empty, as it is removed after the run unless kept)
+        workspace = tempfile.mkdtemp(prefix="benchmark-") if self.Workspace is None \
+            else make_install_dir(self.Workspace)
+
+        timings = []
+
+        try:
+            with working_directory(workspace):
+                timings.append(self.time_stage(
+                    'install_synthetic', lambda: self.SyntheticData,
+                    lambda synthetic_data: synthetic_data.install(workspace) or True, run_id=1,
+                    verbose=verbose))
+
+                for stage_name in stages:
+                    setup, run = self.Stages[stage_name]
+                    for run_id in range(1, repeat + 1):
+                        timings.append(
+                            self.time_stage(stage_name, setup, run, run_id, verbose=verbose))
+
+        finally:
+            self.SyntheticData.uninstall()
+            if not self.Keep:
+                shutil.rmtree(workspace, ignore_errors=True)
+
+        results = pd.DataFrame(timings)
+        results.insert(0, 'Timestamp', pd.Timestamp.now().floor('s'))
+        results.insert(1, 'Commit', get_commit_id())
+        results.insert(2, 'Machine', platform.platform())
+        results.insert(3, 'Python', platform.python_version())
+        results.insert(4, 'Scale', self.Scale)
+
+        self.Results = results
+
+        return results
+
+    def save_results(self, path_to_file=None, verbose=False):
+        """
+        Append the results to the history of the results.
+
+        :param path_to_file: path to the history (.csv) of the results, defaults to ``None``
+            (i.e. ``.PathToResults``)
+        :type path_to_file: str or None
+        :param verbose: whether to print relevant information in console, defaults to ``False``
+        :type verbose: bool
+        """
+
+        path_to_file = self.PathToResults if path_to_file is None else path_to_file
+        os.makedirs(os.path.dirname(os.path.abspath(path_to_file)), exist_ok=True)
+
+        file_exists = os.path.isfile(path_to_file)
+        self.Results.to_csv(path_to_file, mode='a', header=not file_exists, index=False)
+
+        if verbose:
+            print("{} the results to \"{}\".".format(
+                "Appended" if file_exists else "Saved", os.path.relpath(path_to_file)))
+
+
+def summarise_results(history):
+    """
+    Summarise the history of the results, i.e. the median time of each stage for each commit.
+
+    :param history: history of the results (see :py:meth:`Benchmark.save_results`)
+    :type history: pandas.DataFrame
+    :return: median time (in seconds) of each stage (column) for each commit and scale (row)
+    :rtype: pandas.DataFrame
+    """
+
+    succeeded = history[history.Succeeded.astype(bool)]
+
+    summary = succeeded.groupby(['Timestamp', 'Commit', 'Scale', 'Stage'], sort=False).Seconds.median()
+    summary = summary.unstack('Stage').sort_index(level='Timestamp')
+
+    return summary
+
+
+def find_regressions(history, tolerance=0.1):
+    """
+    Find the stages of which the latest time is longer than the previous one (at the same scale).
+
+    :param history: history of the results (see :py:meth:`Benchmark.save_results`)
+    :type history: pandas.DataFrame
+    :param tolerance: relative increase in time that is tolerated, defaults to ``0.1``
+    :type tolerance: float
+    :return: the previous and latest times (in seconds) of the stages that have regressed
+    :rtype: pandas.DataFrame
+    """
+
+    summary = summarise_results(history).reset_index()
+
+    regressions = []
+    for scale, dat in summary.groupby('Scale'):
+        if len(dat) < 2:
+            continue
+
+        previous, latest = dat.iloc[-2], dat.iloc[-1]
+        for stage_name in dat.columns.drop(['Timestamp', 'Commit', 'Scale']):
+            if latest[stage_name] > previous[stage_name] * (1 + tolerance):
+                regressions.append({
+                    'Scale': scale, 'Stage': stage_name,
+                    'PreviousCommit': previous.Commit, 'PreviousSeconds': previous[stage_name],
+                    'LatestCommit': latest.Commit, 'LatestSeconds': latest[stage_name]})
+
+    return pd.DataFrame(regressions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline on synthetic data.")
+    parser.add_argument('--scale', type=float, default=0.01,
+                        help="scale of the synthetic data relative to the databases")
+    parser.add_argument('--repeat', type=int, default=1, help="number of runs of each stage")
+    parser.add_argument('--stages', nargs='+', default=None, help="names of the stages to be run")
+    parser.add_argument('--random-seed', type=int, default=0,
+                        help="seed of the random number generators of the synthetic data")
+    parser.add_argument('--workspace', default=None,
+                        help="a new or empty directory where the synthetic data is installed")
+    parser.add_argument('--keep', action='store_true', help="keep the workspace after the run")
+    parser.add_argument('--results', default=None, help="path to the history of the results")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="relative increase in time that is reported as a regression")
+    parser.add_argument('--trace', default=None, help="path where a trace of the stages is saved")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="record the peak memory of each span of the trace")
+    args = parser.parse_args(argv)
+
+    benchmark = Benchmark(scale=args.scale, random_seed=args.random_seed,
+                          workspace=args.workspace, keep=args.keep)
+
+    if args.trace:
+        start_tracing(os.path.abspath(args.trace), trace_memory=args.trace_memory)
+    benchmark.run(stages=args.stages, repeat=args.repeat, verbose=True)
+    if args.trace:
+        spans = stop_tracing(verbose=True)
+        print("\nSpans (by the time spent in the spans themselves):")
+        print(summarise_trace(spans).head(20).to_string())
+
+    benchmark.save_results(args.results, verbose=True)
+
+    history = pd.read_csv(benchmark.PathToResults if args.results is None else args.results)
+    regressions = find_regressions(history, tolerance=args.tolerance)
+    if not regressions.empty:
+        print("\nRegressions (slower by more than {:.0%}):".format(args.tolerance))
+        print(regressions.to_string(index=False))
+
+    return 0 if benchmark.Results.Succeeded.all() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
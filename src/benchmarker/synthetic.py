@@ -0,0 +1,1455 @@
+"""
+Synthetic data with the same schemas as the (proprietary) METEx, Vegetation, MIDAS and UKCP09 data.
+
+The synthetic data is generated at a configurable scale (``scale=1`` gives tables of roughly the
+same sizes as those of the databases), so that the pipeline can be exercised (e.g. benchmarked)
+without access to the databases.
+
+The tables that are cached locally by the pipeline (e.g. 'PfPI', 'IncidentRecord', 'FurlongData'
+and 'HazardTree') are installed as the pickle files from which the pipeline reads them, and the
+tables that are queried from the databases (i.e. 'Weather', 'UKCP09' and 'MIDAS_RADTOB') are
+stored in a local SQLite database, which the data sources connect to instead of MS SQL Server.
+"""
+
+import functools
+import os
+import sqlite3
+import string
+
+import numpy as np
+import pandas as pd
+import shapely.geometry
+from pyhelpers.dir import cdd
+from pyhelpers.geom import osgb36_to_wgs84, wgs84_to_osgb36
+from pyhelpers.store import save_json
+
+import preprocessor
+from utils import cdd_network, cdd_weather, data_source_factories, nr_mileage_nums_to_str, \
+    register_data_source, save_pickle
+
+
+# == Reference data ===================================================================================
+
+# Route: (Region, IMDMs, (longitude, latitude) of the centre of the Route)
+routes = {
+    'Anglia': ('Eastern', ['IMDM Tottenham', 'IMDM Romford', 'IMDM Ipswich'], (0.65, 52.05)),
+    'East Midlands': ('Eastern', ['IMDM Bedford', 'IMDM Derby'], (-1.05, 52.55)),
+    'North and East': ('Eastern', ['IMDM York', 'IMDM Sheffield', 'IMDM Doncaster'], (-1.35, 53.85)),
+    'Kent': ('Southern', ['IMDM Ashford', 'IMDM Orpington'], (0.75, 51.25)),
+    'Sussex': ('Southern', ['IMDM Brighton', 'IMDM Croydon'], (-0.15, 50.95)),
+    'Wessex': ('Southern', ['IMDM Woking', 'IMDM Eastleigh'], (-1.25, 51.05)),
+    'Western': ('Wales and Western', ['IMDM Bristol', 'IMDM Reading', 'IMDM Plymouth'],
+                (-2.45, 51.15)),
+    'Wales': ('Wales and Western', ['IMDM Cardiff', 'IMDM Shrewsbury'], (-3.45, 51.95)),
+    'LNW South': ('North West and Central', ['IMDM Bletchley', 'IMDM Saltley'], (-1.55, 52.35)),
+    'LNW North': ('North West and Central', ['IMDM Manchester', 'IMDM Preston'], (-2.55, 53.65)),
+    'Scotland': ('Scotland', ['IMDM Glasgow', 'IMDM Edinburgh', 'IMDM Perth'], (-3.75, 56.05)),
+}
+
+# Weather category: (proportion of weather-related incidents, reason codes)
+weather_categories = {
+    'Wind': (0.28, ['XW', 'JL']),
+    'Adhesion': (0.16, ['XD']),
+    'Flooding': (0.14, ['JK', 'XK']),
+    'Snow': (0.11, ['XT']),
+    'Heat': (0.11, ['IR', 'XH', 'IB', 'JH']),
+    'Cold': (0.09, ['XV']),
+    'Lightning': (0.07, ['XO']),
+    'Fog': (0.04, ['XU']),
+}
+
+# Proportion of incidents that are attributed to weather
+weather_related_proportion = 0.068
+
+# Reason code: (name, description, category, category description)
+incident_reasons = {
+    'IA': ('Signal failure', 'Signal failure', 'IA', 'Signalling'),
+    'IB': ('Points failure', 'Points failure', 'IB', 'Points'),
+    'IQ': ('Track circuit failure', 'Track circuit failure', 'IQ', 'Signalling'),
+    'IR': ('Broken/cracked/twisted/buckled rail', 'Rail buckle', 'IR', 'Track'),
+    'IS': ('Track defects', 'Track defects (other than rail defects)', 'IS', 'Track'),
+    'JH': ('Heat related speed restriction', 'Critical rail temperature speeds', 'JH', 'Track'),
+    'JK': ('Flooding', 'Flooding not due to exceptional weather', 'JK', 'Structures'),
+    'JL': ('Network Rail staff error', 'Blanket speed restriction (high winds)', 'JL', 'Other'),
+    'XD': ('Adhesion', 'Low adhesion (leaf fall)', 'XD', 'External'),
+    'XH': ('Severe heat', 'Severe weather - heat', 'XH', 'External'),
+    'XK': ('Flooding', 'Severe weather - flooding', 'XK', 'External'),
+    'XO': ('Lightning', 'Lightning strike', 'XO', 'External'),
+    'XT': ('Snow', 'Severe weather - snow', 'XT', 'External'),
+    'XU': ('Fog', 'Severe weather - fog', 'XU', 'External'),
+    'XV': ('Cold', 'Frozen equipment', 'XV', 'External'),
+    'XW': ('High winds', 'Severe weather - wind', 'XW', 'External'),
+    'XA': ('Trespass', 'Trespass', 'XA', 'External'),
+    'XB': ('Vandalism', 'Vandalism/theft', 'XB', 'External'),
+    'OC': ('Signaller error', 'Signaller error', 'OC', 'Operations'),
+    'QH': ('Possession overrun', 'Overrunning possession', 'QH', 'Possessions'),
+    'MU': ('Fleet defect', 'Train fault', 'MU', 'Fleet'),
+    'TG': ('Train crew', 'Train crew causes', 'TG', 'Train operator'),
+    'FC': ('Freight operator', 'Freight operator causes', 'FC', 'Freight operator'),
+}
+
+# Reason codes of incidents that are not attributed to weather
+non_weather_reason_codes = ['IA', 'IB', 'IQ', 'IR', 'IS', 'XA', 'XB', 'OC', 'QH', 'MU', 'TG', 'FC']
+
+# Performance event code: (probability, group, name)
+performance_events = {
+    'A': (0.62, 'Delay', 'Automatic'),
+    'M': (0.25, 'Delay', 'Manual'),
+    'C': (0.06, 'Cancellation', 'Cancellation'),
+    'P': (0.04, 'Cancellation', 'Part Cancellation'),
+    'D': (0.02, 'Cancellation', 'Diverted'),
+    'F': (0.01, 'Delay', 'Failed to Stop'),
+}
+
+cover_percent_columns = [
+    'CoverPercentAlder', 'CoverPercentAsh', 'CoverPercentBeech', 'CoverPercentBirch',
+    'CoverPercentConifer', 'CoverPercentElm', 'CoverPercentHorseChestnut', 'CoverPercentLime',
+    'CoverPercentOak', 'CoverPercentPoplar', 'CoverPercentShrub', 'CoverPercentSweetChestnut',
+    'CoverPercentSycamore', 'CoverPercentWillow', 'CoverPercentOpenSpace', 'CoverPercentOther']
+
+tef_score_columns = [
+    'MainSpeciesScore', 'TreeSizeScore', 'SurroundingLandScore', 'DistanceFromRailScore',
+    'OtherVegScore', 'TopographyScore', 'AtmosphereScore', 'TreeDensityScore']
+
+work_req_columns = [
+    'WorkReq_ExpertInspection', 'WorkReq_LocalisedPruning', 'WorkReq_GeneralPruning',
+    'WorkReq_CrownRemoval', 'WorkReq_StumpRemoval', 'WorkReq_TreeRemoval',
+    'WorkReq_TargetManagement', 'WorkReq_FurtherInvestigation', 'WorkReq_LimbRemoval',
+    'WorkReq_InstallSupport']
+
+tree_species = ['Ash', 'Oak', 'Sycamore', 'Birch', 'Willow', 'Poplar', 'Conifer', 'Beech',
+                'Lime', 'Horse Chestnut', 'No data']
+
+# Size of a METEx weather cell (in degrees)
+weather_cell_width, weather_cell_height = 0.25, 1 / 6
+
+# Sizes of the tables (i.e. numbers of rows) at ``scale=1``
+full_sizes = {'StanoxLocation': 7560, 'TrustIncident': 4049984, 'MetStations': 150}
+
+
+# == Helper functions =================================================================================
+
+def smooth_noise(rng, size, span):
+    """
+    Generate (standardised) noise that is correlated over about ``span`` steps.
+
+    :param rng: random number generator
+    :type rng: numpy.random.Generator
+    :param size: number of values
+    :type size: int
+    :param span: span (i.e. number of steps) of the exponential smoothing
+    :type span: int
+    :return: the noise, with a standard deviation of about 1
+    :rtype: numpy.ndarray
+    """
+
+    alpha = 1 / span
+
+    # Exponentially weighted moving average of white noise (after a burn-in of 5 spans)
+    noise = pd.Series(rng.standard_normal(size + 5 * span)).ewm(alpha=alpha, adjust=False).mean()
+    noise = noise.to_numpy()[5 * span:] / np.sqrt(alpha / (2 - alpha))
+
+    return noise
+
+
+def yards_to_nr_mileage_strs(yards):
+    """
+    Convert yards to Network Rail mileages (as strings), e.g. ``1850`` to ``'1.0090'``.
+
+    :param yards: yards
+    :type yards: numpy.ndarray or pandas.Series
+    :return: Network Rail mileages
+    :rtype: numpy.ndarray
+    """
+
+    yards = np.asarray(yards, dtype=np.int64)
+
+    return nr_mileage_nums_to_str(pd.Series(yards // 1760 + (yards % 1760) / 10000)).values
+
+
+def make_names(rng, size, suffixes=('', '', '', ' Junction', ' Yard', ' Sidings')):
+    """
+    Make (unique) names of places.
+
+    :param rng: random number generator
+    :type rng: numpy.random.Generator
+    :param size: number of names
+    :type size: int
+    :param suffixes: suffixes of the names
+    :type suffixes: tuple
+    :return: names of places
+    :rtype: list
+    """
+
+    heads = ['Ash', 'Brad', 'Chel', 'Dun', 'East', 'Fair', 'Glen', 'Hal', 'Ips', 'Kir', 'Lang',
+             'Mel', 'Nor', 'Old', 'Pen', 'Rad', 'Sel', 'Thor', 'Up', 'West', 'Ald', 'Bex', 'Cran',
+             'Dor', 'Elm', 'Frod', 'Gos', 'Hex', 'Ket', 'Lud']
+    tails = ['ford', 'ton', 'bury', 'ham', 'field', 'ley', 'wick', 'stow', 'combe', 'mouth',
+             'by', 'thorpe', 'well', 'worth', 'minster']
+
+    names = []
+    for i, head, tail, suffix in zip(
+            range(size), rng.choice(heads, size), rng.choice(tails, size),
+            rng.choice(suffixes, size)):
+        name = head + tail + suffix
+        names.append(name if name not in names else "{} {}".format(name, i))
+
+    return names
+
+
+def make_install_dir(path_to_dir):
+    """
+    Make (or check) a directory where the synthetic data is installed.
+
+    The directory must be either new or empty, so that no existing data (e.g. the pickle files of
+    the real tables) could be overwritten by the synthetic data.
+
+    :param path_to_dir: path to a directory
+    :type path_to_dir: str
+    :return: absolute path to the (empty) directory
+    :rtype: str
+    :raises FileExistsError: if ``path_to_dir`` is a file or a directory that is not empty
+
+    **Test**::
+
+        >>> import os
+        >>> import tempfile
+        >>> from benchmarker.synthetic import make_install_dir
+
+        >>> path_to_dir = make_install_dir(os.path.join(tempfile.mkdtemp(), "synthetic"))
+        >>> os.listdir(path_to_dir)
+        []
+
+        >>> make_install_dir(os.path.dirname(path_to_dir))
+        Traceback (most recent call last):
+          ...
+        FileExistsError: ...
+    """
+
+    path_to_dir = os.path.abspath(path_to_dir)
+
+    if os.path.exists(path_to_dir) and (not os.path.isdir(path_to_dir) or os.listdir(path_to_dir)):
+        raise FileExistsError(
+            "\"{}\" already exists and is not an empty directory; the synthetic data is installed "
+            "only in a new or empty directory.".format(path_to_dir))
+
+    os.makedirs(path_to_dir, exist_ok=True)
+
+    return path_to_dir
+
+
+class SyntheticStations:
+    """
+    Station data (see ``pyrcs.other_assets.Stations``) for the synthetic data.
+
+    :param station_data: station locations, with columns 'Station', 'Degrees Longitude'
+        and 'Degrees Latitude'
+    :type station_data: pandas.DataFrame
+    """
+
+    def __init__(self, station_data):
+        self.StnKey = 'Mileages, operators and grid coordinates'
+        self.StationData = station_data
+
+    def fetch_station_data(self, update=False, verbose=False):
+        """
+        Fetch the station data.
+
+        :return: station data
+        :rtype: dict
+        """
+
+        return {self.StnKey: self.StationData}
+
+
+def synthetic_table(func):
+    """
+    Generate a synthetic table only once (for each instance of :py:class:`SyntheticData`).
+    """
+
+    @functools.wraps(func)
+    def wrapper(self):
+        if func.__name__ not in self.Tables:
+            self.Tables[func.__name__] = func(self)
+        return self.Tables[func.__name__]
+
+    return wrapper
+
+
+# == Synthetic data ===================================================================================
+
+class SyntheticData:
+    """
+    Synthetic data of the METEx, Vegetation, MIDAS and UKCP09 databases.
+
+    :param scale: scale of the synthetic data relative to the data in the databases,
+        defaults to ``0.01``
+    :type scale: float
+    :param start_date: start date of the incident records and weather data,
+        defaults to ``'2006-04-01'``
+    :type start_date: str
+    :param end_date: end date of the incident records and weather data,
+        defaults to ``'2019-03-31'``
+    :type end_date: str
+    :param random_seed: seed of the random number generators, defaults to ``0``
+    :type random_seed: int
+
+    :ivar dict Tables: generated tables (each of which is generated on first use)
+    :ivar str InstallDir: directory where the synthetic data has been installed
+    :ivar str DatabasePath: path to the SQLite database (once the data has been installed)
+
+    **Test**::
+
+        >>> from benchmarker import SyntheticData
+
+        >>> synthetic_data = SyntheticData(scale=0.001)
+
+        >>> pfpi = synthetic_data.get_pfpi()
+        >>> pfpi.columns.tolist()
+        ['IncidentRecordId',
+         'PerformanceEventCode',
+         'PfPIMinutes',
+         'PfPICosts',
+         'PerformanceEventGroup',
+         'PerformanceEventName']
+    """
+
+    def __init__(self, scale=0.01, start_date='2006-04-01', end_date='2019-03-31',
+                 random_seed=0):
+        self.Scale = scale
+        self.StartDate = pd.Timestamp(start_date)
+        self.EndDate = pd.Timestamp(end_date) + pd.Timedelta(hours=23)
+        self.RandomSeed = random_seed
+
+        self.Tables = {}
+        self.InstallDir = None
+        self.DatabasePath = None
+
+        self.DefaultDataSources = {}
+
+    def make_rng(self, *keys):
+        """
+        Make a random number generator for generating a table (or part of it).
+
+        The generator depends only on the ``random_seed`` and the ``keys``, so that each table is
+        the same regardless of the order in which the tables are generated.
+
+        :param keys: e.g. name of a table
+        :type keys: str or int
+        :return: random number generator
+        :rtype: numpy.random.Generator
+        """
+
+        entropy = [self.RandomSeed] + [
+            int.from_bytes(k.encode(), 'little') % (2 ** 32) if isinstance(k, str) else int(k)
+            for k in keys]
+
+        return np.random.default_rng(entropy)
+
+    def get_hours(self):
+        """
+        Get the (hourly) date/times of the weather data.
+
+        :return: hourly date/times from ``.StartDate`` to ``.EndDate``
+        :rtype: numpy.ndarray
+        """
+
+        hours = np.arange(self.StartDate.to_datetime64(),
+                          self.EndDate.to_datetime64() + np.timedelta64(1, 'h'),
+                          np.timedelta64(1, 'h')).astype('datetime64[ns]')
+
+        return hours
+
+    # == Railway network ==============================================================================
+
+    @synthetic_table
+    def get_network(self):
+        """
+        Generate the locations (i.e. STANOX) along the lines (i.e. ELRs) of each Route.
+
+        :return: STANOX locations, with their ELRs, mileages (in yards) and coordinates
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('Network')
+
+        n_stanox = max(100, int(round(full_sizes['StanoxLocation'] * self.Scale)))
+        route_names = list(routes.keys())
+        route_weights = rng.uniform(0.6, 1.4, len(route_names))
+        route_sizes = rng.multinomial(n_stanox, route_weights / route_weights.sum())
+
+        used_elrs, networks = set(), []
+        for route_name, route_size in zip(route_names, route_sizes):
+            region, imdms, (lon0, lat0) = routes[route_name]
+
+            n_elrs = max(1, route_size // 12)
+            elr_sizes = np.diff(np.sort(np.concatenate(
+                [[0, route_size], rng.integers(0, route_size, n_elrs - 1)])))
+
+            for elr_size in elr_sizes[elr_sizes > 1]:
+                elr = ''.join(rng.choice(list(string.ascii_uppercase), 3))
+                while elr in used_elrs:
+                    elr = ''.join(rng.choice(list(string.ascii_uppercase), 3))
+                used_elrs.add(elr)
+
+                spacing = rng.uniform(1200, 5300, elr_size)  # in yards
+                yards = np.round(rng.uniform(0, 35200) + np.cumsum(spacing) - spacing[0])
+
+                # The line meanders from a random start point near the centre of the Route
+                bearings = rng.uniform(0, 2 * np.pi) + np.cumsum(rng.normal(0, 0.15, elr_size))
+                distances = np.diff(yards, prepend=yards[0]) * 0.9144  # in metres
+                lats = lat0 + rng.normal(0, 0.3) + np.cumsum(distances * np.cos(bearings)) / 111320
+                lons = lon0 + rng.normal(0, 0.45) + np.cumsum(
+                    distances * np.sin(bearings) / (111320 * np.cos(np.radians(lats))))
+
+                networks.append(pd.DataFrame({
+                    'ELR': elr, 'Yards': yards.astype(np.int64), 'Longitude': lons.round(6),
+                    'Latitude': lats.round(6), 'Route': route_name, 'Region': region,
+                    'IMDM': rng.choice(imdms)}))
+
+        network = pd.concat(networks, ignore_index=True)
+
+        network.insert(0, 'Stanox', [
+            '{:05d}'.format(x) for x in rng.choice(np.arange(10000, 90000), len(network), False)])
+        network.insert(1, 'Location', make_names(rng, len(network)))
+        network['IsStation'] = rng.random(len(network)) < 0.6
+
+        col, row = self.find_weather_cells(network.Longitude, network.Latitude)
+        network['WeatherCell'] = self.make_weather_cell_id(col, row)
+
+        return network
+
+    @staticmethod
+    def find_weather_cells(longitudes, latitudes):
+        """
+        Find the (column and row numbers of the) weather cells that contain given locations.
+
+        :param longitudes: longitudes of the locations
+        :type longitudes: numpy.ndarray or pandas.Series
+        :param latitudes: latitudes of the locations
+        :type latitudes: numpy.ndarray or pandas.Series
+        :return: column and row numbers of the weather cells
+        :rtype: tuple
+        """
+
+        col = np.floor((np.asarray(longitudes) + 8.0) / weather_cell_width).astype(np.int64)
+        row = np.floor((np.asarray(latitudes) - 49.5) / weather_cell_height).astype(np.int64)
+
+        return col, row
+
+    @staticmethod
+    def make_weather_cell_id(col, row):
+        """
+        Make IDs of weather cells from their column and row numbers.
+        """
+
+        return row * 40 + col + 1
+
+    @synthetic_table
+    def get_sections(self):
+        """
+        Generate the sections between consecutive STANOX locations (and at single locations).
+
+        :return: STANOX sections, with their start and end locations
+        :rtype: pandas.DataFrame
+        """
+
+        network = self.get_network()
+
+        same_elr = network.ELR.values[:-1] == network.ELR.values[1:]
+        start, end = np.flatnonzero(same_elr), np.flatnonzero(same_elr) + 1
+        point = np.arange(len(network))
+
+        sections = pd.DataFrame({'Start': np.concatenate([start, point]),
+                                 'End': np.concatenate([end, point])})
+        sections.sort_values(['Start', 'End'], inplace=True, ignore_index=True)
+
+        start_loc = network.iloc[sections.Start].reset_index(drop=True)
+        end_loc = network.iloc[sections.End].reset_index(drop=True)
+
+        sections['StartStanox'], sections['EndStanox'] = start_loc.Stanox, end_loc.Stanox
+        sections['StartLocation'], sections['EndLocation'] = start_loc.Location, end_loc.Location
+        sections['StanoxSection'] = sections.StartLocation.where(
+            sections.Start == sections.End, sections.StartLocation + ' - ' + sections.EndLocation)
+
+        for x in ('Longitude', 'Latitude'):
+            sections['Start' + x], sections['End' + x] = start_loc[x], end_loc[x]
+        sections['Route'], sections['IMDM'] = start_loc.Route, start_loc.IMDM
+
+        col, row = self.find_weather_cells((start_loc.Longitude + end_loc.Longitude) / 2,
+                                           (start_loc.Latitude + end_loc.Latitude) / 2)
+        sections['WeatherCell'] = self.make_weather_cell_id(col, row)
+
+        sections.index = pd.RangeIndex(1, len(sections) + 1, name='StanoxSectionId')
+        sections['LocationId'] = sections.index + 100000
+
+        return sections
+
+    # == METEx ========================================================================================
+
+    @synthetic_table
+    def get_imdm(self):
+        """
+        Generate the table 'IMDM'.
+
+        :return: synthetic data of the table 'IMDM'
+        :rtype: pandas.DataFrame
+        """
+
+        imdm = pd.DataFrame(
+            [(imdm, route_name, region) for route_name, (region, imdms, _) in routes.items()
+             for imdm in imdms],
+            columns=['IMDM', 'Route', 'Region']).set_index('IMDM')
+
+        return imdm
+
+    @synthetic_table
+    def get_incident_reason_info(self):
+        """
+        Generate the table 'IncidentReasonInfo' (with extra information).
+
+        :return: synthetic data of the table 'IncidentReasonInfo'
+        :rtype: pandas.DataFrame
+        """
+
+        incident_reason_info = pd.DataFrame.from_dict(
+            incident_reasons, orient='index',
+            columns=['IncidentReasonName', 'IncidentReasonDescription', 'IncidentCategory',
+                     'IncidentCategoryDescription'])
+        incident_reason_info.index.name = 'IncidentReasonCode'
+
+        incident_reason_info['IncidentCategoryGroupDescription'] = \
+            incident_reason_info.IncidentCategoryDescription
+        incident_reason_info['IncidentCategorySuperGroupCode'] = np.where(
+            incident_reason_info.index.str[0].isin(['I', 'J', 'X', 'Q']), 'NR', 'TOC')
+        incident_reason_info['IncidentJPIPCategory'] = np.where(
+            incident_reason_info.index.str[0] == 'X', 'External', 'Internal')
+
+        return incident_reason_info
+
+    @synthetic_table
+    def get_stanox_location(self):
+        """
+        Generate the table 'StanoxLocation' (with mileages in Network Rail format).
+
+        :return: synthetic data of the table 'StanoxLocation'
+        :rtype: pandas.DataFrame
+        """
+
+        network = self.get_network()
+        point_sections = self.get_sections().query('Start == End')
+
+        stanox_location = pd.DataFrame({
+            'Location': network.Location.values,
+            'LocationAlias': network.Location.str.upper().values,
+            'ELR': network.ELR.values,
+            'Yards': network.Yards.values,
+            'Mileage': yards_to_nr_mileage_strs(network.Yards),
+            'LocationId': point_sections.LocationId.values,
+        }, index=pd.Index(network.Stanox.values, name='Stanox'))
+
+        return stanox_location
+
+    @synthetic_table
+    def get_stanox_section(self):
+        """
+        Generate the table 'StanoxSection'.
+
+        :return: synthetic data of the table 'StanoxSection'
+        :rtype: pandas.DataFrame
+        """
+
+        stanox_section = self.get_sections()[
+            ['LocationId', 'StanoxSection', 'StartLocation', 'StartStanox', 'EndLocation',
+             'EndStanox']].copy()
+        stanox_section['ApproximateLocation'] = None
+
+        return stanox_section
+
+    @synthetic_table
+    def get_location(self):
+        """
+        Generate the table 'Location'.
+
+        :return: synthetic data of the table 'Location'
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('Location')
+
+        sections = self.get_sections()
+
+        location = sections[['StartLongitude', 'StartLatitude', 'EndLongitude', 'EndLatitude',
+                             'WeatherCell']].copy()
+        location['SMDCell'] = rng.integers(1, 200, len(location))
+        location['IMDM'] = sections.IMDM.values
+        location.index = pd.Index(sections.LocationId.values, name='LocationId')
+
+        return location
+
+    @synthetic_table
+    def get_station_locations(self):
+        """
+        Generate the station locations (see ``pyrcs.other_assets.Stations``).
+
+        :return: station names and coordinates
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('Stations')
+
+        stations = self.get_network().query('IsStation')
+
+        station_locations = pd.DataFrame({
+            'Station': stations.Location.values,
+            'Degrees Longitude': (stations.Longitude + rng.normal(0, 0.001, len(stations))).values,
+            'Degrees Latitude': (stations.Latitude + rng.normal(0, 0.001, len(stations))).values})
+
+        return station_locations
+
+    @synthetic_table
+    def get_weather_cell(self):
+        """
+        Generate the table 'WeatherCell' (merged with the IMDM weather cell map).
+
+        :return: synthetic data of the table 'WeatherCell'
+        :rtype: pandas.DataFrame
+        """
+
+        sections = self.get_sections()
+
+        weather_cell = sections.groupby('WeatherCell').agg(
+            {'Route': lambda x: x.mode()[0], 'IMDM': lambda x: x.mode()[0]})
+        weather_cell.index.name = 'WeatherCellId'
+        weather_cell.insert(0, 'IMDMWeatherCellMapId', np.arange(1, len(weather_cell) + 1))
+
+        row, col = np.divmod(weather_cell.index.values - 1, 40)
+        weather_cell['Longitude'] = col * weather_cell_width - 8.0
+        weather_cell['Latitude'] = row * weather_cell_height + 49.5
+        weather_cell['width'], weather_cell['height'] = weather_cell_width, weather_cell_height
+
+        corners = {
+            'll': (weather_cell.Longitude, weather_cell.Latitude),
+            'ul': (weather_cell.Longitude, weather_cell.Latitude + weather_cell_height),
+            'ur': (weather_cell.Longitude + weather_cell_width,
+                   weather_cell.Latitude + weather_cell_height),
+            'lr': (weather_cell.Longitude + weather_cell_width, weather_cell.Latitude),
+        }
+        for k, (lon, lat) in corners.items():
+            weather_cell[k + '_Longitude'], weather_cell[k + '_Latitude'] = lon, lat
+        weather_cell['Polygon_WGS84'] = [
+            shapely.geometry.Polygon(x) for x in zip(*[zip(*v) for v in corners.values()])]
+
+        for k, (lon, lat) in corners.items():
+            weather_cell[k + '_Easting'], weather_cell[k + '_Northing'] = wgs84_to_osgb36(
+                lon.values, lat.values)
+        weather_cell['Polygon_OSGB36'] = [
+            shapely.geometry.Polygon(x) for x in zip(*[zip(
+                weather_cell[k + '_Easting'], weather_cell[k + '_Northing']) for k in corners])]
+
+        weather_cell['Region'] = weather_cell.Route.map(lambda x: routes[x][0])
+
+        return weather_cell
+
+    def get_weather(self, weather_cell_id):
+        """
+        Generate the hourly weather observations in a weather cell (i.e. part of the table
+        'Weather').
+
+        :param weather_cell_id: weather cell ID
+        :type weather_cell_id: int
+        :return: synthetic weather data of the weather cell
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('Weather', weather_cell_id)
+
+        hours = self.get_hours()
+        n = len(hours)
+
+        latitude = (weather_cell_id - 1) // 40 * weather_cell_height + 49.5
+        day_of_year = (hours - hours.astype('datetime64[Y]')).astype('timedelta64[D]').astype(
+            np.int64)
+        hour_of_day = (hours - hours.astype('datetime64[D]')).astype('timedelta64[h]').astype(
+            np.int64)
+        season = np.cos(2 * np.pi * (day_of_year - 15) / 365.25)  # 1 in winter, -1 in summer
+
+        temperature = 10.5 - 1.2 * (latitude - 52) - 6.5 * season - 3.5 * np.cos(
+            2 * np.pi * (hour_of_day - 3) / 24) + 2.5 * smooth_noise(rng, n, 72)
+
+        wetness = smooth_noise(rng, n, 8)
+        total_precipitation = np.where(wetness > 0.9, rng.exponential(1.2, n) * (wetness - 0.9), 0)
+        snowfall = np.where(temperature < 1.0, total_precipitation * 10, 0)
+
+        wind_speed = np.exp(1.6 + 0.25 * season + 0.45 * smooth_noise(rng, n, 24))
+        wind_gust = wind_speed * rng.uniform(1.3, 1.8, n)
+        wind_direction = (225 + 70 * smooth_noise(rng, n, 36)) % 360
+
+        relative_humidity = np.clip(
+            78 + 8 * np.cos(2 * np.pi * (hour_of_day - 3) / 24) + 12 * np.tanh(wetness) +
+            5 * rng.standard_normal(n), 20, 100)
+
+        weather = pd.DataFrame({
+            'WeatherCell': weather_cell_id,
+            'DateTime': hours,
+            'Temperature': temperature.round(1),
+            'RelativeHumidity': relative_humidity.round(1),
+            'WindSpeed': wind_speed.round(1),
+            'WindGust': wind_gust.round(1),
+            'WindDirection': wind_direction.round(0),
+            'Snowfall': snowfall.round(2),
+            'TotalPrecipitation': total_precipitation.round(2),
+        })
+
+        # Soil moisture indices (of four levels) respond more slowly at deeper levels
+        for i, span in enumerate((24, 96, 384, 1536), start=1):
+            moisture = pd.Series(total_precipitation).ewm(alpha=1 / span, adjust=False).mean()
+            weather['SMILevel{}'.format(i)] = np.clip(0.55 + 4 * moisture - 0.2 * np.clip(
+                temperature - 15, 0, None) / 10, 0, 1).round(3)
+
+        return weather
+
+    def sample_weather_hours(self, weather, weather_category, size):
+        """
+        Sample the hours (of a weather cell) at which weather-related incidents occurred.
+
+        The hours are sampled with probabilities that depend on the weather conditions, e.g.
+        incidents attributed to wind are more likely to occur when the gusts are strong.
+
+        :param weather: weather data of a weather cell (see :py:meth:`SyntheticData.get_weather`)
+        :type weather: pandas.DataFrame
+        :param weather_category: weather category
+        :type weather_category: str
+        :param size: number of hours
+        :type size: int
+        :return: sampled hours
+        :rtype: numpy.ndarray
+        """
+
+        rng = self.make_rng('WeatherHours', weather.WeatherCell.iloc[0], weather_category)
+
+        if weather_category == 'Wind':
+            weights = weather.WindGust ** 4
+        elif weather_category == 'Heat':
+            weights = np.exp((weather.Temperature - 22) / 2)
+        elif weather_category in ('Snow', 'Flooding'):
+            weights = weather.TotalPrecipitation * (
+                (weather.Temperature < 1) if weather_category == 'Snow' else 1) + 1e-6
+        elif weather_category == 'Cold':
+            weights = np.exp(-weather.Temperature / 2)
+        elif weather_category == 'Lightning':
+            weights = weather.TotalPrecipitation * (weather.Temperature > 12) + 1e-6
+        elif weather_category == 'Fog':
+            weights = np.exp((weather.RelativeHumidity - 100) / 3 - weather.WindSpeed)
+        else:  # 'Adhesion' (i.e. leaf fall) in autumn
+            weights = weather.DateTime.dt.month.isin([10, 11]) + 0.05
+
+        weights = weights.to_numpy(dtype=np.float64)
+        hours = rng.choice(weather.DateTime.values, size, p=weights / weights.sum())
+
+        return hours
+
+    @synthetic_table
+    def get_trust_incident(self):
+        """
+        Generate the table 'TrustIncident' (along with the weather categories of the incidents).
+
+        Incidents are concentrated on some of the sections; and the incidents that are attributed
+        to weather occur when the relevant weather conditions are severe.
+
+        :return: synthetic data of the table 'TrustIncident'
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('TrustIncident')
+
+        sections = self.get_sections()
+
+        n = max(1000, int(round(full_sizes['TrustIncident'] * self.Scale)))
+
+        # Incidents at some sections are far more frequent than at the others
+        section_weights = 1 / rng.permutation(np.arange(1, len(sections) + 1)) ** 1.1
+        section_pos = rng.choice(len(sections), n, p=section_weights / section_weights.sum())
+
+        categories = list(weather_categories.keys())
+        category_weights = np.array([v[0] for v in weather_categories.values()])
+        weather_category = np.where(
+            rng.random(n) < weather_related_proportion,
+            rng.choice(categories, n, p=category_weights / category_weights.sum()), '')
+
+        start_dates = self.StartDate.to_datetime64() + rng.integers(
+            0, int((self.EndDate - self.StartDate).total_seconds() // 60), n).astype(
+            'timedelta64[m]')
+
+        weather_cell = sections.WeatherCell.values[section_pos]
+        weather_related = pd.DataFrame({'WeatherCell': weather_cell, 'WeatherCategory':
+                                        weather_category}).query('WeatherCategory != ""')
+        for cell_id, cell_dat in weather_related.groupby('WeatherCell'):
+            weather = self.get_weather(cell_id)
+            for category, dat in cell_dat.groupby('WeatherCategory'):
+                start_dates[dat.index.values] = self.sample_weather_hours(
+                    weather, category, len(dat)) + rng.integers(0, 60, len(dat)).astype(
+                    'timedelta64[m]')
+
+        start_dates = pd.DatetimeIndex(start_dates)
+        durations = pd.to_timedelta(np.ceil(rng.lognormal(3.8, 1.0, n)), unit='m')
+
+        trust_incident = pd.DataFrame({
+            'FinancialYear': start_dates.year - (start_dates.month < 4),
+            'Period': (start_dates.month - 4) % 12 + 1,
+            'StanoxSectionId': sections.index.values[section_pos],
+            'IMDM': sections.IMDM.values[section_pos],
+            'TrainId': rng.integers(100000, 999999, n),
+            'TrainCode': [
+                '{}{}{:02d}'.format(a, b, c) for a, b, c in zip(
+                    rng.integers(1, 10, n), rng.choice(list(string.ascii_uppercase), n),
+                    rng.integers(0, 100, n))],
+            'StartDate': start_dates,
+            'EndDate': start_dates + durations,
+            'IncidentDescription': np.where(
+                weather_category == '', 'Delay at ' + sections.StanoxSection.values[section_pos],
+                np.char.add(weather_category.astype(str), ' affecting the line')),
+            'SourceLocationId': sections.LocationId.values[section_pos],
+            'WeatherCategory': weather_category,
+        })
+        trust_incident.sort_values('StartDate', inplace=True, ignore_index=True)
+        trust_incident.index = pd.RangeIndex(1000001, 1000001 + n, name='TrustIncidentId')
+
+        return trust_incident
+
+    @synthetic_table
+    def get_incident_record(self):
+        """
+        Generate the table 'IncidentRecord'.
+
+        :return: synthetic data of the table 'IncidentRecord'
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('IncidentRecord')
+
+        trust_incident = self.get_trust_incident()
+
+        # Most of the TRUST incidents have only one incident record
+        n_records = 1 + rng.poisson(0.16, len(trust_incident))
+        trust_incident = trust_incident.loc[trust_incident.index.repeat(n_records)]
+
+        reason_codes = rng.choice(non_weather_reason_codes, len(trust_incident))
+        for category, (_, codes) in weather_categories.items():
+            idx = np.flatnonzero(trust_incident.WeatherCategory.values == category)
+            reason_codes[idx] = rng.choice(codes, len(idx))
+
+        incident_record = pd.DataFrame({
+            'TrustIncidentId': trust_incident.index.values,
+            'IncidentDuration': (trust_incident.EndDate - trust_incident.StartDate).dt.seconds.values
+            // 60,
+            'IncidentReasonCode': reason_codes,
+            'WeatherCategory': trust_incident.WeatherCategory.values,
+            'IncidentRecordCreateDate': (trust_incident.StartDate + pd.to_timedelta(
+                rng.integers(1, 180, len(trust_incident)), unit='m')).values,
+        }, index=pd.RangeIndex(5000001, 5000001 + len(trust_incident), name='IncidentRecordId'))
+
+        return incident_record
+
+    @synthetic_table
+    def get_pfpi(self):
+        """
+        Generate the table 'PfPI' (with the names of the performance events).
+
+        :return: synthetic data of the table 'PfPI'
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('PfPI')
+
+        incident_record = self.get_incident_record()
+
+        n_pfpi = 1 + rng.poisson(0.07, len(incident_record))
+        incident_record_id = incident_record.index.repeat(n_pfpi)
+        n = len(incident_record_id)
+
+        event_codes = list(performance_events.keys())
+        event_weights = np.array([v[0] for v in performance_events.values()])
+        performance_event_code = rng.choice(event_codes, n, p=event_weights / event_weights.sum())
+
+        pfpi_minutes = np.ceil(rng.lognormal(2.0, 1.2, n))
+        pfpi_costs = (pfpi_minutes * rng.lognormal(4.3, 0.4, n)).round(2)
+
+        pfpi = pd.DataFrame({
+            'IncidentRecordId': incident_record_id,
+            'PerformanceEventCode': performance_event_code,
+            'PfPIMinutes': pfpi_minutes,
+            'PfPICosts': pfpi_costs,
+            'PerformanceEventGroup': [performance_events[x][1] for x in performance_event_code],
+            'PerformanceEventName': [performance_events[x][2] for x in performance_event_code],
+        }, index=pd.RangeIndex(9000001, 9000001 + n, name='PfPIId'))
+
+        return pfpi
+
+    # == Vegetation ===================================================================================
+
+    @synthetic_table
+    def get_furlong_location(self):
+        """
+        Generate the table 'FurlongLocation' (with the relevant columns only).
+
+        Each line (i.e. ELR) is divided into furlongs (i.e. 220 yards).
+
+        :return: synthetic data of the table 'FurlongLocation'
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('FurlongLocation')
+
+        elrs = self.get_network().groupby('ELR', sort=False).agg(
+            {'Yards': ['min', 'max'], 'Route': 'first', 'IMDM': 'first'})
+        elrs.columns = ['StartYards', 'EndYards', 'Route', 'DU']
+
+        n_furlongs = ((elrs.EndYards - elrs.StartYards) // 220 + 1).values
+        start_yards = np.concatenate([
+            np.arange(s, s + 220 * k, 220) for s, k in zip(elrs.StartYards.values, n_furlongs)])
+
+        furlong_location = pd.DataFrame({
+            'Route': elrs.Route.values.repeat(n_furlongs),
+            'RouteAlias': elrs.Route.str.upper().values.repeat(n_furlongs),
+            'DU': elrs.DU.values.repeat(n_furlongs),
+            'ELR': elrs.index.values.repeat(n_furlongs),
+            'StartMileage': yards_to_nr_mileage_strs(start_yards),
+            'EndMileage': yards_to_nr_mileage_strs(start_yards + 220),
+            'Electrified': (rng.random(len(elrs)) < 0.4).astype(int).repeat(n_furlongs),
+            'HazardOnly': (rng.random(len(start_yards)) < 0.03).astype(int),
+        }, index=pd.RangeIndex(1, len(start_yards) + 1, name='FurlongID'))
+
+        furlong_location['StartYards'] = start_yards
+
+        return furlong_location
+
+    @synthetic_table
+    def get_furlong_data(self):
+        """
+        Generate the table 'FurlongData'.
+
+        :return: synthetic data of the table 'FurlongData'
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('FurlongData')
+
+        furlong_location = self.get_furlong_location()
+        n = len(furlong_location)
+
+        furlong_data = pd.DataFrame({
+            'FurlongID': furlong_location.index.values,
+            'StructuredPlantNumber': [
+                'VF{:<4}{:03d}{:04d}'.format(elr, yards // 1760, yards % 1760)
+                for elr, yards in zip(furlong_location.ELR, furlong_location.StartYards)],
+            'AssetNumber': np.arange(200001, 200001 + n),
+            'Route': furlong_location.Route.values,
+            'DU': furlong_location.DU.values,
+            'ELR': furlong_location.ELR.values,
+            'StartMileage': furlong_location.StartMileage.values,
+            'EndMileage': furlong_location.EndMileage.values,
+            'DateOfMeasure': pd.Timestamp('2011-04-01') + pd.to_timedelta(
+                rng.integers(0, 3 * 365 * 24, n), unit='h'),
+            'CuttingAngle': rng.integers(1, 6, n),
+            'CuttingDepth': rng.integers(1, 6, n),
+        })
+
+        for col in tef_score_columns:
+            furlong_data[col] = rng.integers(0, 4, n)
+
+        # Vegetation is clustered along the lines, with the rest being open space and others
+        vegetation = np.clip(smooth_noise(rng, n, 20) * 0.35 + 0.3, 0, 1)
+        species = rng.dirichlet(np.full(len(cover_percent_columns) - 2, 0.3), n)
+        cover_percents = np.floor(species * vegetation[:, None] * 1000) / 10
+        open_space = np.floor((100 - cover_percents.sum(axis=1)) * rng.uniform(0.5, 1, n) * 10) / 10
+        other = (100 - cover_percents.sum(axis=1) - open_space).round(1)
+        furlong_data[cover_percent_columns] = np.column_stack([cover_percents, open_space, other])
+
+        furlong_data['TreeNumberUp'] = rng.poisson(vegetation * 40)
+        furlong_data['TreeNumberDown'] = rng.poisson(vegetation * 40)
+
+        return furlong_data
+
+    @synthetic_table
+    def get_hazard_tree(self):
+        """
+        Generate the table 'HazardTree'.
+
+        :return: synthetic data of the table 'HazardTree'
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('HazardTree')
+
+        furlong_location = self.get_furlong_location()
+        network = self.get_network()
+
+        # Hazardous trees are found at about one in three furlongs, but clustered
+        n_trees = rng.poisson(np.clip(smooth_noise(rng, len(furlong_location), 10), 0, None) * 0.6)
+        furlongs = furlong_location.loc[furlong_location.index.repeat(n_trees)]
+        n = len(furlongs)
+
+        yards = furlongs.StartYards.values + rng.integers(0, 220, n)
+
+        # Locate the trees by interpolating the coordinates of the STANOX locations on the ELR
+        lons, lats = np.empty(n), np.empty(n)
+        for elr, idx in pd.Series(np.arange(n)).groupby(furlongs.ELR.values):
+            elr_locs = network[network.ELR == elr]
+            lons[idx.values] = np.interp(yards[idx.values], elr_locs.Yards, elr_locs.Longitude)
+            lats[idx.values] = np.interp(yards[idx.values], elr_locs.Yards, elr_locs.Latitude)
+        eastings, northings = wgs84_to_osgb36(lons, lats)
+        eastings, northings = eastings + rng.normal(0, 10, n), northings + rng.normal(0, 10, n)
+
+        hazard_tree = pd.DataFrame({
+            'Haztreeid': np.arange(1, n + 1),
+            'FurlongID': furlongs.index.values,
+            'Route': furlongs.Route.values,
+            'DU': furlongs.DU.values,
+            'ELR': furlongs.ELR.values,
+            'Mileage': yards_to_nr_mileage_strs(yards),
+            'Treespecies': pd.Categorical(rng.choice(tree_species, n)),
+            'TreeheightM': rng.gamma(4, 3.5, n).round(1),
+            'TreediameterM': rng.gamma(3, 0.15, n).round(2),
+            'TreeproxrailM': rng.uniform(1, 30, n).round(1),
+            'Treeprox3py': rng.uniform(0, 50, n).round(1),
+            'TreeAgeCatID': rng.integers(1, 8, n),
+            'TreeSizeCatID': rng.integers(1, 6, n),
+            'Northing': northings.round(0),
+            'Easting': eastings.round(0),
+            'Failure_Score': rng.binomial(5, 0.3, n).astype(np.int8),
+            'Target_Score': rng.binomial(6, 0.3, n).astype(np.int8),
+            'Impact_Score': rng.binomial(4, 0.3, n).astype(np.int8),
+        })
+
+        for col in work_req_columns:
+            hazard_tree[col] = rng.random(n) < 0.15
+
+        hazard_tree['Longitude'], hazard_tree['Latitude'] = osgb36_to_wgs84(
+            hazard_tree.Easting.values, hazard_tree.Northing.values)
+
+        return hazard_tree
+
+    @synthetic_table
+    def get_vegetation_lookups(self):
+        """
+        Generate the lookup tables of the classes of cutting angles/depths and tree ages/sizes.
+
+        :return: names and data of the lookup tables
+        :rtype: dict
+        """
+
+        descriptions = {
+            'CuttingAngleClass': ['Flat', 'Shallow', 'Moderate', 'Steep', 'Vertical'],
+            'CuttingDepthClass': ['At grade', '<2m', '2-5m', '5-10m', '>10m'],
+            'TreeAgeClass': ['Y-Young', 'SM-Semi Mature', 'EM-Early Mature', 'M-Mature',
+                             'LM-Late Mature', 'OM-Over Mature', 'VT-Veteran'],
+            'TreeSizeClass': ['S-Small (S)', 'M-Medium (M)', 'L-Large (L)', 'XL-Extra Large (XL)',
+                              'VL-Very Large (VL)'],
+        }
+
+        vegetation_lookups = {
+            k: pd.DataFrame({'Description': v}, index=pd.RangeIndex(1, len(v) + 1, name='Id'))
+            for k, v in descriptions.items()}
+
+        return vegetation_lookups
+
+    # == MIDAS RADTOB and UKCP09 ======================================================================
+
+    @synthetic_table
+    def get_radiation_stations(self):
+        """
+        Generate the information of the meteorological stations that report radiation values.
+
+        :return: synthetic information of the radiation stations
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('MetStations')
+
+        n = max(len(routes), int(round(full_sizes['MetStations'] * self.Scale)))
+        route_names = rng.permutation(np.resize(list(routes.keys()), n))
+
+        centres = np.array([routes[x][2] for x in route_names])
+        longitudes = centres[:, 0] + rng.normal(0, 0.4, n)
+        latitudes = centres[:, 1] + rng.normal(0, 0.3, n)
+
+        rad_stn = pd.DataFrame({
+            'StationName': [x.upper() for x in make_names(rng, n, suffixes=('',))],
+            'Route': route_names,
+            'Latitude': latitudes.round(4),
+            'Longitude': longitudes.round(4),
+            'StationStartDate': pd.Timestamp('1990-01-01'),
+        }, index=pd.Index(rng.choice(np.arange(100, 60000), n, False), name='SRC_ID'))
+
+        rad_stn['Easting'], rad_stn['Northing'] = wgs84_to_osgb36(
+            rad_stn.Longitude.values, rad_stn.Latitude.values)
+        rad_stn['EN_GEOM'] = [
+            shapely.geometry.Point(xy) for xy in zip(rad_stn.Easting, rad_stn.Northing)]
+
+        rad_stn.sort_index(inplace=True)
+
+        return rad_stn
+
+    def get_radtob(self, src_id):
+        """
+        Generate the hourly and daily radiation observations of a met station (i.e. part of the
+        table 'MIDAS_RADTOB').
+
+        :param src_id: ID of a met station
+        :type src_id: int
+        :return: synthetic radiation data of the met station
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('RADTOB', src_id)
+
+        hours = self.get_hours()
+        n = len(hours)
+
+        day_of_year = (hours - hours.astype('datetime64[Y]')).astype('timedelta64[D]').astype(
+            np.int64)
+        hour_of_day = (hours - hours.astype('datetime64[D]')).astype('timedelta64[h]').astype(
+            np.int64)
+
+        # Global irradiation amount (KJ/sq m) peaks at noon in summer, and is 0 at night
+        day_length = 12 - 4.5 * np.cos(2 * np.pi * (day_of_year + 10) / 365.25)
+        sun = np.clip(np.cos(np.pi * (hour_of_day - 12.5) / day_length), 0, None)
+        cloud = np.clip(0.65 + 0.3 * smooth_noise(rng, n, 12), 0.05, 1)
+        glbl_irad_amt = (3200 * sun * cloud).round(0)
+
+        hourly = pd.DataFrame({
+            'SRC_ID': src_id,
+            'OB_END_DATE_TIME': hours + np.timedelta64(1, 'h'),
+            'OB_HOUR_COUNT': 1,
+            'VERSION_NUM': 1,
+            'GLBL_IRAD_AMT': glbl_irad_amt,
+        })
+
+        daily = hourly.groupby(hourly.OB_END_DATE_TIME.values.astype('datetime64[D]')).agg(
+            {'GLBL_IRAD_AMT': 'sum'})
+        daily = pd.DataFrame({
+            'SRC_ID': src_id,
+            'OB_END_DATE_TIME': daily.index + pd.Timedelta(hours=23),
+            'OB_HOUR_COUNT': 24,
+            'VERSION_NUM': 1,
+            'GLBL_IRAD_AMT': daily.GLBL_IRAD_AMT.values,
+        })
+
+        radtob = pd.concat([hourly, daily], ignore_index=True).sort_values(
+            ['OB_END_DATE_TIME', 'OB_HOUR_COUNT'], ignore_index=True)
+        radtob.insert(1, 'OB_END_DATE', radtob.OB_END_DATE_TIME.dt.date)
+
+        return radtob
+
+    @synthetic_table
+    def get_radtob_suppl(self):
+        """
+        Generate the supplementary (daily) radiation data, for one met station of each Route.
+
+        :return: synthetic data of the table 'MIDAS_RADTOB_suppl'
+        :rtype: pandas.DataFrame
+        """
+
+        rad_stn = self.get_radiation_stations()
+
+        suppl = []
+        for route_name, src_id in rad_stn.reset_index().groupby('Route').SRC_ID.first().items():
+            radtob = self.get_radtob(src_id)
+            radtob = radtob[radtob.OB_HOUR_COUNT == 24]
+            suppl.append(pd.DataFrame({
+                'SRC_ID': src_id, 'OB_END_DATE': radtob.OB_END_DATE.values, 'OB_HOUR_COUNT': 24,
+                'GLBL_IRAD_AMT': radtob.GLBL_IRAD_AMT.values, 'Route': route_name}))
+
+        return pd.concat(suppl, ignore_index=True)
+
+    @synthetic_table
+    def get_observation_grids(self):
+        """
+        Generate the UKCP09 observation grids (5km x 5km) along the lines.
+
+        :return: synthetic data of the observation grids
+        :rtype: pandas.DataFrame
+        """
+
+        network = self.get_network()
+
+        # Sample the lines every ~500 metres, and find the grids that contain the points
+        points = []
+        for _, elr_locs in network.groupby('ELR'):
+            yards = np.arange(elr_locs.Yards.min(), elr_locs.Yards.max() + 1, 550)
+            points.append(np.column_stack([np.interp(yards, elr_locs.Yards, elr_locs.Longitude),
+                                           np.interp(yards, elr_locs.Yards, elr_locs.Latitude)]))
+        points = np.concatenate(points)
+
+        eastings, northings = wgs84_to_osgb36(points[:, 0], points[:, 1])
+        centroids = np.unique(np.column_stack(
+            [eastings // 5000 * 5000 + 2500, northings // 5000 * 5000 + 2500]), axis=0)
+        centroids = [tuple(x) for x in centroids]
+
+        long_lat = [osgb36_to_wgs84(x, y) for x, y in centroids]
+
+        observation_grids = pd.DataFrame({
+            'Centroid': centroids,
+            'Centroid_XY': [shapely.geometry.Point(x) for x in centroids],
+            'Centroid_LongLat': [shapely.geometry.Point(x) for x in long_lat],
+            'Grid': [shapely.geometry.box(x - 2500, y - 2500, x + 2500, y + 2500)
+                     for x, y in centroids]})
+        observation_grids.index.name = 'Pseudo_Grid_ID'
+
+        return observation_grids
+
+    def get_ukcp09(self, pseudo_grid_id):
+        """
+        Generate the daily gridded weather observations of an observation grid (i.e. part of the
+        table 'UKCP09').
+
+        :param pseudo_grid_id: (pseudo) ID of an observation grid
+        :type pseudo_grid_id: int
+        :return: synthetic UKCP09 data of the observation grid
+        :rtype: pandas.DataFrame
+        """
+
+        rng = self.make_rng('UKCP09', pseudo_grid_id)
+
+        centroid_x, centroid_y = self.get_observation_grids().Centroid[pseudo_grid_id]
+
+        dates = pd.date_range('2006-01-01', self.EndDate.normalize())
+        n = len(dates)
+
+        season = np.cos(2 * np.pi * (dates.dayofyear.values - 15) / 365.25)
+        mean_temperature = 10.5 - (centroid_y - 250000) / 90000 - 6.5 * season + \
+            2.0 * smooth_noise(rng, n, 3)
+        temperature_range = np.clip(8 - 2 * season + 1.5 * rng.standard_normal(n), 1, None)
+
+        wetness = smooth_noise(rng, n, 2)
+        precipitation = np.where(wetness > 0.3, rng.exponential(4, n) * (wetness - 0.3), 0)
+
+        ukcp09 = pd.DataFrame({
+            'Pseudo_Grid_ID': pseudo_grid_id,
+            'Date': dates.date,
+            'Maximum_Temperature': (mean_temperature + temperature_range / 2).round(2),
+            'Minimum_Temperature': (mean_temperature - temperature_range / 2).round(2),
+            'Precipitation': precipitation.round(2),
+            'Centroid_X': centroid_x,
+            'Centroid_Y': centroid_y,
+        })
+
+        return ukcp09
+
+    # == Installation =================================================================================
+
+    def get_table_pickles(self):
+        """
+        Get the tables that are cached as pickle files by the pipeline.
+
+        The paths are relative to the current working directory (as they are read by the pipeline).
+
+        :return: paths to the pickle files and the corresponding tables
+        :rtype: dict
+        """
+
+        metex, vegetation = preprocessor.METExLite(), preprocessor.Vegetation()
+
+        trust_incident = self.get_trust_incident().drop(columns='WeatherCategory')
+        furlong_location = self.get_furlong_location().drop(columns='StartYards')
+
+        table_pickles = {
+            metex.cdd_tables("IMDM.pickle"): self.get_imdm(),
+            metex.cdd_tables("IncidentReasonInfo-plus.pickle"): self.get_incident_reason_info(),
+            metex.cdd_tables("IncidentRecord-amended.pickle"): self.get_incident_record(),
+            metex.cdd_tables("Location.pickle"): self.get_location(),
+            metex.cdd_tables("PfPI-plus-amended.pickle"): self.get_pfpi(),
+            metex.cdd_tables("StanoxLocation-mileage.pickle"): self.get_stanox_location(),
+            metex.cdd_tables("StanoxSection.pickle"): self.get_stanox_section(),
+            metex.cdd_tables("TrustIncident-y2006-y2018-amended.pickle"): trust_incident,
+            metex.cdd_tables("WeatherCell.pickle"): self.get_weather_cell(),
+            vegetation.cdd_tables("FurlongData.pickle"): self.get_furlong_data(),
+            vegetation.cdd_tables("FurlongLocation-cut.pickle"): furlong_location,
+            vegetation.cdd_tables("HazardTree.pickle"): self.get_hazard_tree(),
+            preprocessor.MIDAS().cdd("radiation-stations-information.pickle"):
+                self.get_radiation_stations(),
+            preprocessor.UKCP09().cdd("observation-grids.pickle"): self.get_observation_grids(),
+        }
+
+        for table_name, table in self.get_vegetation_lookups().items():
+            table_pickles[vegetation.cdd_tables(table_name + ".pickle")] = table
+
+        return table_pickles
+
+    @staticmethod
+    def get_lookups():
+        """
+        Get the lookups (of the names of Routes and weather categories) that are saved as .json
+        files.
+
+        The paths are relative to the current working directory (as they are read by the pipeline).
+
+        :return: paths to the .json files and the corresponding lookups
+        :rtype: dict
+        """
+
+        route_name_changes = {x: x for x in routes}
+        route_name_changes.update({x.upper(): x for x in routes})
+
+        lookups = {
+            cdd_network("routes", "name-changes.json"): route_name_changes,
+            cdd_weather("weather-categories.json"): {'WeatherCategory': list(weather_categories)},
+        }
+
+        return lookups
+
+    def connect(self):
+        """
+        Establish a connection to the SQLite database, in which the schema 'dbo' holds the tables
+        that are queried by the pipeline.
+
+        :return: a connection to the SQLite database
+        :rtype: sqlite3.Connection
+        """
+
+        conn = sqlite3.connect(
+            ':memory:', detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        conn.execute("ATTACH DATABASE ? AS dbo", (self.DatabasePath,))
+
+        return conn
+
+    def create_database(self, verbose=False):
+        """
+        Create the SQLite database of the tables 'Weather', 'UKCP09', 'MIDAS_RADTOB' and
+        'MIDAS_RADTOB_suppl'.
+
+        :param verbose: whether to print relevant information in console, defaults to ``False``
+        :type verbose: bool
+        """
+
+        if os.path.isfile(self.DatabasePath):
+            os.remove(self.DatabasePath)
+
+        conn = sqlite3.connect(self.DatabasePath)
+
+        tables = {
+            'Weather': (self.get_weather, self.get_weather_cell().index,
+                        ['WeatherCell', 'DateTime']),
+            'UKCP09': (self.get_ukcp09, self.get_observation_grids().index,
+                       ['Pseudo_Grid_ID', 'Date']),
+            'MIDAS_RADTOB': (self.get_radtob, self.get_radiation_stations().index,
+                             ['SRC_ID', 'OB_END_DATE_TIME']),
+        }
+
+        for table_name, (get_table, keys, index_cols) in tables.items():
+            if verbose:
+                print("Creating the table \"{}\"".format(table_name), end=" ... ")
+
+            for key in keys:
+                table = get_table(key)
+
+                # Format date/times all at once (rather than one by one in .to_sql())
+                dtype = {}
+                for col in table.select_dtypes('datetime').columns:
+                    table[col] = np.char.replace(
+                        np.datetime_as_string(table[col].values, unit='s'), 'T', ' ')
+                    dtype[col] = 'TIMESTAMP'
+
+                table.to_sql(table_name, conn, if_exists='append', index=False, dtype=dtype,
+                             chunksize=100000)
+            conn.execute('CREATE INDEX [{0}_index] ON [{0}] ({1})'.format(
+                table_name, ', '.join('[{}]'.format(x) for x in index_cols)))
+            conn.commit()
+
+            if verbose:
+                print("Done.")
+
+        self.get_radtob_suppl().to_sql('MIDAS_RADTOB_suppl', conn, index=False)
+
+        conn.commit()
+        conn.close()
+
+    def make_data_source(self, name, **kwargs):
+        """
+        Create a data source that reads the synthetic data.
+
+        :param name: name of the data source, e.g. ``'METExLite'``
+        :type name: str
+        :param kwargs: parameters of the class of the data source
+        :return: an instance of the data source
+        """
+
+        data_source = getattr(preprocessor, name)(**kwargs)
+
+        data_source.DatabaseConn = self.connect()
+        if name == 'METExLite':
+            data_source.StationCode = SyntheticStations(self.get_station_locations())
+
+        return data_source
+
+    def install(self, path_to_dir, verbose=False):
+        """
+        Install the synthetic data in a new (or empty) directory, and make the data sources
+        (see :py:func:`utils.get_data_source`) read it.
+
+        The pipeline reads the data relative to the current working directory, so it should run in
+        ``path_to_dir`` (e.g. see :py:func:`benchmarker.harness.working_directory`).
+
+        :param path_to_dir: directory where the synthetic data is installed, which must be either
+            new or empty (see :py:func:`make_install_dir`)
+        :type path_to_dir: str
+        :param verbose: whether to print relevant information in console, defaults to ``False``
+        :type verbose: bool
+
+        **Test**::
+
+            >>> import os
+            >>> import tempfile
+            >>> from benchmarker import SyntheticData
+            >>> from utils import get_data_source
+
+            >>> synthetic_data = SyntheticData(scale=0.001)
+            >>> synthetic_data.install(tempfile.mkdtemp())
+
+            >>> os.chdir(synthetic_data.InstallDir)
+
+            >>> metex = get_data_source('METExLite')
+            >>> pfpi_tbl = metex.get_pfpi()
+            >>> pfpi_tbl.shape
+            (4992, 6)
+
+            >>> synthetic_data.uninstall()
+        """
+
+        install_dir = make_install_dir(path_to_dir)
+
+        current_dir = os.getcwd()
+        os.chdir(install_dir)
+
+        try:
+            for path_to_pickle, table in self.get_table_pickles().items():
+                os.makedirs(os.path.dirname(path_to_pickle), exist_ok=True)
+                save_pickle(table, path_to_pickle, verbose=verbose)
+
+            for path_to_json, lookup in self.get_lookups().items():
+                os.makedirs(os.path.dirname(path_to_json), exist_ok=True)
+                save_json(lookup, path_to_json, verbose=verbose)
+
+            self.DatabasePath = os.path.abspath(cdd("synthetic", "dbo.sqlite"))
+            os.makedirs(os.path.dirname(self.DatabasePath), exist_ok=True)
+            self.create_database(verbose=verbose)
+
+        finally:
+            os.chdir(current_dir)
+
+        self.InstallDir = install_dir
+
+        for name in ('METExLite', 'Vegetation', 'MIDAS', 'UKCP09'):
+            self.DefaultDataSources.setdefault(name, data_source_factories[name])
+            register_data_source(name, functools.partial(self.make_data_source, name))
+
+    def uninstall(self):
+        """
+        Make the data sources read the databases again.
+        """
+
+        for name, factory in self.DefaultDataSources.items():
+            register_data_source(name, factory)
+
+        self.DefaultDataSources = {}
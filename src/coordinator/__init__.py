@@ -5,5 +5,6 @@ Coordinator.
 from .feature import *
 from .furlong import *
 from .geometry import *
+from .location import *
 
-__all__ = ['feature', 'furlong', 'geometry']
+__all__ = ['feature', 'furlong', 'geometry', 'location']
@@ -1,12 +1,96 @@
 """ Data categorisations """
 
-import datetime
-
 import numpy as np
 import pandas as pd
 from pyhelpers.text import find_similar_str
 
 
+season_names = ['spring', 'summer', 'autumn', 'winter']
+
+# Season (i.e. index of ``season_names``) of each month (the 0th is a placeholder for NaT)
+meteorological_season_of_month = np.array([-1, 3, 3, 0, 0, 0, 1, 1, 1, 2, 2, 2, 3])
+
+# Start dates (month * 100 + day) of spring, summer, autumn and winter (astronomical seasons),
+# and the season of the days before/between/after them
+astronomical_season_starts = np.array([321, 621, 923, 1221])
+astronomical_season_of_period = np.array([3, 0, 1, 2, 3])
+
+
+def label_meteorological_seasons(datetimes):
+    """
+    Label meteorological seasons (and the years in which the seasons start) for datetimes.
+
+    See also :py:func:`get_data_by_meteorological_seasons`.
+
+    :param datetimes: datetime data
+    :type datetimes: pandas.Series
+    :return: season ('Season') and the year in which the season starts ('SeasonYear')
+    :rtype: pandas.DataFrame
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from coordinator.feature import label_meteorological_seasons
+
+        >>> dt = pd.Series(pd.to_datetime(['2015-01-15', '2015-03-01', '2015-12-01']))
+
+        >>> label_meteorological_seasons(dt)
+           Season  SeasonYear
+        0  winter        2014
+        1  spring        2015
+        2  winter        2015
+    """
+
+    months = datetimes.dt.month.fillna(0).astype(np.int64).values
+
+    seasons = pd.Categorical.from_codes(
+        meteorological_season_of_month[months], categories=season_names)
+    season_years = datetimes.dt.year - (months <= 2)
+
+    season_labels = pd.DataFrame({'Season': seasons, 'SeasonYear': season_years},
+                                 index=datetimes.index)
+
+    return season_labels
+
+
+def label_astronomical_seasons(datetimes):
+    """
+    Label astronomical seasons (and the years in which the seasons start) for datetimes.
+
+    See also :py:func:`get_data_by_astronomical_seasons`.
+
+    :param datetimes: datetime data
+    :type datetimes: pandas.Series
+    :return: season ('Season') and the year in which the season starts ('SeasonYear')
+    :rtype: pandas.DataFrame
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from coordinator.feature import label_astronomical_seasons
+
+        >>> dt = pd.Series(pd.to_datetime(['2015-03-20', '2015-03-21', '2015-12-21']))
+
+        >>> label_astronomical_seasons(dt)
+           Season  SeasonYear
+        0  winter        2014
+        1  spring        2015
+        2  winter        2015
+    """
+
+    month_days = (datetimes.dt.month * 100 + datetimes.dt.day).values
+    periods = np.searchsorted(astronomical_season_starts, month_days, side='right')
+
+    codes = np.where(datetimes.isna().values, -1, astronomical_season_of_period[periods])
+    seasons = pd.Categorical.from_codes(codes, categories=season_names)
+    season_years = datetimes.dt.year - (periods == 0)
+
+    season_labels = pd.DataFrame({'Season': seasons, 'SeasonYear': season_years},
+                                 index=datetimes.index)
+
+    return season_labels
+
+
 def get_data_by_meteorological_seasons(incident_records, in_seasons, datetime_col):
     """
     Get data for a meteorological season or seasons.
@@ -32,50 +116,13 @@ def get_data_by_meteorological_seasons(incident_records, in_seasons, datetime_co
     """
 
     if in_seasons:
-        default_season_names = ['spring', 'summer', 'autumn', 'winter']
         input_season_names = [in_seasons] if isinstance(in_seasons, str) else in_seasons
-        valid_names = [find_similar_str(s, default_season_names) for s in input_season_names]
-
-        spring_data, summer_data, autumn_data, winter_data = [pd.DataFrame()] * 4
-
-        for y in pd.unique(incident_records.FinancialYear):
-            y_dat = incident_records[incident_records.FinancialYear == y]
-
-            # Get data for spring -----------------------------------
-            spring_start1 = datetime.datetime(year=y, month=4, day=1)
-            spring_end1 = spring_start1 + pd.DateOffset(months=2)
-            spring_start2 = datetime.datetime(year=y + 1, month=3, day=1)
-            spring_end2 = spring_start2 + pd.DateOffset(months=1)
-            spring_dates1 = pd.date_range(spring_start1, spring_start1 + pd.DateOffset(months=2))
-            spring_dates2 = pd.date_range(spring_start2, spring_start2 + pd.DateOffset(months=2))
-            spring_data = pd.concat([spring_data, y_dat[
-                y_dat[datetime_col].isin(spring_dates1) | y_dat[datetime_col].isin(spring_dates2)]])
-
-            spring_time = \
-                ((y_dat[datetime_col] >= spring_start1) & (y_dat[datetime_col] < spring_end1)) | \
-                ((y_dat[datetime_col] >= spring_start2) & (y_dat[datetime_col] < spring_end2))
-            spring_data = pd.concat([spring_data, y_dat.loc[spring_time]])
-
-            # Get data for summer ----------------------------------
-            summer_start = datetime.datetime(year=y, month=6, day=1)
-            summer_end = summer_start + pd.DateOffset(months=3)
-            summer = (y_dat[datetime_col] >= summer_start) & (y_dat[datetime_col] < summer_end)
-            summer_data = pd.concat([summer_data, y_dat.loc[summer]])
-
-            # Get data for autumn ----------------------------------
-            autumn_start = datetime.datetime(year=y, month=9, day=1)
-            autumn_end = autumn_start + pd.DateOffset(months=3)
-            autumn = (y_dat[datetime_col] >= autumn_start) & (y_dat[datetime_col] < autumn_end)
-            autumn_data = pd.concat([autumn_data, y_dat.loc[autumn]])
-
-            # Get data for winter -----------------------------------
-            winter_start = datetime.datetime(year=y, month=12, day=1)
-            winter_end = winter_start + pd.DateOffset(months=3)
-            winter = (y_dat[datetime_col] >= winter_start) & (y_dat[datetime_col] < winter_end)
-            winter_data = pd.concat([winter_data, y_dat.loc[winter]])
-
-        season_data = eval(
-            "pd.concat([%s], ignore_index=True)" % ', '.join(['{}_data'.format(s) for s in valid_names]))
+        valid_names = [find_similar_str(s, season_names) for s in input_season_names]
+
+        seasons = label_meteorological_seasons(incident_records[datetime_col]).Season
+
+        season_data = incident_records[seasons.isin(valid_names).values]
+        season_data.index = range(len(season_data))
 
         return season_data
 
@@ -116,34 +163,12 @@ def get_data_by_astronomical_seasons(mod_data, in_seasons, datetime_col):
         season_data = mod_data.copy()
 
     else:
-        default_season_names = ['spring', 'summer', 'autumn', 'winter']
-
         input_season_names = [in_seasons] if isinstance(in_seasons, str) else in_seasons
-        selected_seasons = [find_similar_str(s, default_season_names) for s in input_season_names]
-
-        def identify_season(incident_dt):
-            """
-            # (incident_datetime.dt.month % 12 + 3) // 3
-            """
-
-            y = incident_dt.year
-            seasons_dt = [
-                ('winter', (datetime.datetime(y, 1, 1),
-                            datetime.datetime(y, 3, 20) + pd.Timedelta(1, unit='day'))),
-                ('spring', (datetime.datetime(y, 3, 21),
-                            datetime.datetime(y, 6, 20) + pd.Timedelta(1, unit='day'))),
-                ('summer', (datetime.datetime(y, 6, 21),
-                            datetime.datetime(y, 9, 22) + pd.Timedelta(1, unit='day'))),
-                ('autumn', (datetime.datetime(y, 9, 23),
-                            datetime.datetime(y, 12, 20) + pd.Timedelta(1, unit='day'))),
-                ('winter', (datetime.datetime(y, 12, 21),
-                            datetime.datetime(y, 12, 31) + pd.Timedelta(1, unit='day')))]
-
-            return next(season for season, (start, end) in seasons_dt if start <= incident_dt < end)
-
-        mod_data_seasons = mod_data[datetime_col].map(identify_season)
-
-        season_data = mod_data[mod_data_seasons.isin(selected_seasons)]
+        selected_seasons = [find_similar_str(s, season_names) for s in input_season_names]
+
+        mod_data_seasons = label_astronomical_seasons(mod_data[datetime_col]).Season
+
+        season_data = mod_data[mod_data_seasons.isin(selected_seasons).values]
 
     return season_data
 
@@ -6,15 +6,11 @@ import os
 import measurement.measures
 import numpy as np
 import pandas as pd
-from pyhelpers.store import load_pickle, save_pickle
 from pyrcs import ELRMileages
 from pyrcs.utils import nr_mileage_num_to_str, nr_mileage_str_to_num, shift_num_nr_mileage
 
-from preprocessor import METExLite, Vegetation
-from utils import cdd_network, cdd_railway_codes, get_subset, make_filename
-
-metex = METExLite()
-vegetation = Vegetation()
+from utils import cdd_network, cdd_railway_codes, get_data_source, get_subset, load_pickle, \
+    make_filename, save_pickle
 
 
 def cdd_geodata(*sub_dir, mkdir=False):
@@ -344,10 +340,12 @@ def get_adjusted_mileages_same_start_end_elrs(route_name, weather_category, shif
     else:
         try:
             # Get data of incident locations where the 'StartELR' and 'EndELR' are THE SAME
+            metex = get_data_source('METExLite')
             incident_locations = metex.view_metex_schedule8_incident_locations(
                 route_name, weather_category, start_and_end_elr='same', verbose=verbose)
 
             # Get furlong information as reference
+            vegetation = get_data_source('Vegetation')
             ref_furlongs = vegetation.view_nr_vegetation_furlong_data(verbose=verbose)
 
             # Calculate adjusted furlong locations for each incident (for vegetation conditions)
@@ -424,6 +422,7 @@ def get_furlongs_same_start_end_elrs(route_name=None, weather_category=None, shi
                                                                  verbose=verbose)
 
         try:
+            vegetation = get_data_source('Vegetation')
             nr_furlong_data = vegetation.view_nr_vegetation_furlong_data(verbose=verbose)
             # Form a list containing all the furlong IDs
             furlong_ids = list(set(itertools.chain(*adj_mileages.Critical_FurlongIDs)))
@@ -485,6 +484,7 @@ def get_adjusted_mileages_diff_start_end_elrs(route_name, weather_category, shif
     else:
         try:
             # Get data for which the 'StartELR' and 'EndELR' are DIFFERENT
+            metex = get_data_source('METExLite')
             incident_locations_diff_start_end_elr = metex.view_metex_schedule8_incident_locations(
                 route_name, weather_category, start_and_end_elr='diff', verbose=verbose)
             # Get connecting points for different (ELRs, mileages)
@@ -509,6 +509,7 @@ def get_adjusted_mileages_diff_start_end_elrs(route_name, weather_category, shif
                 nr_mileage_str_to_num)
 
             # Get furlong information
+            vegetation = get_data_source('Vegetation')
             nr_furlong_data = vegetation.view_nr_vegetation_furlong_data(verbose=verbose)
 
             adjusted_conn_elr_mileages = locations_conn.apply(
@@ -634,6 +635,7 @@ def get_furlongs_diff_start_end_elrs(route_name=None, weather_category=None, shi
 
         try:
             # Get furlong information
+            vegetation = get_data_source('Vegetation')
             nr_furlong_data = vegetation.view_nr_vegetation_furlong_data(verbose=verbose)
             # Form a list containing all the furlong IDs
             furlong_ids = list(set(itertools.chain(*adj_mileages.Critical_FurlongIDs)))
@@ -799,6 +801,7 @@ def get_incident_location_furlongs(route_name=None, weather_category=None,
 
             furlongs_dat = pd.concat([ilf_same, ilf_diff])
 
+            metex = get_data_source('METExLite')
             incident_locations = metex.view_metex_schedule8_incident_locations(
                 route_name, weather_category, verbose=verbose)
 
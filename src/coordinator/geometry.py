@@ -18,12 +18,8 @@ from pydriosm.downloader import GeofabrikDownloader
 from pydriosm.reader import GeofabrikReader, read_shp_file, unzip_shp_zip
 from pyhelpers.dir import cd
 from pyhelpers.geom import wgs84_to_osgb36
-from pyhelpers.store import load_pickle, save_pickle
 
-from preprocessor import METExLite
-from utils import cdd_network
-
-metex = METExLite()
+from utils import cdd_network, get_data_source, load_pickle, save_pickle
 
 
 # == Weather grid ==
@@ -155,6 +151,7 @@ def find_weather_cell_id(longitude, latitude):
     :return: list, int
     """
 
+    metex = get_data_source('METExLite')
     weather_cell = metex.get_weather_cell()
 
     ll = [shapely.geometry.Point(xy) for xy in zip(weather_cell.ll_Longitude, weather_cell.ll_Latitude)]
@@ -294,6 +291,7 @@ def find_intersecting_weather_cells(x, as_geom=False):
         intxn_weather_cell_ids = find_intersecting_weather_cells(x, as_geom)
     """
 
+    metex = get_data_source('METExLite')
     weather_cell_geoms = metex.get_weather_cell().Polygon_WGS84
     intxn_weather_cells = tuple(cell for cell in weather_cell_geoms if x.intersects(cell))
     if as_geom:
@@ -0,0 +1,357 @@
+""" Location names """
+
+import os
+
+import numpy as np
+import pandas as pd
+from pyhelpers.geom import osgb36_to_wgs84, wgs84_to_osgb36
+from pyhelpers.store import load_json
+from pyrcs.line_data import LocationIdentifiers
+from pyrcs.utils import fetch_loc_names_repl_dict
+
+from utils import cdd_railway_codes, load_pickle, save_pickle
+
+
+# == Normalisation of location names ==================================================================
+
+# Compiled rules (see get_location_name_rules()), kept for the rest of the session once loaded
+_location_name_rules = {}
+
+
+def compile_location_name_rules(update=False):
+    """
+    Compile the errata, location codes and replacement dictionaries (of location names) into an
+    ordered list of rewrite rules.
+
+    Each rule is a tuple of the type of the rule and the rule itself:
+
+        - ``('map', dict)``, which replaces a name (as a whole) with the value of the dictionary;
+        - ``('regex', list)``, which substitutes each matched pattern (in the list of
+          ``(compiled pattern, replacement)``) in a name.
+
+    :param update: whether to update the location codes dictionaries, defaults to ``False``
+    :type update: bool
+    :return: ordered list of rewrite rules
+    :rtype: list
+    """
+
+    # In errata_tiploc, {'CLAPS47': 'CLPHS47'} might be problematic.
+    errata = load_json(cdd_railway_codes("metex-errata.json"))
+    rules = [('map', errata_dict) for errata_dict in errata.values()]  # STANOX, TIPLOC, STANME
+
+    # Location codes (to names)
+    lid = LocationIdentifiers()
+    for code_type in ('STANOX', 'STANME', 'TIPLOC'):
+        loc_id_dict = lid.make_loc_id_dict(code_type, update=update)
+        rules.append(('map', loc_id_dict.Location[loc_id_dict.Location.notnull()].to_dict()))
+
+    # Alternative location names
+    rules.append(('regex', list(fetch_loc_names_repl_dict(regex=True).items())))
+    rules.append(('map', fetch_loc_names_repl_dict()))
+
+    return rules
+
+
+def get_location_name_rules(update=False, verbose=False):
+    """
+    Get the rewrite rules of location names (see :py:func:`compile_location_name_rules`), which are
+    compiled only once and saved as a pickle file.
+
+    :param update: whether to check on update and proceed to update the package data,
+        defaults to ``False``
+    :type update: bool
+    :param verbose: whether to print relevant information in console as the function runs,
+        defaults to ``False``
+    :type verbose: bool or int
+    :return: ordered list of rewrite rules
+    :rtype: list
+
+    **Test**::
+
+        >>> from coordinator.location import get_location_name_rules
+
+        >>> location_name_rules = get_location_name_rules()
+
+        >>> [rule_type for rule_type, _ in location_name_rules]
+        ['map', 'map', 'map', 'map', 'map', 'map', 'regex', 'map']
+    """
+
+    if 'Rules' in _location_name_rules and not update:
+        return _location_name_rules['Rules']
+
+    path_to_pickle = cdd_railway_codes("location-name-rules.pickle")
+
+    if os.path.isfile(path_to_pickle) and not update:
+        rules = load_pickle(path_to_pickle)
+
+    else:
+        rules = compile_location_name_rules(update=update)
+        save_pickle(rules, path_to_pickle, verbose=verbose)
+
+    _location_name_rules['Rules'] = rules
+
+    return rules
+
+
+def rewrite_location_name(name, rules):
+    """
+    Rewrite a location name by an ordered list of rules.
+
+    This is equivalent to applying ``pandas.DataFrame.replace`` with each rule in turn, i.e.
+    a (regular expression) pattern is substituted if it matches the name as it is at the start of
+    the rule.
+
+    :param name: location name
+    :type name: str
+    :param rules: ordered list of rewrite rules (see :py:func:`compile_location_name_rules`)
+    :type rules: list
+    :return: rewritten location name
+    :rtype: str
+
+    **Test**::
+
+        >>> import re
+        >>> from coordinator.location import rewrite_location_name
+
+        >>> rules_ = [('map', {'STRATFD': 'Stratford'}),
+        ...           ('regex', [(re.compile(' [Jj]n$'), ' Junction')])]
+
+        >>> rewrite_location_name('STRATFD', rules_)
+        'Stratford'
+        >>> rewrite_location_name('Stratford Central Jn', rules_)
+        'Stratford Central Junction'
+    """
+
+    for rule_type, rule in rules:
+        if rule_type == 'map':
+            name = rule.get(name, name)
+
+        elif isinstance(name, str):
+            matched = [pattern.search(name) is not None for pattern, _ in rule]
+            for (pattern, replacement), is_matched in zip(rule, matched):
+                if is_matched:
+                    name = pattern.sub(replacement, name) if isinstance(replacement, str) \
+                        else replacement
+
+    return name
+
+
+def normalise_location_names(location_names, update=False, verbose=False):
+    """
+    Normalise location names (e.g. location codes and alternative names), rewriting each distinct
+    name only once.
+
+    :param location_names: location names
+    :type location_names: pandas.DataFrame or pandas.Series
+    :param update: whether to update the rewrite rules, defaults to ``False``
+    :type update: bool
+    :param verbose: whether to print relevant information in console as the function runs,
+        defaults to ``False``
+    :type verbose: bool or int
+    :return: normalised location names (of the same shape as ``location_names``)
+    :rtype: pandas.DataFrame or pandas.Series
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from coordinator.location import normalise_location_names
+
+        >>> loc_names = pd.DataFrame({'StartLocation': ['STRATFD', 'STRATFD'],
+        ...                           'EndLocation': ['Maryland', None]})
+
+        >>> normalise_location_names(loc_names)
+          StartLocation EndLocation
+        0     Stratford    Maryland
+        1     Stratford         NaN
+    """
+
+    rules = get_location_name_rules(update=update, verbose=verbose)
+
+    values = location_names.to_numpy(dtype=object)
+    codes, names = pd.factorize(values.ravel())
+
+    # The last one is for missing names (whose codes are -1)
+    normalised_names = np.empty(len(names) + 1, dtype=object)
+    for i, name in enumerate(names):
+        normalised_names[i] = rewrite_location_name(name, rules)
+    normalised_names[-1] = np.nan
+
+    normalised_values = normalised_names[codes].reshape(values.shape)
+
+    if isinstance(location_names, pd.DataFrame):
+        normalised = pd.DataFrame(normalised_values, index=location_names.index,
+                                  columns=location_names.columns)
+    else:
+        normalised = pd.Series(normalised_values, index=location_names.index,
+                               name=location_names.name)
+
+    return normalised
+
+
+# == Gazetteer of location coordinates ================================================================
+
+# Locations which are missing from the reference data, (Longitude, Latitude)
+missing_location_coordinates = {
+    'Dalston Junction (East London Line)': [-0.0751, 51.5461],
+    'Ashford West Junction (CTRL)': [0.86601557, 51.146927],
+    'Southfleet Junction': [0.34262910, 51.419354],
+    'Channel Tunnel Eurotunnel Boundary CTRL': [1.1310482, 51.094808],
+}
+
+
+def make_location_gazetteer(tiploc_locations, location_metadata, station_data, normalise=True):
+    """
+    Merge the reference data of locations into a gazetteer, i.e. a lookup of the coordinates of each
+    location (name).
+
+    Where a location is found in more than one source, the coordinates are taken from
+    (in order of priority):
+
+        1. ``tiploc_locations`` ('EASTING' and 'NORTHING');
+        2. ``missing_location_coordinates``;
+        3. ``location_metadata`` ('StartLongitude'/'StartLatitude' and
+           'EndLongitude'/'EndLatitude');
+        4. ``station_data`` ('Degrees Longitude' and 'Degrees Latitude').
+
+    The coordinates are converted (between OSGB36 and WGS84) only once for each location, so that
+    (Longitude, Latitude) is almost equivalent to (Easting, Northing).
+
+    :param tiploc_locations: data of the 'TIPLOC_LocationsLyr' sheet of location metadata,
+        where a 'LOOKUP_NAME' may be a tuple of names
+    :type tiploc_locations: pandas.DataFrame
+    :param location_metadata: data of location codes from NR_METEX_* database
+    :type location_metadata: pandas.DataFrame
+    :param station_data: data of stations from Railway Codes website
+    :type station_data: pandas.DataFrame
+    :param normalise: whether to include the normalised names of the locations
+        (see :py:func:`normalise_location_names`), defaults to ``True``
+    :type normalise: bool
+    :return: coordinates (and the source) of each location, indexed by 'Location'
+    :rtype: pandas.DataFrame
+
+    **Test**::
+
+        >>> from coordinator.location import make_location_gazetteer
+        >>> from preprocessor import Schedule8IncidentReports
+
+        >>> sis = Schedule8IncidentReports()
+
+        >>> tiploc_loc = sis.get_location_metadata()['TIPLOC_LocationsLyr']
+        >>> loc_meta_plus = sis.get_location_metadata_plus()
+        >>> stn_data = sis.StationCode.fetch_station_data()[sis.StationCode.StnKey]
+
+        >>> gazetteer = make_location_gazetteer(tiploc_loc, loc_meta_plus, stn_data)
+
+        >>> gazetteer.columns.to_list()
+        ['Easting', 'Northing', 'Longitude', 'Latitude', 'Source']
+    """
+
+    coords_cols = ['Easting', 'Northing', 'Longitude', 'Latitude']
+
+    tiploc = tiploc_locations[['LOOKUP_NAME', 'EASTING', 'NORTHING']].explode('LOOKUP_NAME')
+    tiploc.columns = ['Location', 'Easting', 'Northing']
+    tiploc['Source'] = 'TIPLOC_LocationsLyr'
+
+    missing = pd.DataFrame(
+        [[k] + v for k, v in missing_location_coordinates.items()],
+        columns=['Location', 'Longitude', 'Latitude'])
+    missing['Source'] = 'Missing'
+
+    metadata = pd.concat(
+        [location_metadata[[x + 'Location', x + 'Longitude', x + 'Latitude']].set_axis(
+            ['Location', 'Longitude', 'Latitude'], axis=1) for x in ('Start', 'End')],
+        ignore_index=True)
+    metadata['Source'] = 'METExLocation'
+
+    stations = station_data[['Station', 'Degrees Longitude', 'Degrees Latitude']].set_axis(
+        ['Location', 'Longitude', 'Latitude'], axis=1)
+    stations['Source'] = 'Station'
+
+    gazetteer = pd.concat([tiploc, missing, metadata, stations], ignore_index=True)
+    gazetteer = gazetteer.reindex(columns=['Location'] + coords_cols + ['Source'])
+    gazetteer[coords_cols] = gazetteer[coords_cols].apply(pd.to_numeric, errors='coerce')
+
+    # Keep only the (first) locations of which the coordinates are available
+    has_en = gazetteer.Easting.notnull() & gazetteer.Northing.notnull()
+    has_ll = gazetteer.Longitude.notnull() & gazetteer.Latitude.notnull()
+    gazetteer = gazetteer[(has_en | has_ll) & gazetteer.Location.map(
+        lambda x: isinstance(x, str) and x != '')]
+    gazetteer = gazetteer.drop_duplicates('Location', keep='first').copy()
+
+    # Let (Longitude, Latitude) be almost equivalent to (Easting, Northing)
+    no_en = gazetteer.Easting.isnull() | gazetteer.Northing.isnull()
+    gazetteer.loc[no_en, 'Easting'], gazetteer.loc[no_en, 'Northing'] = wgs84_to_osgb36(
+        gazetteer.Longitude[no_en].values, gazetteer.Latitude[no_en].values)
+    gazetteer['Longitude'], gazetteer['Latitude'] = osgb36_to_wgs84(
+        gazetteer.Easting.values, gazetteer.Northing.values)
+
+    if normalise:
+        normalised_names = normalise_location_names(gazetteer.Location)
+        aliases = gazetteer[normalised_names != gazetteer.Location].assign(
+            Location=normalised_names)
+        gazetteer = pd.concat([gazetteer, aliases]).drop_duplicates('Location', keep='first')
+
+    gazetteer = gazetteer.set_index('Location')
+
+    return gazetteer
+
+
+def find_location_coordinates(data, gazetteer, coords_cols=None, overwrite=True):
+    """
+    Find the coordinates of the start and end locations of each record (e.g. of an incident) in
+    a gazetteer.
+
+    :param data: data with the columns 'StartLocation' and 'EndLocation'
+    :type data: pandas.DataFrame
+    :param gazetteer: gazetteer of locations (see :py:func:`make_location_gazetteer`)
+    :type gazetteer: pandas.DataFrame
+    :param coords_cols: names of the coordinates, defaults to ``None``
+        (i.e. ``['Easting', 'Northing', 'Longitude', 'Latitude']``)
+    :type coords_cols: list or None
+    :param overwrite: whether to overwrite the coordinates that are already available in ``data``,
+        defaults to ``True``; if ``False``, only the missing coordinates are filled in
+    :type overwrite: bool
+    :return: data with the coordinates of the start and end locations,
+        e.g. 'StartEasting', ..., 'EndLatitude'
+    :rtype: pandas.DataFrame
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from coordinator.location import find_location_coordinates
+
+        >>> gaz = pd.DataFrame({'Longitude': [-0.0751, 0.3426], 'Latitude': [51.5461, 51.4194]},
+        ...                    index=['Dalston Junction', 'Southfleet Junction'])
+        >>> dat = pd.DataFrame({'StartLocation': ['Dalston Junction', 'Somewhere'],
+        ...                     'EndLocation': ['Southfleet Junction', 'Dalston Junction']})
+
+        >>> find_location_coordinates(dat, gaz, coords_cols=['Longitude', 'Latitude'])
+              StartLocation          EndLocation  ...  EndLongitude  EndLatitude
+        0  Dalston Junction  Southfleet Junction  ...        0.3426      51.4194
+        1         Somewhere     Dalston Junction  ...       -0.0751      51.5461
+        [2 rows x 6 columns]
+    """
+
+    coords_cols = ['Easting', 'Northing', 'Longitude', 'Latitude'] if coords_cols is None \
+        else list(coords_cols)
+
+    dat = data.copy()
+
+    # Look up the start and end locations all at once
+    prefixes = ('Start', 'End')
+    location_names = dat[[x + 'Location' for x in prefixes]].to_numpy(dtype=object)
+    coordinates = gazetteer[coords_cols].reindex(location_names.ravel(order='F')).to_numpy()
+
+    for i, x in enumerate(prefixes):
+        x_coords_cols = [x + c for c in coords_cols]
+        x_coordinates = coordinates[i * len(dat):(i + 1) * len(dat)]
+
+        if overwrite or not set(x_coords_cols).issubset(dat.columns):
+            for col, values in zip(x_coords_cols, x_coordinates.T):
+                dat[col] = values
+        else:
+            to_fill = dat[x_coords_cols].isnull().any(axis=1).to_numpy() & \
+                      ~np.isnan(x_coordinates).any(axis=1)
+            dat.loc[to_fill, x_coords_cols] = x_coordinates[to_fill]
+
+    return dat
@@ -2,12 +2,15 @@
 Hotspots of weather-related incidents (in the context of wind-related delays).
 """
 
+import concurrent.futures
+import copy
+import hashlib
 import os
 
 import mapclassify
 import matplotlib
+import matplotlib.collections
 import matplotlib.font_manager
-import matplotlib.patches
 import matplotlib.pyplot as plt
 import mpl_toolkits.basemap
 import numpy as np
@@ -18,11 +21,11 @@ import shapely.geometry
 import shapely.ops
 from pyhelpers.ops import colour_bar_index, confirmed
 from pyhelpers.settings import mpl_preferences, pd_preferences
-from pyhelpers.store import load_pickle, save_fig, save_pickle
+from pyhelpers.store import save_fig
 
 from coordinator.geometry import get_shp_coordinates, get_shp_file_path_for_basemap
-from preprocessor import METExLite, Vegetation
-from utils import cd_models, cdd_network, get_subset, make_filename
+from utils import cd_models, cdd_network, get_data_source, get_subset, load_pickle, \
+    make_filename, save_pickle
 
 
 class Hotspots:
@@ -30,8 +33,10 @@ class Hotspots:
     def __init__(self, database_name='NR_METEx_20150331'):
         self.Name = 'Hotspots of weather-related incidents in the context of wind-related delays'
 
-        self.METEx = METExLite(database_name=database_name)
-        self.Vegetation = Vegetation()
+        self.DatabaseName = database_name
+
+        self.METEx = get_data_source('METExLite', database_name=database_name)
+        self.Vegetation = get_data_source('Vegetation')
 
         self.Route = 'Anglia'
         self.WeatherCategory = 'Wind'
@@ -40,6 +45,11 @@ class Hotspots:
 
         self.LegendLoc = (1.05, 0.85)
 
+        self.JenksBreaks = {}
+
+        # Data shared by the figures, prepared once (see prepare_hotspots_data()) and read only
+        self.PreparedData = {}
+
         # matplotlib.use('TkAgg')
         mpl_preferences(font_name='Cambria')
         pd_preferences()
@@ -59,23 +69,285 @@ class Hotspots:
         :param show_metex_weather_cells: [bool]
         :param show_osm_landuse_forest: [bool]
         :param show_nr_hazardous_trees: [bool]
-        :param save_as: [str; None]
-        :param dpi: [int; None]
+        :param save_as: [str; list; None] file format(s), e.g. '.tif' or ['.tif', '.png']
+        :param dpi: [int; list; None] dpi (for each of the file formats)
         :param verbose: [bool]
         """
 
-        if save_as.lstrip('.') in fig.canvas.get_supported_filetypes():
-            suffix = zip([show_metex_weather_cells, show_osm_landuse_forest, show_nr_hazardous_trees],
-                         ['weather-grid', 'vegetation', 'hazard-trees'])
-            filename = '-'.join([keyword] + [v for s, v in suffix if s is True])
+        save_as_ = [save_as] if isinstance(save_as, str) else list(save_as)
+        dpi_ = list(dpi) if isinstance(dpi, (list, tuple)) else [dpi] * len(save_as_)
+
+        suffix = zip([show_metex_weather_cells, show_osm_landuse_forest, show_nr_hazardous_trees],
+                     ['weather-grid', 'vegetation', 'hazard-trees'])
+        filename = '-'.join([keyword] + [v for s, v in suffix if s is True])
+
+        for fmt, fmt_dpi in zip(save_as_, dpi_):
+            if fmt.lstrip('.') in fig.canvas.get_supported_filetypes():
+                path_to_file = cd_models(
+                    "prototype", self.WeatherCategory.lower(), category, filename + fmt)
+
+                save_fig(path_to_file, dpi=fmt_dpi, conv_svg_to_emf=True, verbose=verbose)
+
+    # == Render markers and polygons ==================================================================
+
+    @staticmethod
+    def _project(base_map, longitudes, latitudes):
+        """
+        Project (all) coordinates onto a base map at once.
+
+        :param base_map: [mpl_toolkits.basemap.Basemap]
+        :param longitudes: [array-like] longitudes (of any shape)
+        :param latitudes: [array-like] latitudes (of the same shape as ``longitudes``)
+        :return: [tuple] (numpy.ndarray, numpy.ndarray) projected x and y (of the same shape)
+        """
+
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+
+        x, y = base_map(longitudes.ravel(), latitudes.ravel())
+
+        return np.reshape(x, longitudes.shape), np.reshape(y, longitudes.shape)
+
+    def _plot_markers(self, base_map, longitudes, latitudes, colour, marker_size, **kwargs):
+        """
+        Plot markers of locations on a base map as a single collection.
+
+        :param base_map: [mpl_toolkits.basemap.Basemap]
+        :param longitudes: [array-like] longitudes of the locations
+        :param latitudes: [array-like] latitudes of the locations
+        :param colour: colour of the markers
+        :param marker_size: [numbers.Number] size of the markers (in points, as ``markersize``)
+        :param kwargs: optional parameters of `matplotlib.axes.Axes.scatter`_
+        :return: [matplotlib.collections.PathCollection]
+
+        .. _`matplotlib.axes.Axes.scatter`:
+            https://matplotlib.org/stable/api/_as_gen/matplotlib.axes.Axes.scatter.html
+        """
+
+        x, y = self._project(base_map, longitudes, latitudes)
+
+        marker_kwargs = {'marker': 'o', 'alpha': 0.9, 'edgecolors': 'w', 'linewidths': 1,
+                         'zorder': 2}
+        marker_kwargs.update(kwargs)
+
+        markers = base_map.scatter(x, y, s=marker_size ** 2, facecolor=colour, **marker_kwargs)
+
+        return markers
+
+    def _plot_polygons(self, base_map, longitudes, latitudes, **kwargs):
+        """
+        Plot polygons (of the same number of vertices) on a base map as a single collection.
+
+        :param base_map: [mpl_toolkits.basemap.Basemap]
+        :param longitudes: [array-like] longitudes of the vertices, of size (n_polygons, n_vertices)
+        :param latitudes: [array-like] latitudes of the vertices, of size (n_polygons, n_vertices)
+        :param kwargs: optional parameters of `matplotlib.collections.PolyCollection`_
+        :return: [matplotlib.collections.PolyCollection]
+
+        .. _`matplotlib.collections.PolyCollection`:
+            https://matplotlib.org/stable/api/collections_api.html
+        """
+
+        x, y = self._project(base_map, longitudes, latitudes)
+
+        polygons = matplotlib.collections.PolyCollection(np.stack([x, y], axis=-1), **kwargs)
+        plt.gca().add_collection(polygons)
+
+        return polygons
+
+    def _get_jenks_breaks(self, values, k, random_seed=1, **kwargs):
+        """
+        Get Jenks natural breaks of data, which are memoised for each snapshot of the data.
+
+        :param values: [numpy.ndarray] data values
+        :param k: [int] number of classes
+        :param random_seed: [int] (default: 1)
+        :param kwargs: optional parameters of `mapclassify.NaturalBreaks`_
+        :return: [mapclassify.NaturalBreaks]
+
+        .. _`mapclassify.NaturalBreaks`:
+            https://pysal.org/mapclassify/generated/mapclassify.NaturalBreaks.html
+        """
+
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        key = (hashlib.md5(values.tobytes()).hexdigest(), k, random_seed,
+               tuple(sorted(kwargs.items())))
+
+        if key not in self.JenksBreaks:
+            # Set a random_seed number
+            np.random.seed(random_seed)
+
+            self.JenksBreaks[key] = mapclassify.NaturalBreaks(y=values, k=k, **kwargs)
+
+        return self.JenksBreaks[key]
+
+    @staticmethod
+    def _get_bin_positions(values, bins):
+        """
+        Get the position of the (Jenks) bin of each value.
+
+        A value falls in the first bin whose upper bound is not less than it (or the last bin,
+        if it is greater than all the upper bounds); the position of a null value is -1.
+
+        :param values: [array-like] data values
+        :param bins: [array-like] (ascending) upper bounds of the bins
+        :return: [numpy.ndarray] positions of the bins
+        """
+
+        values = np.asarray(values, dtype=np.float64)
 
-            path_to_file = cd_models(
-                "prototype", self.WeatherCategory.lower(), category, filename + save_as)
+        bin_positions = np.minimum(np.searchsorted(bins, values, side='left'), len(bins) - 1)
+        bin_positions[np.isnan(values)] = -1
 
-            save_fig(path_to_file, dpi=dpi, conv_svg_to_emf=True, verbose=verbose)
+        return bin_positions
 
     # == Prepare base maps ============================================================================
 
+    def _path_to_base_map_pickle(self):
+        """
+        Get the path to the pickle file of the (pre-projected) base map of the current Route.
+
+        :return: [str] path to the pickle file
+        """
+
+        filename = make_filename("base-map", self.Route, None, self.Projection)
+        path_to_pickle = cd_models("prototype", "basemap", filename)
+
+        return path_to_pickle
+
+    def _make_base_map(self):
+        """
+        Make a base map (i.e. the Basemap projection) for the current Route.
+
+        :return: [mpl_toolkits.basemap.Basemap]
+        """
+
+        base_map = mpl_toolkits.basemap.Basemap(
+            llcrnrlon=-0.565409,  # ll[0] - 0.06 * width,
+            llcrnrlat=51.23622,  # ll[1] - 0.06 + 0.002 * height,
+            urcrnrlon=1.915975,  # ur[0] + extra * width,
+            urcrnrlat=53.15000,  # ur[1] + extra + 0.01 * height,
+            ellps='WGS84',
+            lat_ts=0,
+            lon_0=-2.,
+            lat_0=49.,
+            projection=self.Projection,
+            resolution='i',
+            suppress_ticks=True,
+            epsg=27700)
+
+        return base_map
+
+    def prepare_base_map(self, add_osm_natural_tree=False, update=False, verbose=False):
+        """
+        Prepare a base map (i.e. the Basemap projection with the pre-projected layers)
+        for the figures, and save it as a pickle file.
+
+        This is the only step that writes the pickle file of the base map; it is to be run once
+        before plotting, so that the shapefiles are not read and re-projected again.
+
+        :param add_osm_natural_tree: [bool] whether to include OSM natural trees (default: False)
+        :param update: [bool] (default: False)
+        :param verbose: [bool] (default: False)
+        :return: [mpl_toolkits.basemap.Basemap]
+
+        **Test**::
+
+            >>> from illustrator.hotspot import Hotspots
+
+            >>> hotspots = Hotspots()
+
+            >>> base_map = hotspots.prepare_base_map()
+        """
+
+        path_to_pickle = self._path_to_base_map_pickle()
+
+        if os.path.isfile(path_to_pickle) and not update:
+            base_map = load_pickle(path_to_pickle)
+            to_save = False
+        else:
+            base_map = self._make_base_map()
+            to_save = True
+
+        layers = [('railways', 'rail', self.Route.lower()),
+                  ('landuse', 'forest', 'osm_landuse_forest')]
+        if add_osm_natural_tree:
+            layers.append(('natural', 'tree', 'osm_natural_tree'))
+
+        # Read (and project) the layers that are not yet available in the base map
+        for osm_layer, osm_feature, name in layers:
+            if not hasattr(base_map, name):
+                self._read_shp_layer(base_map, osm_layer, osm_feature, name=name)
+                to_save = True
+
+        if to_save:
+            save_pickle(base_map, path_to_pickle, verbose=verbose)
+
+        return base_map
+
+    def get_base_map(self, update=False):
+        """
+        Get a base map (i.e. the Basemap projection with the pre-projected railway layer).
+
+        The base map is a copy of the prepared one (see :py:meth:`Hotspots.prepare_hotspots_data`)
+        or loaded from the pickle file made by :py:meth:`Hotspots.prepare_base_map`;
+        if neither is available (or ``update=True``), it is made in memory only.
+
+        :param update: [bool] (default: False)
+        :return: [mpl_toolkits.basemap.Basemap]
+
+        **Test**::
+
+            >>> from illustrator.hotspot import Hotspots
+
+            >>> hotspots = Hotspots()
+
+            >>> base_map = hotspots.get_base_map()
+        """
+
+        path_to_pickle = self._path_to_base_map_pickle()
+
+        if 'BaseMap' in self.PreparedData and not update:
+            # A copy, as the base map is drawn on
+            base_map = copy.deepcopy(self.PreparedData['BaseMap'])
+
+        elif os.path.isfile(path_to_pickle) and not update:
+            base_map = load_pickle(path_to_pickle)
+
+        else:
+            base_map = self._make_base_map()
+
+            # Read (and project) the railway tracks
+            self._read_shp_layer(base_map, 'railways', 'rail', name=self.Route.lower())
+
+        return base_map
+
+    def _read_shp_layer(self, base_map, osm_layer, osm_feature, name):
+        """
+        Read an OSM layer (within the boundary of a base map) into the base map, if it is not
+        yet available in the base map.
+
+        Nothing is saved here; see :py:meth:`Hotspots.prepare_base_map` for the cached layers.
+
+        :param base_map: [mpl_toolkits.basemap.Basemap]
+        :param osm_layer: [str] e.g. 'railways', 'landuse', 'natural'
+        :param osm_feature: [str] e.g. 'rail', 'forest', 'tree'
+        :param name: [str] name of the attribute of the base map for the projected shapes
+        :return: [list] projected shapes of the layer
+        """
+
+        if not hasattr(base_map, name):
+            boundary_polygon = shapely.geometry.Polygon(
+                zip(base_map.boundarylons, base_map.boundarylats))
+
+            path_to_shp_file = get_shp_file_path_for_basemap(
+                osm_subregion='England', osm_layer=osm_layer, osm_feature=osm_feature,
+                boundary_polygon=boundary_polygon, sub_area_name=self.Route.lower())
+
+            base_map.readshapefile(shapefile=path_to_shp_file, name=name, drawbounds=False)
+
+        return base_map.__getattribute__(name)
+
     def plot_base_map(self, railway_line_color='#3D3D3D', legend_loc=(1.05, 0.85)):
         """
         Create a base map.
@@ -102,36 +374,19 @@ class Hotspots:
         plt.subplots_adjust(left=0.001, bottom=0.000, right=0.6035, top=1.000)
 
         # Plot basemap
-        base_map = mpl_toolkits.basemap.Basemap(
-            llcrnrlon=-0.565409,  # ll[0] - 0.06 * width,
-            llcrnrlat=51.23622,  # ll[1] - 0.06 + 0.002 * height,
-            urcrnrlon=1.915975,  # ur[0] + extra * width,
-            urcrnrlat=53.15000,  # ur[1] + extra + 0.01 * height,
-            ellps='WGS84',
-            lat_ts=0,
-            lon_0=-2.,
-            lat_0=49.,
-            projection=self.Projection,
-            resolution='i',
-            suppress_ticks=True,
-            epsg=27700)
+        base_map = self.get_base_map()
 
         # base_map.arcgisimage(service='World_Shaded_Relief', xpixels=1500, dpi=300, verbose=False)
         base_map.drawmapboundary(color='white', fill_color='white')
         # base_map.drawcoastlines()
         base_map.fillcontinents(color='#dcdcdc')  # color='#555555'
 
-        # Add a layer for railway tracks
-        boundary_polygon = shapely.geometry.Polygon(zip(base_map.boundarylons, base_map.boundarylats))
-
-        path_to_shp_file = get_shp_file_path_for_basemap(
-            osm_subregion='England', osm_layer='railways', osm_feature='rail',
-            boundary_polygon=boundary_polygon, sub_area_name=self.Route.lower())
-
-        base_map.readshapefile(
-            shapefile=path_to_shp_file, name=self.Route.lower(), linewidth=1.5,
-            color=railway_line_color,  # '#626262', '#939393', '#757575'
+        # Add a layer for railway tracks (which have been projected onto the base map)
+        railway_lines = matplotlib.collections.LineCollection(
+            self._read_shp_layer(base_map, 'railways', 'rail', name=self.Route.lower()),
+            linewidth=1.5, color=railway_line_color,  # '#626262', '#939393', '#757575'
             zorder=4)
+        plt.gca().add_collection(railway_lines)
 
         # Show legend
         plt.plot([], '-', label="Railway track", linewidth=2.2, color=railway_line_color)
@@ -176,7 +431,10 @@ class Hotspots:
 
         # Get Weather cell data
 
-        data = self.METEx.get_weather_cell(update=update)
+        if 'WeatherCell' in self.PreparedData and not update:
+            data = self.PreparedData['WeatherCell']
+        else:
+            data = self.METEx.get_weather_cell(update=update)
         data = get_subset(data, route_name='Anglia')
         # Drop duplicated Weather cell data
         unhashable_cols = ('Polygon_WGS84', 'Polygon_OSGB36', 'IMDM', 'Route')
@@ -185,15 +443,12 @@ class Hotspots:
 
         weather_cell_colour = '#D5EAFF'  # '#add6ff', '#99ccff', '#fff68f
 
-        # Plot the Weather cells one by one
-        for i in range(len(data)):
-            ll_x, ll_y = base_map(data['ll_Longitude'].iloc[i], data['ll_Latitude'].iloc[i])
-            ul_x, ul_y = base_map(data['ul_Longitude'].iloc[i], data['ul_Latitude'].iloc[i])
-            ur_x, ur_y = base_map(data['ur_Longitude'].iloc[i], data['ur_Latitude'].iloc[i])
-            lr_x, lr_y = base_map(data['lr_Longitude'].iloc[i], data['lr_Latitude'].iloc[i])
-            xy = zip([ll_x, ul_x, ur_x, lr_x], [ll_y, ul_y, ur_y, lr_y])
-            p = matplotlib.patches.Polygon(list(xy), fc=weather_cell_colour, ec='#4b4747', zorder=2)
-            plt.gca().add_patch(p)
+        # Plot all the Weather cells as one collection
+        corners = ['ll', 'ul', 'ur', 'lr']
+        self._plot_polygons(
+            base_map, data[[c + '_Longitude' for c in corners]].values,
+            data[[c + '_Latitude' for c in corners]].values,
+            facecolors=weather_cell_colour, edgecolors='#4b4747', zorder=2)
 
         # Add labels
         plt.plot(
@@ -234,41 +489,30 @@ class Hotspots:
         print("Plotting the OSM natural/forest ... ", end="")
 
         # OSM - landuse - forest
-        boundary_polygon = shapely.geometry.Polygon(zip(base_map.boundarylons, base_map.boundarylats))
-        bounded_landuse_forest_shp = get_shp_file_path_for_basemap(
-            osm_subregion='England', osm_layer='landuse', osm_feature='forest',
-            boundary_polygon=boundary_polygon, sub_area_name='anglia')
-
         osm_landuse_forest_colour = '#72886E'  # '#7f987b', '#8ea989', '#72946c', '#72946c'
 
-        base_map.readshapefile(
-            bounded_landuse_forest_shp, name='osm_landuse_forest', color=osm_landuse_forest_colour,
-            zorder=3)
+        forest_boundaries = matplotlib.collections.LineCollection(
+            self._read_shp_layer(base_map, 'landuse', 'forest', name='osm_landuse_forest'),
+            color=osm_landuse_forest_colour, zorder=3)
+        plt.gca().add_collection(forest_boundaries)
 
         # Fill the patches? Note this may take a long time and dramatically increase the file of the map
         if fill_forest_patches:
             print("\n")
             print("Filling the 'osm_landuse_forest' polygons ... ", end="")
 
-            forest_polygons = [
-                matplotlib.patches.Polygon(
-                    p, fc=osm_landuse_forest_colour, ec=osm_landuse_forest_colour, zorder=4)
-                for p in base_map.__getattribute__('osm_landuse_forest')]
-
-            for i in range(len(forest_polygons)):
-                plt.gca().add_patch(forest_polygons[i])
+            forest_polygons = matplotlib.collections.PolyCollection(
+                base_map.__getattribute__('osm_landuse_forest'),
+                facecolors=osm_landuse_forest_colour, edgecolors=osm_landuse_forest_colour,
+                zorder=4)
+            plt.gca().add_collection(forest_polygons)
 
         # OSM - natural - tree
         if add_osm_natural_tree:
-            bounded_natural_tree_shp = get_shp_file_path_for_basemap(
-                'England', 'natural', 'tree', boundary_polygon, sub_area_name='anglia')
-            base_map.readshapefile(
-                bounded_natural_tree_shp, name='osm_natural_tree', color=osm_landuse_forest_colour,
-                zorder=3)
-            natural_tree_points = [
-                shapely.geometry.Point(p) for p in base_map.__getattribute__('osm_natural_tree')]
+            natural_tree_points = np.array(
+                self._read_shp_layer(base_map, 'natural', 'tree', name='osm_natural_tree'))
             base_map.scatter(
-                [geom.x for geom in natural_tree_points], [geom.y for geom in natural_tree_points],
+                natural_tree_points[:, 0], natural_tree_points[:, 1],
                 marker='o', s=2, facecolor='#008000', label="Tree", alpha=0.5, zorder=3)
 
         # Add label
@@ -304,18 +548,19 @@ class Hotspots:
 
         print("Plotting the hazardous trees ... ", end="")
 
-        hazardous_trees = self.Vegetation.view_hazardous_trees()
+        if 'HazardousTrees' in self.PreparedData:
+            hazardous_trees = self.PreparedData['HazardousTrees']
+        else:
+            hazardous_trees = self.Vegetation.view_hazardous_trees()
 
-        map_points = [
-            shapely.geometry.Point(base_map(long, lat))
-            for long, lat in zip(hazardous_trees.Longitude, hazardous_trees.Latitude)]
-        hazardous_trees_points = shapely.geometry.MultiPoint(map_points)
+        map_x, map_y = self._project(
+            base_map, hazardous_trees.Longitude.values, hazardous_trees.Latitude.values)
 
         # Plot hazardous trees on the basemap
         hazardous_tree_colour = '#ab790a'  # '#886008', '#6e376e', '#5a7b6c'
 
         base_map.scatter(
-            [geom.x for geom in hazardous_trees_points], [geom.y for geom in hazardous_trees_points],
+            map_x, map_y,
             marker='x',  # edgecolor='w',
             s=20, lw=1.5, facecolor=hazardous_tree_colour, label="Hazardous trees", alpha=0.6,
             antialiased=True, zorder=3)
@@ -410,7 +655,10 @@ class Hotspots:
         pickle_filename = make_filename("s8hotspots", self.Route, self.WeatherCategory)
         path_to_pickle = self.METEx.cdd_views(pickle_filename)
 
-        if os.path.isfile(path_to_pickle) and not update:
+        if 'Midpoints' in self.PreparedData and not update:
+            incident_hotspots = self.PreparedData['Midpoints'].copy()
+
+        elif os.path.isfile(path_to_pickle) and not update:
             incident_hotspots = load_pickle(path_to_pickle)
 
         else:
@@ -539,7 +787,10 @@ class Hotspots:
         pickle_filename = make_filename("s8hotspots-annual-delays", self.Route, self.WeatherCategory)
         path_to_pickle = self.METEx.cdd_views(pickle_filename)
 
-        if os.path.isfile(path_to_pickle) and not update:
+        if 'AnnualStats' in self.PreparedData and not update:
+            annual_stats = self.PreparedData['AnnualStats'].copy()
+
+        elif os.path.isfile(path_to_pickle) and not update:
             annual_stats = load_pickle(path_to_pickle)
             annual_stats = get_subset(annual_stats, self.Route, self.WeatherCategory)
 
@@ -549,7 +800,7 @@ class Hotspots:
             selected_features = [
                 'FinancialYear', 'WeatherCategory', 'Route', 'StanoxSection',
                 'StartLongitude', 'StartLatitude', 'EndLongitude', 'EndLatitude']
-            schedule8_data_ = schedule8_data.groupby(selected_features).agg(
+            schedule8_data_ = schedule8_data.groupby(selected_features, observed=True).agg(
                 {'DelayMinutes': sum, 'DelayCost': sum, 'IncidentCount': sum}).reset_index()
 
             incident_location_midpoints = self.get_midpoints_for_plotting_hotspots(update=update)
@@ -625,11 +876,9 @@ class Hotspots:
         for y, fy in zip(years, f_years):
             plot_data = schedule8_annual_stats[schedule8_annual_stats.FinancialYear == int(y)][0:20]
             top_hotspots.append(fy + ':  ' + plot_data.StanoxSection.iloc[0])
-            for i in plot_data.index:
-                mid_x, mid_y = base_map(plot_data.MidLongitude[i], plot_data.MidLatitude[i])
-                base_map.plot(
-                    mid_x, mid_y, zorder=2, marker='o', color=colours[years.index(y)], alpha=0.9,
-                    markersize=26, markeredgecolor='w')
+            self._plot_markers(
+                base_map, plot_data.MidLongitude.values, plot_data.MidLatitude.values,
+                colour=colours[years.index(y)], marker_size=26)
 
         # Add a colour bar
         cb = colour_bar_index(cmap=cmap, n_colours=len(label), labels=label, shrink=0.4, pad=0.068)
@@ -695,11 +944,9 @@ class Hotspots:
             sort_by=['DelayMinutes', 'IncidentCount', 'DelayCost'], update=update)
         notnull_data = hotspots_data_init[hotspots_data_init.DelayMinutes.notnull()]
 
-        # Set a random_seed number
-        np.random.seed(random_seed)
-
         # Calculate Jenks natural breaks for delay minutes
-        breaks = mapclassify.NaturalBreaks(y=notnull_data.DelayMinutes.values, k=6, initial=100)
+        breaks = self._get_jenks_breaks(
+            notnull_data.DelayMinutes.values, k=6, random_seed=random_seed, initial=100)
         hotspots_data = hotspots_data_init.join(
             pd.DataFrame({'jenks_bins': breaks.yb}, index=notnull_data.index))
         # hotspots_data['jenks_bins'].fillna(-1, inplace=True)
@@ -714,21 +961,12 @@ class Hotspots:
         fig, base_map = self.plot_base_map()
         fig.subplots_adjust(left=0.001, bottom=0.000, right=0.7715, top=1.000)
 
-        bins = list(breaks.bins)
-        for b in range(len(bins)):
-            idx_0, idx_1 = hotspots_data.DelayMinutes <= bins[b], hotspots_data.DelayMinutes > bins[
-                b - 1]
-            if bins[b] == min(bins):
-                plotting_data = hotspots_data[idx_0]
-            elif bins[b] == max(bins):
-                plotting_data = hotspots_data[idx_1]
-            else:
-                plotting_data = hotspots_data[idx_0 & idx_1]
-            for i in plotting_data.index:
-                mid_x, mid_y = base_map(plotting_data.MidLongitude[i], plotting_data.MidLatitude[i])
-                base_map.plot(mid_x, mid_y, zorder=2, marker='o', color=colours[b], alpha=0.9,
-                              markersize=marker_size[b],
-                              markeredgecolor='w')
+        bin_positions = self._get_bin_positions(hotspots_data.DelayMinutes, breaks.bins)
+        for b in range(len(breaks.bins)):
+            plotting_data = hotspots_data[bin_positions == b]
+            self._plot_markers(
+                base_map, plotting_data.MidLongitude.values, plotting_data.MidLatitude.values,
+                colour=colours[b], marker_size=marker_size[b])
 
         # Add a colour bar
         cb = colour_bar_index(
@@ -799,11 +1037,9 @@ class Hotspots:
             sort_by=['IncidentCount', 'DelayCost', 'DelayMinutes'], update=update)
         notnull_data = hotspots_data_init[hotspots_data_init.IncidentCount.notnull()]
 
-        # Set a random_seed number
-        np.random.seed(random_seed)
-
         # Calculate Jenks natural breaks for delay minutes
-        breaks = mapclassify.NaturalBreaks(y=notnull_data.IncidentCount.values, k=6, initial=100)
+        breaks = self._get_jenks_breaks(
+            notnull_data.IncidentCount.values, k=6, random_seed=random_seed, initial=100)
         hotspots_data = hotspots_data_init.join(
             pd.DataFrame(data={'jenks_bins': breaks.yb}, index=notnull_data.index))
 
@@ -817,26 +1053,12 @@ class Hotspots:
         fig, base_map = self.plot_base_map(legend_loc=(1.05, 0.9))
         fig.subplots_adjust(left=0.001, bottom=0.000, right=0.7715, top=1.000)
 
-        bins = list(breaks.bins)
-        for b in range(len(bins)):
-            ind1 = hotspots_data.IncidentCount <= bins[b]
-            ind2 = hotspots_data.IncidentCount > bins[b - 1]
-            if np.isnan(bins[b]):
-                plotting_data = hotspots_data[hotspots_data.IncidentCount.isnull()]
-            elif bins[b] == np.nanmin(bins):
-                plotting_data = hotspots_data[ind1]
-            elif bins[b] == np.nanmax(bins):
-                plotting_data = hotspots_data[ind2]
-            else:
-                plotting_data = hotspots_data[ind1 & ind2]
-
-            for i in plotting_data.index:
-                mid_lat = plotting_data.MidLatitude[i]
-                mid_lon = plotting_data.MidLongitude[i]
-                x_mid_pt, y_mid_pt = base_map(mid_lon, mid_lat)
-                base_map.plot(x_mid_pt, y_mid_pt, zorder=2,
-                              marker='o', color=colours[b], alpha=0.9, markersize=marker_size[b],
-                              markeredgecolor='w')
+        bin_positions = self._get_bin_positions(hotspots_data.IncidentCount, breaks.bins)
+        for b in range(len(breaks.bins)):
+            plotting_data = hotspots_data[bin_positions == b]
+            self._plot_markers(
+                base_map, plotting_data.MidLongitude.values, plotting_data.MidLatitude.values,
+                colour=colours[b], marker_size=marker_size[b])
 
         # Add a colour bar
         cb = colour_bar_index(cmap=cmap, n_colours=len(jenks_labels), labels=jenks_labels, shrink=0.4,
@@ -906,11 +1128,9 @@ class Hotspots:
         hotspots_data_init.replace(to_replace={'DelayCost': {0: np.nan}}, inplace=True)
         notnull_data = hotspots_data_init[hotspots_data_init.DelayCost.notnull()]
 
-        # Set a random_seed number
-        np.random.seed(random_seed)
-
         # Calculate Jenks natural breaks for delay minutes
-        breaks = mapclassify.NaturalBreaks(y=notnull_data.DelayCost.values, k=5, initial=100)
+        breaks = self._get_jenks_breaks(
+            notnull_data.DelayCost.values, k=5, random_seed=random_seed, initial=100)
         hotspots_data = hotspots_data_init.join(
             pd.DataFrame(data={'jenks_bins': breaks.yb}, index=notnull_data.index))
         # df.drop('jenks_bins', axis=1, inplace=True)
@@ -929,24 +1149,13 @@ class Hotspots:
         fig, base_map = self.plot_base_map(legend_loc=(1.05, 0.90))
         fig.subplots_adjust(left=0.001, bottom=0.000, right=0.7715, top=1.000)
 
-        bins = [np.nan] + list(breaks.bins)
-        for b in range(len(bins)):
-            idx_0, idx_1 = hotspots_data.DelayCost <= bins[b], hotspots_data.DelayCost > bins[b - 1]
-            if np.isnan(bins[b]):
-                plotting_data = hotspots_data[hotspots_data.DelayCost.isnull()]
-            elif bins[b] == np.nanmin(bins):
-                plotting_data = hotspots_data[idx_0]
-            elif bins[b] == np.nanmax(bins):
-                plotting_data = hotspots_data[idx_1]
-            else:
-                plotting_data = hotspots_data[idx_0 & idx_1]
-            for i in plotting_data.index:
-                mid_lat = plotting_data.MidLatitude[i]
-                mid_lon = plotting_data.MidLongitude[i]
-                x_mid_pt, y_mid_pt = base_map(mid_lon, mid_lat)
-                base_map.plot(x_mid_pt, y_mid_pt, zorder=2,
-                              marker='o', color=colours[b], alpha=0.9,
-                              markersize=marker_size[b], markeredgecolor='w', markeredgewidth=1)
+        # The first bin is for the locations with no cost
+        bin_positions = self._get_bin_positions(hotspots_data.DelayCost, breaks.bins) + 1
+        for b in range(len(breaks.bins) + 1):
+            plotting_data = hotspots_data[bin_positions == b]
+            self._plot_markers(
+                base_map, plotting_data.MidLongitude.values, plotting_data.MidLatitude.values,
+                colour=colours[b], marker_size=marker_size[b])
 
         # Add a colour bar
         cb = colour_bar_index(cmap=cmap, n_colours=len(jenks_labels), labels=jenks_labels, shrink=0.4,
@@ -1016,11 +1225,9 @@ class Hotspots:
 
         notnull_data = hotspots_data_init[hotspots_data_init.DelayMinutesPerIncident.notnull()]
 
-        # Set a random_seed number
-        np.random.seed(random_seed)
-
         # Calculate Jenks natural breaks for delay minutes
-        breaks = mapclassify.NaturalBreaks(y=notnull_data.DelayMinutesPerIncident.values, k=6)
+        breaks = self._get_jenks_breaks(
+            notnull_data.DelayMinutesPerIncident.values, k=6, random_seed=random_seed)
         hotspots_data = hotspots_data_init.join(
             pd.DataFrame({'jenks_bins': breaks.yb}, index=notnull_data.index))
         # data['jenks_bins'].fillna(-1, inplace=True)
@@ -1035,23 +1242,13 @@ class Hotspots:
         fig, base_map = self.plot_base_map(legend_loc=(1.05, 0.9))
         fig.subplots_adjust(left=0.001, bottom=0.000, right=0.7715, top=1.000)
 
-        bins = list(breaks.bins)
-        for b in range(len(bins)):
-            idx_0 = hotspots_data.DelayMinutesPerIncident <= bins[b]
-            idx_1 = hotspots_data.DelayMinutesPerIncident > bins[b - 1]
-            if bins[b] == min(bins):
-                plotting_data = hotspots_data[idx_0]
-            elif bins[b] == max(bins):
-                plotting_data = hotspots_data[idx_1]
-            else:
-                plotting_data = hotspots_data[idx_0 & idx_1]
-            for i in plotting_data.index:
-                mid_lat = plotting_data.MidLatitude[i]
-                mid_lon = plotting_data.MidLongitude[i]
-                mid_x, mid_y = base_map(mid_lon, mid_lat)
-                base_map.plot(mid_x, mid_y, zorder=2, marker='o', color=colours[b], alpha=0.9,
-                              markersize=marker_size[b],
-                              markeredgecolor='w')
+        bin_positions = self._get_bin_positions(
+            hotspots_data.DelayMinutesPerIncident, breaks.bins)
+        for b in range(len(breaks.bins)):
+            plotting_data = hotspots_data[bin_positions == b]
+            self._plot_markers(
+                base_map, plotting_data.MidLongitude.values, plotting_data.MidLatitude.values,
+                colour=colours[b], marker_size=marker_size[b])
 
         # Add a colour bar
         cb = colour_bar_index(cmap=cmap, n_colours=len(jenks_labels), labels=jenks_labels, shrink=0.4,
@@ -1089,12 +1286,66 @@ class Hotspots:
                                             show_nr_hazardous_trees,
                                             save_as, dpi, verbose=True)
 
-    def plot_hotspots_on_route(self, save_as=".tif", dpi=600, update=False, confirmation_required=True):
+    def prepare_hotspots_data(self, add_osm_natural_tree=False, update=False, verbose=False):
         """
-        :param save_as:
-        :param dpi:
+        Prepare the data shared by the hotspot figures, i.e. the base map (with all the layers),
+        the midpoints of incident locations, the annual stats, the weather cells and the hazardous
+        trees.
+
+        Any (cached) data is updated only here; the plotting methods then read the prepared data
+        (in ``.PreparedData``) and write nothing.
+
+        :param add_osm_natural_tree: [bool] whether to include OSM natural trees (default: False)
         :param update: [bool] (default: False)
+        :param verbose: [bool] (default: False)
+        :return: [dict] the prepared data
+
+        **Test**::
+
+            >>> from illustrator.hotspot import Hotspots
+
+            >>> hotspots = Hotspots()
+
+            >>> prepared_data = hotspots.prepare_hotspots_data()
+            >>> list(prepared_data.keys())
+            ['BaseMap', 'Midpoints', 'AnnualStats', 'WeatherCell', 'HazardousTrees']
+        """
+
+        self.PreparedData = {}
+
+        prepared_data = {
+            'BaseMap': self.prepare_base_map(
+                add_osm_natural_tree=add_osm_natural_tree, update=update, verbose=verbose),
+            'Midpoints': self.get_midpoints_for_plotting_hotspots(update=update, verbose=verbose),
+            'AnnualStats': self.get_schedule8_annual_stats(update=update, verbose=verbose),
+            'WeatherCell': self.METEx.get_weather_cell(update=update),
+            'HazardousTrees': self.Vegetation.view_hazardous_trees(),
+        }
+
+        self.PreparedData = prepared_data
+
+        return prepared_data
+
+    def plot_hotspots_on_route(self, save_as=".tif", dpi=600, update=False, confirmation_required=True,
+                               outputs=None, max_workers=None):
+        """
+        Plot all the hotspot figures for the Route.
+
+        The data shared by the figures is prepared (and cached) first, in the current process
+        (see :py:meth:`Hotspots.prepare_hotspots_data`); the figures are then rendered from the
+        prepared data concurrently in separate processes (with the non-interactive backend 'Agg'),
+        which write nothing but the figures.
+
+        :param save_as: [str; list] file format(s) of the main figures (default: ".tif")
+        :param dpi: [int; list] dpi (for each of the file formats) of the main figures (default: 600)
+        :param update: [bool] whether to update the prepared data (default: False)
         :param confirmation_required:
+        :param outputs: [dict; None (default)] the figures to be rendered, i.e. names of the plotting
+            methods and their keyword arguments (e.g. ``{'show_costs': {'save_as': '.png'}}``);
+            if None, all the hotspot figures (with ``save_as`` and ``dpi`` for the main ones);
+            any ``update`` of a figure applies to the prepared data
+        :param max_workers: [int; None (default)] maximum number of worker processes;
+            if 1, the figures are rendered one after another in the current process
 
         **Test**::
 
@@ -1105,21 +1356,78 @@ class Hotspots:
             >>> hotspots.plot_hotspots_on_route()
         """
 
-        if confirmed(confirmation_required=confirmation_required):
-            # Fig. 1.
-            self.plot_base_map_plus(save_as=save_as, dpi=dpi)
-
-            # Fig. 2: Annual delays
-            self.show_annual_stats(save_as=save_as, dpi=dpi, update=update)
+        if outputs is None:
+            outputs = {
+                # Fig. 1.
+                'plot_base_map_plus': {'save_as': save_as, 'dpi': dpi},
+                # Fig. 2: Annual delays
+                'show_annual_stats': {'save_as': save_as, 'dpi': dpi},
+                # Fig. 3: Delays
+                'show_delays': {'save_as': save_as, 'dpi': dpi},
+                # Cost
+                'show_costs': {'save_as': ".png"},
+                # Frequency
+                'show_incident_frequency': {'save_as': ".png"},
+                # Delay minutes per incident
+                'show_delays_per_incident': {'save_as': ".png"},
+            }
 
-            # Fig. 3: Delays
-            self.show_delays(save_as=save_as, dpi=dpi, update=update)
+        if confirmed(confirmation_required=confirmation_required):
+            # Any update is done once, in the preparation of the shared data
+            update = update or any(kwargs.get('update', False) for kwargs in outputs.values())
+            outputs = {method_name: {k: v for k, v in kwargs.items() if k != 'update'}
+                       for method_name, kwargs in outputs.items()}
 
-            # Cost
-            self.show_costs(save_as=".png", update=update)
+            # Prepare the shared data (so that the figures can all be rendered from it)
+            prepared_data = self.prepare_hotspots_data(
+                add_osm_natural_tree=any(
+                    kwargs.get('add_osm_natural_tree', False) for kwargs in outputs.values()),
+                update=update)
 
-            # Frequency
-            self.show_incident_frequency(save_as=".png", update=update)
+            if max_workers == 1:
+                for method_name, kwargs in outputs.items():
+                    self.__getattribute__(method_name)(**kwargs)
 
-            # Delay minutes per incident
-            self.show_delays_per_incident(save_as=".png", update=update)
+            else:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(
+                            render_hotspots_figure, self.DatabaseName, self.Route,
+                            self.WeatherCategory, method_name, kwargs, prepared_data): method_name
+                        for method_name, kwargs in outputs.items()}
+
+                    for future in concurrent.futures.as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            print("Failed to render the figure by \"{}\". {}.".format(
+                                futures[future], e))
+
+
+def render_hotspots_figure(database_name, route_name, weather_category, method_name, kwargs,
+                           prepared_data):
+    """
+    Render a hotspot figure (in a worker process) from the prepared data.
+
+    :param database_name: [str] name of the METEx database
+    :param route_name: [str] name of the Route
+    :param weather_category: [str] weather category
+    :param method_name: [str] name of the plotting method of :py:class:`Hotspots`,
+        e.g. 'show_delays'
+    :param kwargs: [dict] keyword arguments of the plotting method
+    :param prepared_data: [dict] data shared by the figures
+        (see :py:meth:`Hotspots.prepare_hotspots_data`)
+    :return: [str] the ``method_name``
+    """
+
+    matplotlib.use('Agg')
+
+    hotspots = Hotspots(database_name=database_name)
+    hotspots.Route, hotspots.WeatherCategory = route_name, weather_category
+    hotspots.PreparedData = prepared_data
+
+    hotspots.__getattribute__(method_name)(**kwargs)
+
+    plt.close('all')
+
+    return method_name
@@ -4,9 +4,11 @@ Modeller.
 
 from .prototype import HeatAttributedIncidents, WindAttributedIncidents
 from .prototype_ext import HeatAttributedIncidentsPlus
+from .scoring import ScoringModel
 
 __all__ = [
     'attribution',
     'prototype', 'WindAttributedIncidents', 'HeatAttributedIncidents',
     'prototype_ext', 'HeatAttributedIncidentsPlus',
+    'scoring', 'ScoringModel',
 ]
@@ -1,14 +1,210 @@
 """ Weather attribution of Incidents """
 
+import os
+
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import CountVectorizer
+import scipy.sparse
+from sklearn.feature_extraction.text import HashingVectorizer
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
+from sklearn.base import clone
+from sklearn.model_selection import cross_val_score, train_test_split
+
+from preprocessor import Schedule8IncidentReports
+from utils import cd_models, get_data_source, load_pickle, make_filename, save_pickle
+
+
+# == Text features ====================================================================================
+
+def get_incident_descriptions(data):
+    """
+    Concatenate the description fields of incident records.
+
+    :param data: data of incident records
+    :type data: pandas.DataFrame
+    :return: description of each incident record
+    :rtype: pandas.Series
+    """
+
+    def field(col_name):
+        # (Missing values are left blank, rather than being written as 'nan')
+        return data[col_name].astype(object).fillna('').astype(str)
+
+    descriptions = \
+        field('IncidentDescription') + ' ' + \
+        field('IncidentReasonCode') + ' ' + \
+        field('IncidentReasonName') + ' ' + \
+        field('IncidentReasonDescription') + ' ' + \
+        field('IncidentJPIPCategory') + ' ' + \
+        field('IncidentCategory') + ' ' + \
+        field('IncidentCategoryDescription') + ' ' + \
+        field('IncidentCategorySuperGroupCode')
+
+    return descriptions
+
+
+def get_word_counter(descriptions, name=None, n_features=2 ** 20, chunk_size=100000, update=False,
+                     verbose=False):
+    """
+    Get word counts of descriptions of incident records.
+
+    The descriptions are tokenised chunk by chunk into a fixed number of (hashed) features,
+    so that no vocabulary needs to be fitted. If a ``name`` is given, word counts of the distinct
+    descriptions are cached under the name, and only the descriptions that have not been seen before
+    are vectorised; the cache keeps only the descriptions that are given (i.e. those of the current
+    data), so that it does not grow with the descriptions that are no longer in the data.
+
+    :param descriptions: description of each incident record
+    :type descriptions: pandas.Series or list
+    :param name: name under which the word counts are cached, e.g. ``'task-1'``,
+        defaults to ``None`` (i.e. no cache)
+    :type name: str or None
+    :param n_features: number of (hashed) features, defaults to ``2 ** 20``
+    :type n_features: int
+    :param chunk_size: number of descriptions that are tokenised at a time, defaults to ``100000``
+    :type chunk_size: int
+    :param update: whether to ignore the cached word counts, defaults to ``False``
+    :type update: bool
+    :param verbose: whether to print relevant information in console, defaults to ``False``
+    :type verbose: bool
+    :return: word counts of the descriptions (one row per description)
+    :rtype: scipy.sparse.csr_matrix
+
+    **Test**::
+
+        from modeller.attribution import get_word_counter
+
+        word_counter = get_word_counter(['Wind blown object', 'Heat related speed restriction'])
+
+        print(word_counter.shape)
+        # (2, 1048576)
+    """
+
+    distinct_descriptions = pd.Index(pd.unique(np.asarray(descriptions, dtype=object)))
+
+    if name is None:
+        path_to_pickle = None
+    else:
+        path_to_pickle = cd_models(
+            "prototype", "attribution",
+            make_filename("word-counter", None, None, name, str(n_features)))
+
+    cached_descriptions = pd.Index([], dtype=object)
+    cached_word_counter = scipy.sparse.csr_matrix((0, n_features), dtype=np.float64)
+    pruned = False
 
-from preprocessor import METExLite, Schedule8IncidentReports
+    if path_to_pickle is not None and os.path.isfile(path_to_pickle) and not update:
+        cached_descriptions, cached_word_counter = load_pickle(path_to_pickle)
 
-metex = METExLite()
+        # Prune the word counts of the descriptions that are no longer in the data
+        in_use = cached_descriptions.isin(distinct_descriptions)
+        if not in_use.all():
+            cached_descriptions = cached_descriptions[in_use]
+            cached_word_counter = cached_word_counter[np.flatnonzero(in_use)]
+            pruned = True
+
+    new_descriptions = distinct_descriptions.difference(cached_descriptions, sort=False)
+
+    if len(new_descriptions) > 0:
+        vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        new_word_counter = [
+            vectorizer.transform(new_descriptions[i:i + chunk_size])
+            for i in range(0, len(new_descriptions), chunk_size)]
+
+        cached_descriptions = cached_descriptions.append(new_descriptions)
+        cached_word_counter = scipy.sparse.vstack(
+            [cached_word_counter] + new_word_counter, format='csr')
+
+    if path_to_pickle is not None and (len(new_descriptions) > 0 or pruned):
+        save_pickle((cached_descriptions, cached_word_counter), path_to_pickle, verbose=verbose)
+
+    word_counter = cached_word_counter[cached_descriptions.get_indexer(descriptions)]
+
+    return word_counter
+
+
+# == Model training ===================================================================================
+
+def fit_classification_model(name, model, train_set, test_set, target, split=None,
+                             warm_start=False, cv=None, n_jobs=-1, verbose=False):
+    """
+    Fit (or continue fitting) a classification model of incident descriptions.
+
+    The fitted model is saved with the settings of the (hashed) word counts, the split of the data
+    sets, the parameters of the classifier and its metrics. If ``warm_start=True``, the model is
+    fitted starting from the previous solution, but only if a previously fitted model is available
+    for the same split, parameters, features and classes (so that no model that has been fitted
+    on the test set of another split is reused).
+
+    :param name: name of the model, e.g. ``'task-1'``
+    :type name: str
+    :param model: an (unfitted) classifier
+    :type model: sklearn.linear_model.LogisticRegression
+    :param train_set: training data set, i.e. ``{'word_counter': ..., 'data_frame': ...}``
+    :type train_set: dict
+    :param test_set: test data set, i.e. ``{'word_counter': ..., 'data_frame': ...}``
+    :type test_set: dict
+    :param target: name of the column of the target variable in ``'data_frame'``
+    :type target: str
+    :param split: settings of the split of ``train_set`` and ``test_set``,
+        e.g. ``{'random_state': 0, 'test_size': 0.2}``, defaults to ``None`` (i.e. a fixed split)
+    :type split: dict or None
+    :param warm_start: whether to start from a previously fitted model, defaults to ``False``
+    :type warm_start: bool
+    :param cv: number of cross-validation folds, defaults to ``None`` (i.e. no cross-validation)
+    :type cv: int or None
+    :param n_jobs: number of cross-validation folds that are fitted in parallel,
+        defaults to ``-1`` (i.e. all processors); note that the classifier itself is fitted as one
+        (binary or multinomial) problem
+    :type n_jobs: int
+    :param verbose: whether to print relevant information in console, defaults to ``False``
+    :type verbose: bool
+    :return: fitted model and its metrics
+    :rtype: tuple - (sklearn.linear_model.LogisticRegression, dict)
+    """
+
+    split = {} if split is None else dict(split)
+
+    path_to_pickle = cd_models("prototype", "attribution", make_filename(
+        name + "-model", None, None, *["{}_{}".format(k, v) for k, v in sorted(split.items())]))
+
+    x_train, y_train = train_set['word_counter'], train_set['data_frame'][target]
+    x_test, y_test = test_set['word_counter'], test_set['data_frame'][target]
+
+    # Parameters of the classifier (apart from those that do not affect the solution)
+    params = {k: v for k, v in model.get_params().items()
+              if k not in ('warm_start', 'n_jobs', 'verbose')}
+
+    if warm_start and os.path.isfile(path_to_pickle):
+        prev_model_data = load_pickle(path_to_pickle)
+        prev_model = prev_model_data['Model']
+
+        # Reuse the previous solution only if it has been fitted in the same way on the same data
+        if prev_model_data.get('Split') == split and prev_model_data.get('Params') == params and \
+                prev_model.coef_.shape[1] == x_train.shape[1] and \
+                set(prev_model.classes_) == set(np.unique(y_train)):
+            model = prev_model.set_params(**model.get_params())
+            model.set_params(warm_start=True)
+        else:
+            print("The previously fitted \"{}\" model does not match the split, parameters, "
+                  "features or classes, and is not reused.".format(name))
+
+    metrics = {}
+    if cv:
+        metrics['CrossValidationScores'] = cross_val_score(
+            clone(model).set_params(warm_start=False), x_train, y_train, cv=cv, n_jobs=n_jobs)
+
+    model.fit(x_train, y_train)
+
+    metrics['TrainingScore'] = model.score(x_train, y_train)
+    if x_test.shape[0] > 0:
+        metrics['TestScore'] = model.score(x_test, y_test)
+
+    save_pickle({'Model': model, 'NFeatures': x_train.shape[1], 'Split': split, 'Params': params,
+                 'Metrics': metrics},
+                path_to_pickle, verbose=verbose)
+
+    return model, metrics
 
 
 # == Task 1: Broad classification of incidents into weather-related and non-weather-related ===========
@@ -39,6 +235,7 @@ def get_task_1_train_test_data(random_state=0, test_size=0.2):
         # {'word_counter': <scipy.sparse.csr_matrix>, 'data_frame': <pandas.DataFrame>}
     """
 
+    metex = get_data_source('METExLite')
     dat = metex.view_schedule8_costs_by_datetime_location_reason()
     dat['weather_related'] = dat.WeatherCategory.map(lambda x: 0 if x == '' else 1)
 
@@ -54,18 +251,9 @@ def get_task_1_train_test_data(random_state=0, test_size=0.2):
                 'WeatherCategory']
 
     data = dat[['weather_related'] + features]
-    data['descriptions'] = \
-        data.IncidentDescription.astype(str) + ' ' + \
-        data.IncidentReasonCode + ' ' + \
-        data.IncidentReasonName + ' ' + \
-        data.IncidentReasonDescription + ' ' + \
-        data.IncidentJPIPCategory + ' ' + \
-        data.IncidentCategory + ' ' + \
-        data.IncidentCategoryDescription + ' ' + \
-        data.IncidentCategorySuperGroupCode
-
-    vectorizer = CountVectorizer()
-    word_counter = vectorizer.fit_transform(np.array(data.descriptions))
+    data['descriptions'] = get_incident_descriptions(data)
+
+    word_counter = get_word_counter(data.descriptions, name="task-1")
 
     if random_state is None:
         train_data, test_data = data[data.FinancialYear < 2018], data[data.FinancialYear == 2018]
@@ -90,7 +278,9 @@ def get_task_1_train_test_data(random_state=0, test_size=0.2):
     return train_set, test_set
 
 
-def classification_model_for_identifying_weather_related_incidents(random_state=0, test_size=0.2):
+def classification_model_for_identifying_weather_related_incidents(random_state=0, test_size=0.2,
+                                                                   warm_start=False, cv=None,
+                                                                   n_jobs=-1):
     """
     Fit model for Task 1.
 
@@ -98,6 +288,12 @@ def classification_model_for_identifying_weather_related_incidents(random_state=
     :type random_state: int, None
     :param test_size: size of test data set, defaults to ``0.2``
     :type test_size: int, float
+    :param warm_start: whether to start from the previously fitted model, defaults to ``False``
+    :type warm_start: bool
+    :param cv: number of cross-validation folds, defaults to ``None``
+    :type cv: int or None
+    :param n_jobs: number of cross-validation folds that are fitted in parallel, defaults to ``-1``
+    :type n_jobs: int
     :return: trained model
     :rtype: sklearn.linear_model.logistic.LogisticRegression
 
@@ -119,7 +315,10 @@ def classification_model_for_identifying_weather_related_incidents(random_state=
                                solver='saga', max_iter=1000, multi_class='ovr',
                                verbose=True,
                                warm_start=False, n_jobs=1)
-    model.fit(train_set['word_counter'], train_set['data_frame'].weather_related)
+    model, _ = fit_classification_model(
+        "task-1", model, train_set, test_set, target='weather_related',
+        split={'random_state': random_state, 'test_size': test_size}, warm_start=warm_start, cv=cv,
+        n_jobs=n_jobs)
 
     # model.score(test_set['word_counter'], test_set['data_frame'].weather_related)
     # test_set['data_frame']['weather_related_predicted'] = model.predict(test_set['word_counter'])
@@ -155,6 +354,7 @@ def get_task_2_train_test_data():
         columns={'Year': 'FinancialYear', 'IncidentReason': 'IncidentReasonCode'},
         inplace=True)
 
+    metex = get_data_source('METExLite')
     dat = metex.view_schedule8_costs_by_datetime_location_reason()
     dat.WeatherCategory.fillna('', inplace=True)
 
@@ -175,19 +375,9 @@ def get_task_2_train_test_data():
 
     data = pd.DataFrame(pd.concat([dat_train, dat_test], ignore_index=True))
 
-    data['descriptions'] = \
-        data.IncidentDescription.astype(str) + ' ' + \
-        data.IncidentReasonCode + ' ' + \
-        data.IncidentReasonName + ' ' + \
-        data.IncidentReasonDescription + ' ' + \
-        data.IncidentJPIPCategory + ' ' + \
-        data.IncidentCategory + ' ' + \
-        data.IncidentCategoryDescription + ' ' + \
-        data.IncidentCategorySuperGroupCode
+    data['descriptions'] = get_incident_descriptions(data)
 
-    vectorizer = CountVectorizer()
-    word_counter = vectorizer.fit_transform(np.array(data.descriptions))
-    # data['word_count'] = csr_matrix_to_dict(word_counter, vectorizer)
+    word_counter = get_word_counter(data.descriptions, name="task-2")
 
     train_data, test_data = data[data.FinancialYear < 2014], data[data.FinancialYear == 2014]
     idx_train, idx_test = train_data.index, test_data.index
@@ -199,12 +389,19 @@ def get_task_2_train_test_data():
     return train_set, test_set
 
 
-def classification_model_for_weather_related_incidents(random_state=0):
+def classification_model_for_weather_related_incidents(random_state=0, warm_start=False, cv=None,
+                                                       n_jobs=-1):
     """
     Fit model for Task 2.
 
     :param random_state: a random seed number, defaults to ``0``
     :type random_state: int, None
+    :param warm_start: whether to start from the previously fitted model, defaults to ``False``
+    :type warm_start: bool
+    :param cv: number of cross-validation folds, defaults to ``None``
+    :type cv: int or None
+    :param n_jobs: number of cross-validation folds that are fitted in parallel, defaults to ``-1``
+    :type n_jobs: int
     :return: trained model
     :rtype: sklearn.linear_model.logistic.LogisticRegression
 
@@ -221,7 +418,9 @@ def classification_model_for_weather_related_incidents(random_state=0):
                                solver='saga', max_iter=1000, multi_class='multinomial',
                                verbose=True,
                                warm_start=False, n_jobs=1)
-    model.fit(train_set['word_counter'], train_set['data_frame'].WeatherCategory)
+    model, _ = fit_classification_model(
+        "task-2", model, train_set, test_set, target='WeatherCategory', warm_start=warm_start,
+        cv=cv, n_jobs=n_jobs)
 
     # test_set['data_frame']['predicted_weather_category'] = model.predict(test_set['word_counter'])
 
@@ -16,14 +16,22 @@ import pandas as pd
 import shapely.geometry
 import statsmodels.discrete.discrete_model as sm_dcm
 from pyhelpers.settings import mpl_preferences, pd_preferences
-from pyhelpers.store import load_pickle, save_fig, save_pickle, save_svg_as_emf
+from pyhelpers.store import save_fig, save_svg_as_emf
 from sklearn import metrics
 from sklearn.utils import extmath
 
 from coordinator.feature import categorise_track_orientations, get_data_by_meteorological_seasons
 from coordinator.furlong import get_furlongs_data, get_incident_location_furlongs
-from preprocessor import METExLite
-from utils import cd_models, make_filename
+from modeller.scoring import ScoringModel
+from utils import apply_categorical_schema, apply_in_chunks, apply_to_scratch, cd_models, \
+    get_data_source, is_scratch_complete, iter_scratch_chunks, load_from_scratch, load_pickle, \
+    make_filename, save_pickle, traced
+
+# Ratio of the memory required by .integrate_incident_weather() to the size of a chunk of incident
+# records (see utils.estimate_chunk_size()): at its peak, the records of both the IPs and the non-IPs
+# (i.e. two copies of the chunk, each with the weather statistics appended) are held alongside
+# their concatenation (i.e. another two copies)
+INCIDENT_WEATHER_EXPANSION = 4
 
 
 class WindAttributedIncidents:
@@ -36,18 +44,21 @@ class WindAttributedIncidents:
         given that StartELR != EndELR, defaults to ``220``
     :param hazard_pctl:
     :type hazard_pctl: defaults to ``50``
+    :param memory_budget: memory budget (in bytes) for processing a chunk of incident records;
+        if ``None`` (default), all incident records are processed at once
+    :type memory_budget: int or None
     """
 
     def __init__(self, trial_id,
                  ip_start_hrs=-12, ip_end_hrs=12, nip_start_hrs=-12,
                  shift_yards_same_elr=220, shift_yards_diff_elr=220, hazard_pctl=50,
-                 model_type='logit', in_seasons=None, outlier_pctl=99):
+                 model_type='logit', in_seasons=None, outlier_pctl=99, memory_budget=None):
 
         self.Name = 'A prototype data model of predicting wind-related incidents.'
 
         self.TrialID = "{}".format(trial_id)
 
-        self.METEx = METExLite(database_name='NR_METEx_20150331')
+        self.METEx = get_data_source('METExLite', database_name='NR_METEx_20150331')
 
         self.Route = 'Anglia'
         self.WeatherCategory = 'Wind'
@@ -61,6 +72,8 @@ class WindAttributedIncidents:
 
         self.HazardsPercentile = hazard_pctl
 
+        self.MemoryBudget = memory_budget
+
         # Get incident_location_furlongs
         self.Furlongs = get_furlongs_data(route_name=self.Route, weather_category=None,
                                           shift_yards_same_elr=self.ShiftYardsForSameELRs,
@@ -483,7 +496,171 @@ class WindAttributedIncidents:
 
     # == Data integration =============================================================================
 
-    def get_incident_location_weather(self, update=False, pickle_it=False, verbose=False):
+    @traced()
+    def integrate_incident_weather(self, incidents):
+        """
+        Integrate the weather conditions of the incident / non-incident periods for incident records.
+
+        :param incidents: data of incident records
+        :type incidents: pandas.DataFrame
+        :return: weather conditions of the incident records
+        :rtype: pandas.DataFrame
+
+        **Test**::
+
+            >>> from modeller.prototype import WindAttributedIncidents
+
+            >>> w_model = WindAttributedIncidents(trial_id=2)
+
+            >>> incident_records = w_model.METEx.view_schedule8_costs_by_datetime_location_reason(
+            ...     w_model.Route, w_model.WeatherCategory)
+
+            >>> incid_loc_weather = w_model.integrate_incident_weather(incident_records)
+        """
+
+        # Get data for the specified "Incident Periods"
+        incidents = incidents.copy()
+        incidents['Incident_Duration'] = incidents.EndDateTime - incidents.StartDateTime
+        incidents['Critical_StartDateTime'] = \
+            incidents.StartDateTime.map(datetime_truncate.truncate_hour) + \
+            pd.Timedelta(hours=self.IP_StartHrs)
+        incidents['Critical_EndDateTime'] = \
+            incidents.EndDateTime.apply(datetime_truncate.truncate_hour) + \
+            pd.Timedelta(hours=self.IP_EndHrs)
+        incidents['Critical_Period'] = \
+            incidents.Critical_EndDateTime - incidents.Critical_StartDateTime
+
+        def get_ip_weather_stats(weather_cell_id, ip_start, ip_end):
+            """
+            Processing weather data for IP.
+            (Get data of weather conditions that led to Incidents for each record.)
+
+            :param weather_cell_id: weather cell ID
+            :type weather_cell_id: int
+            :param ip_start: start of an incident period
+            :type ip_start: pandas.Timestamp
+            :param ip_end: end of an incident period
+            :type ip_end: pandas.Timestamp
+            :return: a list of statistics
+            :rtype: list
+
+            **Test**::
+
+                i = 1
+
+                weather_cell_id = incidents.WeatherCell[i]
+                ip_start = incidents.StartDateTime[i]
+                ip_end = incidents.EndDateTime[i]
+            """
+
+            # Get Weather data about where and when the incident occurred
+            ip_weather_obs = self.METEx.query_weather_by_id_datetime(
+                weather_cell_id, ip_start, ip_end, pickle_it=False)
+
+            # Get the max/min/avg Weather parameters for those incident periods
+            weather_stats = self.calc_weather_stats(ip_weather_obs)
+
+            return weather_stats
+
+        # Get data for the specified IP
+        # noinspection PyTypeChecker
+        ip_stats = incidents.apply(
+            lambda x: get_ip_weather_stats(
+                x.WeatherCell, x.Critical_StartDateTime, x.Critical_EndDateTime),
+            axis=1)
+
+        ip_statistics = pd.DataFrame(
+            ip_stats.to_list(), index=ip_stats.index, columns=self.get_weather_variable_names())
+
+        ip_statistics['Temperature_dif'] = \
+            ip_statistics.Temperature_max - ip_statistics.Temperature_min
+
+        #
+        ip_data = incidents.join(ip_statistics.dropna(), how='inner')
+        ip_data['IncidentReported'] = 1
+
+        # Processing Weather data for non-IP
+        nip_data = incidents.copy(deep=True)
+        nip_data.Critical_EndDateTime = nip_data.Critical_StartDateTime  # + .timedelta(hours=0)
+        nip_data.Critical_StartDateTime = \
+            nip_data.Critical_StartDateTime + pd.Timedelta(hours=self.NIP_StartHrs)
+        nip_data.Critical_Period = \
+            nip_data.Critical_EndDateTime - nip_data.Critical_StartDateTime
+
+        # Get data of Weather which did not cause Incidents for each record
+        def get_non_ip_weather_stats(weather_cell_id, nip_start, nip_end, stanox_section):
+            """
+            Processing weather data for non-IP.
+            (Get data of weather conditions that were less likely to lead to incidents.)
+
+            :param weather_cell_id: weather cell ID
+            :type weather_cell_id: int
+            :param nip_start: start of a non-incident period
+            :type nip_start: pandas.Timestamp
+            :param nip_end: end of a non-incident period
+            :type nip_end: pandas.Timestamp
+            :param stanox_section: STANOX section
+            :type stanox_section: str
+            :return: a list of statistics
+            :rtype: list
+
+            **Test**::
+
+                i = 1000
+
+                weather_cell_id = nip_data.WeatherCell.iloc[i]
+                nip_start = nip_data.StartDateTime.iloc[i]
+                nip_end = nip_data.EndDateTime.iloc[i]
+                stanox_section = nip_data.StanoxSection.iloc[i]
+            """
+
+            # Get non-IP Weather data about where and when the incident occurred
+            non_ip_weather_obs = self.METEx.query_weather_by_id_datetime(
+                weather_cell_id, nip_start, nip_end, pickle_it=False)
+
+            # Get all incident period data on the same section
+            overlaps = ip_data[
+                (ip_data.StanoxSection == stanox_section) &
+                (((ip_data.Critical_StartDateTime <= nip_start) & (
+                        ip_data.Critical_EndDateTime >= nip_start)) |
+                 ((ip_data.Critical_StartDateTime <= nip_end) & (
+                         ip_data.Critical_EndDateTime >= nip_end)))]
+
+            # Skip data of Weather causing Incidents at around the same time but
+            if not overlaps.empty:
+                non_ip_weather_obs = non_ip_weather_obs[
+                    (non_ip_weather_obs.DateTime < np.min(overlaps.Critical_StartDateTime)) |
+                    (non_ip_weather_obs.DateTime > np.max(overlaps.Critical_EndDateTime))]
+
+            # Get the max/min/avg Weather parameters for those incident periods
+            non_ip_weather_stats = self.calc_weather_stats(non_ip_weather_obs)
+
+            return non_ip_weather_stats
+
+        # Get stats data for the specified "Non-Incident Periods"
+        # noinspection PyTypeChecker
+        nip_stats = nip_data.apply(
+            lambda x: get_non_ip_weather_stats(
+                x.WeatherCell, x.Critical_StartDateTime, x.Critical_EndDateTime,
+                x.StanoxSection),
+            axis=1)
+        nip_statistics = pd.DataFrame(
+            nip_stats.tolist(), index=nip_stats.index, columns=self.get_weather_variable_names())
+        nip_statistics['Temperature_dif'] = \
+            nip_statistics.Temperature_max - nip_statistics.Temperature_min
+
+        #
+        nip_data = nip_data.join(nip_statistics.dropna(), how='inner')
+        nip_data['IncidentReported'] = 0
+
+        # Merge "ip_data" and "nip_data" into one DataFrame
+        incident_location_weather = pd.concat([nip_data, ip_data], axis=0, ignore_index=True)
+
+        return incident_location_weather
+
+    @traced()
+    def get_incident_location_weather(self, update=False, pickle_it=False, verbose=False,
+                                      as_scratch=False):
         """
         Get TRUST data and the weather conditions for each incident location.
 
@@ -493,8 +670,11 @@ class WindAttributedIncidents:
         :type pickle_it: bool
         :param verbose: whether to print relevant information in console, defaults to ``False``
         :type verbose: bool or int
-        :return: weather conditions of incident locations
-        :rtype: pandas.DataFrame or None
+        :param as_scratch: whether to return the path to the scratch directory where the result is
+            saved chunk by chunk (only if ``.MemoryBudget`` is set), defaults to ``False``
+        :type as_scratch: bool
+        :return: weather conditions of incident locations (or the path to their scratch directory)
+        :rtype: pandas.DataFrame or str or None
 
         **Test**::
 
@@ -518,8 +698,14 @@ class WindAttributedIncidents:
             "weather", self.Route, self.WeatherCategory,
             self.IP_StartHrs, self.IP_EndHrs, self.NIP_StartHrs, save_as=".pickle")
         path_to_pickle = self.cdd_trial(pickle_filename)
+        path_to_scratch = self.cdd_trial("scratch", os.path.splitext(pickle_filename)[0])
 
-        if os.path.isfile(path_to_pickle) and not update:
+        as_scratch = as_scratch and self.MemoryBudget is not None
+
+        if as_scratch and is_scratch_complete(path_to_scratch) and not update:
+            incident_location_weather = path_to_scratch
+
+        elif not as_scratch and os.path.isfile(path_to_pickle) and not update:
             incident_location_weather = load_pickle(path_to_pickle)
 
         else:
@@ -530,144 +716,21 @@ class WindAttributedIncidents:
                 # Drop non-weather-related incident records
                 if self.WeatherCategory is None:
                     incidents = incidents[incidents.WeatherCategory != '']
-                # Get data for the specified "Incident Periods"
-                incidents['Incident_Duration'] = incidents.EndDateTime - incidents.StartDateTime
-                incidents['Critical_StartDateTime'] = \
-                    incidents.StartDateTime.map(datetime_truncate.truncate_hour) + \
-                    pd.Timedelta(hours=self.IP_StartHrs)
-                incidents['Critical_EndDateTime'] = \
-                    incidents.EndDateTime.apply(datetime_truncate.truncate_hour) + \
-                    pd.Timedelta(hours=self.IP_EndHrs)
-                incidents['Critical_Period'] = \
-                    incidents.Critical_EndDateTime - incidents.Critical_StartDateTime
 
-                def get_ip_weather_stats(weather_cell_id, ip_start, ip_end):
-                    """
-                    Processing weather data for IP.
-                    (Get data of weather conditions that led to Incidents for each record.)
-
-                    :param weather_cell_id: weather cell ID
-                    :type weather_cell_id: int
-                    :param ip_start: start of an incident period
-                    :type ip_start: pandas.Timestamp
-                    :param ip_end: end of an incident period
-                    :type ip_end: pandas.Timestamp
-                    :return: a list of statistics
-                    :rtype: list
-
-                    **Test**::
-
-                        i = 1
-
-                        weather_cell_id = incidents.WeatherCell[i]
-                        ip_start = incidents.StartDateTime[i]
-                        ip_end = incidents.EndDateTime[i]
-                    """
-
-                    # Get Weather data about where and when the incident occurred
-                    ip_weather_obs = self.METEx.query_weather_by_id_datetime(
-                        weather_cell_id, ip_start, ip_end, pickle_it=False)
-
-                    # Get the max/min/avg Weather parameters for those incident periods
-                    weather_stats = self.calc_weather_stats(ip_weather_obs)
-
-                    return weather_stats
-
-                # Get data for the specified IP
-                # noinspection PyTypeChecker
-                ip_stats = incidents.apply(
-                    lambda x: get_ip_weather_stats(
-                        x.WeatherCell, x.Critical_StartDateTime, x.Critical_EndDateTime),
-                    axis=1)
-
-                ip_statistics = pd.DataFrame(
-                    ip_stats.to_list(), index=ip_stats.index, columns=self.get_weather_variable_names())
-
-                ip_statistics['Temperature_dif'] = \
-                    ip_statistics.Temperature_max - ip_statistics.Temperature_min
-
-                #
-                ip_data = incidents.join(ip_statistics.dropna(), how='inner')
-                ip_data['IncidentReported'] = 1
-
-                # Processing Weather data for non-IP
-                nip_data = incidents.copy(deep=True)
-                nip_data.Critical_EndDateTime = nip_data.Critical_StartDateTime  # + .timedelta(hours=0)
-                nip_data.Critical_StartDateTime = \
-                    nip_data.Critical_StartDateTime + pd.Timedelta(hours=self.NIP_StartHrs)
-                nip_data.Critical_Period = \
-                    nip_data.Critical_EndDateTime - nip_data.Critical_StartDateTime
-
-                # Get data of Weather which did not cause Incidents for each record
-                def get_non_ip_weather_stats(weather_cell_id, nip_start, nip_end, stanox_section):
-                    """
-                    Processing weather data for non-IP.
-                    (Get data of weather conditions that were less likely to lead to incidents.)
-
-                    :param weather_cell_id: weather cell ID
-                    :type weather_cell_id: int
-                    :param nip_start: start of a non-incident period
-                    :type nip_start: pandas.Timestamp
-                    :param nip_end: end of a non-incident period
-                    :type nip_end: pandas.Timestamp
-                    :param stanox_section: STANOX section
-                    :type stanox_section: str
-                    :return: a list of statistics
-                    :rtype: list
-
-                    **Test**::
-
-                        i = 1000
-
-                        weather_cell_id = nip_data.WeatherCell.iloc[i]
-                        nip_start = nip_data.StartDateTime.iloc[i]
-                        nip_end = nip_data.EndDateTime.iloc[i]
-                        stanox_section = nip_data.StanoxSection.iloc[i]
-                    """
-
-                    # Get non-IP Weather data about where and when the incident occurred
-                    non_ip_weather_obs = self.METEx.query_weather_by_id_datetime(
-                        weather_cell_id, nip_start, nip_end, pickle_it=False)
-
-                    # Get all incident period data on the same section
-                    overlaps = ip_data[
-                        (ip_data.StanoxSection == stanox_section) &
-                        (((ip_data.Critical_StartDateTime <= nip_start) & (
-                                ip_data.Critical_EndDateTime >= nip_start)) |
-                         ((ip_data.Critical_StartDateTime <= nip_end) & (
-                                 ip_data.Critical_EndDateTime >= nip_end)))]
-
-                    # Skip data of Weather causing Incidents at around the same time but
-                    if not overlaps.empty:
-                        non_ip_weather_obs = non_ip_weather_obs[
-                            (non_ip_weather_obs.DateTime < np.min(overlaps.Critical_StartDateTime)) |
-                            (non_ip_weather_obs.DateTime > np.max(overlaps.Critical_EndDateTime))]
-
-                    # Get the max/min/avg Weather parameters for those incident periods
-                    non_ip_weather_stats = self.calc_weather_stats(non_ip_weather_obs)
-
-                    return non_ip_weather_stats
-
-                # Get stats data for the specified "Non-Incident Periods"
-                # noinspection PyTypeChecker
-                nip_stats = nip_data.apply(
-                    lambda x: get_non_ip_weather_stats(
-                        x.WeatherCell, x.Critical_StartDateTime, x.Critical_EndDateTime,
-                        x.StanoxSection),
-                    axis=1)
-                nip_statistics = pd.DataFrame(
-                    nip_stats.tolist(), index=nip_stats.index, columns=self.get_weather_variable_names())
-                nip_statistics['Temperature_dif'] = \
-                    nip_statistics.Temperature_max - nip_statistics.Temperature_min
-
-                #
-                nip_data = nip_data.join(nip_statistics.dropna(), how='inner')
-                nip_data['IncidentReported'] = 0
-
-                # Merge "ip_data" and "nip_data" into one DataFrame
-                incident_location_weather = pd.concat([nip_data, ip_data], axis=0, ignore_index=True)
-
-                if pickle_it:
+                if self.MemoryBudget is None:
+                    incident_location_weather = self.integrate_incident_weather(incidents)
+                else:
+                    # Process the incident records (of the same sections together) chunk by chunk
+                    apply_in_chunks(
+                        incidents, self.integrate_incident_weather, path_to_scratch,
+                        memory_budget=self.MemoryBudget, expansion=INCIDENT_WEATHER_EXPANSION,
+                        group_by='StanoxSection', verbose=verbose)
+                    del incidents
+                    incident_location_weather = \
+                        path_to_scratch if as_scratch else \
+                        load_from_scratch(path_to_scratch, ignore_index=True)
+
+                if pickle_it and not as_scratch:
                     save_pickle(incident_location_weather, path_to_pickle, verbose=verbose)
 
             except Exception as e:
@@ -676,6 +739,7 @@ class WindAttributedIncidents:
 
         return incident_location_weather
 
+    @traced()
     def get_incident_location_vegetation(self, update=False, pickle_it=False, verbose=False):
         """
         Get vegetation conditions of incident locations.
@@ -767,7 +831,8 @@ class WindAttributedIncidents:
 
         return incident_location_vegetation
 
-    def integrate_data(self, update=False, pickle_it=False, verbose=False):
+    @traced()
+    def integrate_data(self, update=False, pickle_it=False, verbose=False, as_scratch=False):
         """
         Integrate the weather and vegetation conditions for incident locations.
 
@@ -777,8 +842,11 @@ class WindAttributedIncidents:
         :type pickle_it: bool
         :param verbose: whether to print relevant information in console, defaults to ``False``
         :type verbose: bool or int
-        :return: integrated data set for modelling
-        :rtype: pandas.DataFrame or None
+        :param as_scratch: whether to return the path to the scratch directory where the result is
+            saved chunk by chunk (only if ``.MemoryBudget`` is set), defaults to ``False``
+        :type as_scratch: bool
+        :return: integrated data set for modelling (or the path to its scratch directory)
+        :rtype: pandas.DataFrame or str or None
 
         **Test**::
 
@@ -803,39 +871,65 @@ class WindAttributedIncidents:
             self.IP_StartHrs, self.IP_EndHrs, self.NIP_StartHrs,
             self.ShiftYardsForSameELRs, self.ShiftYardsForDiffELRs, self.HazardsPercentile)
         path_to_file = self.cdd_trial(pickle_filename)
+        path_to_scratch = self.cdd_trial("scratch", os.path.splitext(pickle_filename)[0])
 
-        if os.path.isfile(path_to_file) and not update:
-            integrated_data = load_pickle(path_to_file)
+        as_scratch = as_scratch and self.MemoryBudget is not None
+
+        if as_scratch and is_scratch_complete(path_to_scratch) and not update:
+            integrated_data = path_to_scratch
+
+        elif not as_scratch and os.path.isfile(path_to_file) and not update:
+            integrated_data = apply_categorical_schema(load_pickle(path_to_file))
 
         else:
             try:
-                # Get information of Schedule 8 incident and the relevant weather conditions
-                incident_location_weather = self.get_incident_location_weather()
                 # Get information of vegetation conditions for the incident locations
-                incident_location_vegetation = self.get_incident_location_vegetation()
+                incident_location_vegetation = apply_categorical_schema(
+                    self.get_incident_location_vegetation())
                 # incident_location_vegetation.drop(
                 #     labels=['IncidentCount', 'DelayCost', 'DelayMinutes'], axis=1, inplace=True)
 
-                common_feats = list(
-                    set(incident_location_weather.columns) & set(incident_location_vegetation.columns))
-                integrated_weather_vegetation = pd.merge(
-                    incident_location_weather, incident_location_vegetation,
-                    how='inner', on=common_feats)
+                def integrate_weather_vegetation(incident_location_weather_):
+                    incident_location_weather_ = apply_categorical_schema(incident_location_weather_)
 
-                # Electrified
-                integrated_weather_vegetation.Electrified = \
-                    integrated_weather_vegetation.Electrified.astype(int)
+                    common_feats = list(
+                        set(incident_location_weather_.columns) &
+                        set(incident_location_vegetation.columns))
 
-                # Categorise average wind directions into 4 quadrants
-                wind_direction = pd.cut(
-                    integrated_weather_vegetation.WindDirection_avg.values,
-                    [0, 90, 180, 270, 360], right=False)
+                    integrated_weather_vegetation = pd.merge(
+                        incident_location_weather_, incident_location_vegetation,
+                        how='inner', on=common_feats)
 
-                integrated_data = integrated_weather_vegetation.join(
-                    pd.DataFrame(wind_direction, columns=['WindDirection_avg_quadrant'])).join(
-                    pd.get_dummies(wind_direction, prefix='WindDirection_avg'))
+                    # Electrified
+                    integrated_weather_vegetation.Electrified = \
+                        integrated_weather_vegetation.Electrified.astype(int)
 
-                if pickle_it:
+                    # Categorise average wind directions into 4 quadrants
+                    wind_direction = pd.cut(
+                        integrated_weather_vegetation.WindDirection_avg.values,
+                        [0, 90, 180, 270, 360], right=False)
+
+                    integrated_data_ = integrated_weather_vegetation.join(
+                        pd.DataFrame(wind_direction, columns=['WindDirection_avg_quadrant'])).join(
+                        pd.get_dummies(wind_direction, prefix='WindDirection_avg'))
+
+                    return integrated_data_
+
+                if self.MemoryBudget is None:
+                    # Get information of Schedule 8 incident and the relevant weather conditions
+                    integrated_data = integrate_weather_vegetation(
+                        self.get_incident_location_weather())
+                else:
+                    # Merge the weather conditions (saved chunk by chunk) with vegetation, one chunk
+                    # at a time, without assembling the whole of them in memory
+                    apply_to_scratch(
+                        self.get_incident_location_weather(as_scratch=True, verbose=verbose),
+                        integrate_weather_vegetation, path_to_scratch, verbose=verbose)
+                    integrated_data = \
+                        path_to_scratch if as_scratch else \
+                        load_from_scratch(path_to_scratch, ignore_index=True)
+
+                if pickle_it and not as_scratch:
                     save_pickle(integrated_data, path_to_file, verbose=verbose)
 
             except Exception as e:
@@ -859,43 +953,66 @@ class WindAttributedIncidents:
             >>> _, training_data, test_data = w_model.prep_training_and_test_sets()
         """
 
-        # Get the mdata for modelling
-        integrated_dat = self.integrate_data()
+        def select_season_data(data):
+            # Select season data: 'spring', 'summer', 'autumn', 'winter'
+            return get_data_by_meteorological_seasons(
+                data, in_seasons=self.Seasons, datetime_col='StartDate')
 
-        # Select season data: 'spring', 'summer', 'autumn', 'winter'
-        processed_data = get_data_by_meteorological_seasons(
-            integrated_dat, in_seasons=self.Seasons, datetime_col='StartDate')
+        # Get the mdata for modelling
+        if self.MemoryBudget is None:
+            season_data = select_season_data(self.integrate_data())
+            delay_minutes = season_data.DelayMinutes
+        else:
+            # Read the integrated data set (saved chunk by chunk) one chunk at a time
+            path_to_scratch = self.integrate_data(as_scratch=True)
+            season_data = None
+            delay_minutes = np.concatenate([
+                select_season_data(x).DelayMinutes.to_numpy()
+                for x in iter_scratch_chunks(path_to_scratch, columns=['StartDate', 'DelayMinutes'])])
 
         # Remove outliers
         if 95 <= self.OutlierPercentile <= 100:
-            upper_limit = np.percentile(processed_data.DelayMinutes, self.OutlierPercentile)
-            processed_data = processed_data[processed_data.DelayMinutes <= upper_limit]
-            # from pyhelpers.ops import get_extreme_outlier_bounds
-            # l, u = get_extreme_outlier_bounds(integrated_data.DelayMinutes, k=1.5)
-            # integrated_data = integrated_data[
-            #     integrated_data.DelayMinutes.between(l, u, inclusive=True)]
-
-        # CoverPercent
-        cover_percent_cols = [x for x in processed_data.columns if re.match('^CoverPercent', x)]
-        processed_data.loc[:, cover_percent_cols] = processed_data[cover_percent_cols] / 10.0
-        processed_data.loc[:, 'CoverPercentDiff'] = \
-            processed_data.CoverPercentVegetation - processed_data.CoverPercentOpenSpace - \
-            processed_data.CoverPercentOther
-        processed_data.loc[:, 'CoverPercentDiff'] = \
-            processed_data.CoverPercentDiff * processed_data.CoverPercentDiff.map(
-                lambda x: 1 if x >= 0 else 0)
-
-        # Scale down 'WindGust_max' and 'RelativeHumidity_max'
-        processed_data.loc[:, 'WindGust_max'] = processed_data.WindGust_max / 10.0
-        processed_data.loc[:, 'RelativeHumidity_max'] = processed_data.RelativeHumidity_max / 10.0
-
-        # Add an intercept
-        if add_const:
-            processed_data['const'] = 1
-
-        # Set the outcomes of non-incident records to 0
-        outcome_columns = ['DelayMinutes', 'DelayCost', 'IncidentCount']
-        processed_data.loc[processed_data.IncidentReported == 0, outcome_columns] = 0
+            upper_limit = np.percentile(delay_minutes, self.OutlierPercentile)
+        else:
+            upper_limit = None
+
+        def process_data(data):
+            if upper_limit is not None:
+                data = data[data.DelayMinutes <= upper_limit]
+                # from pyhelpers.ops import get_extreme_outlier_bounds
+                # l, u = get_extreme_outlier_bounds(integrated_data.DelayMinutes, k=1.5)
+                # integrated_data = integrated_data[
+                #     integrated_data.DelayMinutes.between(l, u, inclusive=True)]
+
+            # CoverPercent
+            cover_percent_cols = [x for x in data.columns if re.match('^CoverPercent', x)]
+            data.loc[:, cover_percent_cols] = data[cover_percent_cols] / 10.0
+            data.loc[:, 'CoverPercentDiff'] = \
+                data.CoverPercentVegetation - data.CoverPercentOpenSpace - data.CoverPercentOther
+            data.loc[:, 'CoverPercentDiff'] = \
+                data.CoverPercentDiff * data.CoverPercentDiff.map(lambda x: 1 if x >= 0 else 0)
+
+            # Scale down 'WindGust_max' and 'RelativeHumidity_max'
+            data.loc[:, 'WindGust_max'] = data.WindGust_max / 10.0
+            data.loc[:, 'RelativeHumidity_max'] = data.RelativeHumidity_max / 10.0
+
+            # Add an intercept
+            if add_const:
+                data['const'] = 1
+
+            # Set the outcomes of non-incident records to 0
+            outcome_columns = ['DelayMinutes', 'DelayCost', 'IncidentCount']
+            data.loc[data.IncidentReported == 0, outcome_columns] = 0
+
+            return data
+
+        if season_data is not None:
+            processed_data = process_data(season_data)
+        else:
+            # Assemble the design matrix from the processed chunks
+            processed_data = pd.concat(
+                [process_data(select_season_data(x)) for x in iter_scratch_chunks(path_to_scratch)],
+                axis=0, ignore_index=True, sort=False)
 
         # Select data before 2014 as training data set, with the rest being test set
         training_set = processed_data[processed_data.FinancialYear < 2014]
@@ -1004,6 +1121,7 @@ class WindAttributedIncidents:
             path_to_file_veg = self.cdd_trial("vegetation_variables" + save_as)
             save_fig(path_to_file_veg, dpi=dpi, conv_svg_to_emf=True, verbose=verbose)
 
+    @traced()
     def logistic_regression(self, add_intercept=True, random_state=0, pickle_it=True, verbose=True):
         """
         Logistic regression model.
@@ -1043,6 +1161,7 @@ class WindAttributedIncidents:
             else:
                 mod = sm_dcm.Probit(training_set.IncidentReported, training_set[explanatory_variables])
             result_summary = mod.fit(method='newton', maxiter=1000, full_output=True, disp=False)
+            self.__setattr__('Model', result_summary)
 
             if verbose:
                 print(result_summary.summary2())
@@ -1068,6 +1187,10 @@ class WindAttributedIncidents:
             self.__setattr__('AUC', auc)
             self.__setattr__('Threshold', threshold)
 
+            if pickle_it:
+                scoring_model = ScoringModel.from_trained_model(self)
+                scoring_model.save(self.cdd_trial(scoring_model.Name + ".pickle"), verbose=verbose)
+
             # prediction accuracy
             test_set['incident_prediction'] = test_set.incident_prob.apply(
                 lambda x: 1 if x >= threshold else 0)
@@ -1248,6 +1371,7 @@ class WindAttributedIncidents:
             path_to_pred_fig = self.cdd_trial("predicted_likelihood" + save_as)
             save_fig(path_to_pred_fig, dpi=dpi, conv_svg_to_emf=True, verbose=verbose)  # Fig. 7.
 
+    @traced()
     def evaluate_prototype_model(self, add_intercept=True, pickle_each_run=False, verbose=True):
         """
         Evaluate the primer model given different settings.
@@ -1395,7 +1519,7 @@ class HeatAttributedIncidents:
 
         self.TrialID = "{}".format(trial_id)
 
-        self.METEx = METExLite(database_name='NR_METEx_20150331')
+        self.METEx = get_data_source('METExLite', database_name='NR_METEx_20150331')
 
         self.Route = 'Anglia'
         self.WeatherCategory = 'Heat'
@@ -1791,6 +1915,7 @@ class HeatAttributedIncidents:
 
     # == Data integration =============================================================================
 
+    @traced()
     def get_incident_location_weather(self, update=False, pickle_it=False, verbose=False):
         """
         Get TRUST data and the weather conditions for each incident location.
@@ -2119,6 +2244,7 @@ class HeatAttributedIncidents:
             path_to_fig = self.cdd_trial("temperature-deviation" + save_as)
             save_fig(path_to_fig, dpi=dpi, verbose=verbose, conv_svg_to_emf=True)
 
+    @traced()
     def get_incident_location_vegetation(self, update=False, pickle_it=False, verbose=False):
         """
         Get vegetation conditions of incident locations.
@@ -2210,6 +2336,7 @@ class HeatAttributedIncidents:
 
         return incident_location_vegetation
 
+    @traced()
     def integrate_data(self, update=False, pickle_it=False, verbose=False):
         """
         Integrate the weather and vegetation conditions for incident locations.
@@ -2248,14 +2375,16 @@ class HeatAttributedIncidents:
         path_to_pickle = self.cdd_trial(pickle_filename)
 
         if os.path.isfile(path_to_pickle) and not update:
-            integrated_data = load_pickle(path_to_pickle)
+            integrated_data = apply_categorical_schema(load_pickle(path_to_pickle))
 
         else:
             try:
                 # Get Schedule 8 incident and Weather data for locations
-                incident_location_weather = self.get_incident_location_weather()
+                incident_location_weather = apply_categorical_schema(
+                    self.get_incident_location_weather())
                 # Get Vegetation conditions for the locations
-                incident_location_vegetation = self.get_incident_location_vegetation()
+                incident_location_vegetation = apply_categorical_schema(
+                    self.get_incident_location_vegetation())
 
                 # Merge the above two data sets
                 common_features = list(
@@ -2425,6 +2554,7 @@ class HeatAttributedIncidents:
             path_to_fig_file = self.cdd_trial("variables" + save_as)
             save_fig(path_to_fig_file, dpi=dpi, verbose=verbose, conv_svg_to_emf=True)
 
+    @traced()
     def logistic_regression(self, add_intercept=True, random_state=0, pickle_it=True, verbose=True):
         """
         Logistic regression model.
@@ -2464,6 +2594,7 @@ class HeatAttributedIncidents:
             else:
                 mod = sm_dcm.Probit(training_set.IncidentReported, training_set[explanatory_variables])
             result_summary = mod.fit(maxiter=10000, full_output=True, disp=False)  # method='newton'
+            self.__setattr__('Model', result_summary)
             if verbose:
                 print(result_summary.summary2())
 
@@ -2487,6 +2618,10 @@ class HeatAttributedIncidents:
             self.__setattr__('AUC', auc)
             self.__setattr__('Threshold', threshold)
 
+            if pickle_it:
+                scoring_model = ScoringModel.from_trained_model(self)
+                scoring_model.save(self.cdd_trial(scoring_model.Name + ".pickle"), verbose=verbose)
+
             # prediction accuracy
             test_set['incident_prediction'] = test_set.incident_prob.apply(
                 lambda x: 1 if x >= threshold else 0)
@@ -2622,6 +2757,7 @@ class HeatAttributedIncidents:
             path_to_pred_fig = self.cdd_trial("predicted_likelihood" + save_as)
             save_fig(path_to_pred_fig, dpi=dpi, verbose=verbose, conv_svg_to_emf=True)
 
+    @traced()
     def evaluate_prototype_model(self, add_intercept=True, pickle_each_run=False, verbose=True):
         """
         Evaluate the primer model given different settings.
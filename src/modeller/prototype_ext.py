@@ -49,7 +49,7 @@ import shapely.geometry
 import shapely.ops
 from pyhelpers.geom import get_geometric_midpoint, wgs84_to_osgb36
 from pyhelpers.settings import mpl_preferences, pd_preferences
-from pyhelpers.store import load_pickle, save_fig, save_pickle
+from pyhelpers.store import save_fig
 from scipy.stats import norm
 from sklearn import metrics
 
@@ -57,8 +57,15 @@ from coordinator.feature import categorise_temperatures, categorise_track_orient
     get_data_by_meteorological_seasons
 from coordinator.geometry import create_weather_grid_buffer, find_closest_met_stn, \
     find_intersecting_weather_grid
-from preprocessor import METExLite, MIDAS, UKCP09
-from utils import cd_models, make_filename
+from modeller.scoring import ScoringModel
+from utils import apply_in_chunks, cd_models, get_data_source, is_scratch_complete, \
+    iter_scratch_chunks, load_from_scratch, load_pickle, make_filename, save_pickle, traced
+
+# Ratio of the memory required by .integrate_incident_weather() to the size of a chunk of incident
+# records (see utils.estimate_chunk_size()): at its peak, the records of both the prior-IPs and the
+# non-IPs (i.e. two copies of the chunk, each with the weather statistics appended) are held
+# alongside their concatenation (i.e. another two copies)
+INCIDENT_WEATHER_EXPANSION = 4
 
 
 # noinspection PyPep8Naming
@@ -91,6 +98,64 @@ def calc_p_value(lr, X_train):
     return p
 
 
+def make_daily_periods(start_datetimes, end_datetimes):
+    """
+    Make daily intervals between each pair of start and end date/times.
+
+    This gives the same result as applying ``pandas.interval_range(start, end)`` to each pair of
+    the date/times, whereas all the intervals are generated in a vectorised manner and each
+    distinct period is sliced from them only once.
+
+    :param start_datetimes: start date/times (e.g. of critical periods)
+    :type start_datetimes: pandas.Series
+    :param end_datetimes: end date/times (e.g. of critical periods)
+    :type end_datetimes: pandas.Series
+    :return: daily intervals between each pair of ``start_datetimes`` and ``end_datetimes``
+    :rtype: pandas.Series
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from modeller.prototype_ext import make_daily_periods
+
+        >>> start = pd.Series(pd.to_datetime(['2018-07-01 10:00', '2018-06-30 08:00']))
+        >>> end = pd.Series(pd.to_datetime(['2018-07-02 10:00', '2018-07-02 08:00']))
+
+        >>> periods = make_daily_periods(start, end)
+        >>> periods.map(len).tolist()
+        [1, 2]
+
+        >>> make_daily_periods(start[:0], end[:0]).empty
+        True
+    """
+
+    start = start_datetimes.to_numpy(dtype='datetime64[ns]')
+    end = end_datetimes.to_numpy(dtype='datetime64[ns]')
+
+    if len(start) == 0:
+        return pd.Series([], index=start_datetimes.index, dtype=object)
+
+    one_day = np.timedelta64(1, 'D')
+
+    # Number of breaks of the daily intervals for each pair
+    counts = np.maximum((end - start) // one_day, 0) + 1
+
+    keys, inverse = np.unique(
+        np.column_stack([start.view(np.int64), counts]), axis=0, return_inverse=True)
+    start_, counts_ = keys[:, 0].view('datetime64[ns]'), keys[:, 1]
+
+    # Daily intervals of all the distinct periods, each of which is a slice of them
+    positions = np.cumsum(counts_ - 1)
+    offsets = np.arange(positions[-1]) - np.repeat(positions - (counts_ - 1), counts_ - 1)
+    left = np.repeat(start_, counts_ - 1) + offsets * one_day
+    intervals = pd.IntervalIndex.from_arrays(left, left + one_day)
+
+    periods = np.empty(len(keys), dtype=object)
+    periods[:] = [intervals[i:j] for i, j in zip(positions - (counts_ - 1), positions)]
+
+    return pd.Series(periods[inverse.ravel()], index=start_datetimes.index)
+
+
 class HeatAttributedIncidentsPlus:
     """
     A data model for heat-attributed rail incidents.
@@ -117,6 +182,9 @@ class HeatAttributedIncidentsPlus:
     :type outlier_pctl: int
     :param model_type: 'logit' or 'probit'
     :type model_type: str
+    :param memory_budget: memory budget (in bytes) for processing a chunk of incident records;
+        if ``None`` (default), all incident records are processed at once
+    :type memory_budget: int or None
 
     **Test**::
 
@@ -130,15 +198,16 @@ class HeatAttributedIncidentsPlus:
     def __init__(self, trial_id, route_name=None, weather_category='Heat',
                  seasons=None, reason_codes=None,
                  pip_start_hrs=-24, nip_start_hrs=-24, lp_days=None,
-                 sample_only=False, outlier_pctl=100, model_type='LogisticRegression'):
+                 sample_only=False, outlier_pctl=100, model_type='LogisticRegression',
+                 memory_budget=None):
 
         self.Name = ''
 
         self.TrialID = "{}".format(trial_id)
 
-        self.METEx = METExLite(database_name='NR_METEx_20190203')
-        self.UKCP = UKCP09()
-        self.MIDAS = MIDAS()
+        self.METEx = get_data_source('METExLite', database_name='NR_METEx_20190203')
+        self.UKCP = get_data_source('UKCP09')
+        self.MIDAS = get_data_source('MIDAS')
 
         if route_name is None:
             route_name = ['Anglia', 'Wessex', 'Wales', 'North and East']
@@ -158,10 +227,13 @@ class HeatAttributedIncidentsPlus:
         self.NIP_StartHrs = nip_start_hrs
         self.LP = lp_days
 
-        self.LP_Anglia = lambda x: -20 if x in range(24, 29) else (-13 if x > 28 else 0)
-        self.LP_Wessex = lambda x: -30 if x in range(24, 29) else (-25 if x > 28 else 0)
-        self.LP_NE = lambda x: -18 if x in range(24, 29) else (-16 if x > 28 else 0)
-        self.LP_Wales = lambda x: -19 if x in range(24, 29) else (-5 if x > 28 else 0)
+        # Latent periods (in days) of each Route: (24 <= max. temp. <= 28, max. temp. > 28)
+        self.LatentPeriods = {
+            'Anglia': (-20, -13),
+            'Wessex': (-30, -25),
+            'North and East': (-18, -16),
+            'Wales': (-19, -5),
+        }
 
         self.SamplesOnly = sample_only
         if isinstance(self.SamplesOnly, bool):
@@ -171,6 +243,8 @@ class HeatAttributedIncidentsPlus:
 
         self.OutlierPercentile = outlier_pctl
 
+        self.MemoryBudget = memory_budget
+
         def mode(x):
             return scipy.stats.mode(np.around(x))[0]
 
@@ -333,70 +407,66 @@ class HeatAttributedIncidentsPlus:
         data['Critical_EndDateTime'] = data.StartDateTime.dt.round('H')
 
         # Start date and time of the prior IP
-        critical_start_dt = data.Critical_EndDateTime.map(
-            lambda x: x + pd.Timedelta(
-                hours=self.PIP_StartHrs if x.time() > datetime.time(9) else self.PIP_StartHrs * 2))
+        after_nine = (data.Critical_EndDateTime - data.Critical_EndDateTime.dt.normalize()) > \
+            pd.Timedelta(hours=9)
+        pip_start_hrs = np.where(after_nine, self.PIP_StartHrs, self.PIP_StartHrs * 2)
+        critical_start_dt = data.Critical_EndDateTime + pd.to_timedelta(pip_start_hrs, unit='h')
         data.insert(
             data.columns.get_loc('Critical_EndDateTime'), 'Critical_StartDateTime', critical_start_dt)
 
         # Prior-IP dates of each incident
-        data['Critical_Period'] = data[['Critical_StartDateTime', 'Critical_EndDateTime']].apply(
-            lambda x: pd.interval_range(x[0], x[1]), axis=1)
+        data['Critical_Period'] = make_daily_periods(
+            data.Critical_StartDateTime, data.Critical_EndDateTime)
 
         return data
 
-    def set_lp_and_nip(self, route_name, ip_max_temp_max, ip_start_dt):
+    def get_latent_periods(self, route_names, ip_max_temp_max):
+        """
+        Determine latent periods (in days) for given Routes and maximum temperatures.
+
+        :param route_names: names of Routes (any other than those in ``.LatentPeriods``
+            are regarded as 'Wales')
+        :type route_names: pandas.Series
+        :param ip_max_temp_max: maximum temperatures during the prior IPs
+        :type ip_max_temp_max: pandas.Series
+        :return: latent periods (in days)
+        :rtype: numpy.ndarray
+        """
+
+        moderate_lp, hot_lp = [
+            route_names.map({k: v[i] for k, v in self.LatentPeriods.items()}).fillna(
+                self.LatentPeriods['Wales'][i]).to_numpy()
+            for i in range(2)]
+
+        ip_max_temp_max = ip_max_temp_max.to_numpy(dtype=np.float64)
+
+        lp = np.where(np.isin(ip_max_temp_max, range(24, 29)), moderate_lp,
+                      np.where(ip_max_temp_max > 28, hot_lp, 0))
+
+        return lp
+
+    def set_lp_and_nip(self, route_names, ip_max_temp_max, ip_start_dt):
         """
-        Determine latent period for a given date/time and the maximum temperature.
-
-        :param route_name:
-        :type route_name:
-        :param ip_max_temp_max:
-        :type ip_max_temp_max:
-        :param ip_start_dt:
-        :type ip_start_dt:
-        :return:
-        :rtype:
+        Determine latent periods and non-incident periods for given date/times and maximum
+        temperatures.
+
+        :param route_names: names of Routes
+        :type route_names: pandas.Series
+        :param ip_max_temp_max: maximum temperatures during the prior IPs
+        :type ip_max_temp_max: pandas.Series
+        :param ip_start_dt: start date/times of the prior IPs
+        :type ip_start_dt: pandas.Series
+        :return: start date/times, end date/times and periods of the non-IPs
+        :rtype: tuple
         """
 
-        if route_name == 'Anglia':
-            lp = self.LP_Anglia(ip_max_temp_max)
-            # if 24 <= ip_max_temp_max <= 28:
-            #     lp = -20
-            # elif ip_max_temp_max > 28:
-            #     lp = -13
-            # else:
-            #     lp = 0
-        elif route_name == 'Wessex':
-            lp = self.LP_Wessex(ip_max_temp_max)
-            # if 24 <= ip_max_temp_max <= 28:
-            #     lp = -30
-            # elif ip_max_temp_max > 28:
-            #     lp = -25
-            # else:
-            #     lp = 0
-        elif route_name == 'North and East':
-            lp = self.LP_NE(ip_max_temp_max)
-            # if 24 <= ip_max_temp_max <= 28:
-            #     lp = -18
-            # elif ip_max_temp_max > 28:
-            #     lp = -16
-            # else:
-            #     lp = 0
-        else:  # route_name == 'Wales':
-            lp = self.LP_Wales(ip_max_temp_max)
-            # if 24 <= ip_max_temp_max <= 28:
-            #     lp = -19
-            # elif ip_max_temp_max > 28:
-            #     lp = -5
-            # else:
-            #     lp = 0
-
-        critical_end_dt = ip_start_dt + pd.Timedelta(days=lp)
+        lp = self.get_latent_periods(route_names, ip_max_temp_max)
+
+        critical_end_dt = ip_start_dt + pd.to_timedelta(lp, unit='D')
 
         critical_start_dt = critical_end_dt + pd.Timedelta(hours=self.NIP_StartHrs)
 
-        critical_period = pd.interval_range(critical_start_dt, critical_end_dt)
+        critical_period = make_daily_periods(critical_start_dt, critical_end_dt)
 
         return critical_start_dt, critical_end_dt, critical_period
 
@@ -425,33 +495,156 @@ class HeatAttributedIncidentsPlus:
         non_ip_data = incidents.copy()  # Get weather data that did not cause any incident
 
         if self.LP is None:
-            col_names = ['Critical_StartDateTime', 'Critical_EndDateTime', 'Critical_Period']
-            non_ip_data[col_names] = prior_ip_data.apply(
-                lambda x: pd.Series(
-                    self.set_lp_and_nip(x.Route, x.Maximum_Temperature_max, x.Critical_StartDateTime)),
-                axis=1)
+            non_ip_data.Critical_StartDateTime, non_ip_data.Critical_EndDateTime, \
+                non_ip_data.Critical_Period = self.set_lp_and_nip(
+                    prior_ip_data.Route, prior_ip_data.Maximum_Temperature_max,
+                    prior_ip_data.Critical_StartDateTime)
 
         else:
             non_ip_data.Critical_EndDateTime = \
                 non_ip_data.Critical_StartDateTime + pd.Timedelta(days=self.LP)
             non_ip_data.Critical_StartDateTime = \
                 non_ip_data.Critical_EndDateTime + pd.Timedelta(hours=self.NIP_StartHrs)
-            non_ip_data.Critical_Period = \
-                non_ip_data[['Critical_StartDateTime', 'Critical_EndDateTime']].apply(
-                    lambda x: pd.interval_range(x[0], x[1]), axis=1)
+            non_ip_data.Critical_Period = make_daily_periods(
+                non_ip_data.Critical_StartDateTime, non_ip_data.Critical_EndDateTime)
 
         return non_ip_data
 
+    @staticmethod
+    def get_ip_overlaps(non_ip_data, prior_ip_data, stanox_section_col='StanoxSection'):
+        """
+        Find the prior IPs (on the same section) overlapping each non-incident period.
+
+        :param non_ip_data: non-IP data
+        :type non_ip_data: pandas.DataFrame
+        :param prior_ip_data: prior-IP data
+        :type prior_ip_data: pandas.DataFrame
+        :param stanox_section_col: column name of STANOX sections, defaults to ``'StanoxSection'``
+        :type stanox_section_col: str
+        :return: the earliest start and the latest end of the overlapping prior IPs
+            (``NaT`` if there is none) for each non-IP record
+        :rtype: pandas.DataFrame
+        """
+
+        col_names = [stanox_section_col, 'Critical_StartDateTime', 'Critical_EndDateTime']
+
+        nip_data = non_ip_data[col_names].reset_index(drop=True)
+        nip_data['NIP_ID'] = nip_data.index
+
+        overlaps = nip_data.merge(prior_ip_data[col_names], on=stanox_section_col,
+                                  suffixes=('', '_PIP'))
+
+        nip_start, nip_end = overlaps.Critical_StartDateTime, overlaps.Critical_EndDateTime
+        pip_start, pip_end = overlaps.Critical_StartDateTime_PIP, overlaps.Critical_EndDateTime_PIP
+        overlaps = overlaps[((pip_start <= nip_start) & (pip_end >= nip_start)) |
+                            ((pip_start <= nip_end) & (pip_end >= nip_end))]
+
+        ip_overlaps = overlaps.groupby('NIP_ID').aggregate(
+            IP_Overlap_StartDateTime=('Critical_StartDateTime_PIP', 'min'),
+            IP_Overlap_EndDateTime=('Critical_EndDateTime_PIP', 'max'))
+        ip_overlaps = ip_overlaps.reindex(nip_data.NIP_ID)
+        ip_overlaps.index = non_ip_data.index
+
+        return ip_overlaps
+
+    # == Requests for weather data ====================================================================
+
+    @staticmethod
+    def get_unique_requests(data, canonicalisers):
+        """
+        Canonicalise the requests for weather data of incident records and find the unique ones.
+
+        :param data: data of incident records
+        :type data: pandas.DataFrame
+        :param canonicalisers: column names (of ``data``) of the requests, each mapping to
+            a function that turns a value into a canonical (hashable) key, or to ``None``
+            if the value itself is the key
+        :type canonicalisers: dict
+        :return: unique requests (each represented by the first of its records) and
+            the request ID of each record
+        :rtype: tuple
+
+        **Test**::
+
+            >>> import pandas as pd
+            >>> from modeller.prototype_ext import HeatAttributedIncidentsPlus
+
+            >>> dat = pd.DataFrame({'Weather_Grid': [[2, 1], [1, 2], [3]]})
+            >>> requests, request_ids = HeatAttributedIncidentsPlus.get_unique_requests(
+            ...     dat, {'Weather_Grid': lambda x: tuple(sorted(x))})
+
+            >>> requests
+              Weather_Grid
+            0       [2, 1]
+            1          [3]
+            >>> request_ids
+            array([0, 0, 1])
+        """
+
+        keys = [data[k] if f is None else data[k].map(f) for k, f in canonicalisers.items()]
+
+        request_ids, _ = pd.factorize(pd.Series(list(zip(*keys)), dtype=object))
+
+        _, first_positions = np.unique(request_ids, return_index=True)
+        requests = data[list(canonicalisers)].iloc[first_positions]
+        requests.index = range(len(requests))
+
+        return requests, request_ids
+
+    @staticmethod
+    def canonicalise_grids(grids):
+        """
+        Canonicalise a list of (weather observation) grids / met stations.
+
+        :param grids: a list of weather observation IDs or met station IDs
+        :type grids: list
+        :return: sorted and unique IDs
+        :rtype: tuple
+        """
+
+        return tuple(sorted(set(grids)))
+
+    @staticmethod
+    def canonicalise_ukcp09_period(period):
+        """
+        Canonicalise a critical period into the dates of which the UKCP09 data is queried.
+
+        See also :py:meth:`preprocessor.UKCP09.query_by_grid_datetime`.
+
+        :param period: prior-incident / non-incident period
+        :type period: pandas.IntervalIndex
+        :return: start and end dates
+        :rtype: tuple
+        """
+
+        return period.left[0].normalize(), period.right[0].normalize()
+
+    @staticmethod
+    def canonicalise_radtob_period(period):
+        """
+        Canonicalise a critical period into the date/times of which the RADTOB data is queried.
+
+        See also :py:meth:`preprocessor.MIDAS.query_radtob_by_grid_datetime`.
+
+        :param period: prior-incident / non-incident period
+        :type period: pandas.IntervalIndex
+        :return: start and end date/times
+        :rtype: tuple
+        """
+
+        return period.left.min(), period.right.max()
+
     # == UKCP09 =======================================================================================
 
     def calculate_ukcp09_stats(self, weather_data):
         """
-        Calculate the statistics for the weather variables (except radiation).
+        Calculate the statistics for the weather variables (except radiation) of each request.
 
-        :param weather_data: data set of weather observations (for a certain period)
+        :param weather_data: data set of weather observations (for certain periods), with
+            a column 'Request_ID'
         :type weather_data: pandas.DataFrame
-        :return: some statistics of the UKCP09 data in the data set of weather observations
-        :rtype: list
+        :return: some statistics of the UKCP09 data for each request
+        :rtype: pandas.DataFrame
 
         **Test**::
 
@@ -461,47 +654,54 @@ class HeatAttributedIncidentsPlus:
         """
 
         if weather_data.empty:
-            weather_stats_info = [np.nan] * sum(map(np.count_nonzero, self.UKCP09StatsCalc.values()))
+            weather_stats = pd.DataFrame(columns=self.UKCP09VariableNames, dtype=np.float64)
 
         else:
-            # Create a pseudo id for groupby() & aggregate()
-            weather_data['Pseudo_ID'] = 0
-            weather_stats = weather_data.groupby('Pseudo_ID').aggregate(self.UKCP09StatsCalc)
-            # a, b = [list(x) for x in weather_stats.columns.levels]
-            # weather_stats.columns = ['_'.join(x) for x in itertools.product(a, b)]
-            # if not weather_stats.empty:
-            #     stats_info = weather_stats.values[0].tolist()
-            # else:
-            #     stats_info = [np.nan] * len(weather_stats.columns)
-
-            weather_stats_info = weather_stats.values[0].tolist()
+            weather_stats = weather_data.groupby('Request_ID').aggregate(self.UKCP09StatsCalc)
+            weather_stats.columns = self.UKCP09VariableNames
 
-        return weather_stats_info
+        return weather_stats
 
-    def integrate_pip_ukcp09_data(self, grids, period, pickle_it=True):
+    @traced()
+    def integrate_ukcp09_data(self, requests, pickle_it=True):
         """
-        Gather gridded weather observations of the given period for each incident record.
+        Gather gridded weather observations of the given periods for each unique request.
 
-        :param grids: e.g. grids = incidents.Weather_Grid.iloc[0]
-        :param period: e.g. period = incidents.Critical_Period.iloc[0]
-        :param pickle_it:
-        :return:
+        :param requests: unique requests of (grids, period[, ip_overlap_start, ip_overlap_end]);
+            see also :py:meth:`HeatAttributedIncidentsPlus.get_unique_requests`
+        :type requests: pandas.DataFrame
+        :param pickle_it: whether to save the queried data as pickle files, defaults to ``True``
+        :type pickle_it: bool
+        :return: statistics of the UKCP09 data for each request
+        :rtype: pandas.DataFrame
 
         **Test**::
 
-            grids = incidents.Weather_Grid.iloc[1]
-            period = incidents.Critical_Period.iloc[1]
-
+            requests, _ = h_model_plus.get_unique_requests(
+                incidents, {'Weather_Grid': h_model_plus.canonicalise_grids,
+                            'Critical_Period': h_model_plus.canonicalise_ukcp09_period})
         """
 
-        # Find weather data for the specified period
-        prior_ip_weather = self.UKCP.query_by_grid_datetime(grids, period, pickle_it=pickle_it)
-        # Calculate the max/min/avg for weather parameters during the period
-        weather_stats = self.calculate_ukcp09_stats(prior_ip_weather)
-
-        # Whether "max_temp = weather_stats[0]" is the hottest of year so far
-        obs_by_far = self.UKCP.query_by_grid_datetime_(grids, period, pickle_it=pickle_it)
-        weather_stats.append(1 if weather_stats[0] > obs_by_far.Maximum_Temperature.max() else 0)
+        weather_data = []
+        for request_id, grids, period, *ip_overlap in requests.itertuples(name=None):
+            # Find weather data for the specified period
+            weather = self.UKCP.query_by_grid_datetime(grids, period, pickle_it=pickle_it)
+            # Skip data of weather causing Incidents at around the same time (on the same section)
+            if ip_overlap and pd.notna(ip_overlap[0]):
+                weather = weather[(weather.Date < ip_overlap[0]) | (weather.Date > ip_overlap[1])]
+            weather_data.append(weather.assign(Request_ID=request_id))
+
+        # Calculate the max/min/avg for weather parameters during the period of each request
+        weather_stats = self.calculate_ukcp09_stats(
+            pd.concat(weather_data, ignore_index=True, sort=False)).reindex(requests.index)
+
+        # Whether "max_temp" is the hottest of year so far
+        ytd_max_temp = pd.Series(
+            [self.UKCP.query_daily_indicators(grids, period.left[0]).Maximum_Temperature_ytd_max.max()
+             for grids, period in zip(requests.iloc[:, 0], requests.iloc[:, 1])],
+            index=requests.index, dtype=np.float64)
+        weather_stats['Hottest_Heretofore'] = \
+            (weather_stats.Maximum_Temperature_max > ytd_max_temp).astype(np.int64)
 
         return weather_stats
 
@@ -523,12 +723,12 @@ class HeatAttributedIncidentsPlus:
             critical_period_col = 'Critical_Period'
         """
 
-        prior_ip_weather_stats = incidents[[weather_grid_col, critical_period_col]].apply(
-            lambda x: pd.Series(self.integrate_pip_ukcp09_data(x[0], x[1])), axis=1)
-
-        w_col_names = self.UKCP09VariableNames + ['Hottest_Heretofore']
+        requests, request_ids = self.get_unique_requests(
+            incidents, {weather_grid_col: self.canonicalise_grids,
+                        critical_period_col: self.canonicalise_ukcp09_period})
 
-        prior_ip_weather_stats.columns = w_col_names
+        prior_ip_weather_stats = self.integrate_ukcp09_data(requests).iloc[request_ids]
+        prior_ip_weather_stats.index = incidents.index
 
         prior_ip_weather_stats['Temperature_Change_max'] = \
             abs(prior_ip_weather_stats.Maximum_Temperature_max -
@@ -540,49 +740,6 @@ class HeatAttributedIncidentsPlus:
 
         return prior_ip_weather_stats
 
-    def integrate_nip_ukcp09_data(self, grids, period, stanox_section, pip_data, pickle_it=True):
-        """
-        Gather gridded weather observations of the corresponding non-incident period
-        for each incident record.
-
-        :param grids:
-        :param period:
-        :param stanox_section:
-        :param pip_data:
-        :param pickle_it:
-        :return:
-
-        **Test**::
-
-            grids = nip_data_.Weather_Grid.iloc[0]
-            period = nip_data_.Critical_Period.iloc[0]
-            stanox_section = nip_data_.StanoxSection.iloc[0]
-        """
-
-        # Get non-IP weather data about where and when the incident occurred
-        nip_weather = self.UKCP.query_by_grid_datetime(grids, period, pickle_it=pickle_it)
-
-        # Get all incident period data on the same section
-        ip_overlap = pip_data[
-            (pip_data.StanoxSection == stanox_section) &
-            (((pip_data.Critical_StartDateTime <= period.left.to_pydatetime()[0]) &
-              (pip_data.Critical_EndDateTime >= period.left.to_pydatetime()[0])) |
-             ((pip_data.Critical_StartDateTime <= period.right.to_pydatetime()[0]) &
-              (pip_data.Critical_EndDateTime >= period.right.to_pydatetime()[0])))]
-        # Skip data of weather causing Incidents at around the same time; but
-        if not ip_overlap.empty:
-            nip_weather = nip_weather[
-                (nip_weather.Date < min(ip_overlap.Critical_StartDateTime)) |
-                (nip_weather.Date > max(ip_overlap.Critical_EndDateTime))]
-        # Get the max/min/avg weather parameters for those incident periods
-        weather_stats = self.calculate_ukcp09_stats(nip_weather)
-
-        # Whether "max_temp = weather_stats[0]" is the hottest of year so far
-        obs_by_far = self.UKCP.query_by_grid_datetime_(grids, period, pickle_it=pickle_it)
-        weather_stats.append(1 if weather_stats[0] > obs_by_far.Maximum_Temperature.max() else 0)
-
-        return weather_stats
-
     def get_nip_ukcp09_stats(self, nip_data_, pip_data, weather_grid_col='Weather_Grid',
                              critical_period_col='Critical_Period',
                              stanox_section_col='StanoxSection'):
@@ -606,11 +763,16 @@ class HeatAttributedIncidentsPlus:
             stanox_section_col = 'StanoxSection'
         """
 
-        non_ip_weather_stats = \
-            nip_data_[[weather_grid_col, critical_period_col, stanox_section_col]].apply(
-                lambda x: pd.Series(self.integrate_nip_ukcp09_data(x[0], x[1], x[2], pip_data)), axis=1)
+        ip_overlaps = self.get_ip_overlaps(nip_data_, pip_data, stanox_section_col)
+
+        requests, request_ids = self.get_unique_requests(
+            nip_data_[[weather_grid_col, critical_period_col]].join(ip_overlaps),
+            {weather_grid_col: self.canonicalise_grids,
+             critical_period_col: self.canonicalise_ukcp09_period,
+             'IP_Overlap_StartDateTime': None, 'IP_Overlap_EndDateTime': None})
 
-        non_ip_weather_stats.columns = self.UKCP09VariableNames + ['Hottest_Heretofore']
+        non_ip_weather_stats = self.integrate_ukcp09_data(requests).iloc[request_ids]
+        non_ip_weather_stats.index = nip_data_.index
 
         non_ip_weather_stats['Temperature_Change_max'] = \
             non_ip_weather_stats.Maximum_Temperature_max - non_ip_weather_stats.Minimum_Temperature_min
@@ -621,56 +783,85 @@ class HeatAttributedIncidentsPlus:
 
     # == RADTOB =======================================================================================
 
+    @staticmethod
+    def select_radtob_obs(midas_radtob):
+        """
+        Select the radiation observations (of a period) for calculating the statistics.
+
+        :param midas_radtob: data of MIDAS RADTOB (for a certain period)
+        :type midas_radtob: pandas.DataFrame
+        :return: data of the observations for calculating the statistics
+        :rtype: pandas.DataFrame
+        """
+
+        # if 24 not in midas_radtob.OB_HOUR_COUNT:
+        #     midas_radtob = midas_radtob.append(midas_radtob.iloc[-1, :])
+        #     midas_radtob.VERSION_NUM.iloc[-1] = 0
+        #     midas_radtob.OB_HOUR_COUNT.iloc[-1] = midas_radtob.OB_HOUR_COUNT.iloc[0:-1].sum()
+        #     midas_radtob.GLBL_IRAD_AMT.iloc[-1] = midas_radtob.GLBL_IRAD_AMT.iloc[0:-1].sum()
+
+        if 24 in midas_radtob.OB_HOUR_COUNT.values:
+            temp = midas_radtob[midas_radtob.OB_HOUR_COUNT == 24]
+            midas_radtob = pd.concat([temp, midas_radtob.loc[temp.last_valid_index() + 1:]])
+
+        return midas_radtob
+
     def calculate_radtob_stats(self, midas_radtob):
         """
-        Calculate the statistics for the radiation variables.
+        Calculate the statistics for the radiation variables of each request.
 
-        :param midas_radtob:
-        :return:
+        :param midas_radtob: data of MIDAS RADTOB (for certain periods), with a column 'Request_ID'
+        :type midas_radtob: pandas.DataFrame
+        :return: statistics of the radiation data for each request
+        :rtype: pandas.DataFrame
 
         **Test**::
 
             midas_radtob = prior_ip_radtob.copy()
         """
 
+        # r_col_names = specify_weather_variable_names(integrator.specify_radtob_stats_calculations())
+        # r_col_names += ['GLBL_IRAD_AMT_total']
+        r_col_names = ['GLBL_IRAD_AMT_total']
+
         # Solar irradiation amount (Kjoules/ sq metre over the observation period)
         if midas_radtob.empty:
-            # stats_info = [np.nan] * (sum(map(np.count_nonzero, self.RADTOBStatsCalc.values())))
-            stats_info = np.nan
+            radtob_stats = pd.DataFrame(columns=r_col_names, dtype=np.float64)
 
         else:
-            # if 24 not in midas_radtob.OB_HOUR_COUNT:
-            #     midas_radtob = midas_radtob.append(midas_radtob.iloc[-1, :])
-            #     midas_radtob.VERSION_NUM.iloc[-1] = 0
-            #     midas_radtob.OB_HOUR_COUNT.iloc[-1] = midas_radtob.OB_HOUR_COUNT.iloc[0:-1].sum()
-            #     midas_radtob.GLBL_IRAD_AMT.iloc[-1] = midas_radtob.GLBL_IRAD_AMT.iloc[0:-1].sum()
+            radtob_stats = midas_radtob.groupby(['Request_ID', 'SRC_ID']).aggregate(
+                self.RADTOBStatsCalc)
+            # Take the statistics of the first met station for each request
+            radtob_stats = radtob_stats.groupby(level='Request_ID').head(1).droplevel('SRC_ID')
+            radtob_stats.columns = r_col_names
 
-            if 24 in midas_radtob.OB_HOUR_COUNT.values:
-                temp = midas_radtob[midas_radtob.OB_HOUR_COUNT == 24]
-                midas_radtob = pd.concat([temp, midas_radtob.loc[temp.last_valid_index() + 1:]])
-
-            radtob_stats = midas_radtob.groupby('SRC_ID').aggregate(self.RADTOBStatsCalc)
-            stats_info = radtob_stats.values.flatten()[0]
-
-        return stats_info
+        return radtob_stats
 
-    def integrate_pip_radtob(self, met_stn_id, period, route_name, use_suppl_dat, pickle_it=True):
+    @traced()
+    def integrate_radtob(self, requests, use_suppl_dat, pickle_it=True):
         """
-        Gather solar radiation of the given period for each incident record.
+        Gather solar radiation of the given periods for each unique request.
 
-        :param met_stn_id:
-        :param period:
-        :param route_name:
+        :param requests: unique requests of (met_stn_id, period, route_name
+            [, ip_overlap_start, ip_overlap_end]);
+            see also :py:meth:`HeatAttributedIncidentsPlus.get_unique_requests`
+        :type requests: pandas.DataFrame
         :param use_suppl_dat:
-        :param pickle_it:
-        :return:
+        :type use_suppl_dat: bool
+        :param pickle_it: whether to save the (cached) queried data as a pickle file,
+            defaults to ``True``
+        :type pickle_it: bool
+        :return: statistics of the radiation data for each request
+        :rtype: pandas.DataFrame
 
         **Test**::
 
-            met_stn_id = incidents.Met_SRC_ID.iloc[4]
-            period = incidents.Critical_Period.iloc[4]
-            route_name = incidents.Route.iloc[4]
             use_suppl_dat = True
+
+            requests, _ = h_model_plus.get_unique_requests(
+                incidents, {'Met_SRC_ID': h_model_plus.canonicalise_grids,
+                            'Critical_Period': h_model_plus.canonicalise_radtob_period,
+                            'Route': None})
         """
 
         # irad_obs_ = irad_obs[irad_obs.SRC_ID.isin(met_stn_id)]
@@ -680,10 +871,26 @@ class HeatAttributedIncidentsPlus:
         # except KeyError:
         #     prior_ip_radtob = pd.DataFrame()
 
-        prior_ip_radtob = self.MIDAS.query_radtob_by_grid_datetime(
-            met_stn_id, period, route_name, use_suppl_dat, pickle_it=pickle_it)
+        radtob_data = []
+        for request_id, met_stn_id, period, route_name, *ip_overlap in \
+                requests.itertuples(name=None):
+            midas_radtob = self.MIDAS.query_radtob_by_grid_datetime(
+                met_stn_id, period, route_name, use_suppl_dat)
+            # Skip data of weather causing Incidents at around the same time (on the same section)
+            if ip_overlap and pd.notna(ip_overlap[0]):
+                midas_radtob = midas_radtob[
+                    (midas_radtob.OB_END_DATE < ip_overlap[0]) |
+                    (midas_radtob.OB_END_DATE > ip_overlap[1])]
+            if not midas_radtob.empty:
+                midas_radtob = self.select_radtob_obs(midas_radtob)
+            radtob_data.append(midas_radtob.assign(Request_ID=request_id))
+
+        # Keep the (locally cached) RADTOB data for the next runs
+        if pickle_it:
+            self.MIDAS.save_radtob_cache()
 
-        radtob_stats = self.calculate_radtob_stats(prior_ip_radtob)
+        radtob_stats = self.calculate_radtob_stats(
+            pd.concat(radtob_data, ignore_index=True, sort=False)).reindex(requests.index)
 
         return radtob_stats
 
@@ -708,57 +915,16 @@ class HeatAttributedIncidentsPlus:
             incidents
         """
 
-        prior_ip_radtob_stats = incidents[[met_stn_id_col, critical_period_col, route_name_col]].apply(
-            lambda x: pd.Series(self.integrate_pip_radtob(x[0], x[1], x[2], use_suppl_dat)), axis=1)
+        requests, request_ids = self.get_unique_requests(
+            incidents, {met_stn_id_col: self.canonicalise_grids,
+                        critical_period_col: self.canonicalise_radtob_period,
+                        route_name_col: None})
 
-        # r_col_names = specify_weather_variable_names(integrator.specify_radtob_stats_calculations())
-        # r_col_names += ['GLBL_IRAD_AMT_total']
-        prior_ip_radtob_stats.columns = ['GLBL_IRAD_AMT_total']  # r_col_names
+        prior_ip_radtob_stats = self.integrate_radtob(requests, use_suppl_dat).iloc[request_ids]
+        prior_ip_radtob_stats.index = incidents.index
 
         return prior_ip_radtob_stats
 
-    def integrate_nip_radtob(self, met_stn_id, period, route_name, use_suppl_dat, prior_ip_data,
-                             stanox_section, pickle_it=True):
-        """
-        Gather solar radiation of the corresponding non-incident period for each incident record.
-
-        :param met_stn_id: e.g. met_stn_id = nip_data_.Met_SRC_ID.iloc[1]
-        :param period: e.g. period = nip_data_.Critical_Period.iloc[1]
-        :param route_name:
-        :param use_suppl_dat:
-        :param stanox_section: e.g. location = nip_data_.StanoxSection.iloc[0]
-        :param prior_ip_data:
-        :param pickle_it:
-        :return:
-        """
-
-        # irad_obs_ = irad_obs[irad_obs.SRC_ID.isin(met_stn_id)]
-        #
-        # try:
-        #     non_ip_radtob = irad_obs_.set_index('OB_END_DATE').loc[period]
-        # except KeyError:
-        #     non_ip_radtob = pd.DataFrame()
-
-        non_ip_radtob = self.MIDAS.query_radtob_by_grid_datetime(
-            met_stn_id, period, route_name, use_suppl_dat, pickle_it=pickle_it)
-
-        # Get all incident period data on the same section
-        ip_overlap = prior_ip_data[
-            (prior_ip_data.StanoxSection == stanox_section) &
-            (((prior_ip_data.Critical_StartDateTime <= period.left.to_pydatetime()[0]) &
-              (prior_ip_data.Critical_EndDateTime >= period.left.to_pydatetime()[0])) |
-             ((prior_ip_data.Critical_StartDateTime <= period.right.to_pydatetime()[0]) &
-              (prior_ip_data.Critical_EndDateTime >= period.right.to_pydatetime()[0])))]
-        # Skip data of weather causing Incidents at around the same time; but
-        if not ip_overlap.empty:
-            non_ip_radtob = non_ip_radtob[
-                (non_ip_radtob.OB_END_DATE < min(ip_overlap.Critical_StartDateTime)) |
-                (non_ip_radtob.OB_END_DATE > max(ip_overlap.Critical_EndDateTime))]
-
-        radtob_stats = self.calculate_radtob_stats(non_ip_radtob)
-
-        return radtob_stats
-
     def get_nip_radtob_stats(self, non_ip_data, prior_ip_data, met_stn_id_col='Met_SRC_ID',
                              critical_period_col='Critical_Period', route_name_col='Route',
                              stanox_section_col='StanoxSection', use_suppl_dat=True):
@@ -779,20 +945,24 @@ class HeatAttributedIncidentsPlus:
         :rtype: pandas.DataFrame
         """
 
-        cols = [met_stn_id_col, critical_period_col, route_name_col, stanox_section_col]
-        non_ip_radtob_stats = non_ip_data[cols].apply(
-            lambda x: pd.Series(
-                self.integrate_nip_radtob(x[0], x[1], x[2], use_suppl_dat, prior_ip_data, x[3])),
-            axis=1)
+        ip_overlaps = self.get_ip_overlaps(non_ip_data, prior_ip_data, stanox_section_col)
 
-        # r_col_names = specify_weather_variable_names(integrator.specify_radtob_stats_calculations())
-        # r_col_names += ['GLBL_IRAD_AMT_total']
-        non_ip_radtob_stats.columns = ['GLBL_IRAD_AMT_total']  # r_col_names
+        cols = [met_stn_id_col, critical_period_col, route_name_col]
+        requests, request_ids = self.get_unique_requests(
+            non_ip_data[cols].join(ip_overlaps),
+            {met_stn_id_col: self.canonicalise_grids,
+             critical_period_col: self.canonicalise_radtob_period,
+             route_name_col: None,
+             'IP_Overlap_StartDateTime': None, 'IP_Overlap_EndDateTime': None})
+
+        non_ip_radtob_stats = self.integrate_radtob(requests, use_suppl_dat).iloc[request_ids]
+        non_ip_radtob_stats.index = non_ip_data.index
 
         return non_ip_radtob_stats
 
     # == Data of weather conditions ===================================================================
 
+    @traced()
     def get_processed_incident_records(self, update=False, random_state=1):
         """
 
@@ -919,8 +1089,79 @@ class HeatAttributedIncidentsPlus:
 
         return incidents
 
+    @traced()
+    def integrate_incident_weather(self, incidents):
+        """
+        Integrate the weather conditions of the prior-IPs and non-IPs for incident records.
+
+        :param incidents: data of incident records
+        :type incidents: pandas.DataFrame
+        :return: weather conditions of the incident records
+        :rtype: pandas.DataFrame
+
+        **Test**::
+
+            >>> from modeller.prototype_ext import HeatAttributedIncidentsPlus
+
+            >>> h_model_plus = HeatAttributedIncidentsPlus(trial_id=2, sample_only=True)
+
+            >>> incident_data = h_model_plus.get_processed_incident_records()
+
+            >>> dat = h_model_plus.integrate_incident_weather(incident_data)
+        """
+
+        # -- Data integration for the specified prior-IP ----------------------------------------------
+
+        incidents = self.get_pip_records(incidents)
+
+        # Get prior-IP statistics of weather variables for each incident.
+        pip_ukcp09_stats = self.get_pip_ukcp09_stats(
+            incidents, weather_grid_col='Weather_Grid', critical_period_col='Critical_Period')
+
+        # Get prior-IP statistics of radiation data for each incident.
+        pip_radtob_stats = self.get_pip_radtob_stats(
+            incidents, met_stn_id_col='Met_SRC_ID', critical_period_col='Critical_Period',
+            route_name_col='Route', use_suppl_dat=True)
+
+        pip_data = incidents.join(pip_ukcp09_stats).join(pip_radtob_stats)
+
+        pip_data['Incident_Reported'] = 1
+
+        # -- Data integration for the specified non-IP ------------------------------------------------
+
+        nip_data_ = self.get_nip_records(incidents, pip_data)
+
+        nip_ukcp09_stats = self.get_nip_ukcp09_stats(
+            nip_data_, pip_data, weather_grid_col='Weather_Grid',
+            critical_period_col='Critical_Period', stanox_section_col='StanoxSection')
+
+        nip_radtob_stats = self.get_nip_radtob_stats(
+            nip_data_, pip_data, met_stn_id_col='Met_SRC_ID',
+            critical_period_col='Critical_Period', route_name_col='Route',
+            stanox_section_col='StanoxSection', use_suppl_dat=True)
+
+        nip_data = nip_data_.join(nip_ukcp09_stats).join(nip_radtob_stats)
+
+        nip_data['Incident_Reported'] = 0
+
+        # -- Merge "pip_data" and "nip_data_" ---------------------------------------------------------
+        incident_location_weather = pd.concat(
+            [pip_data, nip_data], axis=0, ignore_index=True, sort=False)
+
+        # -- Categorise track orientations into four directions (N-S, E-W, NE-SW, NW-SE) --------------
+        incident_location_weather = incident_location_weather.join(
+            categorise_track_orientations(incident_location_weather))
+
+        # -- Categorise temperature: 25, 26, 27, 28, 29, 30 -------------------------------------------
+        incident_location_weather = incident_location_weather.join(
+            categorise_temperatures(
+                incident_location_weather, column_name='Maximum_Temperature_max'))
+
+        return incident_location_weather
+
+    @traced()
     def get_incident_location_weather(self, random_state=1, update=False, pickle_it=False,
-                                      verbose=True):
+                                      verbose=True, as_scratch=False):
         """
         Process data of weather conditions for each incident location.
 
@@ -931,7 +1172,11 @@ class HeatAttributedIncidentsPlus:
         :type pickle_it: bool
         :param verbose: whether to print relevant information in console, defaults to ``True``
         :type verbose: bool or int
-        :return:
+        :param as_scratch: whether to return the path to the scratch directory where the result is
+            saved chunk by chunk (only if ``.MemoryBudget`` is set), defaults to ``False``
+        :type as_scratch: bool
+        :return: weather conditions of incident locations (or the path to their scratch directory)
+        :rtype: pandas.DataFrame or str or None
 
         .. note::
 
@@ -980,8 +1225,14 @@ class HeatAttributedIncidentsPlus:
             str(self.NIP_StartHrs) + 'h',
             "sample-rs{}".format(random_state) if self.SamplesOnly else "", sep="_")
         path_to_pickle = self.cdd_trial(pickle_filename)
+        path_to_scratch = self.cdd_trial("scratch", os.path.splitext(pickle_filename)[0])
 
-        if os.path.isfile(path_to_pickle) and not update:
+        as_scratch = as_scratch and self.MemoryBudget is not None
+
+        if as_scratch and is_scratch_complete(path_to_scratch) and not update:
+            incident_location_weather = path_to_scratch
+
+        elif not as_scratch and os.path.isfile(path_to_pickle) and not update:
             incident_location_weather = load_pickle(path_to_pickle)
 
         else:
@@ -990,54 +1241,22 @@ class HeatAttributedIncidentsPlus:
 
                 incidents = self.get_processed_incident_records(update=False, random_state=random_state)
 
-                # -- Data integration for the specified prior-IP --------------------------------------
-
-                incidents = self.get_pip_records(incidents)
-
-                # Get prior-IP statistics of weather variables for each incident.
-                pip_ukcp09_stats = self.get_pip_ukcp09_stats(
-                    incidents, weather_grid_col='Weather_Grid', critical_period_col='Critical_Period')
-
-                # Get prior-IP statistics of radiation data for each incident.
-                pip_radtob_stats = self.get_pip_radtob_stats(
-                    incidents, met_stn_id_col='Met_SRC_ID', critical_period_col='Critical_Period',
-                    route_name_col='Route', use_suppl_dat=True)
-
-                pip_data = incidents.join(pip_ukcp09_stats).join(pip_radtob_stats)
-
-                pip_data['Incident_Reported'] = 1
-
-                # -- Data integration for the specified non-IP ----------------------------------------
-
-                nip_data_ = self.get_nip_records(incidents, pip_data)
-
-                nip_ukcp09_stats = self.get_nip_ukcp09_stats(
-                    nip_data_, pip_data, weather_grid_col='Weather_Grid',
-                    critical_period_col='Critical_Period', stanox_section_col='StanoxSection')
-
-                nip_radtob_stats = self.get_nip_radtob_stats(
-                    nip_data_, pip_data, met_stn_id_col='Met_SRC_ID',
-                    critical_period_col='Critical_Period', route_name_col='Route',
-                    stanox_section_col='StanoxSection', use_suppl_dat=True)
-
-                nip_data = nip_data_.join(nip_ukcp09_stats).join(nip_radtob_stats)
-
-                nip_data['Incident_Reported'] = 0
-
-                # -- Merge "pip_data" and "nip_data_" -------------------------------------------------
-                incident_location_weather = pd.concat(
-                    [pip_data, nip_data], axis=0, ignore_index=True, sort=False)
-
-                # -- Categorise track orientations into four directions (N-S, E-W, NE-SW, NW-SE) ------
-                incident_location_weather = incident_location_weather.join(
-                    categorise_track_orientations(incident_location_weather))
-
-                # -- Categorise temperature: 25, 26, 27, 28, 29, 30 -----------------------------------
-                incident_location_weather = incident_location_weather.join(
-                    categorise_temperatures(
-                        incident_location_weather, column_name='Maximum_Temperature_max'))
-
-                if pickle_it:
+                # -- Data integration for the specified prior-IP and non-IP ---------------------------
+
+                if self.MemoryBudget is None:
+                    incident_location_weather = self.integrate_incident_weather(incidents)
+                else:
+                    # Process the incident records (of the same sections together) chunk by chunk
+                    apply_in_chunks(
+                        incidents, self.integrate_incident_weather, path_to_scratch,
+                        memory_budget=self.MemoryBudget, expansion=INCIDENT_WEATHER_EXPANSION,
+                        group_by='StanoxSection', verbose=verbose)
+                    del incidents
+                    incident_location_weather = \
+                        path_to_scratch if as_scratch else \
+                        load_from_scratch(path_to_scratch, ignore_index=True)
+
+                if pickle_it and not as_scratch:
                     save_pickle(incident_location_weather, path_to_pickle, verbose=verbose)
 
             except Exception as e:
@@ -1295,24 +1514,50 @@ class HeatAttributedIncidentsPlus:
             [5 rows x 88 columns]
         """
 
-        # Get the mdata for modelling
-        processed_dat = self.get_incident_location_weather(pickle_it=True)
-        processed_data = processed_dat.dropna(subset=['Temperature_Change_max', 'GLBL_IRAD_AMT_total'])
+        subset = ['Temperature_Change_max', 'GLBL_IRAD_AMT_total']
 
-        processed_data.GLBL_IRAD_AMT_total = processed_data.GLBL_IRAD_AMT_total / 1000
+        # Get the mdata for modelling
+        if self.MemoryBudget is None:
+            processed_dat = self.get_incident_location_weather(pickle_it=True)
+            processed_dat = processed_dat.dropna(subset=subset)
+            delay_minutes = processed_dat.DelayMinutes
+        else:
+            # Read the data (saved chunk by chunk) one chunk at a time
+            path_to_scratch = self.get_incident_location_weather(as_scratch=True)
+            processed_dat = None
+            delay_minutes = np.concatenate([
+                x.dropna(subset=subset).DelayMinutes.to_numpy()
+                for x in iter_scratch_chunks(path_to_scratch, columns=subset + ['DelayMinutes'])])
 
         # Remove outliers
         if 95 <= self.OutlierPercentile <= 100:
-            upper_limit = np.percentile(processed_data.DelayMinutes, self.OutlierPercentile)
-            processed_data = processed_data[processed_data.DelayMinutes <= upper_limit]
-        # from pyhelpers.ops import get_extreme_outlier_bounds
-        # l, u = get_extreme_outlier_bounds(processed_data.DelayMinutes, k=1.5)
-        # processed_data = processed_data[
-        #     processed_data.DelayMinutes.between(l, u, inclusive=True)]
+            upper_limit = np.percentile(delay_minutes, self.OutlierPercentile)
+        else:
+            upper_limit = None
+
+        def process_data(data):
+            data.GLBL_IRAD_AMT_total = data.GLBL_IRAD_AMT_total / 1000
 
-        # Set the outcomes of non-incident records to 0
-        outcome_columns = ['DelayMinutes', 'DelayCost', 'IncidentCount']
-        processed_data.loc[processed_data.Incident_Reported == 0, outcome_columns] = 0
+            if upper_limit is not None:
+                data = data[data.DelayMinutes <= upper_limit]
+            # from pyhelpers.ops import get_extreme_outlier_bounds
+            # l, u = get_extreme_outlier_bounds(processed_data.DelayMinutes, k=1.5)
+            # processed_data = processed_data[
+            #     processed_data.DelayMinutes.between(l, u, inclusive=True)]
+
+            # Set the outcomes of non-incident records to 0
+            outcome_columns = ['DelayMinutes', 'DelayCost', 'IncidentCount']
+            data.loc[data.Incident_Reported == 0, outcome_columns] = 0
+
+            return data
+
+        if processed_dat is not None:
+            processed_data = process_data(processed_dat)
+        else:
+            # Assemble the design matrix from the processed chunks
+            processed_data = pd.concat(
+                [process_data(x.dropna(subset=subset)) for x in iter_scratch_chunks(path_to_scratch)],
+                axis=0, ignore_index=True, sort=False)
 
         # Select data before 2014 as training data set, with the rest being test set
         training_set = processed_data[processed_data.StartDateTime < datetime.datetime(2016, 1, 1)]
@@ -1419,6 +1664,7 @@ class HeatAttributedIncidentsPlus:
 
             save_fig(path_to_fig_file, dpi, verbose=verbose, conv_svg_to_emf=True)
 
+    @traced()
     def logistic_regression(self, add_intercept=True, random_state=1, pickle_it=False, verbose=True):
         """
         Train/test a logistic regression model for predicting heat-related incidents.
@@ -1523,6 +1769,10 @@ class HeatAttributedIncidentsPlus:
         self.__setattr__('AUC', auc)
         self.__setattr__('Threshold', threshold)
 
+        if pickle_it:
+            scoring_model = ScoringModel.from_trained_model(self)
+            scoring_model.save(self.cdd_trial(scoring_model.Name + ".pickle"), verbose=verbose)
+
         # Mean accuracy on the test set
         mean_accuracy = lr.score(X_test, y_test)
         if verbose:
@@ -0,0 +1,485 @@
+"""
+Batch scoring of weather-related incidents with trained (logit/probit) models.
+
+A trained model is saved with its coefficients, the names (and scaling) of its explanatory
+variables and its threshold, so that new incident records (with the corresponding weather
+conditions) can be scored without rebuilding the training set.
+
+Command line usage::
+
+    python -m modeller.scoring <path to model> <path to input data> <path to output data>
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.special
+from pyhelpers.store import save
+
+from coordinator.feature import categorise_temperatures, categorise_track_orientations
+from utils import load_pickle, make_filename, save_pickle
+
+
+def calc_cover_percent_diff(data):
+    """
+    Calculate the (non-negative) difference between the percentage of vegetation cover and that of
+    open space and other cover (all of which have been scaled down by 10).
+
+    :param data: data of (scaled) explanatory variables
+    :type data: dict
+    :return: values of 'CoverPercentDiff'
+    :rtype: numpy.ndarray
+    """
+
+    cover_percent_diff = \
+        data['CoverPercentVegetation'] - data['CoverPercentOpenSpace'] - data['CoverPercentOther']
+
+    return np.maximum(cover_percent_diff, 0)
+
+
+def calc_temperature_dif(data):
+    """
+    Calculate the difference between the maximum and the minimum temperatures.
+
+    :param data: data of (scaled) explanatory variables
+    :type data: dict
+    :return: values of 'Temperature_dif'
+    :rtype: numpy.ndarray
+    """
+
+    temperature_dif = data['Temperature_max'] - data['Temperature_min']
+
+    return temperature_dif
+
+
+def categorise_wind_directions(data):
+    """
+    Categorise average wind directions into four quadrants,
+    as in :py:meth:`WindAttributedIncidents.integrate_data()
+    <modeller.prototype.WindAttributedIncidents.integrate_data>`.
+
+    :param data: input data, which contains 'WindDirection_avg'
+    :type data: pandas.DataFrame
+    :return: dummy variables of the quadrants, e.g. 'WindDirection_avg_[0, 90)'
+    :rtype: pandas.DataFrame
+    """
+
+    wind_direction = pd.cut(data['WindDirection_avg'].values, [0, 90, 180, 270, 360], right=False)
+
+    wind_direction_dummies = pd.get_dummies(wind_direction, prefix='WindDirection_avg')
+    wind_direction_dummies.index = data.index
+
+    return wind_direction_dummies
+
+
+def categorise_track_orientation_dummies(data):
+    """
+    Categorise track orientations into four directions (N-S, E-W, NE-SW, NW-SE).
+
+    See also :py:func:`coordinator.feature.categorise_track_orientations`.
+
+    :param data: input data, which contains the start/end longitudes and latitudes
+    :type data: pandas.DataFrame
+    :return: dummy variables of the directions, e.g. 'Track_Orientation_N_S'
+    :rtype: pandas.DataFrame
+    """
+
+    track_orientations = categorise_track_orientations(data.reset_index(drop=True))
+    track_orientations.index = data.index
+
+    return track_orientations
+
+
+def categorise_max_temperatures(data):
+    """
+    Categorise maximum temperatures: < 24, = 24, 25, 26, 27, 28, 29, >= 30,
+    as in :py:meth:`HeatAttributedIncidents.get_incident_location_weather()
+    <modeller.prototype.HeatAttributedIncidents.get_incident_location_weather>`.
+
+    :param data: input data, which contains 'Temperature_max'
+    :type data: pandas.DataFrame
+    :return: dummy variables of the categories, e.g. 'Temperature_max = 24°C'
+    :rtype: pandas.DataFrame
+    """
+
+    labels = \
+        ['Temperature_max < 24°C'] + \
+        ['Temperature_max {} {}°C'.format('≥' if x >= 30 else '=', x) for x in range(24, 31)]
+    temperature_category = pd.cut(
+        data['Temperature_max'].values,
+        bins=[-np.inf] + list(range(24, 31)) + [np.inf], right=False, labels=labels)
+
+    temperature_dummies = pd.get_dummies(temperature_category)
+    temperature_dummies.index = data.index
+
+    return temperature_dummies
+
+
+def categorise_maximum_max_temperatures(data):
+    """
+    Categorise the maximum of maximum temperatures,
+    as in :py:meth:`HeatAttributedIncidentsPlus.get_incident_location_weather()
+    <modeller.prototype_ext.HeatAttributedIncidentsPlus.get_incident_location_weather>`.
+
+    See also :py:func:`coordinator.feature.categorise_temperatures`.
+
+    :param data: input data, which contains 'Maximum_Temperature_max'
+    :type data: pandas.DataFrame
+    :return: dummy variables of the categories, e.g. 'Maximum_Temperature_max [24.0, 25.0)°C'
+    :rtype: pandas.DataFrame
+    """
+
+    temperature_dummies = categorise_temperatures(data, column_name='Maximum_Temperature_max')
+
+    return temperature_dummies
+
+
+# Explanatory variables that are derived from other variables, and the (raw) variables required
+derived_variables = {
+    'CoverPercentDiff': (
+        calc_cover_percent_diff,
+        ['CoverPercentVegetation', 'CoverPercentOpenSpace', 'CoverPercentOther']),
+    'Temperature_dif': (calc_temperature_dif, ['Temperature_max', 'Temperature_min']),
+}
+
+# (Prefixes of) dummy variables that are derived by categorising other (raw) variables
+categorical_variables = {
+    'WindDirection_avg_': (categorise_wind_directions, ['WindDirection_avg']),
+    'Track_Orientation_': (
+        categorise_track_orientation_dummies,
+        ['StartLongitude', 'StartLatitude', 'EndLongitude', 'EndLatitude']),
+    'Temperature_max ': (categorise_max_temperatures, ['Temperature_max']),
+    'Maximum_Temperature_max ': (
+        categorise_maximum_max_temperatures, ['Maximum_Temperature_max']),
+}
+
+
+def get_raw_variables(variable):
+    """
+    Get the names of the (raw) variables from which an explanatory variable is derived.
+
+    :param variable: name of an explanatory variable
+    :type variable: str
+    :return: names of the raw variables (``[variable]`` if it is not derived)
+    :rtype: list
+
+    **Test**::
+
+        >>> from modeller.scoring import get_raw_variables
+
+        >>> get_raw_variables('WindDirection_avg_[90, 180)')
+        ['WindDirection_avg']
+        >>> get_raw_variables('WindGust_max')
+        ['WindGust_max']
+    """
+
+    if variable in derived_variables:
+        return derived_variables[variable][1]
+
+    for prefix, (_, raw_variables) in categorical_variables.items():
+        if variable.startswith(prefix):
+            return raw_variables
+
+    return [variable]
+
+
+class ScoringModel:
+    """
+    A trained model for scoring (i.e. predicting probabilities of) weather-related incidents.
+
+    :param variables: names of the explanatory variables (incl. ``'const'`` for the intercept)
+    :type variables: list
+    :param coefficients: estimated coefficients of the ``variables``
+    :type coefficients: list or numpy.ndarray
+    :param link: ``'logit'`` (default) or ``'probit'``
+    :type link: str
+    :param threshold: threshold of the probability for predicting an incident, defaults to ``0.5``
+    :type threshold: float
+    :param scales: scale factor of each (raw) explanatory variable, defaults to ``None``
+    :type scales: dict or None
+    :param name: name of the model, defaults to ``None``
+    :type name: str or None
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from modeller.scoring import ScoringModel
+
+        >>> mod = ScoringModel(['const', 'WindGust_max'], [-3.0, 0.5], scales={'WindGust_max': 0.1})
+
+        >>> mod.predict_proba(pd.DataFrame({'WindGust_max': [20.0, 60.0]}))
+        array([0.11920292, 0.5       ])
+    """
+
+    def __init__(self, variables, coefficients, link='logit', threshold=0.5, scales=None,
+                 name=None):
+        assert link in ('logit', 'probit')
+
+        self.Name = name
+        self.Variables = list(variables)
+        self.Coefficients = np.asarray(coefficients, dtype=np.float64)
+        self.Link = link
+        self.Threshold = threshold
+        self.Scales = {} if scales is None else dict(scales)
+
+        # Raw variables (in the input data) from which the explanatory variables are built
+        self.InputVariables = []
+        for var in [x for x in self.Variables if x != 'const']:
+            self.InputVariables += [
+                x for x in get_raw_variables(var) if x not in self.InputVariables]
+
+    @classmethod
+    def from_trained_model(cls, trained_model):
+        """
+        Create a scoring model from a trained data model.
+
+        :param trained_model: a data model, of which the method ``.logistic_regression()``
+            has been run
+        :type trained_model: modeller.WindAttributedIncidents or modeller.HeatAttributedIncidents
+            or modeller.HeatAttributedIncidentsPlus
+        :return: a scoring model
+        :rtype: ScoringModel
+
+        **Test**::
+
+            >>> from modeller import WindAttributedIncidents
+            >>> from modeller.scoring import ScoringModel
+
+            >>> w_model = WindAttributedIncidents(trial_id=2)
+            >>> _ = w_model.logistic_regression(verbose=False)
+
+            >>> scoring_model = ScoringModel.from_trained_model(w_model)
+        """
+
+        model = trained_model.__getattribute__('Model')
+
+        if hasattr(model, 'params'):  # statsmodels
+            variables = list(model.params.index)
+            coefficients = model.params.values
+            link = 'probit' if model.model.__class__.__name__ == 'Probit' else 'logit'
+        else:  # sklearn.linear_model.LogisticRegression
+            variables = ['const'] + list(trained_model.ExplanatoryVariables)
+            coefficients = np.append(model.intercept_, model.coef_[0])
+            link = 'logit'
+
+        # Scaling of the raw variables (see .prep_training_and_test_sets())
+        if trained_model.__class__.__name__ == 'WindAttributedIncidents':
+            scales = {x: 0.1 for x in variables if x.startswith('CoverPercent')}
+            scales.update({'WindGust_max': 0.1, 'RelativeHumidity_max': 0.1})
+        elif trained_model.__class__.__name__ == 'HeatAttributedIncidentsPlus':
+            scales = {'GLBL_IRAD_AMT_total': 0.001}
+        else:
+            scales = {}
+
+        if 'CoverPercentDiff' in variables:
+            scales.update({x: 0.1 for x in ('CoverPercentVegetation', 'CoverPercentOpenSpace',
+                                            'CoverPercentOther')})
+
+        name = make_filename("scoring-model", trained_model.Route, trained_model.WeatherCategory,
+                             save_as="")
+
+        scoring_model = cls(variables, coefficients, link=link,
+                            threshold=trained_model.__getattribute__('Threshold'), scales=scales,
+                            name=name)
+
+        return scoring_model
+
+    def save(self, path_to_file, verbose=False):
+        """
+        Save the scoring model as a pickle file.
+
+        :param path_to_file: path where the scoring model is saved
+        :type path_to_file: str
+        :param verbose: whether to print relevant information in console, defaults to ``False``
+        :type verbose: bool
+        """
+
+        scoring_model = {'Name': self.Name, 'Variables': self.Variables,
+                         'Coefficients': self.Coefficients, 'Link': self.Link,
+                         'Threshold': self.Threshold, 'Scales': self.Scales}
+
+        save_pickle(scoring_model, path_to_file, verbose=verbose)
+
+    @classmethod
+    def load(cls, path_to_file):
+        """
+        Load a scoring model from a pickle file.
+
+        :param path_to_file: path to the pickle file of a scoring model
+        :type path_to_file: str
+        :return: a scoring model
+        :rtype: ScoringModel
+        """
+
+        scoring_model = load_pickle(path_to_file)
+
+        return cls(scoring_model['Variables'], scoring_model['Coefficients'],
+                   link=scoring_model['Link'], threshold=scoring_model['Threshold'],
+                   scales=scoring_model['Scales'], name=scoring_model['Name'])
+
+    def build_features(self, data):
+        """
+        Build the design matrix of the explanatory variables from (raw) input data.
+
+        An explanatory variable that is in the input data is used as it is (after scaling);
+        otherwise, it is derived from the raw variables in the same way as the prototype models do,
+        e.g. 'Temperature_dif' from 'Temperature_max' and 'Temperature_min', and the dummy
+        variables 'WindDirection_avg_[..)', 'Track_Orientation_*', 'Temperature_max ..°C' and
+        'Maximum_Temperature_max [..)°C' by categorising the corresponding raw variables.
+        Other variables (e.g. 'WindGust_max') must be in the input data.
+
+        :param data: input data, which contains the explanatory variables or ``.InputVariables``
+        :type data: pandas.DataFrame
+        :return: design matrix (with columns in the order of ``.Variables``)
+        :rtype: numpy.ndarray
+        :raises KeyError: if any explanatory variable can be neither found nor derived
+
+        **Test**::
+
+            >>> import pandas as pd
+            >>> from modeller.scoring import ScoringModel
+
+            >>> variables = ['const', 'WindDirection_avg_[90, 180)', 'Temperature_dif']
+            >>> mod = ScoringModel(variables, [-1.0, 0.5, 0.1])
+
+            >>> dat = pd.DataFrame({'WindDirection_avg': [45.0, 135.0],
+            ...                     'Temperature_max': [20.0, 25.0],
+            ...                     'Temperature_min': [10.0, 5.0]})
+            >>> mod.build_features(dat)
+            array([[ 1.,  0., 10.],
+                   [ 1.,  1., 20.]])
+
+            >>> mod.build_features(dat[['WindDirection_avg']])
+            Traceback (most recent call last):
+              ...
+            KeyError: "The input data has no column(s): ['Temperature_max', 'Temperature_min']"
+        """
+
+        missing_variables = []
+        for var in [x for x in self.Variables if x != 'const' and x not in data.columns]:
+            missing_variables += [
+                x for x in get_raw_variables(var)
+                if x not in data.columns and x not in missing_variables]
+        if missing_variables:
+            raise KeyError("The input data has no column(s): {}".format(missing_variables))
+
+        def get_scaled(x):
+            return data[x].to_numpy(dtype=np.float64) * self.Scales.get(x, 1.0)
+
+        categorised = {}
+
+        features = np.empty((len(data), len(self.Variables)), dtype=np.float64)
+        for j, var in enumerate(self.Variables):
+            if var == 'const':
+                features[:, j] = 1.0
+            elif var in data.columns:
+                features[:, j] = get_scaled(var)
+            elif var in derived_variables:
+                calc_func, raw_variables = derived_variables[var]
+                features[:, j] = calc_func({x: get_scaled(x) for x in raw_variables})
+            else:
+                prefix = next(x for x in categorical_variables if var.startswith(x))
+                if prefix not in categorised:
+                    categorised[prefix] = categorical_variables[prefix][0](data)
+                features[:, j] = categorised[prefix][var].to_numpy(dtype=np.float64)
+
+        return features
+
+    def predict_proba(self, data, weather_data=None, on=None, chunk_size=1000000):
+        """
+        Predict probabilities of incidents.
+
+        :param data: data of incident records (or locations to be scored)
+        :type data: pandas.DataFrame
+        :param weather_data: data of weather conditions (e.g. forecasts), defaults to ``None``
+        :type weather_data: pandas.DataFrame or None
+        :param on: column name(s) on which ``weather_data`` is joined to ``data``,
+            defaults to ``None``
+        :type on: str or list or None
+        :param chunk_size: number of rows that are scored at a time, defaults to ``1000000``
+        :type chunk_size: int
+        :return: probabilities of incidents
+        :rtype: numpy.ndarray
+        """
+
+        if weather_data is not None:
+            data = data.merge(weather_data, how='left', on=on)
+
+        probabilities = np.empty(len(data), dtype=np.float64)
+        for i in range(0, len(data), chunk_size):
+            linear_predictor = self.build_features(data.iloc[i:i + chunk_size]) @ self.Coefficients
+            if self.Link == 'logit':
+                probabilities[i:i + chunk_size] = scipy.special.expit(linear_predictor)
+            else:
+                probabilities[i:i + chunk_size] = scipy.special.ndtr(linear_predictor)
+
+        return probabilities
+
+    def predict(self, data, weather_data=None, on=None, chunk_size=1000000):
+        """
+        Predict incidents (i.e. whether the probability reaches the threshold).
+
+        See also :py:meth:`ScoringModel.predict_proba`.
+
+        :return: predicted incidents (``1``) or non-incidents (``0``)
+        :rtype: numpy.ndarray
+        """
+
+        probabilities = self.predict_proba(data, weather_data, on, chunk_size)
+
+        return (probabilities >= self.Threshold).astype(np.int64)
+
+
+def score_data(path_to_model, path_to_input, path_to_output=None, chunk_size=1000000,
+               verbose=False):
+    """
+    Score (raw) input data with a saved scoring model.
+
+    :param path_to_model: path to the pickle file of a scoring model
+    :type path_to_model: str
+    :param path_to_input: path to the input data (a .pickle or .csv file)
+    :type path_to_input: str
+    :param path_to_output: path where the scored data is saved, defaults to ``None``
+    :type path_to_output: str or None
+    :param chunk_size: number of rows that are scored at a time, defaults to ``1000000``
+    :type chunk_size: int
+    :param verbose: whether to print relevant information in console, defaults to ``False``
+    :type verbose: bool
+    :return: input data with 'IncidentProbability' and 'IncidentPrediction'
+    :rtype: pandas.DataFrame
+    """
+
+    scoring_model = ScoringModel.load(path_to_model)
+
+    if os.path.splitext(path_to_input)[1] == ".pickle":
+        data = load_pickle(path_to_input)
+    else:
+        data = pd.read_csv(path_to_input)
+
+    data['IncidentProbability'] = scoring_model.predict_proba(data, chunk_size=chunk_size)
+    data['IncidentPrediction'] = \
+        (data.IncidentProbability >= scoring_model.Threshold).astype(np.int64)
+
+    if path_to_output:
+        save(data, path_to_output, verbose=verbose)
+
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score incident records (with weather conditions) with a trained model.")
+    parser.add_argument('model', help="path to the pickle file of a scoring model")
+    parser.add_argument('input', help="path to the input data (.pickle or .csv)")
+    parser.add_argument('output', help="path where the scored data is saved")
+    parser.add_argument('--chunk-size', type=int, default=1000000,
+                        help="number of rows that are scored at a time")
+    args = parser.parse_args(argv)
+
+    score_data(args.model, args.input, args.output, chunk_size=args.chunk_size, verbose=True)
+
+
+if __name__ == '__main__':
+    main()
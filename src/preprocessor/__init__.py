@@ -2,7 +2,8 @@
 Preprocessor.
 """
 
-from .metex import DelayAttributionGlossary, METExLite, Schedule8IncidentReports, WeatherThresholds
+from .metex import DelayAttributionGlossary, METExLite, Schedule8DataPartitions, \
+    Schedule8IncidentReports, WeatherThresholds
 from .network import Anglia
 from .vegetation import Vegetation
 from .weather import MIDAS, UKCP09
@@ -10,7 +11,8 @@ from .weather import MIDAS, UKCP09
 __all__ = [
     'explorer',
     'network', 'Anglia',
-    'metex', 'METExLite', 'WeatherThresholds', 'Schedule8IncidentReports', 'DelayAttributionGlossary',
+    'metex', 'METExLite', 'Schedule8DataPartitions', 'WeatherThresholds', 'Schedule8IncidentReports',
+    'DelayAttributionGlossary',
     'vegetation', 'Vegetation',
     'weather', 'MIDAS', 'UKCP09',
 ]
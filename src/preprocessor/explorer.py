@@ -2,7 +2,8 @@
 Exploratory analysis.
 """
 
-import itertools
+import concurrent.futures
+import os
 
 import matplotlib.cm
 import matplotlib.pyplot as plt
@@ -13,8 +14,7 @@ from pyhelpers.geom import find_closest_points, get_midpoint, wgs84_to_osgb36
 from pyhelpers.store import save
 
 from coordinator.geometry import get_shp_coordinates
-from preprocessor import METExLite
-from utils import cdd_exploration
+from utils import cdd_exploration, get_data_source, save_pickle
 
 
 def calc_stats(s8weather_incidents):
@@ -29,7 +29,7 @@ def calc_stats(s8weather_incidents):
     """
     s8weather_incidents.rename(columns={'Minutes': 'DelayMinutes', 'Cost': 'DelayCost'},
                                inplace=True)
-    stats = s8weather_incidents.groupby('WeatherCategory').aggregate(
+    stats = s8weather_incidents.groupby('WeatherCategory', observed=True).aggregate(
         {'WeatherCategory': 'count', 'DelayMinutes': np.sum, 'DelayCost': np.sum})
     stats.rename(columns={'WeatherCategory': 'Count'}, inplace=True)
     stats['percentage'] = stats.Count / len(s8weather_incidents) * 100
@@ -201,10 +201,112 @@ def find_midpoint_of_each_incident_location(incident_data):
     return data
 
 
+def merge_group_indices(group_indices, group_cols, merge_by):
+    """
+    Merge the row positions of groups into those of coarser groups, without another groupby pass.
+
+    :param group_indices: row positions of each group, e.g. ``data.groupby(group_cols).indices``
+    :type group_indices: dict
+    :param group_cols: names of the columns by which the groups are keyed
+    :type group_cols: list
+    :param merge_by: name(s) of (some of) the ``group_cols`` by which the coarser groups are keyed
+    :type merge_by: str or list
+    :return: row positions of each coarser group
+    :rtype: dict
+
+    **Test**::
+
+        >>> import numpy as np
+        >>> from preprocessor.explorer import merge_group_indices
+
+        >>> indices = {('Anglia', 1): np.array([0, 3]), ('Wales', 1): np.array([1]),
+        ...            ('Wales', 2): np.array([2])}
+
+        >>> merge_group_indices(indices, ['Region', 'StartMonth'], 'StartMonth')
+        {1: array([0, 1, 3]), 2: array([2])}
+    """
+
+    merge_cols = [merge_by] if isinstance(merge_by, str) else list(merge_by)
+    merge_locs = [group_cols.index(x) for x in merge_cols]
+
+    merged_indices = {}
+    for key, idx in group_indices.items():
+        key_ = key[merge_locs[0]] if isinstance(merge_by, str) \
+            else tuple(key[i] for i in merge_locs)
+        merged_indices.setdefault(key_, []).append(idx)
+
+    merged_indices = {k: np.sort(np.concatenate(v)) for k, v in sorted(merged_indices.items())}
+
+    return merged_indices
+
+
+def export_stats_by_group(data, group_by, path_func, sort_by=None, max_workers=None,
+                          group_indices=None, verbose=False):
+    """
+    Split statistics data by groups (in one pass) and save each group to a separate CSV file.
+
+    :param data: data of statistics
+    :type data: pandas.DataFrame
+    :param group_by: name(s) of the column(s) by which the ``data`` is split
+    :type group_by: str or list
+    :param path_func: a function that returns the path to the CSV file for a group key
+    :type path_func: typing.Callable
+    :param sort_by: column name(s) by which each group is sorted (descending), defaults to ``None``
+    :type sort_by: str or list or None
+    :param max_workers: maximum number of threads that write the files, defaults to ``None``
+    :type max_workers: int or None
+    :param group_indices: row positions of each group (keyed as ``group_by``); if ``None``
+        (default), they are obtained by a groupby pass over the ``data``
+    :type group_indices: dict or None
+    :param verbose: whether to print relevant information in console, defaults to ``False``
+    :type verbose: bool
+    :return: a manifest of the files that have been written
+    :rtype: list
+
+    **Example**::
+
+        from preprocessor.explorer import export_stats_by_group
+
+        manifest = export_stats_by_group(
+            data, ['StartYear', 'StartMonth'],
+            lambda k: cdd_exploration("NC", "02", "GB", "Year_Month", "{}_{:02d}.csv".format(*k)),
+            sort_by=['WeatherCategory', 'IncidentCount', 'DelayMinutes', 'DelayCost'])
+    """
+
+    def save_group(key, idx):
+        dat = data.iloc[idx]
+        if sort_by:
+            dat = dat.sort_values(sort_by, ascending=False, na_position='last')
+        dat.index = range(len(dat))
+        path_to_file = path_func(key)
+        os.makedirs(os.path.dirname(path_to_file), exist_ok=True)
+        save(dat, path_to_file, sep=',', verbose=False)
+        keys = [k.item() if hasattr(k, 'item') else k
+                for k in ([key] if isinstance(group_by, str) else key)]
+        return {'Path': os.path.relpath(path_to_file, cdd_exploration()),
+                'Group': dict(zip(group_cols, keys)),
+                'RowCount': len(dat)}
+
+    group_cols = [group_by] if isinstance(group_by, str) else list(group_by)
+
+    # Positions of the rows of each group are obtained with a single groupby pass
+    if group_indices is None:
+        group_indices = data.groupby(group_by, sort=True, observed=True).indices
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(save_group, k, idx) for k, idx in group_indices.items()]
+        manifest = [f.result() for f in futures]
+
+    if verbose:
+        print("{} files have been saved.".format(len(manifest)))
+
+    return manifest
+
+
 # == 1st dataset =======================================================================
 
-def prepare_stats_data(route_name=None, weather_category=None, update=False,
-                       verbose=True):
+def prepare_stats_data(route_name=None, weather_category=None, update=False, verbose=True,
+                       max_workers=None):
     """
     Prepare data of statistics.
 
@@ -218,6 +320,10 @@ def prepare_stats_data(route_name=None, weather_category=None, update=False,
     :type update: bool
     :param verbose: defaults to ``False``
     :type verbose: bool
+    :param max_workers: maximum number of threads that write the CSV files, defaults to ``None``
+    :type max_workers: int or None
+
+    A manifest of the written files is saved as "NC\\01\\manifest.json".
 
     **Example**::
 
@@ -229,7 +335,7 @@ def prepare_stats_data(route_name=None, weather_category=None, update=False,
         prepare_stats_data(route_name, weather_category, update, verbose)
     """
 
-    metex = METExLite()
+    metex = get_data_source('METExLite')
 
     # Get data of Schedule 8 incident locations
     incident_locations = metex.view_schedule8_costs_by_location(
@@ -239,21 +345,21 @@ def prepare_stats_data(route_name=None, weather_category=None, update=False,
     incident_locations = find_midpoint_of_each_incident_location(incident_locations)
 
     # Split the data by "region"
-    for region in incident_locations.Region.unique():
-        region_data = incident_locations[incident_locations.Region == region]
-        # Sort data by (frequency of incident occurrences, delay minutes, delay cost)
-        sort_by_cols = ['WeatherCategory', 'IncidentCount', 'DelayMinutes', 'DelayCost']
-        region_data.sort_values(sort_by_cols, ascending=False, inplace=True)
-        region_data.index = range(len(region_data))
-        export_path = cdd_exploration("NC", "01", region.replace(" ", "-").lower() + ".csv")
-        save(region_data, export_path, verbose=verbose)
+    sort_by_cols = ['WeatherCategory', 'IncidentCount', 'DelayMinutes', 'DelayCost']
+    manifest = export_stats_by_group(
+        incident_locations, 'Region',
+        lambda region: cdd_exploration("NC", "01", region.replace(" ", "-").lower() + ".csv"),
+        sort_by=sort_by_cols, max_workers=max_workers, verbose=verbose)
+
+    save(manifest, cdd_exploration("NC", "01", "manifest.json"), verbose=verbose)
 
     print("\nCompleted.")
 
 
 # == 2nd dataset =======================================================================
 
-def prepare_monthly_stats_data(route_name=None, weather_category=None, update=False, verbose=True):
+def prepare_monthly_stats_data(route_name=None, weather_category=None, update=False, verbose=True,
+                               max_workers=None, save_all_as_pickle=False):
     """
     Prepare data of monthly statistics.
 
@@ -267,6 +373,13 @@ def prepare_monthly_stats_data(route_name=None, weather_category=None, update=Fa
     :type update: bool
     :param verbose: defaults to ``False``
     :type verbose: bool
+    :param max_workers: maximum number of threads that write the CSV files, defaults to ``None``
+    :type max_workers: int or None
+    :param save_all_as_pickle: whether to save also all the statistics (sorted by region, year
+        and month) in a single pickle file, defaults to ``False``
+    :type save_all_as_pickle: bool
+
+    A manifest of the written files is saved as "NC\\02\\manifest.json".
 
     **Example**::
 
@@ -274,9 +387,11 @@ def prepare_monthly_stats_data(route_name=None, weather_category=None, update=Fa
         weather_category = None
         update = False
         verbose = True
+
+        prepare_monthly_stats_data(route_name, weather_category, update, verbose)
     """
 
-    metex = METExLite()
+    metex = get_data_source('METExLite')
 
     # Get data of Schedule 8 incidents by datetime and location
     dat = metex.view_schedule8_costs_by_datetime_location(
@@ -292,7 +407,7 @@ def prepare_monthly_stats_data(route_name=None, weather_category=None, update=Fa
     stats_calc = {'IncidentCount': np.count_nonzero,
                   'DelayMinutes': np.sum,
                   'DelayCost': np.sum}
-    stats = dat.groupby(list(dat.columns[3:-3])).aggregate(stats_calc)
+    stats = dat.groupby(list(dat.columns[3:-3]), observed=True).aggregate(stats_calc)
     stats.reset_index(inplace=True)
 
     # Find the "midpoint" of each incident location
@@ -301,51 +416,50 @@ def prepare_monthly_stats_data(route_name=None, weather_category=None, update=Fa
 
     sort_by_cols = ['WeatherCategory', 'IncidentCount', 'DelayMinutes', 'DelayCost']
 
-    print("Processing monthly statistics ... ")
-    for m in data.StartMonth.unique():
-        m_ = ("0" + str(m)) if m < 10 else m
-        print("           \"{}\" ... ".format(m_), end="")
-        dat1 = data[data.StartMonth == m]
-        if not dat1.empty:
-            dat1.sort_values(
-                sort_by_cols, ascending=False, na_position='last', inplace=True)
-            dat1.index = range(len(dat1))
-            export_path = cdd_exploration("NC\\02\\GB\\Month", "{}.csv".format(m_))
-            save(dat1, export_path, sep=',', verbose=False)
-        print("Done.")
-    print("Completed.\n")
-
-    print("Processing monthly statistics of GB ... ")
-    years, months = data.StartYear.unique(), data.StartMonth.unique()
-    for y, m in list(itertools.product(years, months)):
-        period = ("{}_0{}" if m < 10 else "{}_{}").format(y, m)
-        print("           \"{}\" ... ".format(period), end="")
-        dat = data[(data.StartYear == y) & (data.StartMonth == m)]
-        if not dat.empty:
-            dat.sort_values(
-                sort_by_cols, ascending=False, na_position='last', inplace=True)
-            dat.index = range(len(dat))
-            export_path = cdd_exploration("NC\\02\\GB\\Year_Month", "{}.csv".format(period))
-            save(dat, export_path, sep=',', verbose=False)
-        print("Done.")
-    print("Completed.\n")
+    # The groups by month and by year and month are merged from those by region, year and month,
+    # so that the data is split with a single groupby pass
+    group_cols = ['Region', 'StartYear', 'StartMonth']
+    # (The incidents of which the region is unknown are grouped under '', so that they still count
+    # towards the statistics of GB; they are not saved as a region)
+    group_indices = data.groupby(
+        [data.Region.fillna(''), data.StartYear, data.StartMonth], sort=True, observed=True).indices
+
+    print("Processing monthly statistics ... ", end="")
+    manifest = export_stats_by_group(
+        data, 'StartMonth',
+        lambda m: cdd_exploration("NC", "02", "GB", "Month", "{:02d}.csv".format(m)),
+        sort_by=sort_by_cols, max_workers=max_workers,
+        group_indices=merge_group_indices(group_indices, group_cols, 'StartMonth'))
+    print("Done.")
+
+    print("Processing monthly statistics of GB ... ", end="")
+    manifest += export_stats_by_group(
+        data, ['StartYear', 'StartMonth'],
+        lambda k: cdd_exploration("NC", "02", "GB", "Year_Month", "{}_{:02d}.csv".format(*k)),
+        sort_by=sort_by_cols, max_workers=max_workers,
+        group_indices=merge_group_indices(group_indices, group_cols, ['StartYear', 'StartMonth']))
+    print("Done.")
 
     # Split the data by "region"
-    print("Processing monthly statistics for each region ... ")
-    for region in data.Region.unique():
-        region_data = data[data.Region == region]
-        years, months = region_data.StartYear.unique(), region_data.StartMonth.unique()
-        print("           \"{}\" ... ".format(region), end="")
-        for y, m in list(itertools.product(years, months)):
-            dat_ = region_data[
-                (region_data.StartYear == y) & (region_data.StartMonth == m)]
-            if not dat_.empty:
-                dat_.sort_values(
-                    sort_by_cols, ascending=False, na_position='last', inplace=True)
-                dat_.index = range(len(dat_))
-                export_path = cdd_exploration("NC", "02", "Region", "{}".format(
-                    region.replace(" ", "-").lower()),
-                    ("{}_0{}.csv" if m < 10 else "{}_{}.csv").format(y, m))
-                save(dat_, export_path, sep=',', verbose=False)
-        print("Done.")
+    print("Processing monthly statistics for each region ... ", end="")
+    manifest += export_stats_by_group(
+        data, group_cols,
+        lambda k: cdd_exploration("NC", "02", "Region", k[0].replace(" ", "-").lower(),
+                                  "{}_{:02d}.csv".format(k[1], k[2])),
+        sort_by=sort_by_cols, max_workers=max_workers,
+        group_indices={k: v for k, v in group_indices.items() if k[0] != ''})
+    print("Done.")
+
+    if save_all_as_pickle:
+        data_ = data.sort_values(['Region', 'StartYear', 'StartMonth'] + sort_by_cols,
+                                 ascending=[True, True, True] + [False] * len(sort_by_cols),
+                                 na_position='last')
+        data_.index = range(len(data_))
+        path_to_pickle = cdd_exploration("NC", "02", "monthly-stats.pickle")
+        save_pickle(data_, path_to_pickle, verbose=verbose)
+        manifest.append({'Path': os.path.relpath(path_to_pickle, cdd_exploration()),
+                         'Group': {}, 'RowCount': len(data_)})
+
+    save(manifest, cdd_exploration("NC", "02", "manifest.json"), verbose=verbose)
+
     print("Completed.\n")
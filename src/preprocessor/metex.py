@@ -25,15 +25,18 @@ import shapely.wkt
 from pyhelpers.dir import cd
 from pyhelpers.geom import osgb36_to_wgs84, wgs84_to_osgb36
 from pyhelpers.ops import confirmed, fake_requests_headers
-from pyhelpers.store import load_json, load_pickle, save, save_fig, save_pickle
+from pyhelpers.store import load_json, save, save_fig
 from pyhelpers.text import find_similar_str
 from pyrcs.line_data import LocationIdentifiers
 from pyrcs.other_assets import Stations
 from pyrcs.utils import fetch_loc_names_repl_dict, fix_num_stanox, mile_chain_to_nr_mileage, \
     nr_mileage_num_to_str, nr_mileage_str_to_num, shift_num_nr_mileage, yards_to_nr_mileage
 
-from utils import cdd_metex, cdd_network, cdd_railway_codes, establish_mssql_connection, get_subset, \
-    get_table_primary_keys, make_filename, read_table_by_query, update_nr_route_names
+from utils import DeferredAttribute, apply_categorical_schema, cdd_metex, cdd_network, \
+    cdd_railway_codes, decode_geometry_columns, deferred_mssql_connection, \
+    encode_geometry_columns, establish_mssql_connection, get_data_source, get_subset, \
+    get_subset_index, get_table_primary_keys, load_pickle, make_filename, nr_mileage_nums_to_str, \
+    read_table_by_query, save_pickle, traced, update_nr_route_names
 
 
 class DelayAttributionGlossary:
@@ -948,6 +951,162 @@ class DelayAttributionGlossary:
         return delay_attr_glossary
 
 
+class Schedule8DataPartitions:
+    """
+    A lazy handle of the view of Schedule 8 details that is saved partition by partition.
+
+    Each partition (i.e. data of one Route or one financial year) is kept in a separate pickle file,
+    and only the partitions that are required are loaded into memory.
+    See also :py:meth:`METExLite.view_schedule8_data_partitions()`.
+
+    :param data_dir: path to the directory where the partitions are saved
+    :type data_dir: str
+
+    :ivar str DataDir: path to the directory where the partitions are saved
+    :ivar str ManifestFilename: filename of the manifest of the partitions
+    :ivar dict Manifest: partition column, partition filenames, row counts and lookup values
+
+    **Test**::
+
+        >>> from preprocessor import METExLite
+
+        >>> metex = METExLite()
+
+        >>> s8data_partitions = metex.view_schedule8_data_partitions()
+
+        >>> s8data_partitions.PartitionBy
+        'Route'
+
+        >>> s8data_anglia = s8data_partitions.read('Anglia')
+    """
+
+    ManifestFilename = "manifest.json"
+
+    def __init__(self, data_dir):
+        self.DataDir = data_dir
+        self.Manifest = None
+
+    def is_built(self):
+        """
+        Check whether the partitions have been saved.
+
+        :return: whether the manifest of the partitions exists
+        :rtype: bool
+        """
+
+        return os.path.isfile(os.path.join(self.DataDir, self.ManifestFilename))
+
+    def load_manifest(self):
+        """
+        Load the manifest of the partitions.
+
+        :return: manifest of the partitions
+        :rtype: dict
+        """
+
+        if self.Manifest is None:
+            self.Manifest = load_json(os.path.join(self.DataDir, self.ManifestFilename))
+
+        return self.Manifest
+
+    @property
+    def PartitionBy(self):
+        return self.load_manifest()['PartitionBy']
+
+    @property
+    def keys(self):
+        return list(self.load_manifest()['Partitions'].keys())
+
+    def _resolve_names(self, names, lookup):
+        if names is None:
+            return None
+        names_ = [names] if isinstance(names, (str, int)) else list(names)
+        return [find_similar_str(str(x), lookup) for x in names_]
+
+    def iter_partitions(self, keys=None, columns=None):
+        """
+        Load the partitions one by one.
+
+        :param keys: key(s) of the partitions (e.g. Route names);
+            if ``None`` (default), all partitions
+        :type keys: str or int or list or None
+        :param columns: columns to be retained in each partition; if ``None`` (default), all columns
+        :type columns: list or None
+        :return: data of each partition
+        :rtype: typing.Generator[pandas.DataFrame]
+        """
+
+        partitions = self.load_manifest()['Partitions']
+
+        for key in (self.keys if keys is None else self._resolve_names(keys, self.keys)):
+            partition = load_pickle(os.path.join(self.DataDir, partitions[key]))
+            partition.reset_index(inplace=True)
+            # Make sure all partitions share the same categories, which are kept when concatenated
+            apply_categorical_schema(partition)
+
+            if columns is not None:
+                partition = partition[columns]
+
+            yield partition
+
+    def iter_subsets(self, route_name=None, weather_category=None, columns=None):
+        """
+        Load the data for the given Route and weather category partition by partition.
+
+        Only the partitions of the given Route(s) are opened if the data is partitioned by 'Route'.
+
+        :param route_name: name of a Route, defaults to ``None``
+        :type route_name: str or list or None
+        :param weather_category: weather category, defaults to ``None``
+        :type weather_category: str or list or None
+        :param columns: columns to be retained in each partition; if ``None`` (default), all columns
+        :type columns: list or None
+        :return: subset of data of each partition
+        :rtype: typing.Generator[pandas.DataFrame]
+        """
+
+        manifest = self.load_manifest()
+
+        route_names = self._resolve_names(route_name, manifest['Route'])
+        weather_categories = self._resolve_names(weather_category, manifest['WeatherCategory'])
+
+        keys = route_names if self.PartitionBy == 'Route' else None
+
+        for partition in self.iter_partitions(keys=keys, columns=columns):
+            if route_names is not None and self.PartitionBy != 'Route':
+                partition = partition[partition.Route.isin(route_names)]
+            if weather_categories is not None:
+                partition = partition[partition.WeatherCategory.isin(weather_categories)]
+
+            if not partition.empty:
+                yield partition
+
+    def read(self, route_name=None, weather_category=None, columns=None):
+        """
+        Read the data for the given Route and weather category.
+
+        :param route_name: name of a Route, defaults to ``None``
+        :type route_name: str or list or None
+        :param weather_category: weather category, defaults to ``None``
+        :type weather_category: str or list or None
+        :param columns: columns to be retained; if ``None`` (default), all columns
+        :type columns: list or None
+        :return: data of Schedule 8 details, indexed by 'PfPIId'
+        :rtype: pandas.DataFrame or None
+        """
+
+        subsets = list(self.iter_subsets(route_name, weather_category, columns))
+
+        if subsets:
+            schedule8_data = pd.concat(subsets, ignore_index=True)
+            if 'PfPIId' in schedule8_data.columns:
+                schedule8_data.set_index('PfPIId', inplace=True)
+        else:
+            schedule8_data = None
+
+        return schedule8_data
+
+
 class METExLite:
     """
     METEX database.
@@ -962,6 +1121,7 @@ class METExLite:
     :ivar preprocessor.DelayAttributionGlossary DAG: instance of the DAG class
     :ivar pyrcs.LocationIdentifiers LocationID: instance of the LocationIdentifiers class
     :ivar pyrcs.Stations StationCode: instance of the Stations class
+    :ivar dict or None TrackSummaryIndex: linear-referencing index of the table 'Track Summary'
 
     **Test**::
 
@@ -973,17 +1133,21 @@ class METExLite:
         METEX
     """
 
+    # Connection to the database and lookups of railway codes (created on first use)
+    DatabaseConn = deferred_mssql_connection()
+    LocationID = DeferredAttribute(lambda self: LocationIdentifiers())
+    StationCode = DeferredAttribute(lambda self: Stations())
+
     def __init__(self, database_name='NR_METEx_20190203'):
         self.Name = 'METExLite'
         self.Desc = 'METExLite is a geographic information system (GIS) based decision support tool, ' \
                     'used to assess asset and system vulnerability to weather.'
 
         self.DatabaseName = database_name
-        self.DatabaseConn = establish_mssql_connection(database_name=self.DatabaseName)
 
         self.DAG = DelayAttributionGlossary()
-        self.LocationID = LocationIdentifiers()
-        self.StationCode = Stations()
+
+        self.TrackSummaryIndex = None
 
     # == Change directories ===========================================================================
 
@@ -1094,6 +1258,7 @@ class METExLite:
 
     # == Methods to read table data from the database =================================================
 
+    @traced(io='database')
     def read_table(self, table_name, schema_name='dbo', index_col=None,
                    route_name=None, weather_category=None, save_as=None, update=False, **kwargs):
         """
@@ -2356,10 +2521,9 @@ class METExLite:
         METExLite.Weather = 'Weather'
 
         try:
-            conn_db = establish_mssql_connection(database_name=self.DatabaseName)
             sql_query = "SELECT * FROM dbo.[Weather];"
 
-            chunks = pd.read_sql_query(sql=sql_query, con=conn_db,
+            chunks = pd.read_sql_query(sql=sql_query, con=self.DatabaseConn,
                                        index_col=self.get_primary_key(table_name=METExLite.Weather),
                                        parse_dates=['DateTime'],
                                        chunksize=chunk_size)
@@ -2375,6 +2539,7 @@ class METExLite:
 
         return weather
 
+    @traced(io='database')
     def query_weather_by_id_datetime(self, weather_cell_id, start_dt=None, end_dt=None, postulate=False,
                                      pickle_it=False, dat_dir=None, update=False, verbose=False):
         """
@@ -2449,8 +2614,6 @@ class METExLite:
 
         else:
             try:
-                # Establish a connection to the MSSQL server
-                conn_metex = establish_mssql_connection(database_name=self.DatabaseName)
                 # Specify database sql query
                 sql_query = "SELECT * FROM dbo.[Weather] WHERE {} {} {} AND {} AND {};".format(
                     "[WeatherCell]", "IN" if isinstance(weather_cell_id, tuple) else "=",
@@ -2458,7 +2621,7 @@ class METExLite:
                     "[DateTime] >= '{}'".format(start_dt) if start_dt else "",
                     "[DateTime] <= '{}'".format(end_dt) if end_dt else "")
                 # Query the weather data
-                weather_dat = pd.read_sql(sql_query, conn_metex)
+                weather_dat = pd.read_sql(sql_query, self.DatabaseConn)
 
                 if postulate:
                     i = 0
@@ -2763,7 +2926,7 @@ class METExLite:
         path_to_pickle = self.cdd_tables(METExLite.Track + ".pickle")
 
         if os.path.isfile(path_to_pickle) and not update:
-            track = load_pickle(path_to_pickle)
+            track = decode_geometry_columns(load_pickle(path_to_pickle))
 
         else:
             try:
@@ -2800,7 +2963,7 @@ class METExLite:
                 track.sort_values(['ELR', 'StartYard', 'EndYard'], inplace=True)
                 track.index = range(len(track))
 
-                save_pickle(track, path_to_pickle, verbose=verbose)
+                save_pickle(encode_geometry_columns(track), path_to_pickle, verbose=verbose)
 
             except Exception as e:
                 print("Failed to get \"{}\". {}.".format(METExLite.Track, e))
@@ -2809,110 +2972,152 @@ class METExLite:
         return track
 
     @staticmethod
-    def create_track_geometric_graph(geom_objects, rotate_labels=None):
+    def make_track_geometric_graph(geom_objects):
         """
-        Create a graph to illustrate track geometry.
+        Make a graph of track geometry.
+
+        The vertices of all the line parts are identified by their (x, y) coordinates, so that any
+        parts sharing an endpoint are stitched together at the same node; the edges between
+        consecutive vertices of each part are then added to the graph in one go.
 
         :param geom_objects: geometry objects
         :type geom_objects: iterable of [WKT str, shapely.geometry.LineString,
             or shapely.geometry.MultiLineString]
-        :param rotate_labels: defaults to ``None``
-        :type rotate_labels: numbers.Number, None
-        :return: a graph demonstrating the tracks
+        :return: a graph of the tracks, with node attribute ``'pos'`` (coordinates) and
+            edge attribute ``'weight'`` (length)
+        :rtype: networkx.Graph
 
         **Test**::
 
             >>> from preprocessor import METExLite
-            
+
             >>> metex = METExLite()
 
             >>> track_tbl = metex.get_track()
-            >>> geom_objs = track_tbl.geom[list(range(len(track_tbl[track_tbl.ELR == 'AAV'])))]
 
-            >>> metex.create_track_geometric_graph(geom_objs)
+            >>> g = metex.make_track_geometric_graph(track_tbl[track_tbl.ELR == 'AAV'].geom)
+
+            >>> # Vertices that share the x coordinate (but not the y coordinate) are distinct nodes
+            >>> g = METExLite.make_track_geometric_graph(
+            ...     ['LINESTRING (0 0, 0 1)', 'LINESTRING (0 1, 0 3)'])
+            >>> sorted(g.nodes(data='pos'))
+            [(0, (0.0, 0.0)), (1, (0.0, 1.0)), (2, (0.0, 3.0))]
+            >>> sorted(g.edges(data='weight'))
+            [(0, 1, 1.0), (1, 2, 2.0)]
         """
 
+        # Coordinates of the line parts
+        line_parts = []
+        for geom_obj in geom_objects:
+            if isinstance(geom_obj, str):
+                geom_obj = shapely.wkt.loads(geom_obj)
+
+            if isinstance(geom_obj, shapely.geometry.MultiLineString):
+                line_parts += [np.asarray(line.coords)[:, :2] for line in geom_obj.geoms]
+            else:
+                line_parts.append(np.asarray(geom_obj.coords)[:, :2])
+
         g = nx.Graph()
 
-        import matplotlib.pyplot as plt
+        line_parts = [x for x in line_parts if len(x) > 0]
+        if not line_parts:
+            return g
 
-        fig, ax = plt.subplots()
+        coordinates = np.concatenate(line_parts).astype(np.float64)
+        part_ids = np.repeat(np.arange(len(line_parts)), [len(x) for x in line_parts])
 
-        max_node_id = 0
-        for geom_obj in geom_objects:
+        # Identify the nodes by the (unique) coordinates
+        uniques, node_ids = np.unique(coordinates, axis=0, return_inverse=True)
+        node_ids = node_ids.ravel()
 
-            if isinstance(geom_obj, str):
-                geom_obj = shapely.wkt.loads(geom_obj)
+        # Edges between consecutive vertices of each part
+        consecutive = np.flatnonzero(part_ids[:-1] == part_ids[1:])
+        u, v = node_ids[consecutive], node_ids[consecutive + 1]
+        lengths = np.hypot(*(coordinates[consecutive + 1] - coordinates[consecutive]).T)
 
-            geom_type, geom_pos = shapely.geometry.mapping(geom_obj).values()
+        node_positions = map(tuple, uniques.tolist())
+        g.add_nodes_from((i, {'pos': pos}) for i, pos in enumerate(node_positions))
+        not_loop = u != v
+        g.add_weighted_edges_from(
+            zip(u[not_loop].tolist(), v[not_loop].tolist(), lengths[not_loop].tolist()))
 
-            if geom_type == 'MultiLineString':
+        return g
 
-                # Sort line strings of the multi-line string
-                geom_pos_idx = list(range(len(geom_pos)))
-                pos_idx_sorted = []
-                while geom_pos_idx:
-                    y = geom_pos_idx[0]
-                    p1 = [i for i, x in enumerate([x[-1] for x in geom_pos]) if x == geom_pos[y][0]]
-                    if p1 and p1[0] not in pos_idx_sorted:
-                        pos_idx_sorted = p1 + [y]
-                    else:
-                        pos_idx_sorted = [y]
-
-                    p2 = [i for i, x in enumerate([x[0] for x in geom_pos]) if x == geom_pos[y][-1]]
-                    if p2:
-                        pos_idx_sorted += p2
-
-                    geom_pos_idx = [a for a in geom_pos_idx if a not in pos_idx_sorted]
-
-                    if len(geom_pos_idx) == 1:
-                        y = geom_pos_idx[0]
-                        p3 = [i for i, x in enumerate([x[-1] for x in geom_pos]) if x == geom_pos[y][0]]
-                        if p3 and p3[0] in pos_idx_sorted:
-                            pos_idx_sorted.insert(pos_idx_sorted.index(p3[0]) + 1, y)
-                            break
-
-                        p4 = [i for i, x in enumerate([x[0] for x in geom_pos]) if x == geom_pos[y][-1]]
-                        if p4 and p4[0] in pos_idx_sorted:
-                            pos_idx_sorted.insert(pos_idx_sorted.index(p4[0]), y)
-                            break
-
-                geom_pos = [geom_pos[i] for i in pos_idx_sorted]
-                geom_pos = [x[:-1] for x in geom_pos[:-1]] + [geom_pos[-1]]
-                geom_pos = [x for g_pos in geom_pos for x in g_pos]
-
-            # j = 0
-            # n = g.number_of_nodes()
-            # while j < len(geom_pos):
-            #     # Nodes
-            #     g_pos = geom_pos[j]
-            #     for i in range(len(g_pos)):
-            #         g.add_node(i + n + 1, pos=g_pos[i])
-            #     # Edges
-            #     current_max_node_id = g.number_of_nodes()
-            #     edges = [(x, x + 1) for x in range(n + 1, n + current_max_node_id)
-            #              if x + 1 <= current_max_node_id]
-            #     g.add_edges_from(edges)
-            #     n = current_max_node_id
-            #     j += 1
-
-            # Nodes
-
-            for i in range(len(geom_pos)):
-                g.add_node(i + 1 + max_node_id, pos=geom_pos[i])
-
-            # Edges
-            number_of_nodes = g.number_of_nodes()
-            edges = [(i, i + 1) for i in range(1 + max_node_id, number_of_nodes + 1) if
-                     i + 1 <= number_of_nodes]
-            # edges = [(i, i + 1) for i in range(1, number_of_nodes + 1) if i + 1 <= number_of_nodes]
-            g.add_edges_from(edges)
-
-            # Plot
-            nx.draw_networkx(g, pos=nx.get_node_attributes(g, name='pos'), ax=ax, node_size=0,
-                             with_labels=False)
-
-            max_node_id = number_of_nodes
+    def get_track_geometric_graph(self, route_name=None, update=False, verbose=False):
+        """
+        Get a graph of the track geometry (of the whole network or a Route).
+
+        See also :py:meth:`METExLite.make_track_geometric_graph`.
+
+        :param route_name: name of a Route; if ``None`` (default), all Routes
+        :type route_name: str or None
+        :param update: whether to check on update and proceed to update the package data,
+            defaults to ``False``
+        :type update: bool
+        :param verbose: whether to print relevant information in console as the function runs,
+            defaults to ``False``
+        :type verbose: bool or int
+        :return: a graph of the tracks
+        :rtype: networkx.Graph or None
+
+        **Test**::
+
+            >>> from preprocessor import METExLite
+
+            >>> metex = METExLite()
+
+            >>> g = metex.get_track_geometric_graph(route_name='Anglia', update=True, verbose=True)
+            Updating "Track-graph-Anglia.pickle" at "data\\metex\\database_lite\\tables" ... Done.
+        """
+
+        path_to_pickle = self.cdd_tables(make_filename("Track-graph", route_name))
+
+        if os.path.isfile(path_to_pickle) and not update:
+            track_graph = load_pickle(path_to_pickle)
+
+        else:
+            try:
+                track = self.get_track()
+                if route_name is not None:
+                    track = get_subset(track, route_name)
+
+                track_graph = self.make_track_geometric_graph(track.geom)
+
+                save_pickle(track_graph, path_to_pickle, verbose=verbose)
+
+            except Exception as e:
+                print("Failed to get the graph of \"Track\". {}.".format(e))
+                track_graph = None
+
+        return track_graph
+
+    @staticmethod
+    def draw_track_geometric_graph(g, rotate_labels=None):
+        """
+        Draw a graph of track geometry.
+
+        :param g: a graph of the tracks (see :py:meth:`METExLite.make_track_geometric_graph`)
+        :type g: networkx.Graph
+        :param rotate_labels: defaults to ``None``
+        :type rotate_labels: numbers.Number, None
+
+        **Test**::
+
+            >>> from preprocessor import METExLite
+
+            >>> metex = METExLite()
+
+            >>> g = metex.get_track_geometric_graph(route_name='Anglia')
+
+            >>> metex.draw_track_geometric_graph(g)
+        """
+
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots()
+
+        nx.draw_networkx(g, pos=nx.get_node_attributes(g, name='pos'), ax=ax, node_size=0,
+                         with_labels=False)
 
         ax.tick_params(left=True, bottom=True, labelleft=True, labelbottom=True, gridOn=True,
                        grid_linestyle='--')
@@ -2928,6 +3133,36 @@ class METExLite:
                 tick.set_rotation(rotate_labels)
         plt.tight_layout()
 
+    def create_track_geometric_graph(self, geom_objects, rotate_labels=None):
+        """
+        Create a graph to illustrate track geometry.
+
+        :param geom_objects: geometry objects
+        :type geom_objects: iterable of [WKT str, shapely.geometry.LineString,
+            or shapely.geometry.MultiLineString]
+        :param rotate_labels: defaults to ``None``
+        :type rotate_labels: numbers.Number, None
+        :return: a graph demonstrating the tracks
+        :rtype: networkx.Graph
+
+        **Test**::
+
+            >>> from preprocessor import METExLite
+            
+            >>> metex = METExLite()
+
+            >>> track_tbl = metex.get_track()
+            >>> geom_objs = track_tbl.geom[list(range(len(track_tbl[track_tbl.ELR == 'AAV'])))]
+
+            >>> g = metex.create_track_geometric_graph(geom_objs)
+        """
+
+        g = self.make_track_geometric_graph(geom_objects)
+
+        self.draw_track_geometric_graph(g, rotate_labels=rotate_labels)
+
+        return g
+
     @staticmethod
     def cleanse_track_summary(dat):
         """
@@ -3000,9 +3235,12 @@ class METExLite:
         route_names_changes_alt = dict(zip(temp.index, temp.Route))
         dat['Route'] = dat.SubRoute.replace(route_names_changes_alt)
 
-        # Mileages
+        # Mileages (converted from yards in one go, equivalent to ``yards_to_nr_mileage``)
         mileage_colnames, yard_colnames = ['StartMileage', 'EndMileage'], ['StartYards', 'EndYards']
-        dat[mileage_colnames] = dat[yard_colnames].applymap(yards_to_nr_mileage)
+        for mileage_col, yard_col in zip(mileage_colnames, yard_colnames):
+            yards = pd.to_numeric(dat[yard_col], errors='coerce')
+            miles = np.floor(yards / 1760)
+            dat[mileage_col] = nr_mileage_nums_to_str(miles + (yards - miles * 1760) / 10000)
 
         return dat
 
@@ -3060,20 +3298,249 @@ class METExLite:
 
         return track_summary
 
-    def query_track_summary(self, elr, track_id, start_yard=None, end_yard=None, pickle_it=True,
+    def get_track_summary_index(self, update=False, verbose=False):
+        """
+        Get a linear-referencing index of the table 'Track Summary'.
+
+        Track segments are sorted by ``'ELR'``, ``'TrackID'`` and ``'StartYards'``, so that the
+        segments of each track (i.e. each pair of ELR and TrackID) occupy a contiguous block of rows
+        in the order of their start yards.
+
+        :param update: whether to check on update and proceed to update the package data,
+            defaults to ``False``
+        :type update: bool
+        :param verbose: whether to print relevant information in console as the function runs,
+            defaults to ``False``
+        :type verbose: bool or int
+        :return: sorted track segments (``'Segments'``), the track number of each segment
+            (``'TrackNo'``) and the maximum segment length (in yards) of each track (``'Tracks'``)
+        :rtype: dict or None
+
+        **Test**::
+
+            >>> from preprocessor import METExLite
+
+            >>> metex = METExLite()
+
+            >>> track_summary_index = metex.get_track_summary_index()
+
+            >>> list(track_summary_index.keys())
+            ['Segments', 'TrackNo', 'Tracks']
+        """
+
+        if self.TrackSummaryIndex is not None and not update:
+            return self.TrackSummaryIndex
+
+        path_to_pickle = self.cdd_tables("TrackSummary-index.pickle")
+
+        if os.path.isfile(path_to_pickle) and not update:
+            track_summary_index = load_pickle(path_to_pickle)
+
+        else:
+            try:
+                track_summary = self.get_track_summary(update=update, verbose=verbose)
+
+                key_cols, yard_cols = ['ELR', 'TrackID'], ['StartYards', 'EndYards']
+                segments = track_summary.dropna(subset=key_cols + yard_cols).sort_values(
+                    key_cols + yard_cols, kind='mergesort')
+
+                track_segments = segments.groupby(key_cols, sort=False)
+                segment_lengths = segments.EndYards - segments.StartYards
+                tracks = segment_lengths.groupby(
+                    [segments.ELR, segments.TrackID], sort=False).max().to_frame('MaxLength')
+
+                track_summary_index = {'Segments': segments,
+                                       'TrackNo': track_segments.ngroup().to_numpy(),
+                                       'Tracks': tracks}
+
+                save_pickle(track_summary_index, path_to_pickle, verbose=verbose)
+
+            except Exception as e:
+                print("Failed to get the index of \"Track Summary\". {}.".format(e))
+                track_summary_index = None
+
+        self.TrackSummaryIndex = track_summary_index
+
+        return track_summary_index
+
+    @traced(io='database')
+    def query_track_segments(self, elr, track_id=None, start_yard=None, end_yard=None,
+                             how='within'):
+        """
+        Find (in bulk) the track segments that fall within / overlap given ELR and yard ranges.
+
+        :param elr: ELR of each query
+        :type elr: list or numpy.ndarray or pandas.Series
+        :param track_id: TrackID of each query; if ``None`` (default), all tracks of the ELR
+        :type track_id: list or numpy.ndarray or pandas.Series or None
+        :param start_yard: start yard of each query; if ``None`` (default), the start of a track
+        :type start_yard: list or numpy.ndarray or pandas.Series or None
+        :param end_yard: end yard of each query; if ``None`` (default), the end of a track
+        :type end_yard: list or numpy.ndarray or pandas.Series or None
+        :param how: ``'within'`` (default), i.e. segments between the start and end yards, or
+            ``'overlaps'``, i.e. segments that cover any part of the yard range
+        :type how: str
+        :return: positions of the queries and, correspondingly,
+            (positional) indices of the matched segments in the index of the track summary
+        :rtype: tuple
+
+        **Test**::
+
+            >>> from preprocessor import METExLite
+
+            >>> metex = METExLite()
+
+            >>> query_pos, segment_pos = metex.query_track_segments(
+            ...     ['AAV', 'AAV'], [1100, 1100], [51150, 60000], [66220, 61000], how='overlaps')
+
+            >>> segments = metex.get_track_summary_index()['Segments'].iloc[segment_pos]
+        """
+
+        assert how in ('within', 'overlaps')
+
+        track_summary_index = self.get_track_summary_index()
+        segments, tracks = track_summary_index['Segments'], track_summary_index['Tracks']
+
+        elrs = np.asarray(elr, dtype=object)
+        start_yards = np.full(len(elrs), -np.inf) if start_yard is None else \
+            pd.to_numeric(np.asarray(start_yard), errors='coerce').astype(np.float64)
+        end_yards = np.full(len(elrs), np.inf) if end_yard is None else \
+            pd.to_numeric(np.asarray(end_yard), errors='coerce').astype(np.float64)
+        start_yards[np.isnan(start_yards)], end_yards[np.isnan(end_yards)] = -np.inf, np.inf
+        start_yards, end_yards = \
+            np.minimum(start_yards, end_yards), np.maximum(start_yards, end_yards)
+
+        # Locate the track of each query (a query may cover multiple tracks if TrackID is not given)
+        query_pos = np.arange(len(elrs))
+        if track_id is None:
+            track_keys = tracks.index.to_frame(index=False)
+            track_keys['TrackNo'] = np.arange(len(tracks))
+            queries = pd.DataFrame({'ELR': elrs, 'QueryPos': query_pos}).merge(
+                track_keys, how='inner', on='ELR')
+            query_pos, track_no = queries.QueryPos.to_numpy(), queries.TrackNo.to_numpy()
+        else:
+            track_no = tracks.index.get_indexer(pd.MultiIndex.from_arrays([elrs, track_id]))
+            query_pos, track_no = query_pos[track_no >= 0], track_no[track_no >= 0]
+
+        start_yards, end_yards = start_yards[query_pos], end_yards[query_pos]
+        if how == 'overlaps':
+            # Any overlapping segment starts no earlier than the maximum segment length of its track
+            lower_yards = start_yards - tracks.MaxLength.to_numpy(dtype=np.float64)[track_no]
+        else:
+            lower_yards = start_yards
+
+        # Search for the start yards within each track, with segments keyed by (TrackNo, StartYards)
+        segment_starts = segments.StartYards.to_numpy(dtype=np.float64)
+        segment_ends = segments.EndYards.to_numpy(dtype=np.float64)
+        origin = segment_starts.min() if len(segment_starts) > 0 else 0.0
+        span = (segment_starts.max() - origin + 1) if len(segment_starts) > 0 else 1.0
+
+        def make_keys(track_nos, yards):
+            return track_nos * span + np.clip(yards - origin, -0.5, span - 0.5)
+
+        segment_keys = make_keys(track_summary_index['TrackNo'], segment_starts)
+        first_pos = np.searchsorted(segment_keys, make_keys(track_no, lower_yards), side='left')
+        last_pos = np.searchsorted(segment_keys, make_keys(track_no, end_yards), side='right')
+
+        # Expand the candidate segments of each query, and filter them by their end yards
+        counts = np.maximum(last_pos - first_pos, 0)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        segment_pos = np.repeat(first_pos, counts) + offsets
+        query_pos = np.repeat(query_pos, counts)
+
+        if how == 'overlaps':
+            matched = segment_ends[segment_pos] >= np.repeat(start_yards, counts)
+        else:
+            matched = segment_ends[segment_pos] <= np.repeat(end_yards, counts)
+
+        return query_pos[matched], segment_pos[matched]
+
+    def join_track_summary(self, data, elr_col='ELR', track_id_col=None, start_yard_col=None,
+                           end_yard_col=None, columns=None, how='overlaps',
+                           rsuffix='_TrackSummary'):
+        """
+        Join attributes of the track segments, which are located at each record, to given data.
+
+        See also :py:meth:`METExLite.query_track_segments`.
+
+        :param data: data of (e.g. incident) records with ELRs and yards
+        :type data: pandas.DataFrame
+        :param elr_col: column name of ELR, defaults to ``'ELR'``
+        :type elr_col: str
+        :param track_id_col: column name of TrackID, defaults to ``None``
+        :type track_id_col: str or None
+        :param start_yard_col: column name of start yards, defaults to ``None``
+        :type start_yard_col: str or None
+        :param end_yard_col: column name of end yards, defaults to ``None``
+        :type end_yard_col: str or None
+        :param columns: columns of the track summary to be joined, defaults to ``None`` (all)
+        :type columns: list or None
+        :param how: ``'overlaps'`` (default) or ``'within'``
+        :type how: str
+        :param rsuffix: suffix of track summary column names that are also in ``data``,
+            defaults to ``'_TrackSummary'``
+        :type rsuffix: str
+        :return: records of ``data`` (repeated for each matched segment) with attributes of
+            the segments, or ``None`` if failed
+        :rtype: pandas.DataFrame or None
+
+        **Test**::
+
+            >>> import pandas as pd
+            >>> from preprocessor import METExLite
+
+            >>> metex = METExLite()
+
+            >>> dat = pd.DataFrame({'ELR': ['AAV'], 'StartYard': [51150], 'EndYard': [51200]})
+
+            >>> dat_ = metex.join_track_summary(dat, start_yard_col='StartYard',
+            ...                                 end_yard_col='EndYard',
+            ...                                 columns=['TrackID', 'TrackPriority', 'MGTPA'])
+        """
+
+        try:
+            query_pos, segment_pos = self.query_track_segments(
+                elr=data[elr_col].to_numpy(),
+                track_id=data[track_id_col].to_numpy() if track_id_col else None,
+                start_yard=data[start_yard_col].to_numpy() if start_yard_col else None,
+                end_yard=data[end_yard_col].to_numpy() if end_yard_col else None, how=how)
+
+            segments = self.TrackSummaryIndex['Segments']
+            if columns is not None:
+                segments = segments[columns]
+
+            joined_data = data.iloc[query_pos]
+
+            segment_attributes = segments.iloc[segment_pos].set_axis(joined_data.index, axis=0)
+            segment_attributes.columns = [
+                x + rsuffix if x in data.columns else x for x in segment_attributes.columns]
+
+            joined_data = pd.concat([joined_data, segment_attributes], axis=1)
+
+        except Exception as e:
+            print("Failed to join data of \"Track Summary\". {}.".format(e))
+            joined_data = None
+
+        return joined_data
+
+    @traced(io='database')
+    def query_track_summary(self, elr, track_id, start_yard=None, end_yard=None, pickle_it=False,
                             dat_dir=None, update=False, verbose=False):
         """
-        Get track summary data by ``'Track ID'`` and ``'Yard'`` (Query from the database).
+        Get track summary data by ``'Track ID'`` and ``'Yard'``.
+
+        The query is answered by the local index of the track summary
+        (see :py:meth:`METExLite.get_track_summary_index`).
 
         :param elr: ELR
-        :type elr: str
+        :type elr: str or tuple
         :param track_id: TrackID
         :type track_id: tuple or int or numpy.integer
         :param start_yard: start yard, defaults to ``None``
         :type start_yard: int or None
         :param end_yard: end yard, defaults to ``None``
         :type end_yard: int or None
-        :param pickle_it: whether to save the queried data as a pickle file, defaults to ``True``
+        :param pickle_it: whether to save the queried data as a pickle file, defaults to ``False``
         :type pickle_it: bool
         :param dat_dir: directory where the queried data is saved, defaults to ``None``
         :type dat_dir: str or None
@@ -3113,25 +3580,24 @@ class METExLite:
         dat_dir = dat_dir if isinstance(dat_dir, str) and os.path.isabs(dat_dir) else self.cdd_views()
         path_to_pickle = cd(dat_dir, pickle_filename)
 
-        if os.path.isfile(path_to_pickle) and not update:
+        if pickle_it and os.path.isfile(path_to_pickle) and not update:
             return load_pickle(path_to_pickle)
 
         else:
             try:
-                conn_metex = establish_mssql_connection(database_name=self.DatabaseName)
+                if update:
+                    _ = self.get_track_summary_index(update=update, verbose=verbose)
 
-                con1 = "[ELR] {} '{}'".format("=" if isinstance(elr, str) else "IN", elr)
-                con2 = "[TID] {} {}".format(
-                    "=" if isinstance(track_id, (int, np.integer)) else "IN", track_id)
-                con3 = "[Start Yards] >= {}".format(start_yard) if start_yard else ""
-                con4 = "[End Yards] <= {}".format(end_yard) if end_yard else ""
+                queries = list(itertools.product(
+                    elr if isinstance(elr, tuple) else [elr],
+                    track_id if isinstance(track_id, tuple) else [track_id]))
+                query_elrs, query_track_ids = zip(*queries)
 
-                sql_query = "SELECT * FROM dbo.[Track Summary] WHERE {} AND {} AND {} AND {};".format(
-                    con1, con2, con3, con4)
+                _, segment_pos = self.query_track_segments(
+                    query_elrs, query_track_ids, start_yard=[start_yard or np.nan] * len(queries),
+                    end_yard=[end_yard or np.nan] * len(queries), how='within')
 
-                track_summary_raw = pd.read_sql(sql_query, conn_metex)
-
-                track_summary = self.cleanse_track_summary(track_summary_raw)
+                track_summary = self.TrackSummaryIndex['Segments'].iloc[segment_pos].sort_index()
 
                 if pickle_it:
                     save_pickle(track_summary, path_to_pickle, verbose=verbose)
@@ -3255,7 +3721,7 @@ class METExLite:
             calculate_pfpi_stats(data_set, selected_features)
         """
 
-        pfpi_stats = data_set.groupby(selected_features[1:-2]).aggregate({
+        pfpi_stats = data_set.groupby(selected_features[1:-2], observed=True).aggregate({
             # 'IncidentId_and_CreateDate': {'IncidentCount': np.count_nonzero},
             'PfPIId': np.count_nonzero,
             'PfPIMinutes': np.sum,
@@ -3269,8 +3735,179 @@ class METExLite:
 
         return pfpi_stats
 
+    def _get_schedule8_tables(self, weather_attributed_only=False, verbose=False):
+        """
+        Get the tables which are merged into the view of Schedule 8 details.
+
+        :param weather_attributed_only: defaults to ``False``
+        :type weather_attributed_only: bool
+        :param verbose: whether to print relevant information in console as the function runs,
+            defaults to ``False``
+        :type verbose: bool or int
+        :return: keyword arguments of :py:meth:`METExLite._merge_schedule8_tables()`
+        :rtype: dict
+        """
+
+        incident_record = self.get_incident_record(verbose=verbose)  # (233452, 4)  # (4704448, 5)
+        if weather_attributed_only:
+            incident_record = incident_record[
+                incident_record.WeatherCategory != '']  # (320942, 5) ≈ 6.8%
+
+        # Use 'Station' data from Railway Codes website
+        station_locations = self.StationCode.fetch_station_data()[self.StationCode.StnKey]
+        station_locations = station_locations[['Station', 'Degrees Longitude', 'Degrees Latitude']]
+        station_locations = station_locations.dropna().drop_duplicates('Station', keep='first')
+        station_locations.set_index('Station', inplace=True)
+
+        schedule8_tables = {
+            'pfpi': self.get_pfpi(verbose=verbose),  # (260645, 6)  # (5049003, 6)
+            'incident_record': incident_record,
+            'trust_incident': self.get_trust_incident(verbose=verbose),  # (4049984, 11)
+            'stanox_section': self.get_stanox_section(verbose=verbose),  # (9440, 7)  # (10601, 7)
+            'location': self.get_location(verbose=verbose),  # (228851, 6)  # (653882, 7)
+            'stanox_location': self.get_stanox_location(verbose=verbose),  # (7560, 5)  # (7534, 6)
+            'incident_reason_info': self.get_incident_reason_info(verbose=verbose),  # (174, 9)
+            'imdm': self.get_imdm(verbose=verbose),  # (42, 1)  # (42, 3)
+            'station_locations': station_locations,
+        }
+
+        return schedule8_tables
+
+    @staticmethod
+    def _merge_schedule8_tables(pfpi, incident_record, trust_incident, stanox_section, location,
+                                stanox_location, incident_reason_info, imdm, station_locations):
+        """
+        Merge the tables of Schedule 8 details (TRUST data).
+
+        See also :py:meth:`METExLite._get_schedule8_tables()`.
+
+        :return: data of Schedule 8 details, indexed by 'PfPIId'
+        :rtype: pandas.DataFrame
+        """
+
+        # Merge the acquired data sets - starting with (5049003, 6)
+        schedule8_data = pfpi. \
+            join(incident_record,  # (260645, 10)  # (5049003, 11)
+                 on='IncidentRecordId', how='inner'). \
+            join(trust_incident,  # (260483, 21)  # (5048710, 22)
+                 on='TrustIncidentId', how='inner'). \
+            join(stanox_section,  # (260483, 28)  # (5048593, 29)
+                 on='StanoxSectionId', how='inner'). \
+            join(location,  # (260470, 34)  # (5045204, 36)
+                 on='LocationId', how='inner', lsuffix='', rsuffix='_Location'). \
+            join(stanox_location,  # (260190, 39)  # (5029204, 42)
+                 on='StartStanox', how='inner', lsuffix='_Section', rsuffix=''). \
+            join(stanox_location,  # (260140, 44)  # (5024725, 48)
+                 on='EndStanox', how='inner', lsuffix='_Start', rsuffix='_End'). \
+            join(incident_reason_info,  # (260140, 51)  # (5024703, 57)
+                 on='IncidentReasonCode', how='inner'). \
+            join(imdm, on='IMDM_Location', how='inner')  # (5024674, 60)
+
+        # Note: There may be errors in
+        # e.g. IMDM data/column, location id, of the TrustIncident table.
+
+        idx = ~schedule8_data.StartLocation.eq(schedule8_data.Location_Start)
+        if idx.any():
+            start_locations = schedule8_data.loc[idx, 'Location_Start']
+            end_locations = schedule8_data.loc[idx, 'Location_End']
+            schedule8_data.loc[idx, 'StartLocation'] = start_locations
+            schedule8_data.loc[idx, 'EndLocation'] = end_locations
+            schedule8_data.loc[idx, 'StanoxSection'] = start_locations.where(
+                start_locations == end_locations, start_locations + ' - ' + end_locations)
+
+        schedule8_data.drop(['IMDM', 'Location_Start', 'Location_End'], axis=1,
+                            inplace=True)  # (5024674, 57)
+
+        # (260140, 50)  # (5155014, 57)
+        schedule8_data.rename(columns={'LocationAlias_Start': 'StartLocationAlias',
+                                       'LocationAlias_End': 'EndLocationAlias',
+                                       'ELR_Start': 'StartELR', 'Yards_Start': 'StartYards',
+                                       'ELR_End': 'EndELR', 'Yards_End': 'EndYards',
+                                       'Mileage_Start': 'StartMileage',
+                                       'Mileage_End': 'EndMileage',
+                                       'LocationId_Start': 'StartLocationId',
+                                       'LocationId_End': 'EndLocationId',
+                                       'LocationId_Section': 'SectionLocationId',
+                                       'IMDM_Location': 'IMDM',
+                                       'StartDate': 'StartDateTime',
+                                       'EndDate': 'EndDateTime'},
+                              inplace=True)
+
+        # Use the coordinates of stations (from Railway Codes website) where available
+        for x in ('Start', 'End'):
+            temp = schedule8_data[[x + 'Location']].join(
+                station_locations, on=x + 'Location', how='left')
+            i = temp[temp['Degrees Longitude'].notna()].index
+            schedule8_data.loc[i, x + 'Longitude':x + 'Latitude'] = \
+                temp.loc[i, 'Degrees Longitude':'Degrees Latitude'].values
+
+        # data.EndELR.replace({'STM': 'SDC', 'TIR': 'TLL'}, inplace=True)
+        missing_coordinates = {
+            'Highbury & Islington (North London Lines)': [-0.1045, 51.5460],
+            'Dalston Junction (East London Line)': [-0.0751, 51.5461],
+        }
+        for loc_name, lon_lat in missing_coordinates.items():
+            for x in ('Start', 'End'):
+                i = schedule8_data[x + 'Location'] == loc_name
+                schedule8_data.loc[i, [x + 'Longitude', x + 'Latitude']] = lon_lat
+
+        apply_categorical_schema(schedule8_data, save_schema=True)
+
+        return schedule8_data
+
+    def _calculate_pfpi_stats_partition_wise(self, route_name, weather_category, selected_features,
+                                             sort_by=None):
+        """
+        Calculate the 'DelayMinutes' and 'DelayCosts' for the Schedule 8 data.
+
+        The partitioned view of Schedule 8 details (by 'Route'; see
+        :py:meth:`METExLite.view_schedule8_data_partitions()`) is read partition by partition
+        if it is available; otherwise, the stats are calculated for the merged view.
+
+        :param route_name: name of a Route
+        :type route_name: str or list or None
+        :param weather_category: weather category
+        :type weather_category: str or list or None
+        :param selected_features: a list of selected features (column names)
+        :type selected_features: list
+        :param sort_by: a column or a list of columns by which the selected data is sorted,
+            defaults to ``None``
+        :type sort_by: str or list or None
+        :return: pandas.DataFrame
+        """
+
+        s8data_partitions = self.get_schedule8_data_partitions()
+
+        if not s8data_partitions.is_built():
+            schedule8_data = self.view_schedule8_data(route_name, weather_category,
+                                                      rearrange_index=True)
+            selected_data = schedule8_data[selected_features]
+            return self.calculate_pfpi_stats(selected_data, selected_features, sort_by=sort_by)
+
+        pfpi_stats = [
+            self.calculate_pfpi_stats(selected_data, selected_features)
+            for selected_data in s8data_partitions.iter_subsets(
+                route_name, weather_category, columns=selected_features)]
+
+        if not pfpi_stats:  # No data for the given Route and weather category
+            return self.calculate_pfpi_stats(
+                pd.DataFrame(columns=selected_features), selected_features, sort_by=sort_by)
+
+        pfpi_stats = pd.concat(pfpi_stats, ignore_index=True)
+
+        # The stats of a group spread over different partitions need to be added up
+        group_features = selected_features[1:-2]
+        if s8data_partitions.PartitionBy not in group_features:
+            pfpi_stats = pfpi_stats.groupby(group_features, observed=True).sum().reset_index()
+
+        if sort_by:
+            pfpi_stats.sort_values(sort_by, inplace=True)
+
+        return pfpi_stats
+
     # == Methods to create views ======================================================================
 
+    @traced()
     def view_schedule8_data(self, route_name=None, weather_category=None, rearrange_index=False,
                             weather_attributed_only=False, update=False, pickle_it=False,
                             verbose=False):
@@ -3346,7 +3983,7 @@ class METExLite:
         path_to_pickle = self.cdd_views(pickle_filename)
 
         if os.path.isfile(path_to_pickle) and not update:
-            schedule8_data = load_pickle(path_to_pickle)
+            schedule8_data = apply_categorical_schema(load_pickle(path_to_pickle))
             if rearrange_index and schedule8_data.index.name == 'PfPIId':
                 schedule8_data.reset_index(inplace=True)
 
@@ -3355,116 +3992,31 @@ class METExLite:
 
             try:
 
+                subset_index = None
+
                 if os.path.isfile(path_to_merged) and not update:
-                    schedule8_data = load_pickle(path_to_merged)
+                    schedule8_data = apply_categorical_schema(load_pickle(path_to_merged))
+                    subset_index = get_subset_index(schedule8_data, path_to_merged)
+
+                elif route_name and not update and self.get_schedule8_data_partitions(
+                        weather_attributed_only=weather_attributed_only).is_built():
+                    # Open only the partition(s) of the given Route(s)
+                    schedule8_data = self.get_schedule8_data_partitions(
+                        weather_attributed_only=weather_attributed_only).read(route_name)
 
                 else:
-                    pfpi = self.get_pfpi(verbose=verbose)  # Get PfPI # (260645, 6)  # (5049003, 6)
-                    incident_record = self.get_incident_record(
-                        verbose=verbose)  # (233452, 4)  # (4704448, 5)
-                    trust_incident = self.get_trust_incident(
-                        verbose=verbose)  # (192054, 11)  # (4049984, 11)
-                    location = self.get_location(verbose=verbose)  # (228851, 6)  # (653882, 7)
-                    imdm = self.get_imdm(verbose=verbose)  # (42, 1)  # (42, 3)
-                    incident_reason_info = self.get_incident_reason_info(
-                        verbose=verbose)  # (393, 7)  # (174, 9)
-                    stanox_location = self.get_stanox_location(verbose=verbose)  # (7560, 5)  # (7534, 6)
-                    stanox_section = self.get_stanox_section(verbose=verbose)  # (9440, 7)  # (10601, 7)
-
-                    if weather_attributed_only:
-                        incident_record = incident_record[
-                            incident_record.WeatherCategory != '']  # (320942, 5) ≈ 6.8%
-
-                    # Merge the acquired data sets - starting with (5049003, 6)
-                    schedule8_data = pfpi. \
-                        join(incident_record,  # (260645, 10)  # (5049003, 11)
-                             on='IncidentRecordId', how='inner'). \
-                        join(trust_incident,  # (260483, 21)  # (5048710, 22)
-                             on='TrustIncidentId', how='inner'). \
-                        join(stanox_section,  # (260483, 28)  # (5048593, 29)
-                             on='StanoxSectionId', how='inner'). \
-                        join(location,  # (260470, 34)  # (5045204, 36)
-                             on='LocationId', how='inner', lsuffix='', rsuffix='_Location'). \
-                        join(stanox_location,  # (260190, 39)  # (5029204, 42)
-                             on='StartStanox', how='inner', lsuffix='_Section', rsuffix=''). \
-                        join(stanox_location,  # (260140, 44)  # (5024725, 48)
-                             on='EndStanox', how='inner', lsuffix='_Start', rsuffix='_End'). \
-                        join(incident_reason_info,  # (260140, 51)  # (5024703, 57)
-                             on='IncidentReasonCode', how='inner'). \
-                        join(imdm, on='IMDM_Location', how='inner')  # (5024674, 60)
-
-                    del pfpi, incident_record, trust_incident, stanox_section, location, \
-                        stanox_location, incident_reason_info, imdm
-                    gc.collect()
+                    schedule8_tables = self._get_schedule8_tables(
+                        weather_attributed_only=weather_attributed_only, verbose=verbose)
+                    schedule8_data = self._merge_schedule8_tables(**schedule8_tables)
 
-                    # Note: There may be errors in
-                    # e.g. IMDM data/column, location id, of the TrustIncident table.
-
-                    idx = schedule8_data[
-                        ~schedule8_data.StartLocation.eq(schedule8_data.Location_Start)].index
-                    for i in idx:
-                        schedule8_data.loc[i, 'StartLocation'] = schedule8_data.loc[i, 'Location_Start']
-                        schedule8_data.loc[i, 'EndLocation'] = schedule8_data.loc[i, 'Location_End']
-                        if schedule8_data.loc[i, 'StartLocation'] == \
-                                schedule8_data.loc[i, 'EndLocation']:
-                            schedule8_data.loc[i, 'StanoxSection'] = schedule8_data.loc[
-                                i, 'StartLocation']
-                        else:
-                            schedule8_data.loc[i, 'StanoxSection'] = \
-                                schedule8_data.loc[i, 'StartLocation'] + ' - ' + schedule8_data.loc[
-                                    i, 'EndLocation']
-
-                    schedule8_data.drop(['IMDM', 'Location_Start', 'Location_End'], axis=1,
-                                        inplace=True)  # (5024674, 57)
-
-                    # (260140, 50)  # (5155014, 57)
-                    schedule8_data.rename(columns={'LocationAlias_Start': 'StartLocationAlias',
-                                                   'LocationAlias_End': 'EndLocationAlias',
-                                                   'ELR_Start': 'StartELR', 'Yards_Start': 'StartYards',
-                                                   'ELR_End': 'EndELR', 'Yards_End': 'EndYards',
-                                                   'Mileage_Start': 'StartMileage',
-                                                   'Mileage_End': 'EndMileage',
-                                                   'LocationId_Start': 'StartLocationId',
-                                                   'LocationId_End': 'EndLocationId',
-                                                   'LocationId_Section': 'SectionLocationId',
-                                                   'IMDM_Location': 'IMDM',
-                                                   'StartDate': 'StartDateTime',
-                                                   'EndDate': 'EndDateTime'},
-                                          inplace=True)
-
-                    # Use 'Station' data from Railway Codes website
-                    station_locations = self.StationCode.fetch_station_data()[self.StationCode.StnKey]
-
-                    station_locations = station_locations[
-                        ['Station', 'Degrees Longitude', 'Degrees Latitude']]
-                    station_locations = \
-                        station_locations.dropna().drop_duplicates('Station', keep='first')
-                    station_locations.set_index('Station', inplace=True)
-                    temp = schedule8_data[['StartLocation']].join(
-                        station_locations, on='StartLocation', how='left')
-                    i = temp[temp['Degrees Longitude'].notna()].index
-                    schedule8_data.loc[i, 'StartLongitude':'StartLatitude'] = \
-                        temp.loc[i, 'Degrees Longitude':'Degrees Latitude'].values.tolist()
-                    temp = schedule8_data[['EndLocation']].join(
-                        station_locations, on='EndLocation', how='left')
-                    i = temp[temp['Degrees Longitude'].notna()].index
-                    schedule8_data.loc[i, 'EndLongitude':'EndLatitude'] = \
-                        temp.loc[i, 'Degrees Longitude':'Degrees Latitude'].values.tolist()
-
-                    # data.EndELR.replace({'STM': 'SDC', 'TIR': 'TLL'}, inplace=True)
-                    i = schedule8_data.StartLocation == 'Highbury & Islington (North London Lines)'
-                    schedule8_data.loc[i, ['StartLongitude', 'StartLatitude']] = [-0.1045, 51.5460]
-                    i = schedule8_data.EndLocation == 'Highbury & Islington (North London Lines)'
-                    schedule8_data.loc[i, ['EndLongitude', 'EndLatitude']] = [-0.1045, 51.5460]
-                    i = schedule8_data.StartLocation == 'Dalston Junction (East London Line)'
-                    schedule8_data.loc[i, ['StartLongitude', 'StartLatitude']] = [-0.0751, 51.5461]
-                    i = schedule8_data.EndLocation == 'Dalston Junction (East London Line)'
-                    schedule8_data.loc[i, ['EndLongitude', 'EndLatitude']] = [-0.0751, 51.5461]
+                    del schedule8_tables
+                    gc.collect()
 
                 schedule8_data.reset_index(inplace=True)  # (5024674, 58)
 
+                # The data has just been loaded (or merged), so it need not be copied
                 schedule8_data = get_subset(schedule8_data, route_name, weather_category,
-                                            rearrange_index)
+                                            rearrange_index, subset_index=subset_index, copy=False)
 
                 if pickle_it:
                     if not os.path.isfile(path_to_merged) or path_to_pickle != path_to_merged:
@@ -3476,6 +4028,136 @@ class METExLite:
 
         return schedule8_data
 
+    def get_schedule8_data_partitions(self, partition_by='Route', weather_attributed_only=False):
+        """
+        Get a handle of the partitioned view of Schedule 8 details (which may not have been built).
+
+        :param partition_by: column by which the data is partitioned, ``'Route'`` (default)
+            or ``'FinancialYear'``
+        :type partition_by: str
+        :param weather_attributed_only: defaults to ``False``
+        :type weather_attributed_only: bool
+        :return: a handle of the partitioned view of Schedule 8 details
+        :rtype: Schedule8DataPartitions
+        """
+
+        assert partition_by in ('Route', 'FinancialYear')
+
+        dir_name = "s8data" + ("-weather-attributed" if weather_attributed_only else "") + \
+                   "-partitioned-by-" + ("route" if partition_by == 'Route' else "financial-year")
+
+        s8data_partitions = Schedule8DataPartitions(self.cdd_views(dir_name))
+
+        return s8data_partitions
+
+    def view_schedule8_data_partitions(self, partition_by='Route', weather_attributed_only=False,
+                                       update=False, verbose=False):
+        """
+        View Schedule 8 details (TRUST data), merged and saved partition by partition.
+
+        Unlike :py:meth:`METExLite.view_schedule8_data()`, the tables are merged for one Route
+        (or one financial year) at a time, so that the merged view is never held in memory as
+        a whole. Note that the source tables (e.g. 'PfPI' and 'IncidentRecord') are still loaded
+        in full, so the memory that is required grows with the size of the source tables
+        (i.e. it is not bounded by the size of a partition).
+
+        :param partition_by: column by which the data is partitioned, ``'Route'`` (default)
+            or ``'FinancialYear'``
+        :type partition_by: str
+        :param weather_attributed_only: defaults to ``False``
+        :type weather_attributed_only: bool
+        :param update: whether to check on update and proceed to update the package data,
+            defaults to ``False``
+        :type update: bool
+        :param verbose: whether to print relevant information in console as the function runs,
+            defaults to ``False``
+        :type verbose: bool or int
+        :return: a (lazy) handle of the partitioned view of Schedule 8 details
+        :rtype: Schedule8DataPartitions or None
+
+        **Test**::
+
+            >>> from preprocessor import METExLite
+
+            >>> metex = METExLite()
+
+            >>> s8data_partitions = metex.view_schedule8_data_partitions(update=True, verbose=True)
+
+            >>> s8data_partitions.keys[:3]
+            ['Anglia', 'East Midlands', 'Kent']
+
+            >>> s8data_anglia_wind = s8data_partitions.read('Anglia', weather_category='Wind')
+        """
+
+        s8data_partitions = self.get_schedule8_data_partitions(
+            partition_by=partition_by, weather_attributed_only=weather_attributed_only)
+
+        if s8data_partitions.is_built() and not update:
+            return s8data_partitions
+
+        try:
+            os.makedirs(s8data_partitions.DataDir, exist_ok=True)
+
+            schedule8_tables = self._get_schedule8_tables(
+                weather_attributed_only=weather_attributed_only, verbose=verbose)
+
+            pfpi = schedule8_tables.pop('pfpi')
+            incident_record = schedule8_tables.pop('incident_record')
+            trust_incident = schedule8_tables.pop('trust_incident')
+
+            # Assign each TRUST incident to a partition
+            if partition_by == 'Route':
+                partition_keys = trust_incident.StanoxSectionId. \
+                    map(schedule8_tables['stanox_section'].LocationId). \
+                    map(schedule8_tables['location'].IMDM).map(schedule8_tables['imdm'].Route)
+            else:
+                partition_keys = trust_incident.FinancialYear
+
+            filename = "s8data" + ("-weather-attributed" if weather_attributed_only else "")
+
+            manifest = {'PartitionBy': partition_by, 'Partitions': {}, 'RowCount': {},
+                        'Route': set(), 'WeatherCategory': set()}
+
+            for key, trust_incident_ in trust_incident.groupby(partition_keys, sort=True):
+                incident_record_ = incident_record[
+                    incident_record.TrustIncidentId.isin(trust_incident_.index)]
+                pfpi_ = pfpi[pfpi.IncidentRecordId.isin(incident_record_.index)]
+
+                schedule8_data = self._merge_schedule8_tables(
+                    pfpi=pfpi_, incident_record=incident_record_, trust_incident=trust_incident_,
+                    **schedule8_tables)
+
+                if schedule8_data.empty:
+                    continue
+
+                key_ = str(key)
+                partition_filename = make_filename(filename, None, None, key_.replace(" ", "_"))
+                path_to_partition = os.path.join(s8data_partitions.DataDir, partition_filename)
+                save_pickle(schedule8_data, path_to_partition, verbose=verbose)
+
+                manifest['Partitions'][key_] = partition_filename
+                manifest['RowCount'][key_] = len(schedule8_data)
+                manifest['Route'].update(schedule8_data.Route.unique())
+                manifest['WeatherCategory'].update(schedule8_data.WeatherCategory.unique())
+
+                del incident_record_, pfpi_, schedule8_data
+                gc.collect()
+
+            manifest['Route'] = sorted(manifest['Route'])
+            manifest['WeatherCategory'] = sorted(manifest['WeatherCategory'])
+
+            path_to_manifest = os.path.join(
+                s8data_partitions.DataDir, s8data_partitions.ManifestFilename)
+            save(manifest, path_to_manifest, verbose=verbose)
+
+            s8data_partitions.Manifest = manifest
+
+        except Exception as e:
+            print("Failed to partition the data about Schedule 8 incidents. {}.".format(e))
+            s8data_partitions = None
+
+        return s8data_partitions
+
     def view_schedule8_data_pfpi(self, route_name=None, weather_category=None, update=False,
                                  pickle_it=False, verbose=False):
         """
@@ -3554,7 +4236,9 @@ class METExLite:
                 if os.path.isfile(path_to_pickle_temp) and not update:
                     temp_data = load_pickle(path_to_pickle_temp)
 
-                    data = get_subset(temp_data, route_name, weather_category)
+                    data = get_subset(
+                        temp_data, route_name, weather_category,
+                        subset_index=get_subset_index(temp_data, path_to_pickle_temp))
 
                 else:
                     # Get the merged data
@@ -3686,11 +4370,11 @@ class METExLite:
                 path_to_pickle_temp = self.cdd_views(make_filename(filename))
                 if os.path.isfile(path_to_pickle_temp) and not update:
                     temp_data = load_pickle(path_to_pickle_temp)
-                    extracted_data = get_subset(temp_data, route_name, weather_category)
+                    extracted_data = get_subset(
+                        temp_data, route_name, weather_category,
+                        subset_index=get_subset_index(temp_data, path_to_pickle_temp))
 
                 else:
-                    schedule8_data = self.view_schedule8_data(route_name, weather_category,
-                                                              rearrange_index=True)
                     selected_features = [
                         'PfPIId',
                         # 'TrustIncidentId', 'IncidentRecordCreateDate',
@@ -3701,8 +4385,8 @@ class METExLite:
                         'StartStanox', 'EndStanox', 'StartLongitude', 'StartLatitude', 'EndLongitude',
                         'EndLatitude',
                         'PfPIMinutes', 'PfPICosts']
-                    selected_data = schedule8_data[selected_features]
-                    extracted_data = self.calculate_pfpi_stats(selected_data, selected_features)
+                    extracted_data = self._calculate_pfpi_stats_partition_wise(
+                        route_name, weather_category, selected_features)
 
                 if pickle_it:
                     save_pickle(extracted_data, path_to_pickle, verbose=verbose)
@@ -3809,11 +4493,11 @@ class METExLite:
 
                 if os.path.isfile(path_to_pickle_temp) and not update:
                     temp_data = load_pickle(path_to_pickle_temp)
-                    extracted_data = get_subset(temp_data, route_name, weather_category)
+                    extracted_data = get_subset(
+                        temp_data, route_name, weather_category,
+                        subset_index=get_subset_index(temp_data, path_to_pickle_temp))
 
                 else:
-                    schedule8_data = self.view_schedule8_data(route_name, weather_category,
-                                                              rearrange_index=True)
                     selected_features = [
                         'PfPIId',
                         # 'TrustIncidentId', 'IncidentRecordCreateDate',
@@ -3828,9 +4512,9 @@ class METExLite:
                         'StartLongitude', 'StartLatitude', 'EndLongitude', 'EndLatitude',
                         'WeatherCell',
                         'PfPICosts', 'PfPIMinutes']
-                    selected_data = schedule8_data[selected_features]
-                    extracted_data = self.calculate_pfpi_stats(selected_data, selected_features,
-                                                               sort_by=['StartDateTime', 'EndDateTime'])
+                    extracted_data = self._calculate_pfpi_stats_partition_wise(
+                        route_name, weather_category, selected_features,
+                        sort_by=['StartDateTime', 'EndDateTime'])
 
                 if pickle_it:
                     save_pickle(extracted_data, path_to_pickle, verbose=verbose)
@@ -3922,20 +4606,19 @@ class METExLite:
         path_to_pickle = self.cdd_views(pickle_filename)
 
         if os.path.isfile(path_to_pickle) and not update:
-            return load_pickle(path_to_pickle, verbose=verbose)
+            return apply_categorical_schema(load_pickle(path_to_pickle, verbose=verbose))
 
         else:
             try:
                 path_to_pickle_temp = self.cdd_views(make_filename(filename))
 
                 if os.path.isfile(path_to_pickle_temp) and not update:
-                    temp_data = load_pickle(path_to_pickle_temp)
-                    extracted_data = get_subset(temp_data, route_name, weather_category)
+                    temp_data = apply_categorical_schema(load_pickle(path_to_pickle_temp))
+                    extracted_data = get_subset(
+                        temp_data, route_name, weather_category,
+                        subset_index=get_subset_index(temp_data, path_to_pickle_temp))
 
                 else:
-                    schedule8_data = self.view_schedule8_data(
-                        route_name, weather_category, rearrange_index=True)
-
                     selected_features = ['PfPIId',
                                          'FinancialYear',
                                          'StartDateTime', 'EndDateTime',
@@ -3959,10 +4642,9 @@ class METExLite:
                                          'IncidentJPIPCategory',
                                          'PfPIMinutes', 'PfPICosts']
 
-                    selected_data = schedule8_data[selected_features]
-
-                    extracted_data = self.calculate_pfpi_stats(
-                        selected_data, selected_features, sort_by=['StartDateTime', 'EndDateTime'])
+                    extracted_data = self._calculate_pfpi_stats_partition_wise(
+                        route_name, weather_category, selected_features,
+                        sort_by=['StartDateTime', 'EndDateTime'])
 
                 if pickle_it:
                     save_pickle(extracted_data, path_to_pickle, verbose=verbose)
@@ -4005,11 +4687,11 @@ class METExLite:
                 path_to_pickle_temp = self.cdd_views(make_filename(filename))
                 if os.path.isfile(path_to_pickle_temp) and not update:
                     temp_data = load_pickle(path_to_pickle_temp)
-                    extracted_data = get_subset(temp_data, route_name, weather_category)
+                    extracted_data = get_subset(
+                        temp_data, route_name, weather_category,
+                        subset_index=get_subset_index(temp_data, path_to_pickle_temp))
 
                 else:
-                    schedule8_data = self.view_schedule8_data(route_name, weather_category,
-                                                              rearrange_index=True)
                     selected_features = [
                         'PfPIId',
                         # 'TrustIncidentId', 'IncidentRecordCreateDate',
@@ -4019,9 +4701,9 @@ class METExLite:
                         'Route', 'IMDM', 'Region',
                         'WeatherCell',
                         'PfPICosts', 'PfPIMinutes']
-                    selected_data = schedule8_data[selected_features]
-                    extracted_data = self.calculate_pfpi_stats(selected_data, selected_features,
-                                                               sort_by=['StartDateTime', 'EndDateTime'])
+                    extracted_data = self._calculate_pfpi_stats_partition_wise(
+                        route_name, weather_category, selected_features,
+                        sort_by=['StartDateTime', 'EndDateTime'])
 
                 if pickle_it:
                     save_pickle(extracted_data, path_to_pickle, verbose=verbose)
@@ -4065,11 +4747,11 @@ class METExLite:
 
                 if os.path.isfile(path_to_pickle_temp) and not update:
                     temp_data = load_pickle(path_to_pickle_temp)
-                    extracted_data = get_subset(temp_data, route_name, weather_category)
+                    extracted_data = get_subset(
+                        temp_data, route_name, weather_category,
+                        subset_index=get_subset_index(temp_data, path_to_pickle_temp))
 
                 else:
-                    schedule8_data = self.view_schedule8_data(route_name, weather_category,
-                                                              rearrange_index=True)
                     selected_features = ['PfPIId',
                                          'FinancialYear',
                                          'Route', 'IMDM', 'Region',
@@ -4084,9 +4766,8 @@ class METExLite:
                                          'IncidentReasonDescription',
                                          'IncidentJPIPCategory',
                                          'PfPIMinutes', 'PfPICosts']
-                    selected_data = schedule8_data[selected_features]
-                    extracted_data = self.calculate_pfpi_stats(selected_data, selected_features,
-                                                               sort_by=None)
+                    extracted_data = self._calculate_pfpi_stats_partition_wise(
+                        route_name, weather_category, selected_features)
 
                 if pickle_it:
                     save_pickle(extracted_data, path_to_pickle, verbose=verbose)
@@ -4130,11 +4811,11 @@ class METExLite:
 
                 if os.path.isfile(path_to_pickle_temp) and not update:
                     temp_data = load_pickle(path_to_pickle_temp)
-                    extracted_data = get_subset(temp_data, route_name, weather_category)
+                    extracted_data = get_subset(
+                        temp_data, route_name, weather_category,
+                        subset_index=get_subset_index(temp_data, path_to_pickle_temp))
 
                 else:
-                    schedule8_data = self.view_schedule8_data(route_name, weather_category,
-                                                              rearrange_index=True)
                     selected_features = ['PfPIId',
                                          'FinancialYear',
                                          'WeatherCategory',
@@ -4155,9 +4836,8 @@ class METExLite:
                                          'IncidentReasonDescription',
                                          'IncidentJPIPCategory',
                                          'PfPIMinutes', 'PfPICosts']
-                    selected_data = schedule8_data[selected_features]
-                    extracted_data = self.calculate_pfpi_stats(selected_data, selected_features,
-                                                               sort_by=None)
+                    extracted_data = self._calculate_pfpi_stats_partition_wise(
+                        route_name, weather_category, selected_features)
 
                 if pickle_it:
                     save_pickle(extracted_data, path_to_pickle, verbose=verbose)
@@ -4201,15 +4881,15 @@ class METExLite:
 
                 if os.path.isfile(path_to_pickle_temp) and not update:
                     temp_data = load_pickle(path_to_pickle_temp)
-                    extracted_data = get_subset(temp_data, route_name, weather_category)
+                    extracted_data = get_subset(
+                        temp_data, route_name, weather_category,
+                        subset_index=get_subset_index(temp_data, path_to_pickle_temp))
 
                 else:
-                    schedule8_data = self.view_schedule8_data(route_name, weather_category,
-                                                              rearrange_index=True)
                     selected_features = ['PfPIId', 'FinancialYear', 'Route', 'IMDM', 'Region',
                                          'WeatherCategory', 'PfPICosts', 'PfPIMinutes']
-                    selected_data = schedule8_data[selected_features]
-                    extracted_data = self.calculate_pfpi_stats(selected_data, selected_features)
+                    extracted_data = self._calculate_pfpi_stats_partition_wise(
+                        route_name, weather_category, selected_features)
 
                 if pickle_it:
                     save_pickle(extracted_data, path_to_pickle, verbose=verbose)
@@ -4355,6 +5035,16 @@ class METExLite:
                 incident_locations[['StartMileage_num', 'EndMileage_num']] = \
                     incident_locations[['StartMileage', 'EndMileage']].applymap(nr_mileage_str_to_num)
 
+                # Fill in the missing coordinates with those in the gazetteer of locations
+                reports = get_data_source('Schedule8IncidentReports')
+                gazetteer = reports.get_location_gazetteer()
+                if gazetteer is not None:
+                    from coordinator.location import find_location_coordinates
+
+                    incident_locations = find_location_coordinates(
+                        incident_locations, gazetteer, coords_cols=['Longitude', 'Latitude'],
+                        overwrite=False)
+
                 incident_locations['StartEasting'], incident_locations['StartNorthing'] = \
                     wgs84_to_osgb36(incident_locations.StartLongitude.values,
                                     incident_locations.StartLatitude.values)
@@ -4379,6 +5069,7 @@ class METExLite:
         except Exception as e:
             print("Failed to fetch \"{}.\" {}.".format(os.path.splitext(pickle_filename)[0], e))
 
+    @traced()
     def update_view_pickles(self, update=True, pickle_it=True, verbose=True):
         """
         Update the local pickle files for all essential views.
@@ -4782,6 +5473,10 @@ class Schedule8IncidentReports:
     Reports of Schedule 8 incidents.
     """
 
+    # Lookups of railway codes (created on first use)
+    LocationID = DeferredAttribute(lambda self: LocationIdentifiers())
+    StationCode = DeferredAttribute(lambda self: Stations())
+
     def __init__(self):
         self.Name = 'Schedule 8 Incidents'
 
@@ -4790,10 +5485,8 @@ class Schedule8IncidentReports:
         self.DataFilename1 = "Schedule8WeatherIncidents"
         self.DataFilename2 = "Schedule8WeatherIncidents-02062006-31032014"
 
-        self.METExLite = METExLite()
+        self.METExLite = get_data_source('METExLite')
         self.DAG = DelayAttributionGlossary()
-        self.LocationID = LocationIdentifiers()
-        self.StationCode = Stations()
 
     def cdd(self, *sub_dir, mkdir=False):
         """
@@ -5543,6 +6236,59 @@ class Schedule8IncidentReports:
 
         return loc_meta_plus
 
+    def get_location_gazetteer(self, update=False, verbose=False):
+        """
+        Get a gazetteer of locations, i.e. the coordinates of each location (name) merged from
+        the location metadata, the location codes from NR_METEX_* database and the station data.
+
+        See also :py:func:`coordinator.location.make_location_gazetteer`.
+
+        :param update: whether to check on update and proceed to update the package data,
+            defaults to ``False``
+        :type update: bool
+        :param verbose: whether to print relevant information in console as the function runs,
+            defaults to ``False``
+        :type verbose: bool or int
+        :return: coordinates of each location, indexed by 'Location'
+        :rtype: pandas.DataFrame or None
+
+        **Test**::
+
+            >>> from preprocessor.metex import Schedule8IncidentReports
+
+            >>> sis = Schedule8IncidentReports()
+
+            >>> gazetteer = sis.get_location_gazetteer(update=True, verbose=True)
+            Updating "location-gazetteer.pickle" at "data\\network\\railway codes" ... Done.
+
+            >>> gazetteer.columns.to_list()
+            ['Easting', 'Northing', 'Longitude', 'Latitude', 'Source']
+        """
+
+        pickle_filename = "location-gazetteer.pickle"
+        path_to_pickle = cdd_railway_codes(pickle_filename)
+
+        if os.path.isfile(path_to_pickle) and not update:
+            gazetteer = load_pickle(path_to_pickle)
+
+        else:
+            try:
+                tiploc_locations = self.get_location_metadata(update=update)['TIPLOC_LocationsLyr']
+                location_metadata = self.get_location_metadata_plus(update=update)
+                station_data = self.StationCode.fetch_station_data()[self.StationCode.StnKey]
+
+                from coordinator.location import make_location_gazetteer
+
+                gazetteer = make_location_gazetteer(tiploc_locations, location_metadata, station_data)
+
+                save_pickle(gazetteer, path_to_pickle, verbose=verbose)
+
+            except Exception as e:
+                print("Failed to get the gazetteer of locations. {}.".format(e))
+                gazetteer = None
+
+        return gazetteer
+
     # == Incidents data ===============================================================================
 
     @staticmethod
@@ -5573,64 +6319,37 @@ class Schedule8IncidentReports:
         dat = data.copy(deep=True)
         old_column_name = col_name + '_Raw'
         dat.rename(columns={col_name: old_column_name}, inplace=True)
+
+        # Cleanse each distinct (raw) location only once
+        codes, raw_locations = pd.factorize(dat[old_column_name])
+        raw_locations = pd.Series(raw_locations, dtype=object)
+
         if sep is not None and isinstance(sep, str):
-            start_end_raw = dat[old_column_name].str.split(sep, expand=True)
+            start_end_raw = raw_locations.str.split(sep, expand=True)
             #
             start_end_raw.columns = ['StartLocation_Raw', 'EndLocation_Raw']
             start_end_raw.EndLocation_Raw.fillna(start_end_raw.StartLocation_Raw, inplace=True)
-            dat = dat.join(start_end_raw)
         else:
-            start_end_raw = dat[[old_column_name]]
+            start_end_raw = raw_locations.to_frame(old_column_name)
 
-        # In errata_tiploc, {'CLAPS47': 'CLPHS47'} might be problematic.
-        errata = load_json(cdd_railway_codes("metex-errata.json"))
-        errata_stanox, errata_tiploc, errata_stanme = errata.values()
-        start_end = start_end_raw.replace(errata_stanox)
-        start_end = start_end.replace(errata_tiploc)
-        start_end = start_end.replace(errata_stanme)
-
-        # Get rid of duplicated records
-        def tidy_alt_codes(code_dict_df, raw_loc):
-            raw_loc.columns = [x.replace('_Raw', '') for x in raw_loc.columns]
-            tmp = raw_loc.join(code_dict_df, on='StartLocation')
-            tmp = tmp[tmp.Location.notnull()]
-            raw_loc.loc[tmp.index, 'StartLocation'] = tmp.Location.values
-            tmp = raw_loc.join(code_dict_df, on='EndLocation')
-            tmp = tmp[tmp.Location.notnull()]
-            raw_loc.loc[tmp.index, 'EndLocation'] = tmp.Location.values
-            return raw_loc
-
-        lid = LocationIdentifiers()
-        #
-        stanox_dict = lid.make_loc_id_dict('STANOX', update=update_dict)
-        start_end = tidy_alt_codes(stanox_dict, start_end)
-        #
-        stanme_dict = lid.make_loc_id_dict('STANME', update=update_dict)
-        start_end = tidy_alt_codes(stanme_dict, start_end)
-        #
-        tiploc_dict = lid.make_loc_id_dict('TIPLOC', update=update_dict)
-        start_end = tidy_alt_codes(tiploc_dict, start_end)
+        # Rectify errata, location codes and alternative names (see coordinator.location)
+        from coordinator.location import normalise_location_names
 
-        #
-        start_end = start_end.replace(fetch_loc_names_repl_dict('Description', regex=True))
-        start_end = start_end.replace(fetch_loc_names_repl_dict(old_column_name, regex=True))
-        start_end = start_end.replace(fetch_loc_names_repl_dict(regex=True), regex=True)
-        start_end = start_end.replace(fetch_loc_names_repl_dict())
-
-        # ref = rc.get_location_codes()['Locations']
-        # ref.drop_duplicates(subset=['Location'], inplace=True)
-        # ref_loc = list(set(ref.Location))
-        #
-        # temp = start_end_raw.join(ref.set_index('Location'), on='StartLocation')
-        # temp_loc = list(set(temp[temp.STANOX.isnull()].StartLocation))
-        #
-        # temp = start_end_raw.join(ref.set_index('Location'), on='EndLocation')
-        # temp_loc = list(set(temp[temp.STANOX.isnull()].EndLocation))
+        start_end = normalise_location_names(start_end_raw, update=update_dict)
+        start_end.columns = [x.replace('_Raw', '') for x in start_end.columns]
 
         # Create new StanoxSection column
-        dat[col_name] = start_end.StartLocation + sep + start_end.EndLocation
         mask_single = start_end.StartLocation == start_end.EndLocation
-        dat[col_name][mask_single] = start_end.StartLocation[mask_single]
+        start_end[col_name] = start_end.StartLocation.where(
+            mask_single, start_end.StartLocation + sep + start_end.EndLocation)
+
+        # Map the cleansed locations back to the incident records
+        start_end = start_end_raw.join(start_end).reindex(codes)
+        start_end.index = dat.index
+
+        if sep is not None and isinstance(sep, str):
+            dat = dat.join(start_end[start_end_raw.columns])
+        dat[col_name] = start_end[col_name]
 
         # Resort column order
         col_names = [list(v) for k, v in
@@ -5638,7 +6357,7 @@ class Schedule8IncidentReports:
         add_names = [old_column_name] + col_names[1][-3:] + ['StartLocation', 'EndLocation']
         col_names = col_names[0] + add_names + col_names[1][:-3]
 
-        cleansed_data = dat.join(start_end)[col_names]
+        cleansed_data = dat.join(start_end[['StartLocation', 'EndLocation']])[col_names]
 
         return cleansed_data
 
@@ -5653,6 +6372,8 @@ class Schedule8IncidentReports:
         :type update_metadata: bool
         :return: cleansed data frame
         :rtype: pandas.DataFrame
+        :raises ValueError: if the gazetteer of locations is not available
+            (see :py:meth:`Schedule8IncidentReports.get_location_gazetteer`)
 
         **Test**::
 
@@ -5665,101 +6386,26 @@ class Schedule8IncidentReports:
 
         """
 
-        dat = data.copy(deep=True)
+        from coordinator.location import find_location_coordinates
+
+        gazetteer = self.get_location_gazetteer(update=update_metadata)
+        if gazetteer is None:
+            # (The gazetteer is made of the location metadata and the station data, without which
+            # the coordinates could not be looked up otherwise either)
+            raise ValueError(
+                "The gazetteer of locations is not available, so no geographical coordinates "
+                "can be looked up for the incident locations")
 
         # Find geographical coordinates for each incident location
-        ref_loc_dat_1, _ = self.get_location_metadata(update=update_metadata).values()
-        coords_cols = ['EASTING', 'NORTHING', 'DEG_LONG', 'DEG_LAT']
-        coords_cols_alt = ['Easting', 'Northing', 'Longitude', 'Latitude']
-        ref_loc_dat_1.rename(columns=dict(zip(coords_cols, coords_cols_alt)), inplace=True)
-        ref_loc_dat_1 = ref_loc_dat_1[['LOOKUP_NAME'] + coords_cols_alt].drop_duplicates('LOOKUP_NAME')
-
-        tmp, idx = [], []
-        for i in ref_loc_dat_1.index:
-            x_ = ref_loc_dat_1.LOOKUP_NAME.loc[i]
-            if isinstance(x_, tuple):
-                for y in x_:
-                    tmp.append([y] + ref_loc_dat_1[coords_cols_alt].loc[i].to_list())
-        ref_colname_1 = ['LOOKUP_NAME'] + coords_cols_alt
-        ref_loc_dat_1 = ref_loc_dat_1[ref_colname_1].append(pd.DataFrame(tmp, columns=ref_colname_1))
-        ref_loc_dat_1.drop_duplicates(subset=coords_cols_alt, keep='last', inplace=True)
-        ref_loc_dat_1.set_index('LOOKUP_NAME', inplace=True)
-
-        dat = dat.join(ref_loc_dat_1[coords_cols_alt], on='StartLocation')
-        dat.rename(columns=dict(zip(coords_cols_alt, ['Start' + c for c in coords_cols_alt])),
-                   inplace=True)
-        dat = dat.join(ref_loc_dat_1[coords_cols_alt], on='EndLocation')
-        dat.rename(columns=dict(zip(coords_cols_alt, ['End' + c for c in coords_cols_alt])),
-                   inplace=True)
-
-        # Get location metadata for reference --------------------------------
-        location_metadata = self.get_location_metadata_plus(update=update_metadata)
-        start_locations = location_metadata[['StartLocation', 'StartLongitude', 'StartLatitude']]
-        start_locations.columns = [c.replace('Start', '') for c in start_locations.columns]
-        end_locations = location_metadata[['EndLocation', 'EndLongitude', 'EndLatitude']]
-        end_locations.columns = [c.replace('End', '') for c in end_locations.columns]
-        loc_metadata = pd.concat([start_locations, end_locations], ignore_index=True)
-        loc_metadata = loc_metadata.drop_duplicates('Location').set_index('Location')
-
-        # Fill in NA coordinates
-        temp = dat[dat.StartEasting.isnull() | dat.StartLongitude.isnull()]
-        temp = temp.join(loc_metadata, on='StartLocation')
-        dat.loc[temp.index, 'StartLongitude':'StartLatitude'] = temp[['Longitude', 'Latitude']].values
-        dat.loc[temp.index, 'StartEasting'], dat.loc[temp.index, 'StartNorthing'] = wgs84_to_osgb36(
-            temp.Longitude.values, temp.Latitude.values)
-
-        temp = dat[dat.EndEasting.isnull() | dat.EndLongitude.isnull()]
-        temp = temp.join(loc_metadata, on='EndLocation')
-        dat.loc[temp.index, 'EndLongitude':'EndLatitude'] = temp[['Longitude', 'Latitude']].values
-
-        # Dalston Junction (East London Line)     --> Dalston Junction [-0.0751, 51.5461]
-        # Ashford West Junction (CTRL)            --> Ashford West Junction [0.86601557, 51.146927]
-        # Southfleet Junction                     --> ? [0.34262910, 51.419354]
-        # Channel Tunnel Eurotunnel Boundary CTRL --> ? [1.1310482, 51.094808]
-        na_loc = ['Dalston Junction (East London Line)', 'Ashford West Junction (CTRL)',
-                  'Southfleet Junction', 'Channel Tunnel Eurotunnel Boundary CTRL']
-        na_loc_longlat = [[-0.0751, 51.5461], [0.86601557, 51.146927], [0.34262910, 51.419354],
-                          [1.1310482, 51.094808]]
-        for x_, longlat in zip(na_loc, na_loc_longlat):
-            if x_ in list(temp.EndLocation):
-                idx = temp[temp.EndLocation == x_].index
-                temp.loc[idx, 'EndLongitude':'Latitude'] = longlat * 2
-                dat.loc[idx, 'EndLongitude':'EndLatitude'] = longlat
-
-        dat.loc[temp.index, 'EndEasting'], dat.loc[temp.index, 'EndNorthing'] = wgs84_to_osgb36(
-            temp.Longitude.values, temp.Latitude.values)
-
-        # ref 2 ----------------------------------------------
-        ref_metadata_2 = self.StationCode.fetch_station_data()[self.StationCode.StnKey]
-        ref_metadata_2 = ref_metadata_2[['Station', 'Degrees Longitude', 'Degrees Latitude']]
-        ref_metadata_2 = ref_metadata_2.dropna().drop_duplicates('Station')
-        ref_metadata_2.columns = [x.replace('Degrees ', '') for x in ref_metadata_2.columns]
-        ref_metadata_2.set_index('Station', inplace=True)
-
-        temp = dat.join(ref_metadata_2, on='StartLocation')
-        temp_start = temp[temp.Longitude.notnull() & temp.Latitude.notnull()]
-        dat.loc[temp_start.index, 'StartLongitude':'StartLatitude'] = temp_start[
-            ['Longitude', 'Latitude']].values
-
-        temp = dat.join(ref_metadata_2, on='EndLocation')
-        temp_end = temp[temp.Longitude.notnull() & temp.Latitude.notnull()]
-        dat.loc[temp_end.index, 'EndLongitude':'EndLatitude'] = temp_end[
-            ['Longitude', 'Latitude']].values
-
-        # Let (Longitude, Latitude) be almost equivalent to (Easting, Northing)
-        dat.loc[:, 'StartLongitude':'StartLatitude'] = np.array(
-            osgb36_to_wgs84(dat.StartEasting.values, dat.StartNorthing.values)).T
-        dat.loc[:, 'EndLongitude':'EndLatitude'] = np.array(
-            osgb36_to_wgs84(dat.EndEasting.values, dat.EndNorthing.values)).T
+        dat = find_location_coordinates(data, gazetteer)
 
         # Convert coordinates to shapely.geometry.Point
-        dat['StartXY'] = dat.apply(lambda x: shapely.geometry.Point(x.StartEasting, x.StartNorthing),
-                                   axis=1)
-        dat['EndXY'] = dat.apply(lambda x: shapely.geometry.Point(x.EndEasting, x.EndNorthing), axis=1)
-        dat['StartLongLat'] = dat.apply(
-            lambda x: shapely.geometry.Point(x.StartLongitude, x.StartLatitude), axis=1)
-        dat['EndLongLat'] = dat.apply(lambda x: shapely.geometry.Point(x.EndLongitude, x.EndLatitude),
-                                      axis=1)
+        for x in ('Start', 'End'):
+            dat[x + 'XY'] = [
+                shapely.geometry.Point(xy) for xy in zip(dat[x + 'Easting'], dat[x + 'Northing'])]
+        for x in ('Start', 'End'):
+            dat[x + 'LongLat'] = [
+                shapely.geometry.Point(xy) for xy in zip(dat[x + 'Longitude'], dat[x + 'Latitude'])]
 
         return dat
 
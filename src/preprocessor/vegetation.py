@@ -10,11 +10,13 @@ import numpy as np
 import pandas as pd
 from pyhelpers.geom import osgb36_to_wgs84
 from pyhelpers.ops import confirmed
-from pyhelpers.store import load_pickle, save, save_pickle
+from pyhelpers.store import save
 from pyhelpers.text import find_similar_str
 from pyrcs.utils import nr_mileage_num_to_str, nr_mileage_str_to_num
 
-from utils import cdd_vegetation, establish_mssql_connection, get_table_primary_keys, make_filename, \
+from utils import cdd_vegetation, decode_geometry_columns, deferred_mssql_connection, \
+    encode_geometry_columns, get_table_column_names, get_table_geometry_column_names, \
+    get_table_primary_keys, load_pickle, make_filename, nr_mileage_nums_to_str, save_pickle, traced, \
     update_nr_route_names
 
 
@@ -40,12 +42,14 @@ class Vegetation:
         Vegetation
     """
 
+    # Connection to the database (established on first use)
+    DatabaseConn = deferred_mssql_connection()
+
     def __init__(self, database_name='NR_Vegetation_20141031'):
         self.Name = 'Vegetation'
         self.Desc = 'Vegetation'
 
         self.DatabaseName = database_name
-        self.DatabaseConn = establish_mssql_connection(database_name=self.DatabaseName)
 
     # == Change directories ===========================================================================
 
@@ -109,10 +113,14 @@ class Vegetation:
 
     # == Read table data from the database ============================================================
 
+    @traced(io='database')
     def read_table(self, table_name, schema_name='dbo', index_col=None, route_name=None, save_as=None,
-                   update=False, **kwargs):
+                   update=False, col_names=None, **kwargs):
         """
         Read tables stored in NR_Vegetation_* database.
+
+        Any columns of 'geometry' type are read as WKB and decoded in bulk
+        (see :py:func:`utils.decode_geometry_columns`).
     
         :param table_name: name of a table
         :type table_name: str
@@ -127,6 +135,9 @@ class Vegetation:
         :param update: whether to check on update and proceed to update the package data,
             defaults to ``False``
         :type update: bool
+        :param col_names: names of the columns to be read (including ``index_col``);
+            if ``None`` (default), all columns
+        :type col_names: list or None
         :param kwargs: optional parameters of `pandas.read_sql`_
         :return: data of the queried table stored in NR_Vegetation_* database
         :rtype: pandas.DataFrame
@@ -147,7 +158,19 @@ class Vegetation:
             0  ANGLIA               0.000678
         """
 
-        sql_query_ = f'SELECT * FROM %s' % f'[{schema_name}].[{table_name}]'
+        geom_col_names = get_table_geometry_column_names(self.DatabaseName, table_name, schema_name)
+
+        if col_names is None and not geom_col_names:
+            selected_columns = '*'
+        else:
+            if col_names is None:
+                col_names = get_table_column_names(self.DatabaseName, table_name, schema_name)
+            # Read the geom column(s) as WKB along with all other selected columns
+            selected_columns = ', '.join(
+                '[{0}].STAsBinary() AS [{0}]'.format(x) if x in geom_col_names else '[{}]'.format(x)
+                for x in col_names)
+
+        sql_query_ = f'SELECT {selected_columns} FROM [{schema_name}].[{table_name}]'
 
         if route_name is None:
             # Get all data of a given table
@@ -159,12 +182,16 @@ class Vegetation:
         # Create a pd.DataFrame of the queried table
         data = pd.read_sql(sql=sql_query, con=self.DatabaseConn, index_col=index_col, **kwargs)
 
+        # Decode geom column(s) in bulk
+        data = decode_geometry_columns(data, [x for x in geom_col_names if x in data.columns])
+
         # Save the DataFrame as a worksheet locally?
         if save_as:
             path_to_file = self.cdd_tables(table_name + save_as)
 
             if not os.path.isfile(path_to_file) or update:
-                save(data, path_to_file, index=False if index_col is None else True)
+                save(encode_geometry_columns(data) if save_as == ".pickle" else data, path_to_file,
+                     index=False if index_col is None else True)
 
         return data
 
@@ -1558,14 +1585,20 @@ class Vegetation:
             table_name + ("-cut" if relevant_columns_only else "") + ".pickle")
 
         if os.path.isfile(path_to_pickle) and not update:
-            furlong_location = load_pickle(path_to_pickle)
+            furlong_location = decode_geometry_columns(load_pickle(path_to_pickle))
 
         else:
             try:
-                # Read data from database
+                relevant_columns = ['Route', 'RouteAlias', 'DU', 'ELR', 'StartMileage', 'EndMileage',
+                                    'Electrified', 'HazardOnly']
+
+                # Read data from database (only the relevant columns, unless the original is saved)
+                primary_key = self.get_primary_key(table_name)
                 furlong_location = self.read_table(
-                    table_name=table_name, index_col=self.get_primary_key(table_name),
-                    save_as=save_original_as, update=update)
+                    table_name=table_name, index_col=primary_key, save_as=save_original_as,
+                    update=update,
+                    col_names=list(primary_key) + relevant_columns
+                    if relevant_columns_only and not save_original_as else None)
 
                 # Re-format mileage data
                 furlong_location[['StartMileage', 'EndMileage']] = \
@@ -1579,11 +1612,9 @@ class Vegetation:
 
                 # Select useful columns only?
                 if relevant_columns_only:
-                    furlong_location = furlong_location[
-                        ['Route', 'RouteAlias', 'DU', 'ELR', 'StartMileage', 'EndMileage',
-                         'Electrified', 'HazardOnly']]
+                    furlong_location = furlong_location[relevant_columns]
 
-                save_pickle(furlong_location, path_to_pickle, verbose=verbose)
+                save_pickle(encode_geometry_columns(furlong_location), path_to_pickle, verbose=verbose)
 
             except Exception as e:
                 print("Failed to get \"{}\". {}.".format(table_name, e))
@@ -1640,12 +1671,13 @@ class Vegetation:
                     table_name=table_name, index_col=None, save_as=save_original_as, update=update)
 
                 # Re-format mileage data
-                hazard_tree.Mileage = hazard_tree.Mileage.apply(nr_mileage_num_to_str)
+                hazard_tree.Mileage = nr_mileage_nums_to_str(hazard_tree.Mileage)
 
                 # Edit the original data
                 hazard_tree.drop(['Treesurvey', 'Treetunnel'], axis=1, inplace=True)
                 hazard_tree.dropna(subset=['Northing', 'Easting'], inplace=True)
-                hazard_tree.Treespecies.replace({'': 'No data'}, inplace=True)
+                hazard_tree.Treespecies = hazard_tree.Treespecies.replace({'': 'No data'}).astype(
+                    'category')
 
                 # Update route data
                 update_nr_route_names(hazard_tree, route_col_name='Route')
@@ -1655,15 +1687,15 @@ class Vegetation:
                     """
                     :param data: original data frame
                     :type data: pandas.DataFrame
-                    :param selected_features: list of columns names
+                    :param selected_features: list of columns names (of Boolean flags)
                     :type selected_features: list
                     :param new_feature: new column name
                     :type new_feature: str
-                    :return: integrated data
+                    :return: integrated data, i.e. the number of flags that are set in each row
                     :rtype: pandas.DataFrame
                     """
-                    data.replace({True: 1, False: 0}, inplace=True)
-                    data[new_feature] = data[selected_features].fillna(0).apply(sum, axis=1)
+                    selected_flags = data[selected_features].fillna(False).astype(np.int8)
+                    data[new_feature] = selected_flags.sum(axis=1).astype(np.int8)
                     data.drop(selected_features, axis=1, inplace=True)
 
                 # Integrate TEF: Failure scores
@@ -1691,7 +1723,7 @@ class Vegetation:
                 hazard_tree.rename(columns=dict(zip(work_req, work_req_desc)), inplace=True)
 
                 # Note the feasibility of the the following operation is not guaranteed:
-                hazard_tree[work_req_desc] = hazard_tree[work_req_desc].fillna(value=0)
+                hazard_tree[work_req_desc] = hazard_tree[work_req_desc].fillna(False).astype(bool)
 
                 # Rearrange DataFrame index
                 hazard_tree.index = range(len(hazard_tree))
@@ -2038,6 +2070,7 @@ class Vegetation:
 
         return furlong_vegetation_data
 
+    @traced()
     def view_nr_vegetation_furlong_data(self, update=False, pickle_it=True, verbose=False):
         """
         Get a view of ELR and mileage data of furlong locations.
@@ -2114,6 +2147,7 @@ class Vegetation:
 
         return nr_vegetation_furlong_data
 
+    @traced()
     def update_vegetation_view_pickles(self, route_name=None, update=True, pickle_it=True, verbose=True):
         """
         Update the local pickle files for all essential views.
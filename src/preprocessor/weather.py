@@ -10,6 +10,7 @@ import zipfile
 
 import datetime_truncate
 import natsort
+import numpy as np
 import pandas as pd
 import shapely.geometry
 import shapely.ops
@@ -17,9 +18,8 @@ import shapely.wkt
 import sqlalchemy.types
 from pyhelpers.dir import cd, validate_input_data_dir
 from pyhelpers.geom import osgb36_to_wgs84, wgs84_to_osgb36
-from pyhelpers.store import load_pickle, save_pickle
 
-from utils import cdd_weather, establish_mssql_connection
+from utils import cdd_weather, deferred_mssql_connection, load_pickle, save_pickle, traced
 
 
 class MIDAS:
@@ -38,6 +38,7 @@ class MIDAS:
     :ivar str SchemaName: name of the schema for storing the radiation observation data
     :ivar str RadtobTblName: name of the table for storing the radiation observation data
     :ivar str RadtobSupplTblName: name of the table for storing supplementary data
+    :ivar dict or None RadtobCache: local cache of the queried RADTOB data
 
     **Test**::
 
@@ -49,6 +50,9 @@ class MIDAS:
         'Met Office RADTOB (Radiation values currently being reported).'
     """
 
+    # Connection to the database (established on first use)
+    DatabaseConn = deferred_mssql_connection()
+
     def __init__(self, database_name='Weather'):
         self.Name = 'Met Office RADTOB (Radiation values currently being reported).'
         self.Acronym = 'MIDAS'
@@ -57,13 +61,14 @@ class MIDAS:
         self.RadtobFilename = "midas-radtob-2006-2019"
         self.HeadersFilename = "radiation-observation-data-headers"
 
-        # Create an engine to the MSSQL server
-        self.DatabaseConn = establish_mssql_connection(database_name=database_name)
+        self.DatabaseName = database_name
 
         self.SchemaName = self.Acronym
         self.RadtobTblName = 'RADTOB'
         self.RadtobSupplTblName = self.RadtobTblName + '_suppl'
 
+        self.RadtobCache = None
+
     def cdd(self, *sub_dir, mkdir=False):
         """
         Change directory to "data\\weather\\midas" and sub-directories / a file.
@@ -538,10 +543,193 @@ class MIDAS:
                                    index=False,
                                    dtype={'OB_END_DATE': sqlalchemy.types.DATE})
 
+    def make_radtob_cache_path(self, dat_dir=None):
+        """
+        Make a full path to the pickle file of the local cache of the queried RADTOB data.
+
+        :param dat_dir: directory where the cache is saved, defaults to ``None``
+        :type dat_dir: str, None
+        :return: a full path to the pickle file of the cache
+        :rtype: str
+
+        **Test**::
+
+            >>> import os
+            >>> from preprocessor.weather import MIDAS
+
+            >>> midas = MIDAS()
+
+            >>> os.path.relpath(midas.make_radtob_cache_path())
+            data\\weather\\midas\\dat\\radtob-cache.pickle
+        """
+
+        dat_dir_ = self.cdd("dat") if dat_dir is None else validate_input_data_dir(dat_dir)
+
+        path_to_cache = cd(dat_dir_, "radtob-cache.pickle")
+
+        return path_to_cache
+
+    def load_radtob_cache(self, dat_dir=None, update=False):
+        """
+        Load the local cache of the queried RADTOB data.
+
+        For each met station, the cache keeps one block of data (sorted by 'OB_END_DATE_TIME'),
+        together with the (closed, disjoint) date/time intervals that have been fetched for it.
+
+        :param dat_dir: directory where the cache is saved, defaults to ``None``
+        :type dat_dir: str, None
+        :param update: whether to start with an empty cache, defaults to ``False``
+        :type update: bool
+        :return: the cache of RADTOB data, i.e. ``{'Stations': {<SRC_ID>: {'Coverage': [...],
+            'Data': ...}}, 'Suppl': ...}``
+        :rtype: dict
+
+        **Test**::
+
+            >>> from preprocessor.weather import MIDAS
+
+            >>> midas = MIDAS()
+
+            >>> radtob_cache = midas.load_radtob_cache()
+
+            >>> list(radtob_cache.keys())
+            ['Stations', 'Suppl']
+        """
+
+        if self.RadtobCache is None or update:
+            path_to_cache = self.make_radtob_cache_path(dat_dir)
+
+            if os.path.isfile(path_to_cache) and not update:
+                self.RadtobCache = load_pickle(path_to_cache)
+            else:
+                self.RadtobCache = {'Stations': {}, 'Suppl': None}
+
+        return self.RadtobCache
+
+    def save_radtob_cache(self, dat_dir=None, verbose=False):
+        """
+        Save the local cache of the queried RADTOB data as a pickle file.
+
+        :param dat_dir: directory where the cache is saved, defaults to ``None``
+        :type dat_dir: str, None
+        :param verbose: whether to print relevant information in console as the function runs,
+            defaults to ``False``
+        :type verbose: bool or int
+        """
+
+        if self.RadtobCache is not None:
+            save_pickle(self.RadtobCache, self.make_radtob_cache_path(dat_dir), verbose=verbose)
+
+    @staticmethod
+    def find_uncovered_intervals(coverage, start, end):
+        """
+        Find the parts of a (closed) interval that are not covered by given intervals.
+
+        :param coverage: sorted and disjoint (closed) intervals, i.e. a list of (start, end)
+        :type coverage: list
+        :param start: start of the interval
+        :param end: end of the interval
+        :return: uncovered parts of the interval [``start``, ``end``], i.e. a list of (start, end)
+        :rtype: list
+
+        **Test**::
+
+            >>> from preprocessor.weather import MIDAS
+
+            >>> MIDAS.find_uncovered_intervals([(2, 4), (6, 7)], 1, 9)
+            [(1, 2), (4, 6), (7, 9)]
+            >>> MIDAS.find_uncovered_intervals([(2, 4), (6, 7)], 3, 4)
+            []
+        """
+
+        uncovered, cursor = [], start
+
+        for c_start, c_end in coverage:
+            if c_start > end:
+                break
+            if c_end < cursor:
+                continue
+            if c_start > cursor:
+                uncovered.append((cursor, c_start))
+            cursor = c_end
+            if cursor >= end:
+                return uncovered
+
+        uncovered.append((cursor, end))
+
+        return uncovered
+
+    @staticmethod
+    def merge_intervals(intervals):
+        """
+        Coalesce overlapping or adjacent (closed) intervals.
+
+        :param intervals: a list of (start, end)
+        :type intervals: list
+        :return: sorted and disjoint intervals
+        :rtype: list
+
+        **Test**::
+
+            >>> from preprocessor.weather import MIDAS
+
+            >>> MIDAS.merge_intervals([(6, 7), (1, 2), (2, 4), (3, 5)])
+            [(1, 5), (6, 7)]
+        """
+
+        merged = []
+
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+
+        return merged
+
+    def fetch_radtob(self, gaps):
+        """
+        Fetch (from database) MIDAS RADTOB for the given date/time intervals of met stations,
+        and add them to the local cache.
+
+        :param gaps: (closed) date/time intervals to be fetched for each met station,
+            i.e. ``{<SRC_ID>: [(start, end), ...]}``
+        :type gaps: dict
+        """
+
+        stations_cache = self.load_radtob_cache()['Stations']
+
+        conditions = " OR ".join(
+            f"([SRC_ID] = {met_stn_id} AND [OB_END_DATE_TIME] BETWEEN "
+            f"'{start:%Y-%m-%d %H:%M:%S}' AND '{end:%Y-%m-%d %H:%M:%S}')"
+            for met_stn_id, intervals in gaps.items() for start, end in intervals)
+
+        sql_query = f"SELECT * FROM dbo.[MIDAS_RADTOB] WHERE {conditions};"
+
+        fetched_data = pd.read_sql(sql=sql_query, con=self.DatabaseConn)  # Query the weather data
+        fetched_data.OB_END_DATE_TIME = pd.to_datetime(fetched_data.OB_END_DATE_TIME)
+
+        for met_stn_id, intervals in gaps.items():
+            block = stations_cache.setdefault(met_stn_id, {'Coverage': [], 'Data': None})
+
+            # Coalesce the newly fetched data (for the met station) into the block
+            new_data = fetched_data[fetched_data.SRC_ID == met_stn_id]
+            if block['Data'] is not None:
+                new_data = pd.concat([block['Data'], new_data]).drop_duplicates()
+
+            block['Data'] = new_data.sort_values(
+                'OB_END_DATE_TIME', kind='mergesort', ignore_index=True)
+            block['Coverage'] = self.merge_intervals(block['Coverage'] + intervals)
+
+    @traced(io='database')
     def query_radtob_by_grid_datetime(self, met_stn_id, period, route_name, use_suppl_dat=False,
                                       update=False, dat_dir=None, pickle_it=False, verbose=False):
         """
-        Query (from database) MIDAS RADTOB (Radiation data) by met station ID for the given ``period``.
+        Query MIDAS RADTOB (Radiation data) by met station ID for the given ``period``.
+
+        The data is served from a local cache (see :py:meth:`MIDAS.load_radtob_cache`); only the
+        date/time intervals that have not yet been fetched for the met stations are queried
+        from the database.
 
         :param met_stn_id: met station ID
         :type met_stn_id: list
@@ -554,9 +742,9 @@ class MIDAS:
         :param update: whether to check on update and proceed to update the package data,
             defaults to ``False``
         :type update: bool
-        :param dat_dir: directory where the queried data is saved, defaults to ``None``
+        :param dat_dir: directory where the cache is saved, defaults to ``None``
         :type dat_dir: str, None
-        :param pickle_it: whether to save the queried data as a pickle file, defaults to ``True``
+        :param pickle_it: whether to save the cache as a pickle file, defaults to ``False``
         :type pickle_it: bool
         :param verbose: whether to print relevant information in console as the function runs,
             defaults to ``False``
@@ -583,48 +771,58 @@ class MIDAS:
             >>> dat = midas.query_radtob_by_grid_datetime(m_stn_id, p, rte, pickle_it=True, verbose=True)
         """
 
-        p_start = period.left.min().strftime('%Y%m%d%H')
-        p_end = period.right.max().strftime('%Y%m%d%H')
-
-        # Make a pickle file
-        pickle_filename = "{}-{}.pickle".format(
-            "-".join(str(x) for x in met_stn_id), "-".join([p_start, p_end]))
-
-        # Specify a directory/path to store the pickle file (if appropriate)
-        if dat_dir is None:
-            dat_dir_ = self.cdd("dat")
-        else:
-            dat_dir_ = validate_input_data_dir(dat_dir)
-        path_to_pickle = cd(dat_dir_, pickle_filename)
-
-        if os.path.isfile(path_to_pickle) and not update:
-            midas_radtob = load_pickle(path_to_pickle)
-
-        else:
-            # Specify database sql query
-            ms_id = tuple(met_stn_id)
-            dates = tuple(
-                x.strftime('%Y-%m-%d %H:%M:%S') for x in [period.left.min(), period.right.max()])
-
-            sql_query = \
-                f"SELECT * FROM dbo.[MIDAS_RADTOB] " \
-                f"WHERE [SRC_ID] IN {ms_id} " \
-                f"AND [OB_END_DATE_TIME] BETWEEN '{dates[0]}' AND '{dates[1]}';"
-
-            midas_radtob = pd.read_sql(sql=sql_query, con=self.DatabaseConn)  # Query the weather data
-
-            if midas_radtob.empty and use_suppl_dat:
-                dates = tuple(x.strftime('%Y-%m-%d') for x in [period.left.min(), period.right.max()])
-
-                sql_query = \
-                    f"SELECT * FROM dbo.[MIDAS_RADTOB_suppl] " \
-                    f"WHERE [Route] = '{route_name}' " \
-                    f"AND [OB_END_DATE] BETWEEN '{dates[0]}' AND '{dates[1]}';"
-
-                midas_radtob = pd.read_sql(sql=sql_query, con=self.DatabaseConn)
-
-            if pickle_it:
-                save_pickle(midas_radtob, path_to_pickle, verbose=verbose)
+        p_start, p_end = period.left.min(), period.right.max()
+
+        met_stn_ids = sorted(
+            set(met_stn_id if isinstance(met_stn_id, (list, tuple)) else [met_stn_id]))
+
+        stations_cache = self.load_radtob_cache(dat_dir)['Stations']
+
+        # Find the date/time intervals that have not yet been fetched
+        gaps = {}
+        for stn_id in met_stn_ids:
+            if update:
+                stn_gaps = [(p_start, p_end)]
+                if stn_id in stations_cache and stations_cache[stn_id]['Data'] is not None:
+                    stn_data = stations_cache[stn_id]['Data']
+                    stations_cache[stn_id]['Data'] = stn_data[
+                        ~stn_data.OB_END_DATE_TIME.between(p_start, p_end)]
+            else:
+                coverage = stations_cache[stn_id]['Coverage'] if stn_id in stations_cache else []
+                stn_gaps = self.find_uncovered_intervals(coverage, p_start, p_end)
+            if stn_gaps:
+                gaps[stn_id] = stn_gaps
+
+        if gaps:
+            self.fetch_radtob(gaps)
+
+        # Serve the period from the cache
+        radtob_data = []
+        for stn_id in met_stn_ids:
+            stn_data = stations_cache[stn_id]['Data']
+            ob_end_date_time = stn_data.OB_END_DATE_TIME.values
+            i, j = ob_end_date_time.searchsorted(np.datetime64(p_start), side='left'), \
+                ob_end_date_time.searchsorted(np.datetime64(p_end), side='right')
+            radtob_data.append(stn_data.iloc[i:j])
+
+        midas_radtob = pd.concat(radtob_data, ignore_index=True) if radtob_data else pd.DataFrame()
+
+        if midas_radtob.empty and use_suppl_dat:
+            radtob_suppl = self.RadtobCache['Suppl']
+
+            if radtob_suppl is None:
+                sql_query = "SELECT * FROM dbo.[MIDAS_RADTOB_suppl];"
+                radtob_suppl = pd.read_sql(sql=sql_query, con=self.DatabaseConn)
+                radtob_suppl.OB_END_DATE = pd.to_datetime(radtob_suppl.OB_END_DATE)
+                self.RadtobCache['Suppl'] = radtob_suppl
+
+            midas_radtob = radtob_suppl[
+                (radtob_suppl.Route == route_name) &
+                radtob_suppl.OB_END_DATE.between(p_start.normalize(), p_end.normalize())]
+            midas_radtob.index = range(len(midas_radtob))
+
+        if pickle_it:
+            self.save_radtob_cache(dat_dir, verbose=verbose)
 
         return midas_radtob
 
@@ -643,6 +841,7 @@ class UKCP09:
     :ivar str Description:
     :ivar str StartDate: (specified with the creation of the instance)
     :ivar sqlalchemy.engine.Connection DatabaseConn: connection to the database
+    :ivar dict DailyIndicators: data of daily weather indicators that have been loaded
 
     **Test**::
 
@@ -654,6 +853,9 @@ class UKCP09:
         UK Climate Projections
     """
 
+    # Connection to the database (established on first use)
+    DatabaseConn = deferred_mssql_connection()
+
     def __init__(self, start_date='2006-01-01', database_name='Weather'):
         self.Name = 'UK Climate Projections'
         self.Acronym = 'UKCP09'
@@ -662,8 +864,10 @@ class UKCP09:
 
         self.StartDate = start_date
 
-        # Create an engine to the MSSQL server
-        self.DatabaseConn = establish_mssql_connection(database_name=database_name)
+        self.DatabaseName = database_name
+
+        # Daily weather indicators (loaded on demand; see .query_daily_indicators())
+        self.DailyIndicators = {}
 
     @staticmethod
     def cdd(*sub_dir, mkdir=False):
@@ -1084,6 +1288,7 @@ class UKCP09:
 
         print("Done. ")
 
+    @traced(io='database')
     def query_by_grid_datetime(self, grids, period, update=False, dat_dir=None, pickle_it=False,
                                verbose=False):
         """
@@ -1162,6 +1367,7 @@ class UKCP09:
 
         return ukcp09_dat
 
+    @traced(io='database')
     def query_by_grid_datetime_(self, grids, period, update=False, dat_dir=None, pickle_it=False,
                                 verbose=False):
         """
@@ -1240,3 +1446,258 @@ class UKCP09:
                 save_pickle(ukcp09_dat, path_to_pickle, verbose=verbose)
 
         return ukcp09_dat
+
+    def make_daily_indicators_pickle_path(self, window=7, base_temperature=15.5):
+        """
+        Make a full path to the pickle file of the daily weather indicators.
+
+        :param window: number of days over which the rolling means are calculated, defaults to ``7``
+        :type window: int
+        :param base_temperature: base temperature (in °C) of the degree days, defaults to ``15.5``
+        :type base_temperature: float
+        :return: a full path to the pickle file of the daily weather indicators
+        :rtype: str
+        """
+
+        filename = "ukcp-daily-indicators-{}d-{}".format(
+            window, str(base_temperature).replace(".", "_"))
+
+        path_to_pickle = self.make_pickle_path(filename)
+
+        return path_to_pickle
+
+    @staticmethod
+    def calculate_daily_indicators(ukcp09_data, window=7, base_temperature=15.5):
+        """
+        Calculate daily weather indicators for each observation grid.
+
+        For each grid and date, the indicators include:
+
+            - the year-to-date maximum of the daily maximum temperature
+              (``'Maximum_Temperature_ytd_max'``) and the year-to-date minimum of the daily minimum
+              temperature (``'Minimum_Temperature_ytd_min'``);
+            - the rolling means of the weather variables over the last ``window`` days
+              (e.g. ``'Maximum_Temperature_7d_mean'``);
+            - the year-to-date accumulations of cooling and heating degree days
+              (``'Cooling_Degree_Days'`` and ``'Heating_Degree_Days'``).
+
+        :param ukcp09_data: data of daily gridded weather observations, with columns
+            'Pseudo_Grid_ID', 'Date', 'Maximum_Temperature', 'Minimum_Temperature'
+            and 'Precipitation'
+        :type ukcp09_data: pandas.DataFrame
+        :param window: number of days over which the rolling means are calculated, defaults to ``7``
+        :type window: int
+        :param base_temperature: base temperature (in °C) of the degree days, defaults to ``15.5``
+        :type base_temperature: float
+        :return: data of daily weather indicators, indexed by 'Pseudo_Grid_ID' and 'Date'
+        :rtype: pandas.DataFrame
+
+        **Test**::
+
+            >>> from preprocessor import UKCP09
+
+            >>> ukcp = UKCP09()
+
+            >>> ukcp09_dat = ukcp.get_obs_data()
+
+            >>> daily_indicators = ukcp.calculate_daily_indicators(ukcp09_dat.reset_index())
+        """
+
+        var_names = ['Maximum_Temperature', 'Minimum_Temperature', 'Precipitation']
+
+        data = ukcp09_data[['Pseudo_Grid_ID', 'Date'] + var_names].copy()
+        data['Date'] = pd.to_datetime(data.Date).dt.normalize()
+        data.sort_values(['Pseudo_Grid_ID', 'Date'], inplace=True, ignore_index=True)
+
+        grid_year = [data.Pseudo_Grid_ID, data.Date.dt.year]
+
+        # Year-to-date maxima / minima
+        data['Maximum_Temperature_ytd_max'] = data.groupby(grid_year).Maximum_Temperature.cummax()
+        data['Minimum_Temperature_ytd_min'] = data.groupby(grid_year).Minimum_Temperature.cummin()
+
+        # Rolling means over the last number of days
+        rolling_means = data.set_index('Date').groupby('Pseudo_Grid_ID')[var_names].rolling(
+            '{}D'.format(window)).mean()
+        for var_name in var_names:
+            data['{}_{}d_mean'.format(var_name, window)] = rolling_means[var_name].to_numpy()
+
+        # Year-to-date accumulations of degree days
+        mean_temperature = (data.Maximum_Temperature + data.Minimum_Temperature) / 2
+        data['Cooling_Degree_Days'] = \
+            (mean_temperature - base_temperature).clip(lower=0).groupby(grid_year).cumsum()
+        data['Heating_Degree_Days'] = \
+            (base_temperature - mean_temperature).clip(lower=0).groupby(grid_year).cumsum()
+
+        daily_indicators = data.set_index(['Pseudo_Grid_ID', 'Date'])
+
+        return daily_indicators
+
+    def get_daily_indicators(self, window=7, base_temperature=15.5, update=False, pickle_it=True,
+                             verbose=False):
+        """
+        Fetch daily weather indicators for each observation grid (from local pickle, if available).
+
+        See also :py:meth:`UKCP09.calculate_daily_indicators`.
+
+        :param window: number of days over which the rolling means are calculated, defaults to ``7``
+        :type window: int
+        :param base_temperature: base temperature (in °C) of the degree days, defaults to ``15.5``
+        :type base_temperature: float
+        :param update: whether to check on update and proceed to update the package data,
+            defaults to ``False``
+        :type update: bool
+        :param pickle_it: whether to save the data as a pickle file, defaults to ``True``
+        :type pickle_it: bool
+        :param verbose: whether to print relevant information in console as the function runs,
+            defaults to ``False``
+        :type verbose: bool or int
+        :return: data of daily weather indicators, indexed by 'Pseudo_Grid_ID' and 'Date'
+        :rtype: pandas.DataFrame or None
+
+        **Test**::
+
+            >>> from preprocessor import UKCP09
+
+            >>> ukcp = UKCP09()
+
+            >>> daily_indicators = ukcp.get_daily_indicators()
+        """
+
+        path_to_pickle = self.make_daily_indicators_pickle_path(window, base_temperature)
+
+        if os.path.isfile(path_to_pickle) and not update:
+            daily_indicators = load_pickle(path_to_pickle)
+
+        else:
+            try:
+                ukcp09_data = self.get_obs_data(use_pseudo_grid_id=True, verbose=verbose)
+
+                daily_indicators = self.calculate_daily_indicators(
+                    ukcp09_data.reset_index(), window=window, base_temperature=base_temperature)
+
+                if pickle_it:
+                    save_pickle(daily_indicators, path_to_pickle, verbose=verbose)
+
+            except Exception as e:
+                print("Failed to get the daily weather indicators. {}.".format(e))
+                daily_indicators = None
+
+        return daily_indicators
+
+    def update_daily_indicators(self, new_data=None, window=7, base_temperature=15.5,
+                                pickle_it=True, verbose=False):
+        """
+        Update the daily weather indicators incrementally with observations of new days.
+
+        Only the indicators from the start of the year (or of the rolling window, if earlier) of
+        the first new day onwards are recalculated.
+
+        :param new_data: data of daily gridded weather observations of new days;
+            if ``None`` (default), those after the latest date of the indicators are queried
+            from the database
+        :type new_data: pandas.DataFrame or None
+        :param window: number of days over which the rolling means are calculated, defaults to ``7``
+        :type window: int
+        :param base_temperature: base temperature (in °C) of the degree days, defaults to ``15.5``
+        :type base_temperature: float
+        :param pickle_it: whether to save the data as a pickle file, defaults to ``True``
+        :type pickle_it: bool
+        :param verbose: whether to print relevant information in console as the function runs,
+            defaults to ``False``
+        :type verbose: bool or int
+        :return: data of (updated) daily weather indicators
+        :rtype: pandas.DataFrame or None
+
+        **Test**::
+
+            >>> from preprocessor import UKCP09
+
+            >>> ukcp = UKCP09()
+
+            >>> daily_indicators = ukcp.update_daily_indicators()
+        """
+
+        daily_indicators = self.get_daily_indicators(
+            window=window, base_temperature=base_temperature, verbose=verbose)
+
+        try:
+            dates = daily_indicators.index.get_level_values('Date')
+            latest_date = dates.max()
+
+            if new_data is None:
+                sql_query = f"SELECT [Pseudo_Grid_ID], [Date], [Maximum_Temperature], " \
+                            f"[Minimum_Temperature], [Precipitation] FROM dbo.[UKCP09] " \
+                            f"WHERE [Date] > '{latest_date.strftime('%Y-%m-%d')}';"
+                new_data = pd.read_sql(sql=sql_query, con=self.DatabaseConn)
+
+            new_data = new_data.assign(Date=pd.to_datetime(new_data.Date).dt.normalize())
+            new_data = new_data[new_data.Date > latest_date]
+
+            if not new_data.empty:
+                # The earliest date from which the indicators are affected by the new days
+                recalc_start = (new_data.Date.min() - pd.Timedelta(days=window - 1)).replace(
+                    month=1, day=1)
+                # (with observations of the preceding days for the rolling means)
+                prior_dates = dates > recalc_start - pd.Timedelta(days=window)
+                recalc_data = pd.concat(
+                    [daily_indicators[prior_dates].reset_index(), new_data],
+                    ignore_index=True, sort=False)
+
+                recalc_indicators = self.calculate_daily_indicators(
+                    recalc_data, window, base_temperature)
+                recalc_indicators = recalc_indicators[
+                    recalc_indicators.index.get_level_values('Date') >= recalc_start]
+
+                daily_indicators = pd.concat(
+                    [daily_indicators[dates < recalc_start], recalc_indicators]).sort_index()
+
+                if pickle_it:
+                    save_pickle(
+                        daily_indicators,
+                        self.make_daily_indicators_pickle_path(window, base_temperature),
+                        verbose=verbose)
+
+            self.DailyIndicators[(window, base_temperature)] = daily_indicators
+
+        except Exception as e:
+            print("Failed to update the daily weather indicators. {}.".format(e))
+
+        return daily_indicators
+
+    @traced()
+    def query_daily_indicators(self, grids, dates, window=7, base_temperature=15.5):
+        """
+        Look up the daily weather indicators by observation grids and dates.
+
+        :param grids: a list of weather observation IDs
+        :type grids: list
+        :param dates: date(s)
+        :type dates: pandas.Timestamp or list or pandas.DatetimeIndex
+        :param window: number of days over which the rolling means are calculated, defaults to ``7``
+        :type window: int
+        :param base_temperature: base temperature (in °C) of the degree days, defaults to ``15.5``
+        :type base_temperature: float
+        :return: daily weather indicators for each of the ``grids`` on each of the ``dates``
+        :rtype: pandas.DataFrame
+
+        **Test**::
+
+            >>> from preprocessor import UKCP09
+
+            >>> ukcp = UKCP09()
+
+            grids = incidents.Weather_Grid.iloc[0]
+            period = incidents.Critical_Period.iloc[0]
+            daily_indicators = ukcp.query_daily_indicators(grids, period.left[0])
+        """
+
+        key = (window, base_temperature)
+        if key not in self.DailyIndicators:
+            self.DailyIndicators[key] = self.get_daily_indicators(window, base_temperature)
+
+        dates = pd.DatetimeIndex([dates] if isinstance(dates, pd.Timestamp) else dates).normalize()
+
+        daily_indicators = self.DailyIndicators[key].reindex(
+            pd.MultiIndex.from_product([grids, dates], names=['Pseudo_Grid_ID', 'Date']))
+
+        return daily_indicators
@@ -2,15 +2,24 @@
 
 
 import functools
+import glob
+import importlib
 import itertools
+import json
 import operator
 import os
+import shutil
+import threading
+import time
+import tracemalloc
 import urllib.parse
 
+import geopandas as gpd
 import numpy as np
 import pandas as pd
+import pyhelpers.store
 import pyodbc
-import shapely.wkt
+import shapely.geometry
 import sqlalchemy
 from pyhelpers.dir import cd, cdd
 from pyhelpers.store import load_json, save
@@ -387,20 +396,14 @@ def read_table_by_query(database_name, table_name, schema_name='dbo', col_names=
 
     # Check if there is column of 'geometry' type
     assert isinstance(table_name, str)
-    sql_query_geom_col = "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS " \
-                         "WHERE TABLE_NAME='{}' AND DATA_TYPE='geometry'".format(table_name)
-    geom_col_res = db_conn.execute(sql_query_geom_col).fetchall()
-    geom_col_names = list(itertools.chain.from_iterable(geom_col_res)) if geom_col_res else []
-
-    # Get a list of column names, excluding the 'geometry' one if it exists
-    table_col_names = [x for x in get_table_column_names(database_name, table_name)
-                       if x not in geom_col_names]
+    geom_col_names = get_table_geometry_column_names(database_name, table_name, schema_name)
 
-    # Specify SQL query - read all non-geom columns
-    selected_col_names = [x for x in col_names if x not in geom_col_names] if col_names \
-        else table_col_names
+    # Specify SQL query - read the geom column(s) as WKB along with all other selected columns
+    selected_col_names = col_names if col_names \
+        else get_table_column_names(database_name, table_name, schema_name)
     sql_query = 'SELECT {} FROM {}."{}"'.format(
-        ', '.join('"' + tbl_col_name + '"' for tbl_col_name in selected_col_names),
+        ', '.join('"{0}".STAsBinary() AS "{0}"'.format(x) if x in geom_col_names else '"' + x + '"'
+                  for x in selected_col_names),
         schema_name, table_name)
 
     # Read the queried table_name into a pandas.DataFrame
@@ -411,26 +414,9 @@ def read_table_by_query(database_name, table_name, schema_name='dbo', col_names=
     if chunk_size:
         table_data = pd.concat([pd.DataFrame(tbl_dat) for tbl_dat in table_data], ignore_index=True)
 
-    # Read geom column(s)
-    if geom_col_names:
-        if len(geom_col_names) == 1:
-            geom_sql_query = 'SELECT {} FROM {}."{}"'.format(
-                '"{}".STAsText()'.format(geom_col_names[0]), schema_name, table_name)
-        else:
-            geom_sql_query = 'SELECT {} FROM {}."{}"'.format(
-                ', '.join('"' + x + '".STAsText()' for x in geom_col_names),
-                schema_name, table_name)
-
-        # Read geom data chunks into a pandas.DataFrame
-        geom_data = pd.read_sql(geom_sql_query, db_conn, chunksize=chunk_size, **kwargs)
-
-        if chunk_size:
-            geom_data = pd.concat(
-                [pd.DataFrame(geom_dat).applymap(shapely.wkt.loads) for geom_dat in geom_data],
-                ignore_index=True)
-        geom_data.columns = geom_col_names
-        #
-        table_data = table_data.join(geom_data)
+    # Decode geom column(s) in bulk
+    table_data = decode_geometry_columns(
+        table_data, [x for x in selected_col_names if x in geom_col_names])
 
     # Disconnect the database
     db_conn.close()
@@ -438,7 +424,8 @@ def read_table_by_query(database_name, table_name, schema_name='dbo', col_names=
     if save_as:
         path_to_file = os.path.join(
             os.path.realpath(data_dir if data_dir else ''), table_name + save_as)
-        save(table_data, path_to_file)
+        save(encode_geometry_columns(table_data) if save_as == ".pickle" else table_data,
+             path_to_file)
 
     return table_data
 
@@ -483,53 +470,30 @@ def save_table_by_chunk(database_name, table_name, schema_name='dbo', col_names=
 
     # Check if there is column of 'geometry' type
     assert isinstance(table_name, str)
-    sql_query_geom_col = "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS " \
-                         "WHERE TABLE_NAME='{}' AND DATA_TYPE='geometry'".format(table_name)
-    geom_col_res = db_conn.execute(sql_query_geom_col).fetchall()
-    geom_col_names = list(itertools.chain.from_iterable(geom_col_res)) if geom_col_res else []
-
-    # Get a list of column names, excluding the 'geometry' one if it exists
-    table_col_names = [x for x in get_table_column_names(database_name, table_name)
-                       if x not in geom_col_names]
-
-    # Specify SQL query - read all of the selected non-geom columns
-    selected_col_names = [x for x in col_names if x not in geom_col_names] if col_names \
-        else table_col_names
+    geom_col_names = get_table_geometry_column_names(database_name, table_name, schema_name)
 
+    # Specify SQL query - read the geom column(s) as WKB along with all other selected columns
+    selected_col_names = col_names if col_names \
+        else get_table_column_names(database_name, table_name, schema_name)
     sql_query = 'SELECT {} FROM {}."{}"'.format(
-        ', '.join('"' + tbl_col_name + '"' for tbl_col_name in selected_col_names),
+        ', '.join('"{0}".STAsBinary() AS "{0}"'.format(x) if x in geom_col_names else '"' + x + '"'
+                  for x in selected_col_names),
         schema_name, table_name)
+    geom_col_names = [x for x in selected_col_names if x in geom_col_names]
 
     dat_dir = os.path.realpath(data_dir if data_dir else 'temp_dat')
-    if not geom_col_names:
-        # Read the queried table_name into a pandas.DataFrame
-        table_data = pd.read_sql(sql=sql_query, con=db_conn, columns=col_names, index_col=index_col,
-                                 chunksize=chunk_size, **kwargs)
-        for tbl_id, tbl_dat in enumerate(table_data):
-            path_to_file = os.path.join(dat_dir, table_name + "_{}".format(tbl_id + 1) + save_as)
-            save(tbl_dat, path_to_file, sheet_name="Sheet_{}".format(tbl_id + 1))
-    else:
-        # Read the queried table_name into a pd.DataFrame
-        table_data = pd.read_sql(sql=sql_query, con=db_conn, columns=col_names, index_col=index_col,
-                                 chunksize=chunk_size, **kwargs)
-        tbl_chunks = [tbl_dat for tbl_dat in table_data]
-
-        if len(geom_col_names) == 1:
-            geom_sql_query = 'SELECT {} FROM {}."{}"'.format(
-                '"{}".STAsText()'.format(geom_col_names[0]), schema_name, table_name)
+
+    # Read the queried table_name into a pandas.DataFrame
+    table_data = pd.read_sql(sql=sql_query, con=db_conn, columns=col_names, index_col=index_col,
+                             chunksize=chunk_size, **kwargs)
+    for tbl_id, tbl_dat in enumerate(table_data):
+        path_to_file = os.path.join(dat_dir, table_name + "_{}".format(tbl_id + 1) + save_as)
+        if save_as == ".pickle":
+            # Keep the geom column(s) as WKB
+            tbl_dat.attrs['GeometryColumns'] = geom_col_names
         else:
-            geom_sql_query = 'SELECT {} FROM {}."{}"'.format(
-                ', '.join('"' + x + '".STAsText()' for x in geom_col_names),
-                schema_name, table_name)
-        geom_data = pd.read_sql(geom_sql_query, db_conn, chunksize=chunk_size, **kwargs)
-        geom_chunks = [geom_dat.applymap(shapely.wkt.loads) for geom_dat in geom_data]
-
-        counter = 0
-        # noinspection PyTypeChecker
-        for tbl_dat, geom_dat in zip(tbl_chunks, geom_chunks):
-            path_to_file = os.path.join(dat_dir, table_name + "_{}".format(counter + 1) + save_as)
-            save(tbl_dat.join(geom_dat), path_to_file, sheet_name="Sheet_{}".format(counter + 1))
-            counter += 1
+            tbl_dat = decode_geometry_columns(tbl_dat, geom_col_names)
+        save(tbl_dat, path_to_file, sheet_name="Sheet_{}".format(tbl_id + 1))
 
     # Disconnect the database
     db_conn.close()
@@ -583,6 +547,101 @@ def get_table_column_names(database_name, table_name, schema_name='dbo'):
     return col_names
 
 
+@functools.lru_cache(maxsize=None)
+def get_table_geometry_column_names(database_name, table_name, schema_name='dbo'):
+    """
+    Get the names of columns of 'geometry' type in a table (looked up only once per table).
+
+    :param database_name: name of a database
+    :type database_name: str
+    :param table_name: name of a queried table from the given database
+    :type table_name: str
+    :param schema_name: defaults to ``'dbo'``
+    :type schema_name: str
+    :return: names of the geometry columns
+    :rtype: tuple
+    """
+
+    db_conn = establish_mssql_connection(database_name)
+    sql_query_geom_col = \
+        "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS " \
+        "WHERE TABLE_SCHEMA='{}' AND TABLE_NAME='{}' AND DATA_TYPE='geometry'".format(
+            schema_name, table_name)
+    geom_col_res = db_conn.execute(sql_query_geom_col).fetchall()
+    db_conn.close()
+
+    geom_col_names = tuple(itertools.chain.from_iterable(geom_col_res)) if geom_col_res else ()
+
+    return geom_col_names
+
+
+def decode_geometry_columns(data_frame, geom_col_names=None):
+    """
+    Decode WKB geometry columns of a data frame into geometry arrays (in bulk).
+
+    :param data_frame: a data frame, of which the geometry columns are of WKB
+    :type data_frame: pandas.DataFrame
+    :param geom_col_names: names of the geometry columns; if ``None`` (default),
+        ``data_frame.attrs['GeometryColumns']`` (see :py:func:`encode_geometry_columns`)
+    :type geom_col_names: list or tuple or None
+    :return: the data frame, of which the geometry columns are of ``geopandas.array.GeometryDtype``
+    :rtype: pandas.DataFrame
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> import shapely.geometry
+        >>> from utils import decode_geometry_columns
+
+        >>> dat = pd.DataFrame({'geom': [shapely.geometry.Point(0, 0).wkb]})
+
+        >>> decode_geometry_columns(dat, ['geom']).geom.dtype
+        <geopandas.array.GeometryDtype object at ...>
+    """
+
+    if geom_col_names is None:
+        geom_col_names = data_frame.attrs.get('GeometryColumns', [])
+
+    for col in geom_col_names:
+        if not isinstance(data_frame[col].dtype, gpd.array.GeometryDtype):
+            data_frame[col] = gpd.array.from_wkb(data_frame[col].values)
+
+    data_frame.attrs.pop('GeometryColumns', None)
+
+    return data_frame
+
+
+def encode_geometry_columns(data_frame):
+    """
+    Encode geometry columns of a data frame as WKB (e.g. to be saved as a pickle file).
+
+    The names of the encoded columns are kept in ``attrs['GeometryColumns']`` of the returned data,
+    with which :py:func:`decode_geometry_columns` restores the geometry objects.
+
+    :param data_frame: a data frame
+    :type data_frame: pandas.DataFrame
+    :return: a shallow copy of the ``data_frame``, of which the geometry columns are of WKB
+    :rtype: pandas.DataFrame
+    """
+
+    geom_col_names = [
+        col for col in data_frame.columns
+        if isinstance(data_frame[col].dtype, gpd.array.GeometryDtype) or
+        (data_frame[col].dtype == object and len(data_frame) > 0 and
+         isinstance(data_frame[col].iloc[0], shapely.geometry.base.BaseGeometry))]
+
+    data = data_frame.copy(deep=False)
+    for col in geom_col_names:
+        geom = data[col].values
+        if not isinstance(geom, gpd.array.GeometryArray):
+            geom = gpd.array.from_shapely(geom)
+        data[col] = gpd.array.to_wkb(geom)
+
+    data.attrs['GeometryColumns'] = geom_col_names
+
+    return data
+
+
 def get_table_primary_keys(database_name, table_name=None, schema_name='dbo', table_type='TABLE'):
     """
     Get the primary keys of each table in a database.
@@ -619,6 +678,491 @@ def get_table_primary_keys(database_name, table_name=None, schema_name='dbo', ta
     return result_pks
 
 
+# == Data sources =====================================================================================
+
+class DeferredAttribute:
+    """
+    An attribute of an instance that is created (by ``factory(instance)``) only when it is first
+    accessed, e.g. a connection to a database.
+
+    Assigning a value to the attribute (e.g. a connection to a local or synthetic backend)
+    overrides it.
+
+    :param factory: a function that takes the instance and returns the value of the attribute
+    :type factory: typing.Callable
+
+    **Test**::
+
+        >>> from utils import DeferredAttribute
+
+        >>> class DataSource:
+        ...     DatabaseConn = DeferredAttribute(lambda self: 'Connection to ' + self.DatabaseName)
+        ...     def __init__(self):
+        ...         self.DatabaseName = 'Weather'
+
+        >>> DataSource().DatabaseConn
+        'Connection to Weather'
+    """
+
+    def __init__(self, factory):
+        self.Factory = factory
+        self.Name = None
+
+    def __set_name__(self, owner, name):
+        self.Name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        value = self.Factory(instance)
+        instance.__dict__[self.Name] = value
+
+        return value
+
+
+def deferred_mssql_connection():
+    """
+    Make an attribute of a connection to MS SQL Server, which is established on first use.
+
+    The name of the database is given by the ``DatabaseName`` of the instance.
+
+    :return: a deferred attribute of the connection
+    :rtype: DeferredAttribute
+    """
+
+    return DeferredAttribute(
+        lambda instance: establish_mssql_connection(database_name=instance.DatabaseName))
+
+
+# Name of a data source: the class (or path to the class) from which it is created
+data_source_factories = {
+    'METExLite': 'preprocessor.METExLite',
+    'Vegetation': 'preprocessor.Vegetation',
+    'MIDAS': 'preprocessor.MIDAS',
+    'UKCP09': 'preprocessor.UKCP09',
+    'Schedule8IncidentReports': 'preprocessor.Schedule8IncidentReports',
+}
+
+_data_sources = {}
+
+
+def register_data_source(name, factory):
+    """
+    Register a class (or any other factory) of a data source, e.g. a local or synthetic backend.
+
+    Any instances of the data source that have been created are discarded.
+
+    :param name: name of the data source, e.g. ``'METExLite'``
+    :type name: str
+    :param factory: a class/function that creates the data source, or the path to it
+    :type factory: typing.Callable or str
+    """
+
+    data_source_factories[name] = factory
+
+    reset_data_sources(name)
+
+
+def set_data_source(name, data_source, **kwargs):
+    """
+    Set (i.e. inject) an instance of a data source.
+
+    :param name: name of the data source, e.g. ``'METExLite'``
+    :type name: str
+    :param data_source: an instance of the data source
+    :param kwargs: parameters with which the instance is requested (see :py:func:`get_data_source`)
+
+    **Test**::
+
+        >>> from utils import get_data_source, reset_data_sources, set_data_source
+
+        >>> set_data_source('MIDAS', 'A synthetic backend')
+
+        >>> get_data_source('MIDAS')
+        'A synthetic backend'
+
+        >>> reset_data_sources('MIDAS')
+    """
+
+    _data_sources[(name, tuple(sorted(kwargs.items())))] = data_source
+
+
+def get_data_source(name, **kwargs):
+    """
+    Get a (shared) instance of a data source, which is created on first use.
+
+    :param name: name of the data source, e.g. ``'METExLite'``
+    :type name: str
+    :param kwargs: parameters of the class of the data source, e.g. ``database_name``
+    :return: an instance of the data source
+
+    **Test**::
+
+        >>> from utils import get_data_source
+
+        >>> metex = get_data_source('METExLite')
+
+        >>> metex is get_data_source('METExLite')
+        True
+    """
+
+    key = (name, tuple(sorted(kwargs.items())))
+
+    if key not in _data_sources:
+        factory = data_source_factories[name]
+
+        if isinstance(factory, str):
+            module_name, factory_name = factory.rsplit('.', 1)
+            factory = getattr(importlib.import_module(module_name), factory_name)
+
+        _data_sources[key] = factory(**kwargs)
+
+    return _data_sources[key]
+
+
+def reset_data_sources(name=None):
+    """
+    Discard the (shared) instances of data sources.
+
+    :param name: name of a data source; if ``None`` (default), all data sources
+    :type name: str or None
+    """
+
+    for key in [k for k in _data_sources if name is None or k[0] == name]:
+        del _data_sources[key]
+
+
+# == Tracing ==========================================================================================
+
+# Spans recorded while tracing (``'Spans'`` is ``None`` when tracing is off)
+_tracer = {'Spans': None, 'PathToTrace': None, 'StartTime': None, 'TraceMemory': False}
+
+_tracer_local = threading.local()  # Stack of the open spans (of each thread)
+
+
+def start_tracing(path_to_trace=None, trace_memory=False):
+    """
+    Start recording timed spans of data-source calls and pipeline stages (see :py:func:`traced`).
+
+    :param path_to_trace: path where the trace (.json) is saved by :py:func:`stop_tracing`,
+        defaults to ``None`` (i.e. "traces\\trace-<date and time>.json" in the current directory)
+    :type path_to_trace: str or None
+    :param trace_memory: whether to record the peak memory (by ``tracemalloc``) of each span,
+        which slows down the pipeline, defaults to ``False``
+    :type trace_memory: bool
+
+    **Test**::
+
+        >>> from utils import start_tracing, stop_tracing
+
+        >>> start_tracing(trace_memory=True)
+
+        >>> # Run (part of) the pipeline, e.g.
+        >>> from modeller import WindAttributedIncidents
+        >>> w_model = WindAttributedIncidents(trial_id=2)
+        >>> _ = w_model.integrate_data(update=True)
+
+        >>> spans = stop_tracing()
+    """
+
+    if path_to_trace is None:
+        timestamp = pd.Timestamp.now().strftime('%Y%m%d%H%M%S')
+        path_to_trace = cd("traces", "trace-{}.json".format(timestamp))
+
+    _tracer.update({'Spans': [], 'PathToTrace': path_to_trace, 'StartTime': time.perf_counter(),
+                    'TraceMemory': trace_memory})
+
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop_tracing(save_it=True, verbose=False):
+    """
+    Stop recording spans, and save them (as a trace in the Trace Event Format) if appropriate.
+
+    The saved trace can be viewed as a flame chart (e.g. in chrome://tracing,
+    https://ui.perfetto.dev or https://www.speedscope.app) or summarised by
+    :py:func:`summarise_trace`.
+
+    :param save_it: whether to save the trace, defaults to ``True``
+    :type save_it: bool
+    :param verbose: whether to print relevant information in console, defaults to ``False``
+    :type verbose: bool
+    :return: recorded spans
+    :rtype: pandas.DataFrame
+    """
+
+    spans = pd.DataFrame(_tracer['Spans'] or [], columns=[
+        'Name', 'Detail', 'Thread', 'Depth', 'Start', 'Seconds', 'SelfSeconds', 'Rows', 'Bytes',
+        'Cache', 'CacheHits', 'CacheMisses', 'PeakMemory', 'Error'])
+
+    if _tracer['TraceMemory'] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    if save_it and _tracer['Spans'] is not None:
+        trace_events = [
+            {'name': span['Name'], 'cat': span['Name'].split('.')[0], 'ph': 'X',
+             'pid': os.getpid(), 'tid': span['Thread'], 'ts': span['Start'] * 1e6,
+             'dur': span['Seconds'] * 1e6,
+             'args': {k: v for k, v in span.items()
+                      if k not in ('Name', 'Thread', 'Start', 'Seconds') and v not in (None, '')}}
+            for span in _tracer['Spans']]
+
+        os.makedirs(os.path.dirname(os.path.abspath(_tracer['PathToTrace'])), exist_ok=True)
+        with open(_tracer['PathToTrace'], 'w') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f, default=str)
+
+        if verbose:
+            print("Saved the trace to \"{}\".".format(os.path.relpath(_tracer['PathToTrace'])))
+
+    _tracer.update({'Spans': None, 'StartTime': None, 'TraceMemory': False})
+
+    return spans
+
+
+def count_rows(result):
+    """
+    Count the rows of (the result of) a data-source call or a pipeline stage.
+
+    :param result: result of a call
+    :return: number of rows, or ``None`` if the result is not a table
+    :rtype: int or None
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from utils import count_rows
+
+        >>> count_rows((pd.DataFrame({'A': range(3)}), None))
+        3
+    """
+
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return len(result)
+    elif isinstance(result, tuple) and result and \
+            isinstance(result[0], (pd.DataFrame, pd.Series)):
+        return len(result[0])
+    else:
+        return None
+
+
+def _describe_args(args):
+    # Short description of the (first) argument of a call, e.g. name of a table or weather cell ID
+    for arg in args:
+        if isinstance(arg, (str, int, np.integer, tuple)):
+            is_path = isinstance(arg, str) and os.path.isabs(arg)
+            desc = os.path.basename(arg) if is_path else str(arg)
+            return desc if len(desc) <= 80 else desc[:77] + '...'
+    return ''
+
+
+def traced(name=None, io=None):
+    """
+    Record each call of a function (e.g. a data-source call or a pipeline stage) as a timed span,
+    while tracing is on (see :py:func:`start_tracing`).
+
+    A span records the time of the call (and the time spent in the call itself, i.e. not in the
+    spans within it), the number of rows of the result, the number of bytes read/written, whether
+    the data was served from a local cache (i.e. a pickle file) and the peak memory.
+
+    :param name: name of the span, defaults to ``None`` (i.e. the qualified name of the function)
+    :type name: str or None
+    :param io: type of the I/O of the function, incl. ``'database'`` (i.e. reading from a database,
+        unless the data is loaded from a pickle file), ``'load'`` and ``'save'`` (i.e. loading and
+        saving a file, the path to which is the first or second argument, respectively);
+        defaults to ``None``
+    :type io: str or None
+    :return: a decorator
+    :rtype: typing.Callable
+
+    **Test**::
+
+        >>> from utils import start_tracing, stop_tracing, traced
+
+        >>> @traced()
+        ... def get_data():
+        ...     return [1, 2, 3]
+
+        >>> start_tracing()
+        >>> _ = get_data()
+        >>> spans = stop_tracing(save_it=False)
+
+        >>> spans[['Name', 'Rows']]
+               Name  Rows
+        0  get_data  None
+    """
+
+    assert io in (None, 'database', 'load', 'save')
+
+    def decorator(func):
+        span_name = func.__qualname__ if name is None else name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer['Spans'] is None:
+                return func(*args, **kwargs)
+
+            stack = _tracer_local.__dict__.setdefault('Stack', [])
+            parent = stack[-1] if stack else None
+
+            # The first argument of a method is the instance
+            detail = _describe_args(args[1:] if '.' in func.__qualname__ else args)
+
+            span = {'Name': span_name, 'Detail': detail,
+                    'Thread': threading.get_ident(), 'Depth': len(stack), 'ChildSeconds': 0.0,
+                    'CacheHits': 1 if io == 'load' else 0, 'CacheMisses': 0, 'PeakMemory': None,
+                    'Error': ''}
+
+            trace_memory = _tracer['TraceMemory'] and tracemalloc.is_tracing()
+            if trace_memory:
+                if parent is not None:
+                    parent['PeakMemory'] = max(
+                        parent['PeakMemory'], tracemalloc.get_traced_memory()[1])
+                if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+                    tracemalloc.reset_peak()
+                span['PeakMemory'] = tracemalloc.get_traced_memory()[0]
+
+            stack.append(span)
+            start = time.perf_counter()
+
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+
+            except Exception as e:
+                span['Error'] = "{}: {}".format(type(e).__name__, e)
+                raise
+
+            finally:
+                seconds = time.perf_counter() - start
+                stack.pop()
+
+                span.update({'Start': start - _tracer['StartTime'], 'Seconds': seconds,
+                             'SelfSeconds': seconds - span.pop('ChildSeconds'),
+                             'Rows': count_rows(result)})
+
+                # Data read from a database, unless (all of) it has been loaded from a pickle file
+                if io == 'database' and (span['CacheMisses'] > 0 or span['CacheHits'] == 0):
+                    span['CacheMisses'] += 1
+                span['Cache'] = \
+                    'miss' if span['CacheMisses'] else 'hit' if span['CacheHits'] else ''
+
+                if io in ('load', 'save'):
+                    path_to_file = args[0] if io == 'load' else args[1]
+                    span['Bytes'] = os.path.getsize(path_to_file) if os.path.isfile(path_to_file) \
+                        else None
+                elif io == 'database' and span['CacheMisses'] and \
+                        isinstance(result, (pd.DataFrame, pd.Series)):
+                    span['Bytes'] = int(result.memory_usage(index=True, deep=False).sum())
+                else:
+                    span['Bytes'] = None
+
+                if trace_memory and tracemalloc.is_tracing():
+                    span['PeakMemory'] = max(
+                        span['PeakMemory'], tracemalloc.get_traced_memory()[1])
+
+                if parent is not None:
+                    parent['ChildSeconds'] += seconds
+                    parent['CacheHits'] += span['CacheHits']
+                    parent['CacheMisses'] += span['CacheMisses']
+                    if trace_memory:
+                        parent['PeakMemory'] = max(parent['PeakMemory'], span['PeakMemory'])
+
+                if _tracer['Spans'] is not None:
+                    _tracer['Spans'].append(span)
+
+        return wrapper
+
+    return decorator
+
+
+@traced('load_pickle', io='load')
+def load_pickle(path_to_pickle, **kwargs):
+    """
+    Load a pickle file (and record the loading as a span while tracing).
+
+    See also ``pyhelpers.store.load_pickle``.
+
+    :param path_to_pickle: path to a pickle file
+    :type path_to_pickle: str
+    :param kwargs: optional parameters of ``pyhelpers.store.load_pickle``
+    :return: data loaded from the pickle file
+    """
+
+    return pyhelpers.store.load_pickle(path_to_pickle, **kwargs)
+
+
+@traced('save_pickle', io='save')
+def save_pickle(pickle_data, path_to_pickle, **kwargs):
+    """
+    Save data as a pickle file (and record the saving as a span while tracing).
+
+    See also ``pyhelpers.store.save_pickle``.
+
+    :param pickle_data: data to be saved
+    :param path_to_pickle: path where the pickle file is saved
+    :type path_to_pickle: str
+    :param kwargs: optional parameters of ``pyhelpers.store.save_pickle``
+    """
+
+    pyhelpers.store.save_pickle(pickle_data, path_to_pickle, **kwargs)
+
+
+def summarise_trace(trace):
+    """
+    Summarise a trace, i.e. the calls, times, rows, bytes, cache hits/misses and peak memory of
+    each (name of) span.
+
+    :param trace: path to a trace (.json) saved by :py:func:`stop_tracing`,
+        or the recorded spans
+    :type trace: str or pandas.DataFrame
+    :return: summary of the spans, sorted by the total time spent in the spans themselves
+    :rtype: pandas.DataFrame
+
+    **Test**::
+
+        >>> from utils import summarise_trace
+
+        >>> trace_summary = summarise_trace("traces\\trace-20210601120000.json")
+        >>> trace_summary.columns.tolist()
+        ['Calls',
+         'Seconds',
+         'SelfSeconds',
+         'MaxSeconds',
+         'Rows',
+         'Bytes',
+         'CacheHits',
+         'CacheMisses',
+         'PeakMemory']
+    """
+
+    if isinstance(trace, str):
+        with open(trace, 'r') as f:
+            trace_events = json.load(f)['traceEvents']
+        spans = pd.DataFrame([dict(Name=e['name'], Seconds=e['dur'] / 1e6, **e['args'])
+                              for e in trace_events])
+    else:
+        spans = trace.copy()
+
+    for col in ['Depth', 'SelfSeconds', 'Rows', 'Bytes', 'Cache', 'PeakMemory']:
+        if col not in spans.columns:
+            spans[col] = np.nan
+
+    # Count the cache hits/misses of a span itself only (i.e. not those within it)
+    spans['Hit'], spans['Miss'] = spans.Cache == 'hit', spans.Cache == 'miss'
+
+    summary = spans.groupby('Name').agg(
+        Calls=('Seconds', 'size'), Seconds=('Seconds', 'sum'), SelfSeconds=('SelfSeconds', 'sum'),
+        MaxSeconds=('Seconds', 'max'), Rows=('Rows', 'sum'), Bytes=('Bytes', 'sum'),
+        CacheHits=('Hit', 'sum'), CacheMisses=('Miss', 'sum'), PeakMemory=('PeakMemory', 'max'))
+
+    summary.sort_values('SelfSeconds', ascending=False, inplace=True)
+
+    return summary
+
+
 # == Misc =============================================================================================
 
 def make_filename(name, route_name=None, weather_category=None, *suffixes, sep="-", save_as=".pickle"):
@@ -673,10 +1217,9 @@ def make_filename(name, route_name=None, weather_category=None, *suffixes, sep="
     if route_name is None:
         route_name_ = ""
     else:
-        rts = list(set(load_json(cdd_network("routes", "name-changes.json")).values()))
-        route_name_ = "_".join(
-            [find_similar_str(x, rts).replace(" ", "") for x in
-             ([route_name] if isinstance(route_name, str) else list(route_name))])
+        rts = sorted(set(load_json(cdd_network("routes", "name-changes.json")).values()))
+        rts_ = (route_name,) if isinstance(route_name, str) else tuple(route_name)
+        route_name_ = "_".join([x.replace(" ", "") for x in find_similar_names(rts_, tuple(rts))])
         if base_name != "":
             route_name_ = sep + route_name_
 
@@ -684,9 +1227,9 @@ def make_filename(name, route_name=None, weather_category=None, *suffixes, sep="
         weather_category_ = ""
     else:
         wcs = load_json(cdd_weather("weather-categories.json"))['WeatherCategory']
+        wcs_ = (weather_category,) if isinstance(weather_category, str) else tuple(weather_category)
         weather_category_ = "_".join(
-            [find_similar_str(x, wcs).replace(" ", "") for x in
-             ([weather_category] if isinstance(weather_category, str) else list(weather_category))])
+            [x.replace(" ", "") for x in find_similar_names(wcs_, tuple(wcs))])
         if base_name != "":
             weather_category_ = sep + weather_category_
 
@@ -708,7 +1251,83 @@ def make_filename(name, route_name=None, weather_category=None, *suffixes, sep="
     return filename
 
 
-def get_subset(data_frame, route_name=None, weather_category=None, rearrange_index=False):
+@functools.lru_cache(maxsize=None)
+def find_similar_names(names, lookup):
+    """
+    Find the most similar value in a lookup list for each of the given names (memoised).
+
+    :param names: names (e.g. of Routes or weather categories) to be resolved
+    :type names: tuple
+    :param lookup: a lookup list of canonical names
+    :type lookup: tuple
+    :return: the canonical name for each of the ``names``
+    :rtype: tuple
+
+    **Test**::
+
+        >>> from utils import find_similar_names
+
+        >>> find_similar_names(('anglia', 'wind'), ('Anglia', 'Wales', 'Wind', 'Heat'))
+        ('Anglia', 'Wind')
+    """
+
+    similar_names = tuple(find_similar_str(x, list(lookup)) for x in names)
+
+    return similar_names
+
+
+def get_subset_index(data_frame, path_to_pickle=None, update=False):
+    """
+    Get the row positions of a data frame for each Route and each weather category.
+
+    :param data_frame: a data frame (that contains 'Route' and/or 'WeatherCategory')
+    :type data_frame: pandas.DataFrame
+    :param path_to_pickle: path to the pickle file of the ``data_frame``; if specified,
+        the index is saved alongside it (and is reused as long as the pickle has not changed),
+        defaults to ``None``
+    :type path_to_pickle: str or None
+    :param update: whether to rebuild the index, defaults to ``False``
+    :type update: bool
+    :return: row positions for each value of 'Route' and 'WeatherCategory'
+    :rtype: dict
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from utils import get_subset_index
+
+        >>> dat = pd.DataFrame({'Route': ['Anglia', 'Wales', 'Anglia'],
+        ...                     'WeatherCategory': ['Wind', 'Wind', 'Heat']})
+
+        >>> subset_index = get_subset_index(dat)
+
+        >>> subset_index['Route']
+        {'Anglia': array([0, 2]), 'Wales': array([1])}
+    """
+
+    if path_to_pickle is not None:
+        path_to_index = os.path.splitext(path_to_pickle)[0] + "-subset-index.pickle"
+
+        if os.path.isfile(path_to_index) and not update and \
+                os.path.getmtime(path_to_index) >= os.path.getmtime(path_to_pickle):
+            subset_index = load_pickle(path_to_index)
+            if subset_index.get('Length') == len(data_frame):
+                return subset_index
+
+    subset_index = {'Length': len(data_frame)}
+    for col in ('Route', 'WeatherCategory'):
+        if col in data_frame.columns:
+            subset_index[col] = data_frame.groupby(col, observed=True, sort=False).indices
+
+    if path_to_pickle is not None:
+        # noinspection PyUnboundLocalVariable
+        save_pickle(subset_index, path_to_index)
+
+    return subset_index
+
+
+def get_subset(data_frame, route_name=None, weather_category=None, rearrange_index=False,
+               subset_index=None, copy=True):
     """
     Subset of a data set for the given Route and weather category.
 
@@ -720,41 +1339,68 @@ def get_subset(data_frame, route_name=None, weather_category=None, rearrange_ind
     :type weather_category: str or list or None
     :param rearrange_index: whether to rearrange the index of the subset, defaults to ``False``
     :type rearrange_index: bool
+    :param subset_index: row positions of the ``data_frame`` for each Route and weather category
+        (see :py:func:`get_subset_index`), defaults to ``None``
+    :type subset_index: dict or None
+    :param copy: whether to return a deep copy even if no rows are removed, defaults to ``True``
+    :type copy: bool
     :return: a subset of the ``data_frame`` for the given ``route_name`` and ``weather_category``
     :rtype: pandas.DataFrame, None
+
+    .. note::
+
+        If neither ``route_name`` nor ``weather_category`` is given and ``copy=False``,
+        the ``data_frame`` itself is returned (or a shallow copy of it if ``rearrange_index=True``),
+        i.e. the result aliases the input; pass ``copy=False`` only if the ``data_frame`` is not
+        used elsewhere (e.g. it has just been loaded).
     """
 
     if data_frame is not None:
         assert isinstance(data_frame, pd.DataFrame) and not data_frame.empty
-        data_subset = data_frame.copy(deep=True)
-
-        if route_name:
-            try:  # assert 'Route' in data_subset.columns
-                data_subset.Route = data_subset.Route.astype(str)
-                route_lookup = list(set(data_subset.Route))
-                route_name_ = [
-                    find_similar_str(x, route_lookup)
-                    for x in ([route_name] if isinstance(route_name, str) else list(route_name))]
-                data_subset = data_subset[data_subset.Route.isin(route_name_)]
-            except AttributeError:
-                print("Couldn't slice the data by 'Route'. "
-                      "The attribute may not exist in the DataFrame.")
-                pass
-
-        if weather_category:
-            try:  # assert 'WeatherCategory' in data_subset.columns
-                data_subset.WeatherCategory = data_subset.WeatherCategory.astype(str)
-                weather_category_lookup = list(set(data_subset.WeatherCategory))
-                weather_category_ = [
-                    find_similar_str(x, weather_category_lookup)
-                    for x in ([weather_category] if isinstance(weather_category, str)
-                              else list(weather_category))
-                ]
-                data_subset = data_subset[data_subset.WeatherCategory.isin(weather_category_)]
-            except AttributeError:
-                print("Couldn't slice the data by 'WeatherCategory'. "
-                      "The attribute may not exist in the DataFrame.")
-                pass
+
+        if subset_index is not None and subset_index.get('Length') != len(data_frame):
+            subset_index = None  # The index does not match the data frame
+
+        positions = None
+
+        for col, names in (('Route', route_name), ('WeatherCategory', weather_category)):
+            if not names:
+                continue
+
+            if col not in data_frame.columns:
+                print("Couldn't slice the data by '{}'. "
+                      "The attribute may not exist in the DataFrame.".format(col))
+                continue
+
+            col_index = subset_index.get(col) if subset_index is not None else None
+            if col_index is not None:
+                lookup = tuple(col_index.keys())
+            else:
+                lookup = tuple(data_frame[col].dropna().unique())
+
+            names_ = find_similar_names(
+                (names,) if isinstance(names, str) else tuple(names), lookup)
+            # (Any name that matches none of the lookup selects no rows)
+            names_ = [x for x in names_ if x is not None]
+
+            if col_index is not None:
+                col_positions = np.concatenate(
+                    [np.empty(0, dtype=int)] +
+                    [col_index.get(x, np.empty(0, dtype=int)) for x in set(names_)])
+            else:
+                col_positions = np.flatnonzero(data_frame[col].isin(names_).values)
+
+            positions = col_positions if positions is None else \
+                np.intersect1d(positions, col_positions, assume_unique=True)
+
+        if positions is not None:
+            data_subset = data_frame.iloc[np.sort(positions)]
+        elif copy:
+            data_subset = data_frame.copy(deep=True)
+        elif rearrange_index:
+            data_subset = data_frame.copy(deep=False)
+        else:
+            data_subset = data_frame
 
         if rearrange_index:
             data_subset.index = range(len(data_subset))  # data_subset.reset_index(inplace=True)
@@ -765,6 +1411,554 @@ def get_subset(data_frame, route_name=None, weather_category=None, rearrange_ind
     return data_subset
 
 
+# == Chunked execution ================================================================================
+
+def estimate_chunk_size(data_frame, memory_budget, expansion=1.0):
+    """
+    Estimate the number of rows of a chunk (of a data frame) to be processed within a memory budget.
+
+    :param data_frame: a data frame
+    :type data_frame: pandas.DataFrame
+    :param memory_budget: memory budget (in bytes) for processing a chunk
+    :type memory_budget: int
+    :param expansion: ratio of the memory required for processing a chunk to the size of the chunk,
+        defaults to ``1.0``
+    :type expansion: int or float
+    :return: number of rows of a chunk
+    :rtype: int
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from utils import estimate_chunk_size
+
+        >>> dat = pd.DataFrame({'A': range(1000)})
+
+        >>> estimate_chunk_size(dat, memory_budget=800)
+        100
+    """
+
+    row_size = data_frame.memory_usage(index=False, deep=True).sum() / max(len(data_frame), 1)
+
+    chunk_size = max(int(memory_budget / max(row_size * expansion, 1)), 1)
+
+    return chunk_size
+
+
+def split_into_chunks(data_frame, chunk_size, group_by=None):
+    """
+    Split a data frame into chunks (each of which keeps the rows of the same group together).
+
+    :param data_frame: a data frame
+    :type data_frame: pandas.DataFrame
+    :param chunk_size: (approximate) number of rows of a chunk
+    :type chunk_size: int
+    :param group_by: name of a column, the rows having the same value of which are kept in the same
+        chunk, defaults to ``None``
+    :type group_by: str or None
+    :return: chunks of the data frame
+    :rtype: typing.Generator[pandas.DataFrame]
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from utils import split_into_chunks
+
+        >>> dat = pd.DataFrame({'A': [1, 2, 1, 3, 2, 1]})
+
+        >>> [len(x) for x in split_into_chunks(dat, chunk_size=2, group_by='A')]
+        [3, 2, 1]
+    """
+
+    if group_by is None:
+        for i in range(0, len(data_frame), chunk_size):
+            yield data_frame.iloc[i:i + chunk_size]
+
+    else:
+        # (Missing values are regarded as one group)
+        group_codes = pd.factorize(data_frame[group_by])[0] + 1
+        group_sizes = np.bincount(group_codes)
+        # Assign each group to a chunk by the (cumulative) position where the group starts
+        group_chunk_ids = (np.cumsum(group_sizes) - group_sizes) // chunk_size
+        chunk_ids = group_chunk_ids[group_codes]
+
+        for chunk_id in np.unique(chunk_ids):
+            yield data_frame[chunk_ids == chunk_id]
+
+
+def save_to_scratch(data_frame, path_to_scratch, chunk_id):
+    """
+    Save a (chunk of) data frame column by column to a scratch directory.
+
+    Numerical, boolean and date/time columns are saved as .npy files (which can be memory-mapped when
+    being loaded); any other columns are saved as pickle files. The index is saved in the same way
+    (level by level) so that it is restored by :py:func:`read_scratch_chunk`.
+
+    :param data_frame: a (chunk of) data frame
+    :type data_frame: pandas.DataFrame
+    :param path_to_scratch: path to a scratch directory
+    :type path_to_scratch: str
+    :param chunk_id: ID number of the chunk
+    :type chunk_id: int
+    """
+
+    path_to_chunk = os.path.join(path_to_scratch, "{:05d}".format(chunk_id))
+    os.makedirs(path_to_chunk, exist_ok=True)
+
+    def save_column(column, filename):
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in 'biufcmM':
+            filename += ".npy"
+            np.save(os.path.join(path_to_chunk, filename), column.to_numpy())
+        else:
+            filename += ".pickle"
+            save_pickle(column.reset_index(drop=True), os.path.join(path_to_chunk, filename))
+        return filename
+
+    column_files = [
+        (col_name, save_column(column, "{:04d}".format(i)))
+        for i, (col_name, column) in enumerate(data_frame.items())]
+
+    index_frame = data_frame.index.to_frame(index=False)
+    index_files = [
+        (level_name, save_column(index_frame.iloc[:, i], "index-{:02d}".format(i)))
+        for i, level_name in enumerate(data_frame.index.names)]
+
+    save_pickle(column_files, os.path.join(path_to_chunk, "columns.pickle"))
+    save_pickle(index_files, os.path.join(path_to_chunk, "index.pickle"))
+
+
+def read_scratch_chunk(path_to_chunk, columns=None, mmap_mode='r'):
+    """
+    Read a chunk of data frame (or some of its columns) from a scratch directory.
+
+    :param path_to_chunk: path to the directory of a chunk
+    :type path_to_chunk: str
+    :param columns: names of the columns to be read; if ``None`` (default), all columns
+    :type columns: list or None
+    :param mmap_mode: memory-map mode of the .npy files (see :py:func:`numpy.load`),
+        defaults to ``'r'``
+    :type mmap_mode: str or None
+    :return: the chunk of data frame (with its index)
+    :rtype: pandas.DataFrame
+    """
+
+    def read_column(filename):
+        path_to_file = os.path.join(path_to_chunk, filename)
+        if filename.endswith(".npy"):
+            return np.load(path_to_file, mmap_mode=mmap_mode)
+        else:
+            return load_pickle(path_to_file)
+
+    column_files = load_pickle(os.path.join(path_to_chunk, "columns.pickle"))
+    if columns is not None:
+        column_files = [x for x in column_files if x[0] in columns]
+
+    chunk = pd.DataFrame(
+        {col_name: read_column(filename) for col_name, filename in column_files},
+        columns=[x[0] for x in column_files])
+
+    index_files = load_pickle(os.path.join(path_to_chunk, "index.pickle"))
+    index_levels = [read_column(filename) for _, filename in index_files]
+    index_names = [x[0] for x in index_files]
+    if len(index_levels) == 1:
+        chunk.index = pd.Index(index_levels[0], name=index_names[0])
+    else:
+        chunk.index = pd.MultiIndex.from_arrays(index_levels, names=index_names)
+
+    return chunk
+
+
+def iter_scratch_chunks(path_to_scratch, columns=None, mmap_mode='r'):
+    """
+    Iterate over the chunks of data frame saved in a scratch directory.
+
+    See also :py:func:`read_scratch_chunk`.
+
+    :return: chunks of data frame
+    :rtype: typing.Generator[pandas.DataFrame]
+    """
+
+    for path_to_chunk in sorted(glob.glob(os.path.join(path_to_scratch, "[0-9]" * 5))):
+        yield read_scratch_chunk(path_to_chunk, columns=columns, mmap_mode=mmap_mode)
+
+
+def is_scratch_complete(path_to_scratch):
+    """
+    Check whether a scratch directory holds the complete set of chunks written by
+    :py:func:`spill_chunks` (i.e. whether its manifest exists and agrees with the chunks).
+
+    :param path_to_scratch: path to a scratch directory
+    :type path_to_scratch: str
+    :return: whether the scratch directory is complete
+    :rtype: bool
+    """
+
+    path_to_manifest = os.path.join(path_to_scratch, "manifest.json")
+
+    if not os.path.isfile(path_to_manifest):
+        return False
+
+    manifest = load_json(path_to_manifest)
+    chunk_count = len(glob.glob(os.path.join(path_to_scratch, "[0-9]" * 5)))
+
+    return manifest['ChunkCount'] == chunk_count
+
+
+def load_from_scratch(path_to_scratch, columns=None, mmap_mode='r', ignore_index=False):
+    """
+    Assemble a data frame (or some of its columns) from the chunks saved in a scratch directory.
+
+    This copies all the chunks into memory; where possible, consume the chunks one by one with
+    :py:func:`iter_scratch_chunks` instead.
+
+    :param path_to_scratch: path to a scratch directory
+    :type path_to_scratch: str
+    :param columns: names of the columns to be loaded; if ``None`` (default), all columns
+    :type columns: list or None
+    :param mmap_mode: memory-map mode of the .npy files (see :py:func:`numpy.load`),
+        defaults to ``'r'``
+    :type mmap_mode: str or None
+    :param ignore_index: whether to discard the index of the chunks (and number the rows from 0),
+        defaults to ``False``
+    :type ignore_index: bool
+    :return: the data frame
+    :rtype: pandas.DataFrame
+    :raises FileNotFoundError: if the scratch directory is not complete
+        (see :py:func:`is_scratch_complete`)
+    """
+
+    if not is_scratch_complete(path_to_scratch):
+        raise FileNotFoundError(
+            "No complete set of chunks is saved in \"{}\"".format(path_to_scratch))
+
+    chunks = iter_scratch_chunks(path_to_scratch, columns=columns, mmap_mode=mmap_mode)
+
+    data_frame = pd.concat(chunks, axis=0, ignore_index=ignore_index, sort=False)
+
+    return data_frame
+
+
+def spill_chunks(chunks, func, path_to_scratch, verbose=False):
+    """
+    Apply a function to chunks of data frame, with the result of each chunk being spilled to
+    a scratch directory.
+
+    Empty results are not saved, unless all the results are empty (in which case the last one is
+    saved so that the columns of the result are kept).
+
+    The chunks are written to a temporary directory, which is moved to ``path_to_scratch`` only
+    after a manifest (i.e. the numbers of the chunks and the rows) has been written to it last;
+    an interrupted run therefore never leaves a partial set of chunks behind at ``path_to_scratch``
+    (see :py:func:`is_scratch_complete`).
+
+    :param chunks: chunks of data frame
+    :type chunks: typing.Iterable[pandas.DataFrame]
+    :param func: a function that takes a chunk and returns a data frame
+    :type func: typing.Callable
+    :param path_to_scratch: path to a scratch directory (any existing contents are removed)
+    :type path_to_scratch: str
+    :param verbose: whether to print relevant information in console, defaults to ``False``
+    :type verbose: bool or int
+    :return: path to the scratch directory
+    :rtype: str
+    """
+
+    path_to_temp = path_to_scratch.rstrip(os.sep) + ".incomplete"
+    shutil.rmtree(path_to_temp, ignore_errors=True)
+    os.makedirs(path_to_temp)
+
+    saved, empty_result = [], None
+
+    for chunk_id, chunk in enumerate(chunks):
+        if verbose:
+            print("Processing chunk {} ({} rows)".format(chunk_id + 1, len(chunk)), end=" ... ")
+
+        result = func(chunk)
+        if result is not None:
+            if result.empty:
+                empty_result = result
+            else:
+                save_to_scratch(result, path_to_temp, chunk_id)
+                saved.append(len(result))
+
+        if verbose:
+            print("Done. ")
+
+    if not saved and empty_result is not None:
+        save_to_scratch(empty_result, path_to_temp, 0)
+        saved.append(0)
+
+    save({'ChunkCount': len(saved), 'RowCount': sum(saved)},
+         os.path.join(path_to_temp, "manifest.json"))
+
+    shutil.rmtree(path_to_scratch, ignore_errors=True)
+    os.replace(path_to_temp, path_to_scratch)
+
+    return path_to_scratch
+
+
+def apply_in_chunks(data_frame, func, path_to_scratch, memory_budget, expansion=1.0, group_by=None,
+                    verbose=False):
+    """
+    Apply a function to a data frame chunk by chunk, with the result of each chunk being spilled to
+    a scratch directory.
+
+    See also :py:func:`spill_chunks`.
+
+    :param data_frame: a data frame
+    :type data_frame: pandas.DataFrame
+    :param func: a function that takes a chunk of ``data_frame`` and returns a data frame
+    :type func: typing.Callable
+    :param path_to_scratch: path to a scratch directory (any existing contents are removed)
+    :type path_to_scratch: str
+    :param memory_budget: memory budget (in bytes) for processing a chunk
+    :type memory_budget: int
+    :param expansion: ratio of the memory required by ``func`` to the size of a chunk,
+        defaults to ``1.0``
+    :type expansion: int or float
+    :param group_by: name of a column, the rows having the same value of which are processed in
+        the same chunk, defaults to ``None``
+    :type group_by: str or None
+    :param verbose: whether to print relevant information in console, defaults to ``False``
+    :type verbose: bool or int
+    :return: path to the scratch directory
+    :rtype: str
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from utils import apply_in_chunks, load_from_scratch
+
+        >>> dat = pd.DataFrame({'A': range(1000)})
+
+        >>> path_to_dat = apply_in_chunks(dat, lambda x: x * 2, "scratch", memory_budget=800)
+        >>> load_from_scratch(path_to_dat).A.sum()
+        999000
+
+        >>> path_to_dat = apply_in_chunks(dat, lambda x: x[x.A < 0], "scratch", memory_budget=800)
+        >>> load_from_scratch(path_to_dat).columns.tolist()
+        ['A']
+    """
+
+    chunk_size = estimate_chunk_size(data_frame, memory_budget, expansion=expansion)
+
+    chunks = split_into_chunks(data_frame, chunk_size, group_by=group_by)
+
+    return spill_chunks(chunks, func, path_to_scratch, verbose=verbose)
+
+
+def apply_to_scratch(path_to_input, func, path_to_scratch, verbose=False):
+    """
+    Apply a function to the chunks saved in a scratch directory one by one, with the result of each
+    chunk being spilled to another scratch directory.
+
+    See also :py:func:`spill_chunks`.
+
+    :param path_to_input: path to the scratch directory of the input chunks
+    :type path_to_input: str
+    :param func: a function that takes a chunk and returns a data frame
+    :type func: typing.Callable
+    :param path_to_scratch: path to a scratch directory for the results
+        (any existing contents are removed)
+    :type path_to_scratch: str
+    :param verbose: whether to print relevant information in console, defaults to ``False``
+    :type verbose: bool or int
+    :return: path to the scratch directory of the results
+    :rtype: str
+    :raises FileNotFoundError: if the scratch directory of the input chunks is not complete
+        (see :py:func:`is_scratch_complete`)
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from utils import apply_in_chunks, apply_to_scratch, load_from_scratch
+
+        >>> dat = pd.DataFrame({'A': range(1000)})
+
+        >>> path_to_dat = apply_in_chunks(dat, lambda x: x * 2, "scratch", memory_budget=800)
+        >>> path_to_dat_ = apply_to_scratch(path_to_dat, lambda x: x + 1, "scratch_")
+        >>> load_from_scratch(path_to_dat_).A.sum()
+        1000000
+    """
+
+    assert os.path.abspath(path_to_input) != os.path.abspath(path_to_scratch)
+
+    if not is_scratch_complete(path_to_input):
+        raise FileNotFoundError(
+            "No complete set of chunks is saved in \"{}\"".format(path_to_input))
+
+    chunks = iter_scratch_chunks(path_to_input)
+
+    return spill_chunks(chunks, func, path_to_scratch, verbose=verbose)
+
+
+# == Categorical schema ===============================================================================
+
+def cdd_schema(*sub_dir, mkdir=False):
+    """
+    Change directory to "data\\metex\\schema" and sub-directories / a file.
+
+    :param sub_dir: name of directory or names of directories (and/or a filename)
+    :type sub_dir: str
+    :param mkdir: whether to create a directory, defaults to ``False``
+    :type mkdir: bool
+    :return: full path to "data\\metex\\schema" and sub-directories / a file
+    :rtype: str
+    """
+
+    path = cdd_metex("schema", *sub_dir, mkdir=mkdir)
+
+    return path
+
+
+# Column name: name of the value dictionary ('StartLocation' and 'EndLocation' share the same one,
+# so that the two columns can be compared with each other)
+categorical_columns = {
+    'Route': 'Route',
+    'IMDM': 'IMDM',
+    'WeatherCategory': 'WeatherCategory',
+    'IncidentReasonCode': 'IncidentReasonCode',
+    'IncidentCategory': 'IncidentCategory',
+    'StanoxSection': 'StanoxSection',
+    'StartLocation': 'Location',
+    'EndLocation': 'Location',
+}
+
+
+# Value dictionaries (see get_categorical_schema()), kept for the rest of the session once loaded
+_categorical_schema = {}
+
+
+def get_categorical_schema():
+    """
+    Get the value dictionaries of the columns that are stored as categorical data.
+
+    The values of 'Route' and 'WeatherCategory' are initialised from the lookup files
+    "name-changes.json" and "weather-categories.json", respectively; the others are collected
+    as they appear in the data (see :py:func:`apply_categorical_schema`).
+
+    The value dictionaries are loaded only once in a session; any values collected since then are
+    saved only by :py:func:`save_categorical_schema`.
+
+    :return: a value dictionary (i.e. a list of categories) for each name in ``categorical_columns``
+    :rtype: dict
+
+    **Test**::
+
+        >>> from utils import get_categorical_schema
+
+        >>> categorical_schema = get_categorical_schema()
+
+        >>> list(categorical_schema.keys())
+        ['Route', 'IMDM', 'WeatherCategory', 'IncidentReasonCode', 'IncidentCategory',
+         'StanoxSection', 'Location']
+    """
+
+    path_to_json = os.path.abspath(cdd_schema("categories.json"))
+
+    if path_to_json in _categorical_schema:
+        categorical_schema = _categorical_schema[path_to_json]
+
+    elif os.path.isfile(path_to_json):
+        categorical_schema = load_json(path_to_json)
+
+    else:
+        route_names = load_json(cdd_network("routes", "name-changes.json")).values()
+        weather_categories = load_json(cdd_weather("weather-categories.json"))['WeatherCategory']
+
+        categorical_schema = {name: [] for name in categorical_columns.values()}
+        categorical_schema['Route'] = remove_list_duplicates(route_names)
+        categorical_schema['WeatherCategory'] = [''] + remove_list_duplicates(weather_categories)
+
+    _categorical_schema[path_to_json] = categorical_schema
+
+    return categorical_schema
+
+
+def save_categorical_schema(verbose=False):
+    """
+    Save the value dictionaries of the columns that are stored as categorical data
+    (see :py:func:`get_categorical_schema`).
+
+    This is done only where the data is created (e.g. by
+    :py:meth:`preprocessor.METExLite.view_schedule8_data`), and never as the data is read,
+    so that processes which read the data concurrently do not write the same file.
+
+    :param verbose: whether to print relevant information in console as the function runs,
+        defaults to ``False``
+    :type verbose: bool or int
+    """
+
+    categorical_schema = get_categorical_schema()
+
+    save(categorical_schema, os.path.join(cdd_schema(mkdir=True), "categories.json"),
+         verbose=verbose)
+
+
+def apply_categorical_schema(data_frame, columns=None, save_schema=False):
+    """
+    Convert the high-repetition columns of a data frame to categorical data.
+
+    Any values that are not yet in the value dictionaries are appended to them, so that
+    the categories (and their codes) of a column stay the same across pickles and views.
+
+    :param data_frame: a data frame
+    :type data_frame: pandas.DataFrame
+    :param columns: names of columns to be converted; if ``None`` (default),
+        all of ``categorical_columns`` that are present in the ``data_frame``
+    :type columns: list or None
+    :param save_schema: whether to save the value dictionaries if any values are appended to them
+        (see :py:func:`save_categorical_schema`), defaults to ``False``
+    :type save_schema: bool
+    :return: the data frame with categorical columns
+    :rtype: pandas.DataFrame
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from utils import apply_categorical_schema
+
+        >>> dat = pd.DataFrame({'Route': ['Anglia', 'Anglia', 'Wales'], 'DelayMinutes': [1, 2, 3]})
+
+        >>> dat = apply_categorical_schema(dat)
+
+        >>> dat.Route.dtype
+        CategoricalDtype(categories=['Anglia', ...], ordered=False)
+    """
+
+    if columns is None:
+        columns = [x for x in categorical_columns if x in data_frame.columns]
+
+    categorical_schema = get_categorical_schema()
+    schema_updated = False
+
+    # Add any new values to the value dictionaries before converting any of the columns
+    for col in columns:
+        categories = categorical_schema.setdefault(categorical_columns.get(col, col), [])
+
+        if isinstance(data_frame[col].dtype, pd.CategoricalDtype):
+            values = data_frame[col].cat.categories
+        else:
+            values = data_frame[col].dropna().unique()
+
+        known_values = set(categories)
+        new_values = [x for x in values if x not in known_values]
+        if new_values:
+            categories += sorted(new_values, key=str)
+            schema_updated = True
+
+    for col in columns:
+        categorical_dtype = pd.CategoricalDtype(
+            categories=categorical_schema[categorical_columns.get(col, col)], ordered=False)
+        if data_frame[col].dtype != categorical_dtype:
+            data_frame[col] = data_frame[col].astype(categorical_dtype)
+
+    if schema_updated and save_schema:
+        save_categorical_schema()
+
+    return data_frame
+
+
 def remove_list_duplicates(lst):
     """
     Remove duplicates in a list.
@@ -911,6 +2105,38 @@ def update_nr_route_names(data_set, route_col_name='Route'):
     data_set[route_col_name] = data_set[new_route_col_name].replace(route_names_changes)
 
 
+def nr_mileage_nums_to_str(mileages):
+    """
+    Convert Network Rail mileages in numerical format to strings, all at once.
+
+    This is equivalent to mapping ``pyrcs.utils.nr_mileage_num_to_str`` over the mileages.
+
+    :param mileages: Network Rail mileages in numerical format
+    :type mileages: pandas.Series
+    :return: Network Rail mileages formatted as ``'<miles>.<yards>'`` (``''`` for null values)
+    :rtype: pandas.Series
+
+    **Test**::
+
+        >>> import pandas as pd
+        >>> from utils import nr_mileage_nums_to_str
+
+        >>> nr_mileage_nums_to_str(pd.Series([1.0005, None, 30]))
+        0     1.0005
+        1
+        2    30.0000
+        dtype: object
+    """
+
+    mileages_num = pd.to_numeric(mileages, errors='coerce').round(4)
+
+    mileages_str = pd.Series(
+        np.char.mod('%.4f', mileages_num.to_numpy(dtype=np.float64)), index=mileages_num.index,
+        dtype=object).where(mileages_num.notnull(), '')
+
+    return mileages_str
+
+
 def get_coefficients(model, feature_names=None):
     """
     Get regression model coefficients presented as a data frame.